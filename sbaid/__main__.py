@@ -0,0 +1,47 @@
+"""
+The entry point into the application. Run it with python -m sbaid.
+"""
+
+import sys
+import asyncio
+from typing import Coroutine, Any
+
+# There is some black magic happening here but when we import these
+# just in time in the result generators the python interpreter
+# segfaults on the workstation. No clue why because that shouldn't
+# ever happen and I'm not going to gdb run cpython now
+import matplotlib  # noqa  # pylint: disable=unused-import
+import numpy  # noqa  # pylint: disable=unused-import
+import seaborn  # noqa  # pylint: disable=unused-import
+
+from gi.repository import GLib
+from gi.events import GLibEventLoopPolicy  # type: ignore
+
+from sbaid.application import Application
+
+
+class _Task(asyncio.Task[Any]):
+    def __init__(self, coro: Coroutine[Any, Any, Any], **kwargs: Any) -> None:
+        super().__init__(coro, **kwargs)
+
+        self.add_done_callback(self.__done_callback)
+        self.__idle_id = GLib.idle_add(lambda: GLib.SOURCE_CONTINUE)
+
+    def __done_callback(self, task: '_Task') -> None:
+        GLib.source_remove(self.__idle_id)
+
+
+def __task_factory(event_loop: asyncio.AbstractEventLoop,
+                   coro: Coroutine[Any, Any, Any], **kwargs: Any) -> asyncio.Task[Any]:
+    return _Task(coro, **kwargs)
+
+
+if __name__ == '__main__':
+    asyncio.set_event_loop_policy(GLibEventLoopPolicy())
+    asyncio.get_event_loop().set_task_factory(__task_factory)
+    app = Application()
+    try:
+        app.run(sys.argv)
+    finally:
+        asyncio.get_event_loop().run_until_complete(app.close())
+    asyncio.set_event_loop_policy(None)
@@ -8,8 +8,10 @@ from typing import Any
 import gi
 
 from sbaid import common
+from sbaid.common.write_behind import write_behind
 from sbaid.model.context import Context as ModelContext
 from sbaid.view_model.context import Context
+from sbaid.view import utils
 from sbaid.view.main_window import MainWindow
 
 try:
@@ -43,9 +45,19 @@ class Application(Adw.Application):
     def do_startup(self, *args: Any, **kwargs: Any) -> None:
         Adw.Application.do_startup(self)
 
+        # edits are written in the background, so their failures are reported like
+        # the ones of other background work of the view
+        write_behind.register_error_reporter(utils.report_error)
+
         self.__view_model_context = Context(ModelContext())
         common.run_coro_in_background(self.__view_model_context.load())
 
+    async def close(self) -> None:
+        """Closes the context. Has to be called once the application stopped running."""
+        if self.get_is_remote():
+            return
+        await self.__view_model_context.close()
+
     def do_activate(self, *args: Any, **kwargs: Any) -> None:
         if not self.__window:
             self.__window = MainWindow(self.__view_model_context, application=self)
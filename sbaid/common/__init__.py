@@ -7,6 +7,8 @@ from typing import Any, Generator, Coroutine
 
 from gi.repository import Gio, GLib
 
+from sbaid.common.i18n import i18n
+
 
 def list_model_iterator(model: Gio.ListModel) -> Generator[Any, Any, None]:
     """Iterates over a Gio.ListModel"""
@@ -32,6 +34,8 @@ _background_tasks: set[asyncio.Task[None]] = set()
 
 def _discard_task(task: asyncio.Task[None]) -> None:
     _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(i18n._("Failed to run a background task: "), task.exception())
 
 
 def run_coro_in_background(coro: Coroutine[Any, Any, None]) -> None:
@@ -0,0 +1,128 @@
+"""
+This module contains the WriteBehind class, which coalesces rapid writes of
+property values to the databases.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Hashable, NamedTuple
+
+from sbaid.common.i18n import i18n
+
+
+class WriteBehindStatistics(NamedTuple):
+    """A snapshot of how a WriteBehind has been used so far."""
+    pending: int
+    scheduled: int
+    coalesced: int
+    """The number of writes that were replaced by a later value before they ran."""
+    flushed: int
+    failed: int
+
+
+class WriteBehind:  # pylint: disable=too-many-instance-attributes
+    """This class keeps only the latest pending write per key, where a key identifies a
+    database column of a single row, e.g. (database, table, row id, column). The pending
+    writes are run once no new write was scheduled for delay seconds, but at the latest
+    max_delay seconds after the oldest pending write was scheduled, or when flush is called.
+    Writes are started in the order their keys were first scheduled. A failed write is
+    handed to every registered error reporter."""
+
+    __delay: float
+    __max_delay: float
+    __pending: dict[Hashable, Callable[[], Awaitable[Any]]]
+    __oldest: float
+    __timer: asyncio.TimerHandle | None
+    __task: asyncio.Task[None] | None
+    __scheduled: int
+    __coalesced: int
+    __flushed: int
+    __failed: int
+    __error_reporters: list[Callable[[Exception], None]]
+
+    def __init__(self, delay: float = 0.3, max_delay: float = 2.0) -> None:
+        self.__delay = delay
+        self.__max_delay = max_delay
+        self.__pending = {}
+        self.__oldest = 0.0
+        self.__timer = None
+        self.__task = None
+        self.__scheduled = 0
+        self.__coalesced = 0
+        self.__flushed = 0
+        self.__failed = 0
+        self.__error_reporters = []
+
+    @property
+    def statistics(self) -> WriteBehindStatistics:
+        """Return the number of pending writes and the counters so far."""
+        return WriteBehindStatistics(len(self.__pending), self.__scheduled, self.__coalesced,
+                                     self.__flushed, self.__failed)
+
+    def register_error_reporter(self, error_reporter: Callable[[Exception], None]) -> None:
+        """Register a function to be called with the exception of every failed write.
+        Failures are only printed while no function is registered."""
+        self.__error_reporters.append(error_reporter)
+
+    def schedule(self, key: Hashable, write: Callable[[], Awaitable[Any]]) -> None:
+        """Schedule the given write for the key, replacing the pending write of that key.
+        Must be called from within a running event loop."""
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        if not self.__pending:
+            self.__oldest = now
+        if key in self.__pending:
+            self.__coalesced += 1
+        self.__pending[key] = write
+        self.__scheduled += 1
+
+        if self.__timer is not None:
+            self.__timer.cancel()
+        delay = min(self.__delay, max(self.__oldest + self.__max_delay - now, 0.0))
+        self.__timer = loop.call_later(delay, self.__on_timeout)
+
+    def __on_timeout(self) -> None:
+        self.__timer = None
+        self.__start_flush()
+
+    def __start_flush(self) -> asyncio.Task[None] | None:
+        if self.__pending and (self.__task is None or self.__task.done()):
+            writes = list(self.__pending.values())
+            self.__pending.clear()
+            self.__task = asyncio.create_task(self.__run(writes))
+        return self.__task
+
+    async def flush(self) -> None:
+        """Run all pending writes right away and wait until they are done."""
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        while (task := self.__start_flush()) is not None and not task.done():
+            await asyncio.shield(task)
+
+    async def __run(self, writes: list[Callable[[], Awaitable[Any]]]) -> None:
+        # the writes are started in order, so they are queued by the database in order
+        results = await asyncio.gather(*(self.__write(write) for write in writes),
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.__failed += 1
+                self.__report_error(result)
+            else:
+                self.__flushed += 1
+        if self.__pending and self.__timer is None:
+            # the timer of the writes scheduled meanwhile ran out while this task was busy
+            asyncio.get_running_loop().call_soon(self.__start_flush)
+
+    def __report_error(self, exception: Exception) -> None:
+        if not self.__error_reporters:
+            print(i18n._("Failed to write a value to the database: "), exception)
+        for error_reporter in self.__error_reporters:
+            error_reporter(exception)
+
+    @staticmethod
+    async def __write(write: Callable[[], Awaitable[Any]]) -> None:
+        await write()
+
+
+write_behind = WriteBehind()
+"""The WriteBehind used for all property edits of the model."""
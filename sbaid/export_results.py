@@ -0,0 +1,75 @@
+"""
+Exports the data of a stored result without the user interface, e.g. for offline analysis:
+
+    python -m sbaid.export_results RESULT_ID DIRECTORY [--format csv] [--cross-section ID]...
+"""
+import argparse
+import asyncio
+import sys
+
+from gi.repository import Gio, GLib
+
+from sbaid.model.database.global_sqlite import GlobalSQLite
+from sbaid.model.results.result_exporter import LAYERS, ResultExporter
+
+
+def __parse_date_time(value: str) -> GLib.DateTime:
+    date_time = GLib.DateTime.new_from_iso8601(value, GLib.TimeZone.new_local())
+    if date_time is None:
+        raise argparse.ArgumentTypeError(f"Invalid iso8601 date time: {value}")
+    return date_time
+
+
+def __parse_args(argv: list[str]) -> argparse.Namespace:
+    default_database = GLib.build_filenamev([GLib.get_user_data_dir(), "sbaid", "global_db"])
+    parser = argparse.ArgumentParser(prog="sbaid.export_results",
+                                     description="Export the data of a stored result.")
+    parser.add_argument("result_id")
+    parser.add_argument("directory")
+    parser.add_argument("--format", dest="format_id",
+                        help="the file format, parquet if available and csv otherwise")
+    parser.add_argument("--cross-section", dest="cross_section_ids", action="append",
+                        help="a cross section to export, can be repeated, default all")
+    parser.add_argument("--start", type=__parse_date_time,
+                        help="export only snapshots captured at or after this time")
+    parser.add_argument("--end", type=__parse_date_time,
+                        help="export only snapshots captured at or before this time")
+    parser.add_argument("--layer", dest="layers", action="append", choices=list(LAYERS),
+                        help="a layer to export, can be repeated, default all")
+    parser.add_argument("--database", default=default_database,
+                        help="the global database file")
+    return parser.parse_args(argv)
+
+
+async def __export(args: argparse.Namespace) -> list[Gio.File]:
+    database = Gio.File.new_for_path(args.database)
+    if not database.query_exists():
+        raise FileNotFoundError(f"No global database at {args.database}")
+    global_db = GlobalSQLite(database)
+    await global_db.open()
+    try:
+        if await global_db.get_result_name(args.result_id) is None:
+            raise ValueError(f"No result with the id {args.result_id}")
+        return await ResultExporter().export(
+            global_db, args.result_id, Gio.File.new_for_path(args.directory), args.format_id,
+            args.cross_section_ids, args.start, args.end, args.layers or list(LAYERS))
+    finally:
+        await global_db.close()
+
+
+def main(argv: list[str]) -> int:
+    """Exports a result as described by the command line arguments and prints the paths
+    of the written files."""
+    args = __parse_args(argv)
+    try:
+        files = asyncio.run(__export(args))
+    except (ValueError, OSError) as e:
+        print("Error:", e, file=sys.stderr)
+        return 1
+    for file in files:
+        print(file.get_path())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
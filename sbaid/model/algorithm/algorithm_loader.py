@@ -0,0 +1,33 @@
+"""This module contains the function that loads an algorithm from its script."""
+import importlib.util
+import os
+import sys
+
+from sbaid.model.algorithm.algorithm import Algorithm
+
+
+def load_algorithm(script_path: str) -> Algorithm | None:
+    """Executes the script at the given path as a module and returns a new instance of the
+    AlgorithmImpl class defined in it. Returns None if the script cannot be loaded."""
+    base_name = os.path.basename(script_path)
+    module_name = base_name.removesuffix(".py")
+
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+
+    if spec is None:
+        return None
+
+    module = importlib.util.module_from_spec(spec)
+
+    if module is None:
+        return None
+
+    sys.modules[module_name] = module
+
+    if spec.loader is None:
+        return None
+
+    spec.loader.exec_module(module)
+
+    algorithm: Algorithm = module.AlgorithmImpl()
+    return algorithm
@@ -0,0 +1,68 @@
+"""This module contains the main function of the process an AlgorithmWorker runs an
+algorithm in. It only imports what the algorithm needs, so starting the process neither
+imports the user interface nor the rest of the model."""
+import pickle
+import time
+from multiprocessing.connection import Connection
+from typing import Any
+
+from gi.repository import GLib
+
+from sbaid.common.cross_section_type import CrossSectionType
+from sbaid.common.i18n import i18n
+from sbaid.common.location import Location
+from sbaid.model.algorithm.algorithm_loader import load_algorithm
+from sbaid.model.simulation.cross_section_state import CrossSectionState
+from sbaid.model.simulation.input import Input
+from sbaid.model.simulation.network_state import NetworkState
+from sbaid.model.simulation.parameter_configuration_state import ParameterConfigurationState
+from sbaid.model.simulation.parameter_state import ParameterState
+
+StatesData = tuple[list[tuple[str, str | None, str | None]],
+                   list[tuple[float, float]],
+                   list[tuple[str, int, int, bool, bool]]]
+"""The parameter configuration and network states as plain data."""
+
+
+def _states_from_data(data: StatesData) -> tuple[ParameterConfigurationState, NetworkState]:
+    parameters, route, cross_sections = data
+    return (ParameterConfigurationState(
+                [ParameterState(name, None if value is None else GLib.Variant.parse(None, value),
+                                cross_section_id)
+                 for name, value, cross_section_id in parameters]),
+            NetworkState([Location(x, y) for x, y in route],
+                         [CrossSectionState(cs_id, CrossSectionType(cs_type), lanes,
+                                            b_display_available, hard_shoulder_available)
+                          for cs_id, cs_type, lanes, b_display_available,
+                          hard_shoulder_available in cross_sections]))
+
+
+def serve(script_path: str, connection: Connection) -> None:
+    """The main function of the worker process. Answers the requests of the AlgorithmWorker
+    until it is stopped or the connection is closed."""
+    algorithm = None
+    while True:
+        try:
+            message = pickle.loads(connection.recv_bytes())
+        except EOFError:
+            return
+        try:
+            if message[0] == "stop":
+                return
+            reply: tuple[Any, ...]
+            if message[0] == "init":
+                algorithm = load_algorithm(script_path)
+                if algorithm is None:
+                    reply = ("error", i18n._("Could not load the algorithm from {}.")
+                             .format(script_path))
+                else:
+                    algorithm.init(*_states_from_data(message[1]))
+                    reply = ("ok", None)
+            else:
+                assert algorithm is not None
+                display = algorithm.calculate_display(Input.from_data(message[1]))
+                reply = ("ok", display.to_data())
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            reply = ("error", f"{type(e).__name__}: {e}")
+        connection.send_bytes(pickle.dumps(reply + (time.process_time(),),
+                                           pickle.HIGHEST_PROTOCOL))
@@ -0,0 +1,174 @@
+"""This module contains the AlgorithmWorker class, which runs an algorithm in a separate
+process, and the exceptions related to it."""
+import asyncio
+import multiprocessing
+import pickle
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any
+
+from sbaid.common import list_model_iterator
+from sbaid.common.i18n import i18n
+from sbaid.model.algorithm.algorithm_process import StatesData, serve
+from sbaid.model.simulation.display import Display
+from sbaid.model.simulation.input import Input
+from sbaid.model.simulation.network_state import NetworkState
+from sbaid.model.simulation.parameter_configuration_state import ParameterConfigurationState
+
+
+class AlgorithmWorkerException(Exception):
+    """Raised when the algorithm in the worker process failed."""
+
+
+class AlgorithmTimeoutException(AlgorithmWorkerException):
+    """Raised when the algorithm did not calculate a display within the time budget.
+    The worker process is restarted for the next step."""
+
+
+class AlgorithmCrashedException(AlgorithmWorkerException):
+    """Raised when the worker process died while calculating a display.
+    The worker process is restarted for the next step."""
+
+
+class AlgorithmWorker:  # pylint: disable=too-many-instance-attributes
+    """This class hosts the algorithm of a script in a separate process, so a slow algorithm
+    neither blocks the main loop nor the simulator and a crashing one does not take down
+    SBAid. The process is reused for every step. Inputs and displays are sent as pickled
+    plain data, with the vehicles as columns.
+
+    A step that takes longer than timeout seconds or kills the process is reported by
+    an exception, and the process is started and initialized again for the next step,
+    at most max_restarts times."""
+
+    __script_path: str
+    __timeout: float
+    __start_timeout: float
+    __max_restarts: int
+    __restarts: int
+    __cpu_time: float
+    __process_cpu_time: float
+    __states: StatesData | None
+    __process: BaseProcess | None
+    __connection: Connection | None
+
+    def __init__(self, script_path: str, timeout: float = 10.0, start_timeout: float = 60.0,
+                 max_restarts: int = 3) -> None:
+        self.__script_path = script_path
+        self.__timeout = timeout
+        self.__start_timeout = start_timeout
+        self.__max_restarts = max_restarts
+        self.__restarts = 0
+        self.__cpu_time = 0.0
+        self.__process_cpu_time = 0.0
+        self.__states = None
+        self.__process = None
+        self.__connection = None
+
+    @property
+    def restarts(self) -> int:
+        """The number of times the process was restarted after a timeout or a crash."""
+        return self.__restarts
+
+    @property
+    def cpu_time(self) -> float:
+        """The CPU time in seconds the processes of the worker used so far, as of the last
+        answer of each process."""
+        return self.__cpu_time + self.__process_cpu_time
+
+    async def start(self, parameter_configuration_state: ParameterConfigurationState,
+                    network_state: NetworkState) -> None:
+        """Start the process, load the algorithm in it and initialize it with the given
+        states. Raise an AlgorithmWorkerException if that fails."""
+        self.__states = _states_to_data(parameter_configuration_state, network_state)
+        await self.__start_process()
+
+    async def calculate_display(self, algorithm_input: Input) -> Display:
+        """Calculate the display for the given input in the process."""
+        if self.__states is None:
+            raise AlgorithmWorkerException(i18n._("The algorithm worker was not started."))
+        if self.__connection is None:
+            if self.__restarts >= self.__max_restarts:
+                raise AlgorithmWorkerException(i18n._("The algorithm failed too often."))
+            self.__restarts += 1
+            await self.__start_process()
+        return Display.from_data(await self.__request(("calculate", algorithm_input.to_data()),
+                                                      self.__timeout))
+
+    async def stop(self) -> None:
+        """Stop the process."""
+        connection = self.__connection
+        process = self.__process
+        self.__connection = None
+        self.__process = None
+        if connection is not None:
+            try:
+                connection.send_bytes(pickle.dumps(("stop",)))
+            except OSError:
+                pass
+            connection.close()
+        if process is not None:
+            await asyncio.get_running_loop().run_in_executor(None, process.join, 5)
+            if process.is_alive():
+                process.kill()
+
+    async def __start_process(self) -> None:
+        context = multiprocessing.get_context("spawn")
+        connection, child_connection = context.Pipe()
+        process = context.Process(target=serve, args=(self.__script_path, child_connection),
+                                  daemon=True)
+        process.start()
+        child_connection.close()
+        self.__process = process
+        self.__connection = connection
+        self.__cpu_time += self.__process_cpu_time
+        self.__process_cpu_time = 0.0
+        try:
+            await self.__request(("init", self.__states), self.__start_timeout)
+        except BaseException:
+            self.__kill()
+            raise
+
+    async def __request(self, message: tuple[Any, ...], timeout: float) -> Any:
+        connection = self.__connection
+        assert connection is not None
+
+        def exchange() -> tuple[Any, ...]:
+            connection.send_bytes(pickle.dumps(message, pickle.HIGHEST_PROTOCOL))
+            if not connection.poll(timeout):
+                raise AlgorithmTimeoutException(
+                    i18n._("The algorithm took longer than {} seconds.").format(timeout))
+            reply: tuple[Any, ...] = pickle.loads(connection.recv_bytes())
+            return reply
+
+        try:
+            reply = await asyncio.get_running_loop().run_in_executor(None, exchange)
+        except (AlgorithmTimeoutException, asyncio.CancelledError):
+            self.__kill()
+            raise
+        except (EOFError, OSError) as e:
+            self.__kill()
+            raise AlgorithmCrashedException(i18n._("The algorithm process died.")) from e
+
+        self.__process_cpu_time = reply[2]
+        if reply[0] == "error":
+            raise AlgorithmWorkerException(reply[1])
+        return reply[1]
+
+    def __kill(self) -> None:
+        if self.__process is not None:
+            self.__process.kill()
+        if self.__connection is not None:
+            self.__connection.close()
+        self.__process = None
+        self.__connection = None
+
+
+def _states_to_data(parameter_configuration_state: ParameterConfigurationState,
+                    network_state: NetworkState) -> StatesData:
+    return ([(state.name, None if state.value is None else state.value.print_(True),
+              state.cross_section_id)
+             for state in list_model_iterator(parameter_configuration_state.parameter_states)],
+            [(location.x, location.y) for location in list_model_iterator(network_state.route)],
+            [(state.id, int(state.type), state.lanes, state.b_display_available,
+              state.hard_shoulder_available)
+             for state in list_model_iterator(network_state.cross_section_states)])
@@ -1,14 +1,14 @@
 """This module defines the AlgorithmConfiguration class"""
-import importlib.util
-import sys
-import os
+import functools
 
 from gi.repository import GObject, Gio
 
 from sbaid import common
+from sbaid.common.write_behind import write_behind
 from sbaid.model.database.project_database import ProjectDatabase
 from sbaid.model.network.network import Network
 from sbaid.model.algorithm.algorithm import Algorithm
+from sbaid.model.algorithm.algorithm_loader import load_algorithm
 from sbaid.model.algorithm_configuration.parameter_configuration import (
     ParameterConfiguration)
 
@@ -48,7 +48,9 @@ class AlgorithmConfiguration(GObject.GObject):
         """Sets the name of the algo config"""
         self.__name = new_name
 
-        common.run_coro_in_background(self.__db.set_algorithm_configuration_name(self.id, new_name))
+        write_behind.schedule((self.__db, "algorithm_configuration", self.id, "name"),
+                              functools.partial(self.__db.set_algorithm_configuration_name,
+                                                self.id, new_name))
 
     script_path: str = GObject.Property(type=str)  # type: ignore
 
@@ -62,7 +64,9 @@ class AlgorithmConfiguration(GObject.GObject):
         """Sets the current script path of the algo config"""
         self.__script_path = new_script_path
 
-        common.run_coro_in_background(self.__db.set_script_path(self.id, new_script_path))
+        write_behind.schedule((self.__db, "algorithm_configuration", self.id, "script_path"),
+                              functools.partial(self.__db.set_script_path, self.id,
+                                                new_script_path))
         common.run_coro_in_background(self.__load_algorithm())
 
     evaluation_interval: int = GObject.Property(type=int)  # type: ignore
@@ -77,8 +81,10 @@ class AlgorithmConfiguration(GObject.GObject):
         """Sets the evaluation interval"""
         self.__evaluation_interval = new_evaluation_interval
 
-        common.run_coro_in_background(self.__db.set_evaluation_interval(self.id,
-                                                                        new_evaluation_interval))
+        write_behind.schedule((self.__db, "algorithm_configuration", self.id,
+                               "evaluation_interval"),
+                              functools.partial(self.__db.set_evaluation_interval, self.id,
+                                                new_evaluation_interval))
 
     display_interval: int = GObject.Property(type=int)  # type: ignore
 
@@ -92,8 +98,10 @@ class AlgorithmConfiguration(GObject.GObject):
         """Sets the display interval"""
         self.__display_interval = new_display_interval
 
-        common.run_coro_in_background(self.__db.set_display_interval(self.id,
-                                                                     new_display_interval))
+        write_behind.schedule((self.__db, "algorithm_configuration", self.id,
+                               "display_interval"),
+                              functools.partial(self.__db.set_display_interval, self.id,
+                                                new_display_interval))
 
     algorithm: Algorithm = GObject.Property(  # type: ignore
         type=Algorithm,
@@ -133,25 +141,9 @@ class AlgorithmConfiguration(GObject.GObject):
         if self.__script_path is None:
             return
 
-        base_name = os.path.basename(self.__script_path)
-        module_name = base_name.removesuffix(".py")
-
-        spec = importlib.util.spec_from_file_location(module_name, self.__script_path)
-
-        if spec is None:
-            return
-
-        module = importlib.util.module_from_spec(spec)
-
-        if module is None:
+        algorithm = load_algorithm(self.__script_path)
+        if algorithm is None:
             return
 
-        sys.modules[module_name] = module
-
-        if spec.loader is None:
-            return
-
-        spec.loader.exec_module(module)
-
-        self.algorithm = module.AlgorithmImpl()
+        self.algorithm = algorithm
         self.parameter_configuration.set_algorithm(self.algorithm)
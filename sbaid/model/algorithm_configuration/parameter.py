@@ -1,7 +1,10 @@
 """This module defines the Parameter class."""
+import functools
+
 from gi.repository import GLib, GObject, Gio
 
 from sbaid import common
+from sbaid.common.write_behind import write_behind
 from sbaid.model.database.project_database import ProjectDatabase
 from sbaid.model.network.cross_section import CrossSection
 from sbaid.common.tag import Tag
@@ -63,8 +66,9 @@ class Parameter(GObject.GObject):
                              f"Expected: {self.value_type.dup_string()}")
         self.__value = value
 
-        common.run_coro_in_background(self.__db.set_parameter_value(
-            self.__algo_config_id, self.name, self.__get_cs_id(), value))
+        key = (self.__algo_config_id, self.name, self.__get_cs_id())
+        write_behind.schedule((self.__db, "parameter", key, "value"),
+                              functools.partial(self.__db.set_parameter_value, *key, value))
 
     cross_section: CrossSection = GObject.Property(  # type: ignore
         type=CrossSection,
@@ -151,16 +155,23 @@ class Parameter(GObject.GObject):
         cs_id = self.__get_cs_id()
 
         db_value = await self.__db.get_parameter_value(self.__algo_config_id, self.name, cs_id)
-        if db_value is not None:
-            self.__value = db_value
-            self.notify("value")
-
         tags = await self.__db.get_all_tag_ids_for_parameter(self.__algo_config_id,
                                                              self.name, cs_id)
-        for tag in tags:
-            name = await self.__db.get_tag_name(tag)
+        self.set_loaded_data(db_value, [(tag, await self.__db.get_tag_name(tag))
+                                        for tag in tags])
+
+    def set_loaded_data(self, value: GLib.Variant | None,
+                        tags: list[tuple[str, str | None]]) -> None:
+        """Sets the value and the ids and names of the tags loaded from the db,
+        without writing them back."""
+        if value is not None:
+            self.__value = value
+            self.notify("value")
 
-            if name:
-                self.__selected_tags.append(Tag(tag, name))
+        for tag_id, name in tags:
+            for available_tag in common.list_model_iterator(self.__available_tags):
+                if available_tag.tag_id == tag_id:
+                    self.__selected_tags.append(available_tag)
+                    break
             else:
-                self.__selected_tags.append(Tag(tag, "Unknown Tag"))
+                self.__selected_tags.append(Tag(tag_id, name if name else "Unknown Tag"))
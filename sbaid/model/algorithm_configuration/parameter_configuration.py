@@ -119,14 +119,20 @@ class ParameterConfiguration(GObject.GObject):  # pylint: disable=too-many-insta
         await exporter.export_parameters(file, self.__parameters)
 
     async def load(self) -> None:
-        """Loads the parameter values from the database."""
+        """Loads the values and tags of all parameters from the database at once."""
         if self.__loaded:
             return
 
         self.__loaded = True
 
+        loaded = {(name, cross_section_id): (value, tags)
+                  for name, cross_section_id, value, tags
+                  in await self.__db.get_all_parameter_values_and_tags(self.__algo_config_id)}
         for param in common.list_model_iterator(self.__parameters):
-            await param.load_from_db()
+            cross_section_id = param.cross_section.id if param.cross_section else None
+            data = loaded.get((param.name, cross_section_id))
+            if data is not None:
+                param.set_loaded_data(*data)
 
     def set_algorithm(self, algorithm: Algorithm) -> None:
         """
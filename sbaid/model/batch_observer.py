@@ -0,0 +1,22 @@
+"""This module represents the BatchObserver class"""
+from gi.repository import GLib, GObject
+
+
+class BatchObserver(GObject.GObject):
+    """This class defines the BatchObserver interface for observing
+    the status of a batch of simulations"""
+
+    def update_progress(self, percentage: float) -> None:
+        """Notify about the progress of the whole batch, the mean of the progress
+        of its simulations with percentage between 0.0 and 1.0."""
+
+    def run_finished(self, run_id: str, result_id: str) -> None:
+        """Notify when the simulation with the given run id finished successfully and
+        give the id of the result that was created in the process"""
+
+    def run_failed(self, run_id: str, error: GLib.Error) -> None:
+        """Notify when the simulation with the given run id failed and pass an error
+        with further information."""
+
+    def finished(self) -> None:
+        """Notify when every simulation of the batch has either finished or failed."""
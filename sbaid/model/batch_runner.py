@@ -0,0 +1,216 @@
+"""This module defines the BatchRunner class"""
+import asyncio
+import functools
+import os
+import time
+from collections.abc import Awaitable, Callable
+from typing import NamedTuple
+
+from gi.repository import GObject, GLib
+
+from sbaid.common.i18n import i18n
+from sbaid.model.algorithm_configuration.algorithm_configuration import AlgorithmConfiguration
+from sbaid.model.batch_observer import BatchObserver
+from sbaid.model.network.network import Network
+from sbaid.model.results.result_manager import ResultManager
+from sbaid.model.simulation_manager import (SimulationManager, SimulationStatistics,
+                                            ParameterValues)
+from sbaid.model.simulation_observer import SimulationObserver
+from sbaid.model.simulator.simulator import Simulator
+
+DEFAULT_ALGORITHM_TIMEOUT = 60.0
+"""The seconds the algorithm of a simulation in a batch may take for each step."""
+
+
+class BatchRun(NamedTuple):
+    """A simulation of a batch. The parameter values replace those of the parameter
+    configuration of the algorithm configuration for this simulation only."""
+    id: str
+    algorithm_configuration: AlgorithmConfiguration
+    parameter_values: ParameterValues | None = None
+
+
+class BatchStatistics(NamedTuple):
+    """The outcome of the simulations of a batch so far and the resources they used."""
+    runs: int
+    finished: int
+    failed: int
+    total: float
+    """The wall clock time in seconds since the batch was started."""
+    cpu_time: float
+    """The CPU time in seconds of SBAid and of the worker processes of the algorithms."""
+    cpu_usage: float
+    """The mean number of busy CPU cores, i.e. the CPU time divided by the total time."""
+
+
+class _RunObserver(SimulationObserver):
+    """Forwards the progress of one simulation of a batch and remembers its outcome."""
+
+    result_id: str | None
+    error: GLib.Error | None
+
+    def __init__(self, on_progress: Callable[[float], None]) -> None:
+        super().__init__()
+        self.__on_progress = on_progress
+        self.result_id = None
+        self.error = None
+
+    def update_progress(self, percentage: float) -> None:
+        self.__on_progress(percentage)
+
+    def finished(self, result_id: str) -> None:
+        self.result_id = result_id
+
+    def failed(self, error: GLib.Error) -> None:
+        if self.error is None:
+            self.error = error
+
+
+class BatchRunner(GObject.GObject):  # pylint: disable=too-many-instance-attributes
+    """
+    This class runs several simulations concurrently, e.g. of different algorithm
+    configurations.
+    Every simulation gets its own simulator instance and, unless algorithm_timeout is None,
+    its algorithm runs in its own worker process. Without worker processes the simulations
+    run one after another, since runs of the same algorithm configuration share its
+    algorithm instance. Each simulation that finishes adds its own result to the result
+    manager.
+    """
+
+    __project_name: str
+    __runs: list[BatchRun]
+    __network: Network
+    __create_simulator: Callable[[], Awaitable[Simulator]]
+    __result_manager: ResultManager
+    __observer: BatchObserver
+    __algorithm_timeout: float | None
+    __max_parallel_runs: int
+
+    __managers: dict[str, SimulationManager]
+    __progress: dict[str, float]
+    __finished: int
+    __failed: int
+    __cancelled: bool
+    __started_at: float
+    __started_at_cpu: float
+    __finished_at: tuple[float, float] | None
+    __batch_task: asyncio.Task[None]
+
+    def __init__(self, project_name: str, runs: list[BatchRun], network: Network,
+                 create_simulator: Callable[[], Awaitable[Simulator]],
+                 result_manager: ResultManager, observer: BatchObserver,
+                 algorithm_timeout: float | None = DEFAULT_ALGORITHM_TIMEOUT,
+                 max_parallel_runs: int | None = None) -> None:
+        """Initialize the batch runner. create_simulator returns a new simulator with the
+        simulation file loaded. At most max_parallel_runs simulations run at the same time,
+        by default one for every CPU core, and only one if algorithm_timeout is None."""
+        super().__init__()
+        self.__project_name = project_name
+        self.__runs = runs
+        self.__network = network
+        self.__create_simulator = create_simulator
+        self.__result_manager = result_manager
+        self.__observer = observer
+        self.__algorithm_timeout = algorithm_timeout
+        if algorithm_timeout is None:
+            # every run would init the one in-process algorithm with its own parameters
+            self.__max_parallel_runs = 1
+        else:
+            self.__max_parallel_runs = max_parallel_runs or os.cpu_count() or 1
+
+        self.__managers = {}
+        self.__progress = {run.id: 0.0 for run in runs}
+        self.__finished = 0
+        self.__failed = 0
+        self.__cancelled = False
+        self.__started_at = time.perf_counter()
+        self.__started_at_cpu = time.process_time()
+        self.__finished_at = None
+
+    @property
+    def statistics(self) -> BatchStatistics:
+        """Return the number of finished and failed simulations and the time and CPU time
+        used so far."""
+        end, end_cpu = self.__finished_at or (time.perf_counter(), time.process_time())
+        total = end - self.__started_at
+        cpu_time = end_cpu - self.__started_at_cpu
+        if self.__algorithm_timeout is not None:
+            cpu_time += sum(statistics.algorithm_cpu
+                            for statistics in self.run_statistics.values())
+        return BatchStatistics(len(self.__runs), self.__finished,
+                               self.__failed, total, cpu_time,
+                               cpu_time / total if total > 0 else 0.0)
+
+    @property
+    def run_statistics(self) -> dict[str, SimulationStatistics]:
+        """Return the statistics of every simulation that was started so far,
+        by the id of its run."""
+        return {run_id: manager.statistics for run_id, manager in self.__managers.items()}
+
+    def start(self) -> None:
+        """Start the simulations"""
+        self.__started_at = time.perf_counter()
+        self.__started_at_cpu = time.process_time()
+        self.__batch_task = asyncio.create_task(self.__run_all())
+
+    async def wait(self) -> None:
+        """Wait until every simulation has finished, failed or was cancelled."""
+        await asyncio.wait((self.__batch_task,))
+
+    async def cancel(self) -> None:
+        """Cancel the running simulations and skip the ones that did not start yet."""
+        self.__cancelled = True
+        await asyncio.gather(*(manager.cancel() for manager in self.__managers.values()))
+
+    async def __run_all(self) -> None:
+        slots = asyncio.Semaphore(self.__max_parallel_runs)
+        try:
+            await asyncio.gather(*(self.__run(run, slots) for run in self.__runs))
+        finally:
+            self.__finished_at = (time.perf_counter(), time.process_time())
+        self.__observer.finished()
+
+    async def __run(self, run: BatchRun, slots: asyncio.Semaphore) -> None:
+        async with slots:
+            if self.__cancelled:
+                self.__run_failed(run.id, GLib.Error(i18n._("Simulation was cancelled.")))
+                return
+
+            try:
+                simulator = await self.__create_simulator()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                print(i18n._("Failed to create a simulator: "), e)
+                self.__run_failed(run.id, GLib.Error(
+                    i18n._("Failed to create a simulator: ") + str(e)))
+                return
+
+            if self.__cancelled:
+                # the batch was cancelled while the simulator was created
+                self.__run_failed(run.id, GLib.Error(i18n._("Simulation was cancelled.")))
+                return
+
+            observer = _RunObserver(functools.partial(self.__update_progress, run.id))
+            manager = SimulationManager(self.__project_name, run.algorithm_configuration,
+                                        self.__network, simulator, self.__result_manager,
+                                        observer, algorithm_timeout=self.__algorithm_timeout,
+                                        parameter_values=run.parameter_values)
+            self.__managers[run.id] = manager
+            manager.start()
+            await manager.wait()
+
+        if observer.result_id is not None:
+            self.__finished += 1
+            self.__update_progress(run.id, 1.0)
+            self.__observer.run_finished(run.id, observer.result_id)
+        else:
+            self.__run_failed(run.id, observer.error or GLib.Error(
+                i18n._("Simulation was cancelled.")))
+
+    def __run_failed(self, run_id: str, error: GLib.Error) -> None:
+        self.__failed += 1
+        self.__update_progress(run_id, 1.0)
+        self.__observer.run_failed(run_id, error)
+
+    def __update_progress(self, run_id: str, progress: float) -> None:
+        self.__progress[run_id] = progress
+        self.__observer.update_progress(sum(self.__progress.values()) / len(self.__progress))
@@ -1,13 +1,22 @@
 """This module defines the Context Class"""
+import asyncio
+import functools
+
 from gi.repository import GObject, Gio, GLib
 from sbaid import common
+from sbaid.common.i18n import i18n
 from sbaid.model.database.global_database import GlobalDatabase
 from sbaid.model.database.global_sqlite import GlobalSQLite
 from sbaid.common.simulator_type import SimulatorType
+from sbaid.common.write_behind import write_behind
 from sbaid.model.project import Project
 from sbaid.model.results.result_manager import ResultManager
 
 
+PROJECT_LOAD_CONCURRENCY = 8
+"""The number of project databases that are opened at the same time while loading."""
+
+
 class ProjectNotFoundError(Exception):
     """Raised when a project couldn't be found."""
 
@@ -48,15 +57,41 @@ class Context(GObject.GObject):
 
         await self.__global_db.open()
 
-        projects = await self.__global_db.get_all_projects()
-        for project_id, simulator_type, simulation_file_path, project_file_path in projects:
+        projects = []
+        uncached = []
+        slots = asyncio.Semaphore(PROJECT_LOAD_CONCURRENCY)
+        for (project_id, simulator_type, simulation_file_path, project_file_path,
+             name, created_at, last_opened) in \
+                await self.__global_db.get_all_projects_with_metadata():
             project = Project(project_id, simulator_type,
                               simulation_file_path, project_file_path, self.result_manager)
-            await project.load_from_db()
-            self.__projects.append(project)
+            if name is not None and created_at is not None and last_opened is not None:
+                project.load_from_metadata(name, created_at, last_opened)
+            else:
+                uncached.append(project)
+            projects.append(project)
+        await asyncio.gather(*(self.__load_project_from_db(project, slots)
+                               for project in uncached))
+
+        for project in projects:
+            self.__add_project(project)
 
         await self.result_manager.load_from_db()
 
+    async def close(self) -> None:
+        """Closes the connections to the global database and all project databases."""
+        try:
+            await write_behind.flush()
+            for project in common.list_model_iterator(self.__projects):
+                try:
+                    await project.close()
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    print(i18n._("Failed to close a project: "), e)
+            await self.result_manager.close()
+        finally:
+            # the connections have to be closed so that their threads end
+            await self.__global_db.close()
+
     async def create_project(self, name: str, sim_type: SimulatorType, simulation_file_path: str,
                              project_file_path: str) -> str:
         """Creates a new project with the given data and returns the unique ID of the new
@@ -73,10 +108,27 @@ class Context(GObject.GObject):
 
         new_project.name = name
 
-        self.__projects.append(new_project)
+        self.__add_project(new_project)
+        self.__cache_metadata(new_project)
 
         return project_id
 
+    async def __load_project_from_db(self, project: Project, slots: asyncio.Semaphore) -> None:
+        async with slots:
+            await project.load_from_db()
+        self.__cache_metadata(project)
+
+    def __add_project(self, project: Project) -> None:
+        project.connect("notify::name", lambda p, _: self.__cache_metadata(p))
+        project.connect("notify::last-opened", lambda p, _: self.__cache_metadata(p))
+        self.__projects.append(project)
+
+    def __cache_metadata(self, project: Project) -> None:
+        write_behind.schedule((self.__global_db, "project", project.id, "metadata"),
+                              functools.partial(self.__global_db.set_project_metadata, project.id,
+                                                project.name, project.created_at,
+                                                project.last_opened))
+
     async def delete_project(self, project_id: str) -> None:
         """Deletes the project with the given ID."""
         for pos, project in enumerate(common.list_model_iterator(self.__projects)):
@@ -0,0 +1,112 @@
+"""This module contains the ConnectionPool class."""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, NamedTuple, Sequence
+
+import aiosqlite
+
+DEFAULT_PRAGMAS: tuple[tuple[str, str | int], ...] = (
+    ("foreign_keys", "ON"),
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", -16000),  # negative values are KiB, so 16 MiB per connection
+    ("mmap_size", 128 * 1024 * 1024),
+)
+"""The pragmas every pooled connection is configured with once after opening."""
+
+
+class PoolStatistics(NamedTuple):
+    """A snapshot of how a ConnectionPool has been used so far."""
+    created: int
+    reused: int
+    open_readers: int
+    writer_open: bool
+
+
+class ConnectionPool:  # pylint: disable=too-many-instance-attributes
+    """This class owns long-lived aiosqlite connections to a single database file.
+    It hands out a small pool of reader connections and a single writer connection
+    that is guarded by a lock. Connections are opened lazily, configured once and
+    kept open until close is called. aiosqlite runs every connection on its own thread,
+    so close has to be awaited before the application exits."""
+
+    def __init__(self, path: str, max_readers: int = 4,
+                 pragmas: Sequence[tuple[str, str | int]] = DEFAULT_PRAGMAS) -> None:
+        self.__path = path
+        self.__pragmas = pragmas
+        self.__reader_slots = asyncio.Semaphore(max_readers)
+        self.__idle_readers: list[aiosqlite.Connection] = []
+        self.__open_readers = 0
+        self.__writer: aiosqlite.Connection | None = None
+        self.__write_lock = asyncio.Lock()
+        self.__generation = 0
+        self.__created = 0
+        self.__reused = 0
+
+    @property
+    def statistics(self) -> PoolStatistics:
+        """Return how many connections were created and how often they were reused."""
+        return PoolStatistics(self.__created, self.__reused, self.__open_readers,
+                              self.__writer is not None)
+
+    async def __connect(self) -> aiosqlite.Connection:
+        connection = await aiosqlite.connect(self.__path)
+        try:
+            for name, value in self.__pragmas:
+                await connection.execute(f"PRAGMA {name} = {value};")
+        except BaseException:
+            await connection.close()
+            raise
+        self.__created += 1
+        return connection
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a connection for reading. At most max_readers connections are used
+        concurrently, further readers wait until one is returned."""
+        async with self.__reader_slots:
+            generation = self.__generation
+            if self.__idle_readers:
+                connection = self.__idle_readers.pop()
+                self.__reused += 1
+            else:
+                connection = await self.__connect()
+                self.__open_readers += 1
+            try:
+                yield connection
+            finally:
+                if generation == self.__generation:
+                    self.__idle_readers.append(connection)
+                else:
+                    await connection.close()
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow the single writer connection. The changes are committed when the
+        block is left and rolled back if it raises."""
+        async with self.__write_lock:
+            if self.__writer is None:
+                self.__writer = await self.__connect()
+            else:
+                self.__reused += 1
+            connection = self.__writer
+            try:
+                yield connection
+            except BaseException:
+                await connection.rollback()
+                raise
+            await connection.commit()
+
+    async def close(self) -> None:
+        """Close all idle connections. Readers that are still borrowed are closed once
+        they are returned. The pool can be used again afterward and reconnects lazily."""
+        async with self.__write_lock:
+            self.__generation += 1
+            connections = self.__idle_readers
+            self.__idle_readers = []
+            self.__open_readers = 0
+            if self.__writer is not None:
+                connections.append(self.__writer)
+                self.__writer = None
+            for connection in connections:
+                await connection.close()
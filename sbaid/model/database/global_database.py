@@ -1,12 +1,164 @@
 """This module contains the GlobalDatabase interface."""
 from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Sequence
 
+import numpy as np
+import numpy.typing as npt
 from gi.repository import GLib
 
 from sbaid.common.a_display import ADisplay
 from sbaid.common.b_display import BDisplay
 from sbaid.common.simulator_type import SimulatorType
-from sbaid.common.vehicle_type import VehicleType
+
+VEHICLE_TYPE_DTYPE = "u1"
+"""The NumPy dtype of the vehicle type column of a lane snapshot."""
+VEHICLE_SPEED_DTYPE = "<f4"
+"""The NumPy dtype of the vehicle speed column of a lane snapshot."""
+LANE_SPEED_DTYPE = "<f8"
+"""The NumPy dtype of the per-lane average speeds of a cross section aggregate."""
+LANE_VOLUME_DTYPE = "<i4"
+"""The NumPy dtype of the per-lane traffic volumes of a cross section aggregate."""
+LANE_A_DISPLAY_DTYPE = "u1"
+"""The NumPy dtype of the per-lane a displays of a cross section aggregate."""
+
+LaneSnapshotData = tuple[int, int, int, float, int, int, bytes, bytes]
+"""id, cross section snapshot id, lane number, average speed, traffic volume, a display,
+vehicle types and vehicle speeds as arrays of VEHICLE_TYPE_DTYPE and VEHICLE_SPEED_DTYPE"""
+CrossSectionSnapshotData = tuple[int, int, str, str, int, list[LaneSnapshotData]]
+"""id, snapshot id, cross section id, cross section name, b display, lane snapshots"""
+SnapshotData = tuple[int, str, str, list[CrossSectionSnapshotData]]
+"""id, result id, iso8601 capture timestamp, cross section snapshots
+
+The ids of snapshots, cross section snapshots and lane snapshots are integers assigned by
+the database when they are added. The ids in the data passed to the database only have to
+be unique within the result, the stored rows get new ids."""
+CrossSectionAggregateData = tuple[int, str, str, str, int, float, int, bytes, bytes, bytes]
+"""snapshot id, iso8601 capture timestamp, cross section id, cross section name, b display,
+average speed over all lanes, summed traffic volume, and the per-lane average speeds,
+traffic volumes and a displays as arrays of LANE_SPEED_DTYPE, LANE_VOLUME_DTYPE and
+LANE_A_DISPLAY_DTYPE, ordered by lane number"""
+
+
+def aggregate_lanes(lanes: list[tuple[float, int, int]]) \
+        -> tuple[float, int, bytes, bytes, bytes]:
+    """Return the average speed, summed traffic volume and per-lane columns of a cross
+    section aggregate from the average speed, traffic volume and a display of its lanes.
+    The average speed is the mean of the lane averages, or 0 without lanes."""
+    speeds = np.array([lane[0] for lane in lanes], dtype=LANE_SPEED_DTYPE)
+    volumes = np.array([lane[1] for lane in lanes], dtype=LANE_VOLUME_DTYPE)
+    a_displays = np.array([lane[2] for lane in lanes], dtype=LANE_A_DISPLAY_DTYPE)
+    average_speed = float(speeds.mean()) if len(speeds) else 0.0
+    return (average_speed, int(volumes.sum()), speeds.tobytes(), volumes.tobytes(),
+            a_displays.tobytes())
+
+
+def aggregate_snapshot(snapshot: SnapshotData) -> list[CrossSectionAggregateData]:
+    """Return the aggregates of all cross section snapshots of a snapshot, in order."""
+    aggregates: list[CrossSectionAggregateData] = []
+    for cs_snapshot in snapshot[3]:
+        lanes = sorted(cs_snapshot[5], key=lambda lane: lane[2])
+        aggregates.append((snapshot[0], snapshot[2], cs_snapshot[2], cs_snapshot[3],
+                           cs_snapshot[4], *aggregate_lanes([(lane[3], lane[4], lane[5])
+                                                             for lane in lanes])))
+    return aggregates
+
+
+RESULT_QUERY_FIELDS: dict[str, tuple[int, str]] = {
+    "snapshot_id": (0, "<i8"),
+    "date": (0, "O"),
+    "cross_section_id": (0, "O"),
+    "cross_section_name": (0, "O"),
+    "b_display": (0, "<i4"),
+    "average_speed": (0, LANE_SPEED_DTYPE),
+    "traffic_volume": (0, "<i8"),
+    "lane_number": (1, "<i4"),
+    "lane_average_speed": (1, LANE_SPEED_DTYPE),
+    "lane_traffic_volume": (1, LANE_VOLUME_DTYPE),
+    "a_display": (1, LANE_A_DISPLAY_DTYPE),
+    "vehicle_type": (2, VEHICLE_TYPE_DTYPE),
+    "vehicle_speed": (2, VEHICLE_SPEED_DTYPE),
+}
+"""The fields of a result query in row order, with the level of the rows they need and
+their NumPy dtype. The levels are 0 for one row per cross section snapshot, 1 for one row
+per lane snapshot and 2 for one row per vehicle. The cross section values are those of the
+aggregates, the dates are iso8601 strings."""
+
+ResultQueryRow = tuple[Any, ...]
+"""The values of RESULT_QUERY_FIELDS in order up to the level of a query, with the
+vehicle types and speeds of a lane as bytes at level 2."""
+
+
+def get_query_level(fields: Sequence[str]) -> int:
+    """Return the level of the rows needed for the given fields.
+    Raise ValueError for unknown fields."""
+    for field in fields:
+        if field not in RESULT_QUERY_FIELDS:
+            raise ValueError(f"Unknown result query field: {field}")
+    return max((RESULT_QUERY_FIELDS[field][0] for field in fields), default=0)
+
+
+def get_timestamp(date: GLib.DateTime) -> int:
+    """Return the unix time of the date in microseconds. Unlike iso8601 strings, these
+    compare in time order across UTC offsets and fractional seconds."""
+    return int(date.to_unix()) * 1_000_000 + int(date.get_microsecond())
+
+
+def in_time_window(date: GLib.DateTime, start: GLib.DateTime | None,
+                   end: GLib.DateTime | None) -> bool:
+    """Return whether the date is within the inclusive window. None leaves it open."""
+    return ((start is None or date.compare(start) >= 0)
+            and (end is None or date.compare(end) <= 0))
+
+
+def get_query_rows(snapshots: Sequence[SnapshotData], cross_section_ids: Sequence[str] | None,
+                   level: int) -> list[ResultQueryRow]:
+    """Return the result query rows of the given level for the snapshots, in the order
+    the database returns them. None selects all cross sections."""
+    rows: list[ResultQueryRow] = []
+    for snapshot in snapshots:
+        for cs_snapshot in snapshot[3]:
+            if cross_section_ids is not None and cs_snapshot[2] not in cross_section_ids:
+                continue
+            lanes = sorted(cs_snapshot[5], key=lambda lane: lane[2])
+            aggregate = aggregate_lanes([(lane[3], lane[4], lane[5]) for lane in lanes])
+            cs_row = (snapshot[0], snapshot[2], cs_snapshot[2], cs_snapshot[3], cs_snapshot[4],
+                      aggregate[0], aggregate[1])
+            if level == 0:
+                rows.append(cs_row)
+            for lane in lanes if level > 0 else []:
+                lane_row = cs_row + (lane[2], lane[3], lane[4], lane[5])
+                rows.append(lane_row + (lane[6], lane[7]) if level == 2 else lane_row)
+    return rows
+
+
+def build_query_columns(rows: Sequence[ResultQueryRow], fields: Sequence[str]) \
+        -> dict[str, npt.NDArray[Any]]:
+    """Return the columns of the given fields of the result query rows, which have to be
+    of the level of the fields. At level 2 the values of a lane are repeated for each of
+    its vehicles."""
+    names = list(RESULT_QUERY_FIELDS)
+    columns: dict[str, npt.NDArray[Any]] = {}
+    if get_query_level(fields) < 2:
+        for field in fields:
+            index = names.index(field)
+            columns[field] = np.array([row[index] for row in rows],
+                                      dtype=RESULT_QUERY_FIELDS[field][1])
+        return columns
+
+    vehicle_columns = {
+        "vehicle_type": [np.frombuffer(row[-2], dtype=VEHICLE_TYPE_DTYPE) for row in rows],
+        "vehicle_speed": [np.frombuffer(row[-1], dtype=VEHICLE_SPEED_DTYPE) for row in rows],
+    }
+    counts = [len(types) for types in vehicle_columns["vehicle_type"]]
+    for field in fields:
+        dtype = RESULT_QUERY_FIELDS[field][1]
+        if field in vehicle_columns:
+            columns[field] = np.concatenate([np.empty(0, dtype=dtype)] + vehicle_columns[field])
+        else:
+            index = names.index(field)
+            columns[field] = np.repeat(np.array([row[index] for row in rows], dtype=dtype),
+                                       counts)
+    return columns
 
 
 class GlobalDatabase(ABC):
@@ -17,6 +169,10 @@ class GlobalDatabase(ABC):
     async def open(self) -> None:
         """Opens the file for the database."""
 
+    @abstractmethod
+    async def close(self) -> None:
+        """Closes all connections to the database."""
+
     @abstractmethod
     async def add_project(self, project_id: str, simulator_type: SimulatorType,
                           simulator_file_path: str, project_file_path: str) -> None:
@@ -26,17 +182,73 @@ class GlobalDatabase(ABC):
     async def get_all_projects(self) -> list[tuple[str, SimulatorType, str, str,]]:
         """Return meta-information about all projects in the database."""
 
+    @abstractmethod
+    async def get_all_projects_with_metadata(self) -> list[tuple[
+            str, SimulatorType, str, str, str | None, GLib.DateTime | None, GLib.DateTime | None]]:
+        """Return all projects like get_all_projects, each with its cached name, creation
+        date and last opened date appended. These are None until set_project_metadata was
+        called for the project."""
+
+    @abstractmethod
+    async def set_project_metadata(self, project_id: str, name: str, created_at: GLib.DateTime,
+                                   last_opened: GLib.DateTime) -> None:
+        """Cache the name, creation date and last opened date of a project, so projects
+        can be listed without opening their databases."""
+
     @abstractmethod
     async def remove_project(self, project_id: str) -> None:
         """Remove a project from the database."""
 
     @abstractmethod
-    async def get_all_results(self) -> list[tuple[str, str, str, GLib.DateTime]]:
-        """Return all results in the database."""
+    async def get_all_results(self) -> list[tuple[str, str, str, GLib.DateTime, bool]]:
+        """Return all results in the database, with whether all their snapshots
+        have been written."""
+
+    @abstractmethod
+    async def get_all_results_with_tag_ids(self) -> list[tuple[str, str, str, GLib.DateTime,
+                                                               bool, list[str]]]:
+        """Return all results in the database like get_all_results, each with the ids of
+        its tags appended."""
 
     @abstractmethod
     async def delete_result(self, result_id: str) -> None:
-        """Remove a result and all sub-results from the database."""
+        """Remove a result and all sub-results from the database. Large results are
+        deleted in several transactions like with delete_result_chunk."""
+
+    @abstractmethod
+    async def mark_result_deleted(self, result_id: str) -> int:
+        """Hide a result from get_all_results before it is deleted with
+        delete_result_chunk. Return the number of snapshots left to delete."""
+
+    @abstractmethod
+    async def get_deleted_result_ids(self) -> list[str]:
+        """Return the ids of the results that are marked as deleted but still stored."""
+
+    @abstractmethod
+    async def delete_result_chunk(self, result_id: str, max_snapshots: int) -> int:
+        """Delete at most max_snapshots snapshots of a result with all their sub-snapshots
+        in one transaction, and the result itself once it has no snapshots left.
+        Return the number of deleted snapshots, which is 0 once the result is gone."""
+
+    @abstractmethod
+    async def reclaim_space(self, max_pages: int) -> int:
+        """Return at most max_pages free pages to the file system, so the database file
+        shrinks after deletions. Return the number of pages that were freed."""
+
+    @abstractmethod
+    async def drop_vehicle_data(self, result_id: str, max_lane_snapshots: int) -> int:
+        """Empty the vehicle columns of at most max_lane_snapshots lane snapshots of a result
+        in one transaction, keeping the lane values and cross section aggregates. Return the
+        number of emptied lane snapshots, which is 0 once no vehicles are left."""
+
+    @abstractmethod
+    async def delete_snapshots(self, result_id: str, snapshot_ids: list[int]) -> int:
+        """Delete the given snapshots of a result with all their sub-snapshots in one
+        transaction. Return the number of deleted snapshots."""
+
+    @abstractmethod
+    async def get_database_size(self) -> int:
+        """Return the size of the database in bytes."""
 
     @abstractmethod
     async def get_result_name(self, result_id: str) -> str | None:
@@ -46,6 +258,15 @@ class GlobalDatabase(ABC):
     async def set_result_name(self, result_id: str, new_name: str) -> None:
         """Sets the name of the given result_id."""
 
+    @abstractmethod
+    async def set_result_cache_key(self, result_id: str, cache_key: str) -> None:
+        """Sets the key of the inputs the given result was simulated with."""
+
+    @abstractmethod
+    async def get_result_ids_with_cache_key(self, cache_key: str) -> list[str]:
+        """Return the ids of the complete results that are not deleted and were
+        simulated with the inputs of the given key."""
+
     @abstractmethod
     async def add_tag(self, tag_id: str, tag_name: str) -> None:
         """Add a tag to the database."""
@@ -71,32 +292,67 @@ class GlobalDatabase(ABC):
         """Return all tags that belong to the given result."""
 
     @abstractmethod
-    async def get_all_snapshots(self, result_id: str) -> list[tuple[str, GLib.DateTime]]:
+    async def get_all_snapshots(self, result_id: str) -> list[tuple[int, GLib.DateTime]]:
         """Return all snapshots from a given result."""
 
     @abstractmethod
-    async def get_all_cross_section_snapshots(self, snapshot_id: str)\
-            -> list[tuple[str, str, str, str, BDisplay]]:
+    async def get_all_cross_section_snapshots(self, snapshot_id: int)\
+            -> list[tuple[int, int, str, str, BDisplay]]:
         """Return all cross section snapshots from a given snapshot."""
 
     @abstractmethod
-    async def get_all_lane_snapshots(self, cross_section_snapshot_id: str)\
-            -> list[tuple[str, int, float, int, ADisplay]]:
+    async def get_all_lane_snapshots(self, cross_section_snapshot_id: int)\
+            -> list[tuple[int, int, float, int, ADisplay]]:
         """Return all lane snapshots from a given cross section snapshot."""
 
     @abstractmethod
-    async def get_all_vehicle_snapshots(self, lane_snapshot_id: str)\
-            -> list[tuple[VehicleType, float]]:
-        """Return all vehicle snapshots from a given lane snapshot."""
+    async def get_vehicle_snapshot_columns(self, lane_snapshot_id: int) -> tuple[bytes, bytes]:
+        """Return the vehicle types and speeds of a given lane snapshot,
+        in the format of LaneSnapshotData."""
 
     @abstractmethod
     async def add_entire_result(self, result_id: str, result_name: str, project_name: str,
                                 creation_date_time: GLib.DateTime,
-                                snapshot_data:
-                                list[tuple[str, str, str,
-                                           list[tuple[str, str, str, str, int,
-                                                      list[tuple[str, str, int, float,
-                                                                 int, int,
-                                                                 list[tuple[str, int, float]]]]]]]]
-                                ) -> None:
+                                snapshot_data: list[SnapshotData]) -> None:
         """Add a result to the database."""
+
+    @abstractmethod
+    async def begin_result(self, result_id: str, result_name: str, project_name: str,
+                           creation_date_time: GLib.DateTime) -> None:
+        """Add an incomplete result without snapshots to the database."""
+
+    @abstractmethod
+    async def add_snapshots(self, snapshot_data: list[SnapshotData]) -> None:
+        """Append snapshots to results in the database, in a single transaction."""
+
+    @abstractmethod
+    async def complete_result(self, result_id: str) -> None:
+        """Mark a result added with begin_result as complete."""
+
+    @abstractmethod
+    def get_snapshot_count(self, result_id: str) -> int:
+        """Return the number of snapshots of a result. This blocks, so it must only be used
+        where an answer is needed synchronously, like in list models."""
+
+    @abstractmethod
+    def get_snapshot_range(self, result_id: str, offset: int, limit: int) -> list[SnapshotData]:
+        """Return at most limit snapshots of a result, starting with the one at offset in
+        capture order, with all their sub-snapshots. This blocks like get_snapshot_count."""
+
+    @abstractmethod
+    def query_result(self, result_id: str, cross_section_ids: Sequence[str] | None,
+                     fields: Sequence[str], start: GLib.DateTime | None = None,
+                     end: GLib.DateTime | None = None) -> dict[str, npt.NDArray[Any]]:
+        """Return the given RESULT_QUERY_FIELDS of a result as NumPy columns, for the
+        snapshots captured within the inclusive window from start to end and the given
+        cross sections. None selects all cross sections. The rows are in capture order,
+        then in the order the cross sections were added, then by lane number. This blocks
+        like get_snapshot_count."""
+
+    @abstractmethod
+    def stream_query_result(self, result_id: str, cross_section_ids: Sequence[str] | None,
+                            fields: Sequence[str], start: GLib.DateTime | None = None,
+                            end: GLib.DateTime | None = None,
+                            chunk_size: int = 10000) -> AsyncIterator[dict[str, npt.NDArray[Any]]]:
+        """Return the columns of query_result in chunks built from at most chunk_size rows,
+        so that large results can be processed with bounded memory."""
@@ -0,0 +1,275 @@
+"""This module contains the schema migrations of the global database, in order."""
+from typing import Any, AsyncIterator
+
+import aiosqlite
+import numpy as np
+from gi.repository import GLib
+
+from sbaid.model.database.global_database import (VEHICLE_TYPE_DTYPE, VEHICLE_SPEED_DTYPE,
+                                                  aggregate_lanes, get_timestamp)
+from sbaid.model.database.migrations import Migration
+
+_BATCH_SIZE = 10000
+
+
+async def _add_foreign_key_indexes(db: aiosqlite.Connection) -> None:
+    """Index every foreign key, so looking up and cascading from a parent row does not
+    scan the child table. The composite indexes also serve the ordered result queries."""
+    for statement in (
+            """CREATE INDEX IF NOT EXISTS snapshot_result_id_date
+            ON snapshot (result_id, date);""",
+            """CREATE INDEX IF NOT EXISTS cross_section_snapshot_snapshot_id_cross_section_id
+            ON cross_section_snapshot (snapshot_id, cross_section_id);""",
+            """CREATE INDEX IF NOT EXISTS lane_snapshot_cross_section_snapshot_id_lane_number
+            ON lane_snapshot (cross_section_snapshot_id, lane_number);""",
+            """CREATE INDEX IF NOT EXISTS vehicle_snapshot_lane_snapshot_id
+            ON vehicle_snapshot (lane_snapshot_id);""",
+            """CREATE INDEX IF NOT EXISTS result_tag_result_id ON result_tag (result_id);""",
+            """CREATE INDEX IF NOT EXISTS result_tag_tag_id ON result_tag (tag_id);"""):
+        await db.execute(statement)
+
+
+async def _add_result_complete(db: aiosqlite.Connection) -> None:
+    """Flag whether all snapshots of a result have been written. Results stored before
+    snapshots could be streamed were always written as a whole."""
+    await db.execute("""ALTER TABLE result ADD COLUMN complete INTEGER NOT NULL DEFAULT 1;""")
+
+
+async def _group_vehicles(cursor: aiosqlite.Cursor) \
+        -> AsyncIterator[tuple[str, list[int], list[float]]]:
+    """Yield the lane snapshot id, vehicle types and speeds for the consecutive rows
+    of the same lane snapshot."""
+    lane_snapshot_id: str | None = None
+    types: list[int] = []
+    speeds: list[float] = []
+    row: Any
+    async for row in cursor:
+        if row[0] != lane_snapshot_id:
+            if lane_snapshot_id is not None:
+                yield lane_snapshot_id, types, speeds
+            lane_snapshot_id, types, speeds = row[0], [], []
+        types.append(row[1])
+        speeds.append(row[2])
+    if lane_snapshot_id is not None:
+        yield lane_snapshot_id, types, speeds
+
+
+async def _store_vehicles_in_columns(db: aiosqlite.Connection) -> None:
+    """Store the vehicles of a lane snapshot as a vehicle type and a speed array in two BLOB
+    columns of the lane snapshot, instead of one vehicle_snapshot row per vehicle."""
+    for column in ("vehicle_types", "vehicle_speeds"):
+        await db.execute(f"""
+        ALTER TABLE lane_snapshot ADD COLUMN {column} BLOB NOT NULL DEFAULT x'';""")
+
+    update = """UPDATE lane_snapshot SET vehicle_types = ?, vehicle_speeds = ? WHERE id = ?;"""
+    updates: list[tuple[bytes, bytes, str]] = []
+    async with db.execute("""SELECT lane_snapshot_id, vehicle_type, speed
+    FROM vehicle_snapshot ORDER BY lane_snapshot_id, rowid;""") as cursor:
+        cursor.arraysize = _BATCH_SIZE
+        async for lane_snapshot_id, types, speeds in _group_vehicles(cursor):
+            updates.append((np.asarray(types, dtype=VEHICLE_TYPE_DTYPE).tobytes(),
+                            np.asarray(speeds, dtype=VEHICLE_SPEED_DTYPE).tobytes(),
+                            lane_snapshot_id))
+            if len(updates) == _BATCH_SIZE:
+                await db.executemany(update, updates)
+                updates.clear()
+    await db.executemany(update, updates)
+    await db.execute("""DROP TABLE vehicle_snapshot;""")
+
+
+async def _use_integer_snapshot_keys(db: aiosqlite.Connection) -> None:
+    """Rebuild the snapshot tables with INTEGER primary keys instead of TEXT uuids, which
+    makes the rows, the foreign keys and their indexes much smaller. The rowid of every
+    row becomes its new id."""
+    for statement in (
+            """CREATE TABLE snapshot_new (
+                id INTEGER PRIMARY KEY,
+                result_id TEXT,
+                date TEXT,
+                FOREIGN KEY (result_id) REFERENCES result (id) ON DELETE CASCADE
+            );""",
+            """INSERT INTO snapshot_new (id, result_id, date)
+            SELECT rowid, result_id, date FROM snapshot;""",
+            """CREATE TABLE cross_section_snapshot_new (
+                id INTEGER PRIMARY KEY,
+                snapshot_id INTEGER,
+                cross_section_id TEXT,
+                cross_section_name TEXT,
+                b_display INT,
+                FOREIGN KEY (snapshot_id) REFERENCES snapshot (id) ON DELETE CASCADE
+            );""",
+            """INSERT INTO cross_section_snapshot_new (id, snapshot_id, cross_section_id,
+            cross_section_name, b_display)
+            SELECT cs.rowid, s.rowid, cs.cross_section_id, cs.cross_section_name, cs.b_display
+            FROM cross_section_snapshot cs JOIN snapshot s ON s.id = cs.snapshot_id;""",
+            """CREATE TABLE lane_snapshot_new (
+                id INTEGER PRIMARY KEY,
+                cross_section_snapshot_id INTEGER,
+                lane_number INT,
+                average_speed REAL,
+                traffic_volume INT,
+                a_display INT,
+                vehicle_types BLOB NOT NULL DEFAULT x'',
+                vehicle_speeds BLOB NOT NULL DEFAULT x'',
+                FOREIGN KEY (cross_section_snapshot_id) REFERENCES cross_section_snapshot (id)
+                    ON DELETE CASCADE
+            );""",
+            """INSERT INTO lane_snapshot_new (id, cross_section_snapshot_id, lane_number,
+            average_speed, traffic_volume, a_display, vehicle_types, vehicle_speeds)
+            SELECT l.rowid, cs.rowid, l.lane_number, l.average_speed, l.traffic_volume,
+            l.a_display, l.vehicle_types, l.vehicle_speeds FROM lane_snapshot l
+            JOIN cross_section_snapshot cs ON cs.id = l.cross_section_snapshot_id;""",
+            """DROP TABLE lane_snapshot;""",
+            """DROP TABLE cross_section_snapshot;""",
+            """DROP TABLE snapshot;""",
+            """ALTER TABLE snapshot_new RENAME TO snapshot;""",
+            """ALTER TABLE cross_section_snapshot_new RENAME TO cross_section_snapshot;""",
+            """ALTER TABLE lane_snapshot_new RENAME TO lane_snapshot;""",
+            """CREATE INDEX snapshot_result_id_date ON snapshot (result_id, date);""",
+            """CREATE INDEX cross_section_snapshot_snapshot_id_cross_section_id
+            ON cross_section_snapshot (snapshot_id, cross_section_id);""",
+            """CREATE INDEX lane_snapshot_cross_section_snapshot_id_lane_number
+            ON lane_snapshot (cross_section_snapshot_id, lane_number);"""):
+        await db.execute(statement)
+
+
+async def _group_lanes(cursor: aiosqlite.Cursor) \
+        -> AsyncIterator[tuple[tuple[Any, ...], list[tuple[float, int, int]]]]:
+    """Yield the cross section snapshot columns and the average speed, traffic volume and
+    a display of its lanes for the consecutive rows of the same cross section snapshot."""
+    cs_snapshot_id: int | None = None
+    cs_snapshot: tuple[Any, ...] = ()
+    lanes: list[tuple[float, int, int]] = []
+    row: Any
+    async for row in cursor:
+        if row[0] != cs_snapshot_id:
+            if cs_snapshot_id is not None:
+                yield cs_snapshot, lanes
+            cs_snapshot_id, cs_snapshot, lanes = row[0], tuple(row[:7]), []
+        if row[7] is not None:
+            lanes.append((row[7], row[8], row[9]))
+    if cs_snapshot_id is not None:
+        yield cs_snapshot, lanes
+
+
+async def _add_cross_section_aggregates(db: aiosqlite.Connection) -> None:
+    """Store an aggregate of every cross section snapshot with its speed, volume and
+    displays, keyed by result and cross section, so diagrams do not need to read the lane
+    and vehicle snapshots. The aggregates of existing results are computed here."""
+    for statement in (
+            """CREATE TABLE cross_section_aggregate (
+                cross_section_snapshot_id INTEGER PRIMARY KEY,
+                snapshot_id INTEGER,
+                result_id TEXT,
+                date TEXT,
+                cross_section_id TEXT,
+                cross_section_name TEXT,
+                b_display INT,
+                average_speed REAL,
+                traffic_volume INT,
+                lane_average_speeds BLOB NOT NULL,
+                lane_traffic_volumes BLOB NOT NULL,
+                lane_a_displays BLOB NOT NULL,
+                FOREIGN KEY (cross_section_snapshot_id) REFERENCES cross_section_snapshot (id)
+                    ON DELETE CASCADE
+            );""",
+            """CREATE INDEX cross_section_aggregate_result_id_cross_section_id_date
+            ON cross_section_aggregate (result_id, cross_section_id, date);"""):
+        await db.execute(statement)
+
+    insert = """INSERT INTO cross_section_aggregate (cross_section_snapshot_id, snapshot_id,
+    result_id, date, cross_section_id, cross_section_name, b_display, average_speed,
+    traffic_volume, lane_average_speeds, lane_traffic_volumes, lane_a_displays)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);"""
+    rows: list[tuple[Any, ...]] = []
+    async with db.execute("""SELECT cs.id, s.id, s.result_id, s.date, cs.cross_section_id,
+    cs.cross_section_name, cs.b_display, l.average_speed, l.traffic_volume, l.a_display
+    FROM cross_section_snapshot cs JOIN snapshot s ON s.id = cs.snapshot_id
+    LEFT JOIN lane_snapshot l ON l.cross_section_snapshot_id = cs.id
+    ORDER BY cs.id, l.lane_number;""") as cursor:
+        cursor.arraysize = _BATCH_SIZE
+        async for cs_snapshot, lanes in _group_lanes(cursor):
+            rows.append((*cs_snapshot, *aggregate_lanes(lanes)))
+            if len(rows) == _BATCH_SIZE:
+                await db.executemany(insert, rows)
+                rows.clear()
+    await db.executemany(insert, rows)
+
+
+async def _add_result_deleted(db: aiosqlite.Connection) -> None:
+    """Flag results that are being deleted in chunks, so they are hidden while their
+    snapshots are deleted. Rows left behind by deletions from before foreign keys were
+    enforced are removed."""
+    for statement in (
+            """ALTER TABLE result ADD COLUMN deleted INTEGER NOT NULL DEFAULT 0;""",
+            """DELETE FROM result_tag WHERE result_id NOT IN (SELECT id FROM result)
+            OR tag_id NOT IN (SELECT id FROM tag);""",
+            """DELETE FROM snapshot WHERE result_id NOT IN (SELECT id FROM result);""",
+            """DELETE FROM cross_section_snapshot
+            WHERE snapshot_id NOT IN (SELECT id FROM snapshot);""",
+            """DELETE FROM lane_snapshot
+            WHERE cross_section_snapshot_id NOT IN (SELECT id FROM cross_section_snapshot);""",
+            """DELETE FROM cross_section_aggregate
+            WHERE cross_section_snapshot_id NOT IN (SELECT id FROM cross_section_snapshot);"""):
+        await db.execute(statement)
+
+
+async def _add_project_metadata(db: aiosqlite.Connection) -> None:
+    """Cache the name and dates of every project, which otherwise are only stored in the
+    project databases. The columns are NULL until the project was loaded once."""
+    for column in ("name", "created_at", "last_opened"):
+        await db.execute(f"""ALTER TABLE project ADD COLUMN {column} TEXT;""")
+
+
+async def _add_result_cache_key(db: aiosqlite.Connection) -> None:
+    """Store the key of the inputs a result was simulated with, so a result can be reused
+    instead of simulating the same inputs again. Existing results have no key."""
+    for statement in (
+            """ALTER TABLE result ADD COLUMN cache_key TEXT;""",
+            """CREATE INDEX result_cache_key ON result (cache_key);"""):
+        await db.execute(statement)
+
+
+async def _add_aggregate_timestamps(db: aiosqlite.Connection) -> None:
+    """Store the capture time of every cross section aggregate as unix microseconds and
+    index it instead of the date, so time windows and the order of the aggregates follow
+    the time even where the UTC offset or the fractional seconds of the dates differ."""
+    for statement in (
+            """ALTER TABLE cross_section_aggregate ADD COLUMN timestamp INTEGER;""",
+            """DROP INDEX cross_section_aggregate_result_id_cross_section_id_date;""",
+            """CREATE INDEX cross_section_aggregate_result_id_cross_section_id_timestamp
+            ON cross_section_aggregate (result_id, cross_section_id, timestamp);""",
+            """CREATE TEMP TABLE snapshot_timestamp (id INTEGER PRIMARY KEY,
+            timestamp INTEGER);"""):
+        await db.execute(statement)
+
+    rows: list[tuple[int, int | None]] = []
+    async with db.execute("""SELECT id, date FROM snapshot;""") as cursor:
+        cursor.arraysize = _BATCH_SIZE
+        async for snapshot_id, date in cursor:
+            date_time = GLib.DateTime.new_from_iso8601(date)  # pylint: disable=no-member
+            rows.append((snapshot_id, None if date_time is None else get_timestamp(date_time)))
+            if len(rows) == _BATCH_SIZE:
+                await db.executemany("""INSERT INTO snapshot_timestamp VALUES (?, ?);""", rows)
+                rows.clear()
+    await db.executemany("""INSERT INTO snapshot_timestamp VALUES (?, ?);""", rows)
+    for statement in (
+            """UPDATE cross_section_aggregate SET timestamp = (SELECT timestamp
+            FROM snapshot_timestamp t WHERE t.id = cross_section_aggregate.snapshot_id);""",
+            """DROP TABLE snapshot_timestamp;"""):
+        await db.execute(statement)
+
+
+MIGRATIONS: list[Migration] = [
+    _add_foreign_key_indexes,
+    _add_result_complete,
+    _store_vehicles_in_columns,
+    _use_integer_snapshot_keys,
+    _add_cross_section_aggregates,
+    _add_result_deleted,
+    _add_project_metadata,
+    _add_result_cache_key,
+    _add_aggregate_timestamps,
+]
+"""All migrations of the global database. The schema version is the index of the last
+applied migration plus one. New migrations must only ever be appended."""
@@ -1,19 +1,27 @@
 """This module contains the GLobalSQLite class."""
+import itertools
 import sqlite3
-from typing import TypeVar
+from typing import Any, AsyncIterator, Callable, Iterable, Sequence, TypeVar
 
 import aiosqlite
 import aiopathlib
+import numpy.typing as npt
 
 from gi.repository import GLib, Gio
 
-from sbaid.common.vehicle_type import VehicleType
 from sbaid.common.a_display import ADisplay
 from sbaid.common.b_display import BDisplay
 from sbaid.common.simulator_type import SimulatorType
 
+from sbaid.model.database.connection_pool import ConnectionPool, DEFAULT_PRAGMAS
 from sbaid.model.database.date_format_error import DateFormatError
-from sbaid.model.database.global_database import GlobalDatabase
+from sbaid.model.database.global_database import (GlobalDatabase, SnapshotData,
+                                                  CrossSectionSnapshotData, LaneSnapshotData,
+                                                  aggregate_snapshot, build_query_columns,
+                                                  get_query_level, get_timestamp)
+from sbaid.model.database.global_migrations import MIGRATIONS
+from sbaid.model.database.migrations import migrate
+from sbaid.model.database.write_queue import WriteQueue, WriteQueueStatistics
 
 
 def get_date_time(formatted_string: str) -> GLib.DateTime:
@@ -27,31 +35,159 @@ def get_date_time(formatted_string: str) -> GLib.DateTime:
 
 T = TypeVar('T', bound="GlobalDatabase")
 
+# The mode only takes effect for new databases, before journal_mode writes the header,
+# databases created without it are switched over by reclaim_space.
+PRAGMAS = (("auto_vacuum", "INCREMENTAL"),) + DEFAULT_PRAGMAS
+
+_INCREMENTAL_AUTO_VACUUM = 2
+"""The value PRAGMA auto_vacuum reports for INCREMENTAL."""
+
 
 class InvalidDatabaseError(Exception):
     """Exception raised when an invalid database is encountered."""
 
 
+INSERT_BATCH_SIZE = 10000
+"""The maximum amount of rows handed to a single executemany call."""
+
+READ_BATCH_SIZE = 10000
+"""The amount of rows fetched at once when reading large tables."""
+
+DELETE_CHUNK_SIZE = 100
+"""The maximum amount of snapshots delete_result deletes in a single transaction."""
+
+
+async def _execute_in_batches(db: aiosqlite.Connection, sql: str,
+                              rows: Iterable[tuple[Any, ...]]) -> None:
+    """Execute the given statement for all rows, using executemany on bounded chunks
+    so the statement is prepared once per chunk and memory use stays limited."""
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, INSERT_BATCH_SIZE)):
+        await db.executemany(sql, batch)
+
+
+async def _get_max_id(db: aiosqlite.Connection, table: str) -> int:
+    """Return the largest id in the given table, or 0 if it is empty."""
+    async with db.execute(f"""SELECT IFNULL(MAX(id), 0) FROM {table};""") as cursor:
+        row = await cursor.fetchone()
+        assert row is not None
+        return int(row[0])
+
+
+_SNAPSHOT_RANGE = """SELECT id FROM snapshot WHERE result_id = ?
+ORDER BY date, id LIMIT ? OFFSET ?"""
+
+
+def _build_result_query(result_id: str, cross_section_ids: Sequence[str] | None, level: int,
+                        start: GLib.DateTime | None,
+                        end: GLib.DateTime | None) -> tuple[str, list[Any]]:
+    """Return the query and parameters for the result query rows of the given level,
+    captured within the inclusive window from start to end. None selects all cross
+    sections or leaves the window open."""
+    columns = ["a.snapshot_id", "a.date", "a.cross_section_id", "a.cross_section_name",
+               "a.b_display", "a.average_speed", "a.traffic_volume"]
+    tables = "cross_section_aggregate a"
+    order = "a.timestamp, a.snapshot_id, a.cross_section_snapshot_id"
+    if level > 0:
+        columns += ["l.lane_number", "l.average_speed", "l.traffic_volume", "l.a_display"]
+        tables += """
+        JOIN lane_snapshot l ON l.cross_section_snapshot_id = a.cross_section_snapshot_id"""
+        order += ", l.lane_number"
+    if level == 2:
+        columns += ["l.vehicle_types", "l.vehicle_speeds"]
+
+    conditions = ["a.result_id = ?"]
+    parameters: list[Any] = [result_id]
+    if cross_section_ids is not None:
+        conditions.append(f"a.cross_section_id IN ({', '.join('?' * len(cross_section_ids))})")
+        parameters += cross_section_ids
+    if start is not None and end is not None:
+        conditions.append("a.timestamp BETWEEN ? AND ?")
+        parameters += [get_timestamp(start), get_timestamp(end)]
+    elif start is not None:
+        conditions.append("a.timestamp >= ?")
+        parameters.append(get_timestamp(start))
+    elif end is not None:
+        conditions.append("a.timestamp <= ?")
+        parameters.append(get_timestamp(end))
+
+    query = f"""
+    SELECT {", ".join(columns)} FROM {tables}
+    WHERE {" AND ".join(conditions)} ORDER BY {order};"""
+    return query, parameters
+
+
+class _SnapshotTree:
+    """Assembles the nested snapshot data from the rows of the three snapshot tables.
+    The rows have to be added parents first, which the queries ensure."""
+
+    def __init__(self) -> None:
+        self.snapshots: list[SnapshotData] = []
+        self.__cs_snapshots: dict[int, list[CrossSectionSnapshotData]] = {}
+        self.__lane_snapshots: dict[int, list[LaneSnapshotData]] = {}
+
+    def queries(self) -> list[tuple[str, Callable[[Any], None]]]:
+        """Return the queries for every table in order together with the method that takes
+        their rows. The queries select the snapshots through the {snapshots} subquery."""
+        return [("""
+        SELECT id, result_id, date FROM snapshot
+        WHERE id IN ({snapshots}) ORDER BY date, id;""", self.__add_snapshot), ("""
+        SELECT cs.id, cs.snapshot_id, cs.cross_section_id, cs.cross_section_name,
+        cs.b_display FROM snapshot s
+        JOIN cross_section_snapshot cs ON cs.snapshot_id = s.id
+        WHERE s.id IN ({snapshots}) ORDER BY cs.id;""", self.__add_cs_snapshot), ("""
+        SELECT l.id, l.cross_section_snapshot_id, l.lane_number, l.average_speed,
+        l.traffic_volume, l.a_display, l.vehicle_types, l.vehicle_speeds FROM snapshot s
+        JOIN cross_section_snapshot cs ON cs.snapshot_id = s.id
+        JOIN lane_snapshot l ON l.cross_section_snapshot_id = cs.id
+        WHERE s.id IN ({snapshots}) ORDER BY l.id;""", self.__add_lane_snapshot)]
+
+    def __add_snapshot(self, row: Any) -> None:
+        self.__cs_snapshots[row[0]] = []
+        self.snapshots.append((row[0], row[1], row[2], self.__cs_snapshots[row[0]]))
+
+    def __add_cs_snapshot(self, row: Any) -> None:
+        self.__lane_snapshots[row[0]] = []
+        self.__cs_snapshots[row[1]].append((row[0], row[1], row[2], row[3], row[4],
+                                            self.__lane_snapshots[row[0]]))
+
+    def __add_lane_snapshot(self, row: Any) -> None:
+        self.__lane_snapshots[row[1]].append((row[0], row[1], row[2], row[3], row[4], row[5],
+                                              row[6], row[7]))
+
+
 class GlobalSQLite(GlobalDatabase):
     """This class implements the GlobalDatabase interface which allows for the all results
     and project metadata to be stored."""
     _file: Gio.File
+    _pool: ConnectionPool
+    _writes: WriteQueue
+    _sync_reader: sqlite3.Connection | None
 
     def __init__(self, file: Gio.File) -> None:
         self._file = file
+        self._pool = ConnectionPool(str(file.get_path()), pragmas=PRAGMAS)
+        self._writes = WriteQueue(self._pool)
+        self._sync_reader = None
+
+    @property
+    def write_statistics(self) -> WriteQueueStatistics:
+        """Return the queue depth and latencies of the small writes to this database."""
+        return self._writes.statistics
 
     async def open(self) -> None:
-        """Load the database's schema."""
+        """Load the database's schema and upgrade it to the latest version."""
         already_existed = self._file.query_exists()
         is_valid = True
         if already_existed:
             try:
-                async with aiosqlite.connect(str(self._file.get_path())) as db:
+                async with self._pool.reader() as db:
                     async with db.execute("""PRAGMA schema_version""") as cursor:
                         res = await cursor.fetchone()
                         assert res is not None
                         is_valid = res[0] != 0
-            except sqlite3.OperationalError as exc:
+            except sqlite3.DatabaseError as exc:
+                await self._pool.close()
                 raise InvalidDatabaseError("The given file is not a database.") from exc
         if not is_valid:
             raise InvalidDatabaseError("The given file is not a valid global sqlite database.")
@@ -59,7 +195,7 @@ class GlobalSQLite(GlobalDatabase):
             async_path = aiopathlib.AsyncPath(self._file.get_parent().get_path())  # type: ignore
             if not await async_path.exists():
                 await async_path.mkdir(parents=True)
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.writer() as db:
             if not already_existed:
                 await db.executescript("""
                 CREATE TABLE project (
@@ -116,54 +252,200 @@ class GlobalSQLite(GlobalDatabase):
                     speed REAL,
                     FOREIGN KEY (lane_snapshot_id) REFERENCES lane_snapshot (id)
                         ON DELETE CASCADE);""")
-                await db.commit()
+            await migrate(db, MIGRATIONS)
+
+    async def close(self) -> None:
+        """Commit all queued writes and close all connections to the database."""
+        await self._writes.flush()
+        if self._sync_reader is not None:
+            self._sync_reader.close()
+            self._sync_reader = None
+        await self._pool.close()
 
     async def add_project(self, project_id: str, simulator_type: SimulatorType,
                           simulator_file_path: str, project_file_path: str) -> None:
         """Add a project to the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""PRAGMA foreign_keys=ON;""")
-            await db.execute("""
-            INSERT INTO project (id, simulator_type_id, simulator_type_name,
-            simulator_file_path, project_file_path)
-            VALUES (?, ?, ?, ?, ?);
-            """, (project_id, simulator_type.id, simulator_type.name,
-                  simulator_file_path, project_file_path))
-            await db.commit()
+        await self._writes.write(("""
+        INSERT INTO project (id, simulator_type_id, simulator_type_name,
+        simulator_file_path, project_file_path)
+        VALUES (?, ?, ?, ?, ?);
+        """, (project_id, simulator_type.id, simulator_type.name,
+              simulator_file_path, project_file_path)))
 
     async def get_all_projects(self) -> list[tuple[str, SimulatorType, str, str,]]:
         """Return meta-information about all projects in the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""SELECT * FROM project;""") as cursor:
                 return list(map(lambda x: (x[0], SimulatorType(x[1], x[2]), x[3], x[4]),
                                 list(await cursor.fetchall())))
 
+    async def get_all_projects_with_metadata(self) -> list[tuple[
+            str, SimulatorType, str, str, str | None, GLib.DateTime | None, GLib.DateTime | None]]:
+        """Return all projects like get_all_projects, each with its cached name, creation
+        date and last opened date appended. These are None until set_project_metadata was
+        called for the project."""
+        async with self._pool.reader() as db:
+            async with db.execute("""
+            SELECT id, simulator_type_id, simulator_type_name, simulator_file_path,
+            project_file_path, name, created_at, last_opened FROM project;""") as cursor:
+                return [(row[0], SimulatorType(row[1], row[2]), row[3], row[4], row[5],
+                         None if row[6] is None else get_date_time(row[6]),
+                         None if row[7] is None else get_date_time(row[7]))
+                        async for row in cursor]
+
+    async def set_project_metadata(self, project_id: str, name: str, created_at: GLib.DateTime,
+                                   last_opened: GLib.DateTime) -> None:
+        """Cache the name, creation date and last opened date of a project, so projects
+        can be listed without opening their databases."""
+        await self._writes.write(("""
+        UPDATE project SET name = ?, created_at = ?, last_opened = ? WHERE id = ?;""",
+                                  (name, created_at.format_iso8601(),
+                                   last_opened.format_iso8601(), project_id)))
+
     async def remove_project(self, project_id: str) -> None:
         """Remove a project from the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""DELETE FROM project WHERE id = ?;""", [project_id])
-            await db.commit()
-
-    async def get_all_results(self) -> list[tuple[str, str, str, GLib.DateTime]]:
-        """Return all results in the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            async with db.execute("""SELECT * FROM result;""") as cursor:
+        await self._writes.write(("""DELETE FROM project WHERE id = ?;""", [project_id]))
+
+    async def get_all_results(self) -> list[tuple[str, str, str, GLib.DateTime, bool]]:
+        """Return all results in the database, with whether all their snapshots
+        have been written."""
+        async with self._pool.reader() as db:
+            async with db.execute("""
+            SELECT id, name, project_name, date, complete FROM result WHERE deleted = 0;""") \
+                    as cursor:
                 if cursor.rowcount == 0:
                     return []
                 return list(map(lambda x: (str(x[0]), str(x[1]), str(x[2]),
-                                           get_date_time(str(x[3]))), await cursor.fetchall()))
+                                           get_date_time(str(x[3])), bool(x[4])),
+                                await cursor.fetchall()))
+
+    async def get_all_results_with_tag_ids(self) -> list[tuple[str, str, str, GLib.DateTime,
+                                                               bool, list[str]]]:
+        """Return all results in the database like get_all_results, each with the ids of
+        its tags appended. Uses a single query for all results."""
+        results: dict[str, tuple[str, str, str, GLib.DateTime, bool, list[str]]] = {}
+        async with self._pool.reader() as db:
+            async with db.execute("""
+            SELECT r.id, r.name, r.project_name, r.date, r.complete, rt.tag_id
+            FROM result r LEFT JOIN result_tag rt ON rt.result_id = r.id
+            WHERE r.deleted = 0 ORDER BY r.rowid, rt.rowid;""") as cursor:
+                async for row in cursor:
+                    result = results.get(row[0])
+                    if result is None:
+                        result = (str(row[0]), str(row[1]), str(row[2]),
+                                  get_date_time(str(row[3])), bool(row[4]), [])
+                        results[row[0]] = result
+                    if row[5] is not None:
+                        result[5].append(str(row[5]))
+        return list(results.values())
 
     async def delete_result(self, result_id: str) -> None:
-        """Remove a result and all sub-results from the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""
-            DELETE FROM result WHERE id = ?;
-            """, [result_id])
-            await db.commit()
+        """Remove a result and all sub-results from the database. Large results are
+        deleted in several transactions like with delete_result_chunk."""
+        await self.mark_result_deleted(result_id)
+        while await self.delete_result_chunk(result_id, DELETE_CHUNK_SIZE):
+            pass
+
+    async def mark_result_deleted(self, result_id: str) -> int:
+        """Hide a result from get_all_results before it is deleted with
+        delete_result_chunk. Return the number of snapshots left to delete."""
+        async with self._pool.writer() as db:
+            await db.execute("""UPDATE result SET deleted = 1 WHERE id = ?;""", (result_id,))
+            async with db.execute("""SELECT COUNT(*) FROM snapshot WHERE result_id = ?;""",
+                                  (result_id,)) as cursor:
+                row = await cursor.fetchone()
+                assert row is not None
+                return int(row[0])
+
+    async def get_deleted_result_ids(self) -> list[str]:
+        """Return the ids of the results that are marked as deleted but still stored."""
+        async with self._pool.reader() as db:
+            async with db.execute("""SELECT id FROM result WHERE deleted = 1;""") as cursor:
+                return [str(row[0]) for row in await cursor.fetchall()]
+
+    async def delete_result_chunk(self, result_id: str, max_snapshots: int) -> int:
+        """Delete at most max_snapshots snapshots of a result with all their sub-snapshots
+        in one transaction, and the result itself once it has no snapshots left.
+        Return the number of deleted snapshots, which is 0 once the result is gone."""
+        async with self._pool.writer() as db:
+            async with db.execute("""
+            DELETE FROM snapshot WHERE id IN (
+                SELECT id FROM snapshot WHERE result_id = ? LIMIT ?);""",
+                                  (result_id, max_snapshots)) as cursor:
+                deleted = cursor.rowcount
+            if deleted == 0:
+                await db.execute("""DELETE FROM result WHERE id = ?;""", (result_id,))
+            return deleted
+
+    async def reclaim_space(self, max_pages: int) -> int:
+        """Return at most max_pages free pages to the file system, so the database file
+        shrinks after deletions. Return the number of pages that were freed.
+
+        Databases created before incremental auto vacuum was enabled are switched to it
+        with a full VACUUM the first time, which frees all pages at once. This only
+        happens here, so that opening the database never waits for the rewrite."""
+        async with self._pool.writer() as db:
+            before = await self.__get_freelist_count(db)
+            async with db.execute("""PRAGMA auto_vacuum;""") as cursor:
+                row = await cursor.fetchone()
+            if row is not None and row[0] != _INCREMENTAL_AUTO_VACUUM:
+                await db.commit()
+                await db.execute("""PRAGMA auto_vacuum = INCREMENTAL;""")
+                await db.execute("""VACUUM;""")
+                return before
+            # incremental_vacuum frees one page per step, so it has to be read to the end
+            async with db.execute(f"""PRAGMA incremental_vacuum({int(max_pages)});""") \
+                    as cursor:
+                await cursor.fetchall()
+            return before - await self.__get_freelist_count(db)
+
+    @staticmethod
+    async def __get_freelist_count(db: aiosqlite.Connection) -> int:
+        async with db.execute("""PRAGMA freelist_count;""") as cursor:
+            row = await cursor.fetchone()
+            assert row is not None
+            return int(row[0])
+
+    async def drop_vehicle_data(self, result_id: str, max_lane_snapshots: int) -> int:
+        """Empty the vehicle columns of at most max_lane_snapshots lane snapshots of a result
+        in one transaction, keeping the lane values and cross section aggregates. Return the
+        number of emptied lane snapshots, which is 0 once no vehicles are left."""
+        async with self._pool.writer() as db:
+            async with db.execute("""
+            UPDATE lane_snapshot SET vehicle_types = x'', vehicle_speeds = x'' WHERE id IN (
+                SELECT l.id FROM snapshot s
+                JOIN cross_section_snapshot c ON c.snapshot_id = s.id
+                JOIN lane_snapshot l ON l.cross_section_snapshot_id = c.id
+                WHERE s.result_id = ?
+                AND (length(l.vehicle_types) > 0 OR length(l.vehicle_speeds) > 0)
+                LIMIT ?);""", (result_id, max_lane_snapshots)) \
+                    as cursor:
+                return cursor.rowcount
+
+    async def delete_snapshots(self, result_id: str, snapshot_ids: list[int]) -> int:
+        """Delete the given snapshots of a result with all their sub-snapshots in one
+        transaction. Return the number of deleted snapshots."""
+        placeholders = ", ".join("?" * len(snapshot_ids))
+        async with self._pool.writer() as db:
+            async with db.execute(f"""
+            DELETE FROM snapshot WHERE result_id = ? AND id IN ({placeholders});""",
+                                  (result_id, *snapshot_ids)) as cursor:
+                return cursor.rowcount
+
+    async def get_database_size(self) -> int:
+        """Return the size of the database in bytes, which shrinks when reclaim_space
+        returns free pages to the file system."""
+        async with self._pool.reader() as db:
+            async with db.execute("""
+            SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size();""") \
+                    as cursor:
+                row = await cursor.fetchone()
+                assert row is not None
+                return int(row[0])
 
     async def get_result_name(self, result_id: str) -> str | None:
         """Return the name of the given result_id from the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""
             SELECT name FROM result WHERE id = ?;
             """, [result_id]) as cursor:
@@ -174,28 +456,35 @@ class GlobalSQLite(GlobalDatabase):
 
     async def set_result_name(self, result_id: str, new_name: str) -> None:
         """Sets the name of the given result_id in the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""UPDATE result SET name = ? WHERE id = ?;""", [new_name, result_id])
-            await db.commit()
+        await self._writes.write(("""UPDATE result SET name = ? WHERE id = ?;""",
+                                  [new_name, result_id]))
+
+    async def set_result_cache_key(self, result_id: str, cache_key: str) -> None:
+        """Sets the key of the inputs the given result was simulated with."""
+        await self._writes.write(("""UPDATE result SET cache_key = ? WHERE id = ?;""",
+                                  [cache_key, result_id]))
+
+    async def get_result_ids_with_cache_key(self, cache_key: str) -> list[str]:
+        """Return the ids of the complete results that are not deleted and were
+        simulated with the inputs of the given key."""
+        async with self._pool.reader() as db:
+            async with db.execute("""SELECT id FROM result
+            WHERE cache_key = ? AND complete = 1 AND deleted = 0;""", (cache_key,)) as cursor:
+                return [str(row[0]) for row in await cursor.fetchall()]
 
     async def add_tag(self, tag_id: str, tag_name: str) -> None:
         """Add a tag to the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""PRAGMA foreign_keys=ON;""")
-            await db.execute("""
-            INSERT INTO tag (id, name) VALUES (?, ?)""", (tag_id, tag_name))
-            await db.commit()
+        await self._writes.write(("""
+        INSERT INTO tag (id, name) VALUES (?, ?)""", (tag_id, tag_name)))
 
     async def remove_tag(self, tag_id: str) -> None:
         """Remove a tag from the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""
-            DELETE FROM tag WHERE id = ?;""", (tag_id,))
-            await db.commit()
+        await self._writes.write(("""
+        DELETE FROM tag WHERE id = ?;""", (tag_id,)))
 
     async def get_tag_name(self, tag_id: str) -> str | None:
         """Return the name of the given tag_id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""
             SELECT name FROM tag WHERE id = ?
             """, [tag_id]) as cursor:
@@ -206,8 +495,7 @@ class GlobalSQLite(GlobalDatabase):
 
     async def add_result_tag(self, result_tag_id: str, result_id: str, tag_id: str) -> None:
         """Add a tag to a result."""""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""PRAGMA foreign_keys=ON;""")
+        async with self._pool.writer() as db:
             async with db.execute("""
             SELECT * FROM tag WHERE id = ?;""", (tag_id,)) as cursor:
                 tags = list(await cursor.fetchall())
@@ -225,95 +513,195 @@ class GlobalSQLite(GlobalDatabase):
             await db.execute("""
             INSERT INTO result_tag (id, result_id, tag_id) VALUES (?, ?, ?);""",
                              (result_tag_id, result_id, tag_id))
-            await db.commit()
 
     async def get_all_tags(self) -> list[tuple[str, str]]:
         """Return all tags in the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""SELECT * FROM tag;""") as cursor:
                 return await cursor.fetchall()
 
     async def get_result_tag_ids(self, result_id: str) -> list[str]:
         """Return all tags that belong to the given result."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""SELECT tag_id FROM result_tag WHERE result_id = ?;
             """, (result_id,)) as cursor:
-                return await cursor.fetchall()
+                return [str(row[0]) for row in await cursor.fetchall()]
 
-    async def get_all_snapshots(self, result_id: str) -> list[tuple[str, GLib.DateTime]]:
+    async def get_all_snapshots(self, result_id: str) -> list[tuple[int, GLib.DateTime]]:
         """Return all snapshots from a given result."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""SELECT id, date FROM snapshot
             WHERE result_id = ?;""", [result_id]) as cursor:
                 res = await cursor.fetchall()
                 if not res:
                     return []
-                return list(map(lambda x: (str(x[0]), get_date_time(x[1])), res))
+                return list(map(lambda x: (int(x[0]), get_date_time(x[1])), res))
 
-    async def get_all_cross_section_snapshots(self, snapshot_id: str) \
-            -> list[tuple[str, str, str, str, BDisplay]]:
+    async def get_all_cross_section_snapshots(self, snapshot_id: int) \
+            -> list[tuple[int, int, str, str, BDisplay]]:
         """Return all cross section snapshots from a given snapshot."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""
             SELECT * FROM cross_section_snapshot WHERE snapshot_id = ?;""",
                                   [snapshot_id]) as cursor:
                 return await cursor.fetchall()
 
-    async def get_all_lane_snapshots(self, cross_section_snapshot_id: str) -> list[
-                                     tuple[str, int, float, int, ADisplay]]:
+    async def get_all_lane_snapshots(self, cross_section_snapshot_id: int) -> list[
+                                     tuple[int, int, float, int, ADisplay]]:
         """Return all lane snapshots from a given cross section snapshot."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""
             SELECT id, lane_number, average_speed, traffic_volume, a_display
             FROM lane_snapshot WHERE cross_section_snapshot_id = ?;
             """, (cross_section_snapshot_id,)) as cursor:
                 return await cursor.fetchall()
 
-    async def get_all_vehicle_snapshots(self, lane_snapshot_id: str) \
-            -> list[tuple[VehicleType, float]]:
-        """Return all vehicle snapshots from a given lane snapshot."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+    async def get_vehicle_snapshot_columns(self, lane_snapshot_id: int) -> tuple[bytes, bytes]:
+        """Return the vehicle types and speeds of a given lane snapshot,
+        in the format of LaneSnapshotData."""
+        async with self._pool.reader() as db:
             async with db.execute("""
-            SELECT vehicle_type, speed FROM vehicle_snapshot WHERE lane_snapshot_id = ?;
+            SELECT vehicle_types, vehicle_speeds FROM lane_snapshot WHERE id = ?;
             """, (lane_snapshot_id,)) as cursor:
-                return await cursor.fetchall()
+                row = await cursor.fetchone()
+                if row is None:
+                    return b"", b""
+                return bytes(row[0]), bytes(row[1])
 
     async def add_entire_result(self, result_id: str, result_name: str, project_name: str,
                                 creation_date_time: GLib.DateTime,
-                                snapshot_data:
-                                list[tuple[str, str, str,
-                                           list[tuple[str, str, str, str, int,
-                                                      list[tuple[str, str, int, float, int, int,
-                                                                 list[tuple[str, int, float]]]]]]]]
-                                ) -> None:
-        """Add a result to the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""PRAGMA foreign_keys=ON;""")
+                                snapshot_data: list[SnapshotData]) -> None:
+        """Add a result to the database. All rows are inserted in batches inside a
+        single transaction, so either the whole result is stored or nothing is."""
+        async with self._pool.writer() as db:
+            await db.execute("""BEGIN;""")
             await db.execute("""
             INSERT INTO result (id, name, project_name, date)
             VALUES (?, ?, ?, ?);
-            """, (result_id, result_name, project_name, creation_date_time.format_iso8601()))
-            for snapshot in snapshot_data:
-                await db.execute("""
-                INSERT INTO snapshot (id, result_id, date)
-                VALUES (?, ?, ?);
-                """, (snapshot[0], snapshot[1], snapshot[2]))
-
-                for cs_snapshot in snapshot[3]:
-                    await db.execute("""
-                    INSERT INTO cross_section_snapshot (id, snapshot_id, cross_section_id,
-                    cross_section_name, b_display)
-                    VALUES (?, ?, ?, ?, ?);
-                    """, (cs_snapshot[0], cs_snapshot[1], cs_snapshot[2],
-                          cs_snapshot[3], cs_snapshot[4]))
-                    for lane_snapshot in cs_snapshot[5]:
-                        await db.execute("""
-                        INSERT INTO lane_snapshot (id, cross_section_snapshot_id, lane_number,
-                        average_speed, traffic_volume, a_display) VALUES (?, ?, ?, ?, ?, ?);
-                        """, (lane_snapshot[0], lane_snapshot[1], lane_snapshot[2],
-                              lane_snapshot[3], lane_snapshot[4], lane_snapshot[5]))
-                        for vehicle_snapshot in lane_snapshot[6]:
-                            await db.execute("""
-                            INSERT INTO vehicle_snapshot VALUES (?, ?, ?);
-                            """, (vehicle_snapshot[0], vehicle_snapshot[1], vehicle_snapshot[2]))
-            await db.commit()
+            """, (result_id, result_name, project_name,
+                  creation_date_time.format_iso8601()))
+            await self.__insert_snapshots(db, snapshot_data)
+
+    async def begin_result(self, result_id: str, result_name: str, project_name: str,
+                           creation_date_time: GLib.DateTime) -> None:
+        """Add an incomplete result without snapshots to the database."""
+        await self._writes.write(("""
+        INSERT INTO result (id, name, project_name, date, complete)
+        VALUES (?, ?, ?, ?, 0);
+        """, (result_id, result_name, project_name,
+              creation_date_time.format_iso8601())))
+
+    async def add_snapshots(self, snapshot_data: list[SnapshotData]) -> None:
+        """Append snapshots to results in the database, in a single transaction."""
+        async with self._pool.writer() as db:
+            await db.execute("""BEGIN;""")
+            await self.__insert_snapshots(db, snapshot_data)
+
+    async def complete_result(self, result_id: str) -> None:
+        """Mark a result added with begin_result as complete."""
+        await self._writes.write(("""UPDATE result SET complete = 1 WHERE id = ?;""",
+                                  (result_id,)))
+
+    @staticmethod
+    async def __insert_snapshots(db: aiosqlite.Connection,
+                                 snapshot_data: list[SnapshotData]) -> None:
+        """Insert the snapshots with new ids following the largest ids in the tables.
+        The ids in the data are ignored, the nesting determines the parent of every row.
+        This must run in the transaction of the writer, so the ids cannot be taken twice."""
+        snapshot_rows: list[tuple[Any, ...]] = []
+        cs_rows: list[tuple[Any, ...]] = []
+        lane_rows: list[tuple[Any, ...]] = []
+        aggregate_rows: list[tuple[Any, ...]] = []
+        cs_id = await _get_max_id(db, "cross_section_snapshot")
+        lane_id = await _get_max_id(db, "lane_snapshot")
+        for snapshot_id, snapshot in enumerate(snapshot_data,
+                                               start=await _get_max_id(db, "snapshot") + 1):
+            snapshot_rows.append((snapshot_id, snapshot[1], snapshot[2]))
+            timestamp = get_timestamp(get_date_time(snapshot[2]))
+            for cs_snapshot, aggregate in zip(snapshot[3], aggregate_snapshot(snapshot)):
+                cs_id += 1
+                cs_rows.append((cs_id, snapshot_id, *cs_snapshot[2:5]))
+                aggregate_rows.append((cs_id, snapshot_id, snapshot[1], timestamp,
+                                       *aggregate[1:]))
+                for lane_snapshot in cs_snapshot[5]:
+                    lane_id += 1
+                    lane_rows.append((lane_id, cs_id, *lane_snapshot[2:]))
+
+        await _execute_in_batches(db, """
+        INSERT INTO snapshot (id, result_id, date) VALUES (?, ?, ?);""", snapshot_rows)
+        await _execute_in_batches(db, """
+        INSERT INTO cross_section_snapshot (id, snapshot_id, cross_section_id,
+        cross_section_name, b_display) VALUES (?, ?, ?, ?, ?);""", cs_rows)
+        await _execute_in_batches(db, """
+        INSERT INTO lane_snapshot (id, cross_section_snapshot_id, lane_number,
+        average_speed, traffic_volume, a_display, vehicle_types, vehicle_speeds)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?);""", lane_rows)
+        await _execute_in_batches(db, """
+        INSERT INTO cross_section_aggregate (cross_section_snapshot_id, snapshot_id, result_id,
+        timestamp, date, cross_section_id, cross_section_name, b_display, average_speed,
+        traffic_volume, lane_average_speeds, lane_traffic_volumes, lane_a_displays)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);""", aggregate_rows)
+
+    def __get_sync_reader(self) -> sqlite3.Connection:
+        if self._sync_reader is None:
+            self._sync_reader = sqlite3.connect(str(self._file.get_path()))
+            self._sync_reader.execute("""PRAGMA query_only = ON;""")
+        return self._sync_reader
+
+    def get_snapshot_count(self, result_id: str) -> int:
+        """Return the number of snapshots of a result. This blocks, so it must only be used
+        where an answer is needed synchronously, like in list models."""
+        row = self.__get_sync_reader().execute("""
+        SELECT COUNT(*) FROM snapshot WHERE result_id = ?;""", (result_id,)).fetchone()
+        return int(row[0])
+
+    def get_snapshot_range(self, result_id: str, offset: int, limit: int) -> list[SnapshotData]:
+        """Return at most limit snapshots of a result, starting with the one at offset in
+        capture order, with all their sub-snapshots. This blocks like get_snapshot_count."""
+        db = self.__get_sync_reader()
+        tree = _SnapshotTree()
+        for query, add_row in tree.queries():
+            cursor = db.execute(query.format(snapshots=_SNAPSHOT_RANGE),
+                                (result_id, limit, offset))
+            while rows := cursor.fetchmany(READ_BATCH_SIZE):
+                for row in rows:
+                    add_row(row)
+        return tree.snapshots
+
+    def query_result(self, result_id: str, cross_section_ids: Sequence[str] | None,
+                     fields: Sequence[str], start: GLib.DateTime | None = None,
+                     end: GLib.DateTime | None = None) -> dict[str, npt.NDArray[Any]]:
+        """Return the given RESULT_QUERY_FIELDS of a result as NumPy columns, for the
+        snapshots captured within the inclusive window from start to end and the given
+        cross sections. None selects all cross sections. The rows are in capture order,
+        then in the order the cross sections were added, then by lane number. This blocks
+        like get_snapshot_count.
+
+        The cross section values are read from the aggregates, the lane table is only
+        joined for lane and vehicle fields."""
+        reader = self.__get_sync_reader()
+        query, parameters = _build_result_query(result_id, cross_section_ids,
+                                                get_query_level(fields), start, end)
+        return build_query_columns(reader.execute(query, parameters).fetchall(), fields)
+
+    def stream_query_result(self, result_id: str, cross_section_ids: Sequence[str] | None,
+                            fields: Sequence[str], start: GLib.DateTime | None = None,
+                            end: GLib.DateTime | None = None,
+                            chunk_size: int = READ_BATCH_SIZE) \
+            -> AsyncIterator[dict[str, npt.NDArray[Any]]]:
+        """Return the columns of query_result in chunks built from at most chunk_size rows,
+        so that large results can be processed with bounded memory."""
+        return self.__stream_query_result(result_id, cross_section_ids, fields, start, end,
+                                          chunk_size)
+
+    async def __stream_query_result(
+            self, result_id: str, cross_section_ids: Sequence[str] | None,
+            fields: Sequence[str], start: GLib.DateTime | None, end: GLib.DateTime | None,
+            chunk_size: int) -> AsyncIterator[dict[str, npt.NDArray[Any]]]:
+        level = get_query_level(fields)
+        async with self._pool.reader() as db:
+            query, parameters = _build_result_query(result_id, cross_section_ids, level,
+                                                    start, end)
+            async with db.execute(query, parameters) as cursor:
+                while rows := await cursor.fetchmany(chunk_size):
+                    yield build_query_columns(rows, fields)  # type: ignore[arg-type]
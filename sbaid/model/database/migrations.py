@@ -0,0 +1,55 @@
+"""This module contains the schema migration runner for the SQLite databases."""
+from typing import Awaitable, Callable, Sequence
+
+import aiosqlite
+
+Migration = Callable[[aiosqlite.Connection], Awaitable[None]]
+"""A migration upgrades the schema by exactly one version using the given connection.
+It must not commit, the runner does that together with the version bump."""
+
+
+class SchemaVersionError(Exception):
+    """Exception raised when a database has a newer schema than this version supports."""
+
+
+async def get_schema_version(db: aiosqlite.Connection) -> int:
+    """Return the schema version stored in the user_version of the database."""
+    async with db.execute("""PRAGMA user_version;""") as cursor:
+        row = await cursor.fetchone()
+        assert row is not None
+        return int(row[0])
+
+
+async def migrate(db: aiosqlite.Connection, migrations: Sequence[Migration]) -> int:
+    """Apply all migrations the database has not seen yet, in order. The schema version
+    is the number of applied migrations and is kept in PRAGMA user_version. Every
+    migration runs in its own transaction together with the version bump, so an
+    interrupted upgrade resumes at the failed migration the next time.
+    Foreign keys are not enforced while migrating to allow rebuilding tables.
+    Return the schema version the database has afterward."""
+    await db.commit()
+    version = await get_schema_version(db)
+    if version > len(migrations):
+        raise SchemaVersionError(f"Unsupported schema version {version}, the latest known "
+                                 f"version is {len(migrations)}.")
+    if version == len(migrations):
+        return version
+
+    async with db.execute("""PRAGMA foreign_keys;""") as cursor:
+        row = await cursor.fetchone()
+        foreign_keys = bool(row and row[0])
+    await db.execute("""PRAGMA foreign_keys = OFF;""")
+    try:
+        for version, migration in enumerate(migrations[version:], start=version + 1):
+            await db.execute("""BEGIN;""")
+            try:
+                await migration(db)
+                await db.execute(f"""PRAGMA user_version = {version};""")
+            except BaseException:
+                await db.rollback()
+                raise
+            await db.commit()
+    finally:
+        if foreign_keys:
+            await db.execute("""PRAGMA foreign_keys = ON;""")
+    return version
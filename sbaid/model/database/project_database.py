@@ -11,6 +11,10 @@ class ProjectDatabase(ABC):
     async def open(self) -> None:
         """Opens the file for the database."""
 
+    @abstractmethod
+    async def close(self) -> None:
+        """Closes all connections to the database."""
+
     @abstractmethod
     async def get_created_at(self) -> GLib.DateTime | None:
         """Return the GLib.DateTime when the project was created."""
@@ -52,6 +56,12 @@ class ProjectDatabase(ABC):
     async def set_cross_section_b_display_active(self, cross_section_id: str, value: bool) -> None:
         """Update whether the b is active for the given cross section."""
 
+    @abstractmethod
+    async def get_all_cross_sections(self) \
+            -> list[tuple[str, str | None, bool | None, bool | None]]:
+        """Return the id, name, hard_shoulder_active and b_display_active value
+        of every cross section stored in the database."""
+
     @abstractmethod
     async def get_algorithm_configuration_name(self, algorithm_configuration_id: str) -> str | None:
         """Return the name of the algorithm_configuration with the given id."""
@@ -117,6 +127,12 @@ class ProjectDatabase(ABC):
         """Return the value of the parameter of the given algorithm configuration
         and parameter and possibly cross section."""
 
+    @abstractmethod
+    async def get_all_parameter_values_and_tags(self, algorithm_configuration_id: str) \
+            -> list[tuple[str, str | None, GLib.Variant | None, list[tuple[str, str | None]]]]:
+        """Return the name, cross section id, value and the ids and names of the tags of
+        every parameter of the given algorithm configuration that has a value or tags."""
+
     @abstractmethod
     async def set_parameter_value(self, algorithm_configuration_id: str, parameter_name: str,
                                   cross_section_id: str | None,
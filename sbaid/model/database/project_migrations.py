@@ -0,0 +1,34 @@
+"""This module contains the schema migrations of the project databases, in order."""
+import aiosqlite
+
+from sbaid.model.database.migrations import Migration
+
+
+async def _add_parameter_key_index(db: aiosqlite.Connection) -> None:
+    """Make a parameter unique per algorithm configuration, name and cross section, so its
+    value can be upserted. The primary key does not cover global parameters, as NULL cross
+    section ids never conflict, so duplicates of those are removed first. Of duplicates
+    the row written last is kept."""
+    await db.execute("""
+    DELETE FROM parameter WHERE rowid NOT IN (
+        SELECT MAX(rowid) FROM parameter
+        GROUP BY algorithm_configuration_id, name, IFNULL(cross_section_id, ''));""")
+    await db.execute("""
+    CREATE UNIQUE INDEX parameter_key
+    ON parameter (algorithm_configuration_id, name, IFNULL(cross_section_id, ''));""")
+
+
+async def _add_parameter_tag_index(db: aiosqlite.Connection) -> None:
+    """Index the parameter tags by their algorithm configuration, so the tags of all
+    parameters of a configuration are loaded without scanning the table."""
+    await db.execute("""
+    CREATE INDEX parameter_tag_algorithm_configuration_id
+    ON parameter_tag (algorithm_configuration_id, parameter_name);""")
+
+
+MIGRATIONS: list[Migration] = [
+    _add_parameter_key_index,
+    _add_parameter_tag_index,
+]
+"""All migrations of the project databases. The schema version is the index of the last
+applied migration plus one. New migrations must only ever be appended."""
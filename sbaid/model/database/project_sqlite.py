@@ -2,11 +2,24 @@
 import sqlite3
 from typing import cast
 
-import aiosqlite
 import aiopathlib
 from gi.repository import GLib, Gio
 
+from sbaid.model.database.connection_pool import ConnectionPool
+from sbaid.model.database.migrations import migrate
 from sbaid.model.database.project_database import ProjectDatabase
+from sbaid.model.database.project_migrations import MIGRATIONS
+from sbaid.model.database.write_queue import Statement, WriteQueue, WriteQueueStatistics
+
+
+def _ensure_cross_section(cross_section_id: str) -> Statement:
+    return """INSERT OR IGNORE INTO cross_section (id) VALUES (?)""", (cross_section_id,)
+
+
+def _ensure_parameter_cross_section(cross_section_id: str | None) -> list[Statement]:
+    """Return the statements that add the cross section of a parameter if it is missing,
+    so the foreign key of the parameter holds and deleting the cross section cascades."""
+    return [] if cross_section_id is None else [_ensure_cross_section(cross_section_id)]
 
 
 class InvalidDatabaseError(Exception):
@@ -18,23 +31,33 @@ class ProjectSQLite(ProjectDatabase):
     project specific data to be stored."""
     _file: Gio.File
     _creation_time: GLib.DateTime
+    _pool: ConnectionPool
+    _writes: WriteQueue
 
     def __init__(self, file: Gio.File) -> None:
         self._file = file
         self._creation_time = cast(GLib.DateTime, GLib.DateTime.new_now_local())
+        self._pool = ConnectionPool(str(file.get_path()))
+        self._writes = WriteQueue(self._pool)
+
+    @property
+    def write_statistics(self) -> WriteQueueStatistics:
+        """Return the queue depth and latencies of the writes to this database."""
+        return self._writes.statistics
 
     async def open(self) -> None:
-        """Loads the database's schema."""
+        """Load the database's schema and upgrade it to the latest version."""
         already_existed = self._file.query_exists()
         is_valid = True
         if already_existed:
             try:
-                async with aiosqlite.connect(str(self._file.get_path())) as db:
+                async with self._pool.reader() as db:
                     async with db.execute("""PRAGMA schema_version""") as cursor:
                         res = await cursor.fetchone()
                         assert res is not None
                         is_valid = res[0] != 0
-            except sqlite3.OperationalError as exc:
+            except sqlite3.DatabaseError as exc:
+                await self._pool.close()
                 raise InvalidDatabaseError("The given file is not a database.") from exc
         if not is_valid:
             raise InvalidDatabaseError("The given file is not a valid project sqlite database.")
@@ -42,10 +65,9 @@ class ProjectSQLite(ProjectDatabase):
             async_path = aiopathlib.AsyncPath(self._file.get_parent().get_path())  # type: ignore
             if not await async_path.exists():
                 await async_path.mkdir(parents=True)
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.writer() as db:
             if not already_existed:
                 await db.executescript("""
-                PRAGMA foreign_keys = ON;
                 CREATE TABLE meta_information(
                     name TEXT,
                     created_at TEXT,
@@ -95,11 +117,16 @@ class ProjectSQLite(ProjectDatabase):
                 (?, ?, ?)""", ("", GLib.DateTime.format_iso8601(self._creation_time),
                                GLib.DateTime.format_iso8601(  # pylint: disable=no-member
                                    GLib.DateTime.new_now_local())))  # type: ignore
-            await db.commit()
+            await migrate(db, MIGRATIONS)
+
+    async def close(self) -> None:
+        """Commit all queued writes and close all connections to the database."""
+        await self._writes.flush()
+        await self._pool.close()
 
     async def get_created_at(self) -> GLib.DateTime | None:
         """Return the GLib.DateTime when the project was created."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with (db.execute("""SELECT created_at FROM meta_information""")
                         as cursor):
                 date = await cursor.fetchone()
@@ -109,7 +136,7 @@ class ProjectSQLite(ProjectDatabase):
 
     async def get_last_opened(self) -> GLib.DateTime:
         """Return the GLib.DateTime when the project was last opened."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with (db.execute("""SELECT last_opened FROM meta_information""")
                         as cursor):
                 date = await cursor.fetchone()
@@ -119,14 +146,12 @@ class ProjectSQLite(ProjectDatabase):
 
     async def set_last_opened(self, new_last_opened: GLib.DateTime) -> None:
         """Update the GLib.DateTime when the project was last opened."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""UPDATE meta_information SET last_opened = ?""",
-                             [new_last_opened.format_iso8601()])
-            await db.commit()
+        await self._writes.write(("""UPDATE meta_information SET last_opened = ?""",
+                                  [new_last_opened.format_iso8601()]))
 
     async def get_project_name(self) -> str | None:
         """Return the name of the project."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""SELECT name FROM meta_information""") as cursor:
                 result_list = await cursor.fetchone()
                 if result_list is None:
@@ -135,23 +160,11 @@ class ProjectSQLite(ProjectDatabase):
 
     async def set_project_name(self, name: str) -> None:
         """Update the name of the project."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""UPDATE meta_information SET name = ?""", [name])
-            await db.commit()
-
-    async def __ensure_cross_section(self, cross_section_id: str) -> None:
-        exists = False
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            async with db.execute("""SELECT * FROM cross_section WHERE id = ?""",
-                                  [cross_section_id]) as cursor:
-                result = await cursor.fetchone()
-                exists = result is not None
-        if not exists:
-            await self.add_cross_section(cross_section_id)
+        await self._writes.write(("""UPDATE meta_information SET name = ?""", [name]))
 
     async def get_cross_section_name(self, cross_section_id: str) -> str | None:
         """Return the name of the cross_section with the given id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""SELECT name FROM cross_section WHERE id = ?""",
                                   [cross_section_id]) as cursor:
                 result = await cursor.fetchone()
@@ -161,16 +174,13 @@ class ProjectSQLite(ProjectDatabase):
 
     async def set_cross_section_name(self, cross_section_id: str, name: str) -> None:
         """Update the name of the cross_section with the given id."""
-        await self.__ensure_cross_section(cross_section_id)
-
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""UPDATE cross_section SET name = ?
-            WHERE id = ?""", (name, cross_section_id))
-            await db.commit()
+        await self._writes.write(_ensure_cross_section(cross_section_id),
+                                 ("""UPDATE cross_section SET name = ?
+                                 WHERE id = ?""", (name, cross_section_id)))
 
     async def get_cross_section_hard_shoulder_active(self, cross_section_id: str) -> bool | None:
         """Return whether the hard should is active for the given cross section."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute(
                     """SELECT hard_shoulder_active FROM cross_section WHERE id = ?""",
                     [cross_section_id]) as cursor:
@@ -182,16 +192,13 @@ class ProjectSQLite(ProjectDatabase):
     async def set_cross_section_hard_shoulder_active(self, cross_section_id: str,
                                                      status: bool) -> None:
         """Update the hard_shoulder_active value of the cross_section with the given id."""
-        await self.__ensure_cross_section(cross_section_id)
-
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""UPDATE cross_section SET hard_shoulder_active = ?
-            WHERE id = ?""", (status, cross_section_id))
-            await db.commit()
+        await self._writes.write(_ensure_cross_section(cross_section_id),
+                                 ("""UPDATE cross_section SET hard_shoulder_active = ?
+                                 WHERE id = ?""", (status, cross_section_id)))
 
     async def get_cross_section_b_display_active(self, cross_section_id: str) -> bool | None:
         """Return whether the hard should is active for the given cross section."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute(
                     """SELECT b_display_active FROM cross_section WHERE id = ?""",
                     [cross_section_id]) as cursor:
@@ -202,16 +209,26 @@ class ProjectSQLite(ProjectDatabase):
 
     async def set_cross_section_b_display_active(self, cross_section_id: str, value: bool) -> None:
         """Update the b_display_active value of the cross_section with the given id."""
-        await self.__ensure_cross_section(cross_section_id)
-
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""UPDATE cross_section SET b_display_active = ?
-            WHERE id = ?""", (value, cross_section_id))
-            await db.commit()
+        await self._writes.write(_ensure_cross_section(cross_section_id),
+                                 ("""UPDATE cross_section SET b_display_active = ?
+                                 WHERE id = ?""", (value, cross_section_id)))
+
+    async def get_all_cross_sections(self) \
+            -> list[tuple[str, str | None, bool | None, bool | None]]:
+        """Return the id, name, hard_shoulder_active and b_display_active value
+        of every cross section stored in the database."""
+        async with self._pool.reader() as db:
+            async with db.execute("""SELECT id, name, hard_shoulder_active, b_display_active
+            FROM cross_section""") as cursor:
+                return [(cross_section_id, name,
+                         None if hard_shoulder_active is None else bool(hard_shoulder_active),
+                         None if b_display_active is None else bool(b_display_active))
+                        async for cross_section_id, name, hard_shoulder_active, b_display_active
+                        in cursor]
 
     async def get_algorithm_configuration_name(self, algorithm_configuration_id: str) -> str | None:
         """Return the name of the algorithm_configuration with the given id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""SELECT name FROM algorithm_configuration
             WHERE id = ?""", [algorithm_configuration_id]) as cursor:
                 result_list = await cursor.fetchone()
@@ -222,15 +239,13 @@ class ProjectSQLite(ProjectDatabase):
     async def set_algorithm_configuration_name(self, algorithm_configuration_id: str,
                                                name: str) -> None:
         """Update the name of the algorithm_configuration with the given id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""UPDATE algorithm_configuration SET name = ?
-            WHERE id = ?""", (name, algorithm_configuration_id))
-            await db.commit()
+        await self._writes.write(("""UPDATE algorithm_configuration SET name = ?
+        WHERE id = ?""", (name, algorithm_configuration_id)))
 
     async def get_algorithm_configuration(self, algorithm_configuration_id: str)\
             -> tuple[str, str, int, int, str, bool]:
         """Return the algorithm_configuration with the given id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""SELECT * FROM algorithm_configuration
             WHERE id = ?""", [algorithm_configuration_id]) as cursor:
                 result_list = await cursor.fetchone()
@@ -240,7 +255,7 @@ class ProjectSQLite(ProjectDatabase):
 
     async def get_all_algorithm_configuration_ids(self) -> list[str]:
         """Return all algorithm_configuration ids."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with (db.execute("""SELECT id FROM algorithm_configuration""")
                         as cursor):
                 result_list = await cursor.fetchall()
@@ -248,7 +263,7 @@ class ProjectSQLite(ProjectDatabase):
 
     async def get_selected_algorithm_configuration_id(self) -> str | None:
         """Return the currently selected algorithm_configuration id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""SELECT id FROM algorithm_configuration
             WHERE is_selected = 1""") as cursor:
                 result = await cursor.fetchone()
@@ -258,15 +273,13 @@ class ProjectSQLite(ProjectDatabase):
 
     async def set_selected_algorithm_configuration_id(self, configuration_id: str) -> None:
         """Update the currently selected algorithm_configuration id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""UPDATE algorithm_configuration SET is_selected = 0""")
-            await db.execute("""UPDATE algorithm_configuration SET is_selected = 1
-            WHERE id = ?""", [configuration_id])
-            await db.commit()
+        await self._writes.write(("""UPDATE algorithm_configuration SET is_selected = 0""", ()),
+                                 ("""UPDATE algorithm_configuration SET is_selected = 1
+                                 WHERE id = ?""", [configuration_id]))
 
     async def get_display_interval(self, algorithm_configuration_id: str) -> int | None:
         """Return the display interval of the given algorithm_configuration id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""SELECT display_interval FROM algorithm_configuration
             WHERE id = ?""", [algorithm_configuration_id]) as cursor:
                 result_list = await cursor.fetchone()
@@ -276,14 +289,12 @@ class ProjectSQLite(ProjectDatabase):
 
     async def set_display_interval(self, algorithm_configuration_id: str, interval: int) -> None:
         """Update the display interval of the given algorithm_configuration id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""UPDATE algorithm_configuration SET display_interval = ?
-            WHERE id = ?""", (interval, algorithm_configuration_id))
-            await db.commit()
+        await self._writes.write(("""UPDATE algorithm_configuration SET display_interval = ?
+        WHERE id = ?""", (interval, algorithm_configuration_id)))
 
     async def get_evaluation_interval(self, algorithm_configuration_id: str) -> int | None:
         """Return the evaluation interval of the given algorithm_configuration id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""SELECT evaluation_interval
             FROM algorithm_configuration WHERE id = ?""", [algorithm_configuration_id]) as cursor:
                 result_list = await cursor.fetchone()
@@ -294,14 +305,12 @@ class ProjectSQLite(ProjectDatabase):
     async def set_evaluation_interval(self, algorithm_configuration_id: str,
                                       interval: int) -> None:
         """Update the evaluation interval of the given algorithm_configuration id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""UPDATE algorithm_configuration
-            SET evaluation_interval = ? WHERE id = ?""", (interval, algorithm_configuration_id))
-            await db.commit()
+        await self._writes.write(("""UPDATE algorithm_configuration
+        SET evaluation_interval = ? WHERE id = ?""", (interval, algorithm_configuration_id)))
 
     async def get_script_path(self, algorithm_configuration_id: str) -> str | None:
         """Return the scrip path of the given algorithm_configuration id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""SELECT script_path FROM algorithm_configuration
             WHERE id = ?""", [algorithm_configuration_id]) as cursor:
                 result_list = await cursor.fetchone()
@@ -311,15 +320,13 @@ class ProjectSQLite(ProjectDatabase):
 
     async def set_script_path(self, algorithm_configuration_id: str, path: str) -> None:
         """Update the script path of the given algorithm_configuration id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""UPDATE algorithm_configuration SET script_path = ?
-            WHERE id = ?""", (path, algorithm_configuration_id))
-            await db.commit()
+        await self._writes.write(("""UPDATE algorithm_configuration SET script_path = ?
+        WHERE id = ?""", (path, algorithm_configuration_id)))
 
     async def get_all_parameters(self, algorithm_configuration_id: str) -> list[tuple[str, str]]:
         """Return all parameters of the given algorithm_configuration id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            async with db.execute("""SELECT parameter_name,
+        async with self._pool.reader() as db:
+            async with db.execute("""SELECT name,
             cross_section_id FROM parameter WHERE algorithm_configuration_id = ?""",
                                   [algorithm_configuration_id]) as cursor:
                 result = await cursor.fetchall()
@@ -331,7 +338,7 @@ class ProjectSQLite(ProjectDatabase):
                                   cross_section_id: str | None) -> GLib.Variant | None:
         """Return the value of the parameter of the given algorithm configuration
         and parameter and possibly cross section."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""SELECT value FROM parameter
                 WHERE algorithm_configuration_id = ? AND name = ? AND cross_section_id is ?""",
                                   (algorithm_configuration_id, parameter_name,
@@ -341,109 +348,101 @@ class ProjectSQLite(ProjectDatabase):
                     return None
                 return GLib.Variant.parse(None, list(result)[0])
 
-    async def __ensure_parameter(self, algorithm_configuration_id: str, parameter_name: str,
-                                 cross_section_id: str | None) -> None:
-        if await self.get_parameter_value(algorithm_configuration_id, parameter_name,
-                                          cross_section_id) is None:
-            await self.add_parameter(algorithm_configuration_id, parameter_name, cross_section_id)
+    async def get_all_parameter_values_and_tags(self, algorithm_configuration_id: str) \
+            -> list[tuple[str, str | None, GLib.Variant | None, list[tuple[str, str | None]]]]:
+        """Return the name, cross section id, value and the ids and names of the tags of
+        every parameter of the given algorithm configuration that has a value or tags."""
+        parameters: dict[tuple[str, str | None],
+                         tuple[GLib.Variant | None, list[tuple[str, str | None]]]] = {}
+        async with self._pool.reader() as db:
+            async with db.execute("""SELECT name, cross_section_id, value FROM parameter
+            WHERE algorithm_configuration_id = ?""", (algorithm_configuration_id,)) as cursor:
+                async for name, cross_section_id, value in cursor:
+                    parameters[(name, cross_section_id)] = (
+                        None if value is None else GLib.Variant.parse(None, value), [])
+            async with db.execute("""SELECT p.parameter_name, p.cross_section_id, p.tag_id,
+            t.name FROM parameter_tag p LEFT JOIN tag t ON t.id = p.tag_id
+            WHERE p.algorithm_configuration_id = ? ORDER BY p.rowid""",
+                                  (algorithm_configuration_id,)) as cursor:
+                async for name, cross_section_id, tag_id, tag_name in cursor:
+                    parameters.setdefault((name, cross_section_id), (None, []))[1].append(
+                        (tag_id, tag_name))
+        return [(name, cross_section_id, value, tags)
+                for (name, cross_section_id), (value, tags) in parameters.items()]
 
     async def set_parameter_value(self, algorithm_configuration_id: str, parameter_name: str,
                                   cross_section_id: str | None,
                                   parameter_value: GLib.Variant) -> None:
         """Update the value of the parameter of the given algorithm configuration,
         parameter name and cross section."""
-        await self.__ensure_parameter(algorithm_configuration_id, parameter_name, cross_section_id)
-
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""UPDATE parameter SET value = ?
-                                WHERE algorithm_configuration_id = ? AND name = ?
-                                AND cross_section_id is ?""",
-                             (parameter_value.print_(True), algorithm_configuration_id,
-                              parameter_name, cross_section_id))
-            await db.commit()
+        await self._writes.write(*_ensure_parameter_cross_section(cross_section_id),
+                                 ("""
+        INSERT INTO parameter (algorithm_configuration_id, name, cross_section_id, value)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (algorithm_configuration_id, name, IFNULL(cross_section_id, ''))
+        DO UPDATE SET value = excluded.value""",
+                                  (algorithm_configuration_id, parameter_name, cross_section_id,
+                                   parameter_value.print_(True))))
 
     async def add_cross_section(self, cross_section_id: str) -> None:
         """Add a new cross section with an id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""
-            INSERT INTO cross_section (id)
-            VALUES (?)""", (cross_section_id,))
-            await db.commit()
+        await self._writes.write(_ensure_cross_section(cross_section_id))
 
     async def remove_cross_section(self, cross_section_id: str) -> None:
         """Remove a cross section from the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""DELETE FROM cross_section WHERE id = ?""",
-                             [cross_section_id])
-            await db.commit()
+        await self._writes.write(("""DELETE FROM cross_section WHERE id = ?""",
+                                  [cross_section_id]))
 
     async def add_algorithm_configuration(self, algorithm_configuration_id: str, name: str,
                                           evaluation_interval: int, display_interval: int,
                                           script_path: str, is_selected: bool = True) -> None:
         """Add a new algorithm configuration to the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            if is_selected:
-                await db.execute("""UPDATE algorithm_configuration
-                SET is_selected = 0""")
-                await db.commit()
-
-            await db.execute("""
-            INSERT INTO algorithm_configuration (id, name, evaluation_interval, display_interval,
-            script_path, is_selected) VALUES (?, ?, ?, ?, ?, ?)""",
-                             (algorithm_configuration_id, name,
-                              evaluation_interval,
-                              display_interval,
-                              script_path, is_selected))
-            await db.commit()
+        statements: list[Statement] = []
+        if is_selected:
+            statements.append(("""UPDATE algorithm_configuration
+            SET is_selected = 0""", ()))
+        statements.append(("""
+        INSERT INTO algorithm_configuration (id, name, evaluation_interval, display_interval,
+        script_path, is_selected) VALUES (?, ?, ?, ?, ?, ?)""",
+                           (algorithm_configuration_id, name,
+                            evaluation_interval,
+                            display_interval,
+                            script_path, is_selected)))
+        await self._writes.write(*statements)
 
     async def remove_algorithm_configuration(self, algorithm_configuration_id: str) -> None:
         """Remove a algorithm configuration from the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""DELETE FROM algorithm_configuration WHERE id = ?""",
-                             [algorithm_configuration_id])
-            await db.commit()
+        await self._writes.write(("""DELETE FROM algorithm_configuration WHERE id = ?""",
+                                  [algorithm_configuration_id]))
 
     async def add_parameter(self, algorithm_configuration_id: str, name: str,
                             cross_section_id: str | None) -> None:
         """Add a new parameter from the given algorithm configuration and parameter."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""INSERT INTO parameter (algorithm_configuration_id,
-            name, cross_section_id) VALUES (?, ?, ?)""",
-                             (algorithm_configuration_id, name, cross_section_id))
-            await db.commit()
+        await self._writes.write(*_ensure_parameter_cross_section(cross_section_id),
+                                 ("""INSERT INTO parameter (algorithm_configuration_id,
+        name, cross_section_id) VALUES (?, ?, ?)""",
+                                  (algorithm_configuration_id, name, cross_section_id)))
 
     async def remove_parameter(self, algorithm_configuration_id: str, name: str,
                                cross_section_id: str | None) -> None:
         """Remove a parameter with the given algorithm configuration and parameter name
         and possibly cross section."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            if cross_section_id is None:
-                await db.execute("""DELETE FROM parameter
-                WHERE algorithm_configuration_id = ? AND name = ? AND cross_section_id IS NULL""",
-                                 (algorithm_configuration_id, name))
-            else:
-                await db.execute("""DELETE FROM parameter
-                            WHERE algorithm_configuration_id = ? AND name = ?
-                            AND cross_section_id = ?""", (algorithm_configuration_id,
-                                                          name, cross_section_id))
-            await db.commit()
+        await self._writes.write(("""DELETE FROM parameter
+        WHERE algorithm_configuration_id = ? AND name = ? AND cross_section_id IS ?""",
+                                  (algorithm_configuration_id, name, cross_section_id)))
 
     async def add_tag(self, tag_id: str, name: str) -> None:
         """Add a new tag to the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""INSERT INTO tag (id, name) VALUES (?, ?)""",
-                             (tag_id, name))
-            await db.commit()
+        await self._writes.write(("""INSERT INTO tag (id, name) VALUES (?, ?)""",
+                                  (tag_id, name)))
 
     async def remove_tag(self, tag_id: str) -> None:
         """Remove a tag from the database."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""DELETE FROM tag WHERE id = ?""", [tag_id])
-            await db.commit()
+        await self._writes.write(("""DELETE FROM tag WHERE id = ?""", [tag_id]))
 
     async def get_tag_name(self, tag_id: str) -> str | None:
         """Return the name of the given tag_id."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""
             SELECT name FROM tag WHERE id = ?""", [tag_id]) as cursor:
                 result = list(await cursor.fetchall())
@@ -455,24 +454,26 @@ class ProjectSQLite(ProjectDatabase):
                                 algorithm_configuration_id: str,
                                 cross_section_id: str | None, tag_id: str) -> None:
         """Add a new parameter tag entry which represents a tag
-        belonging to the given parameter."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""INSERT INTO parameter_tag (id, parameter_name,
-            algorithm_configuration_id, cross_section_id, tag_id)
-            VALUES (?, ?, ?, ?, ?)""", (parameter_tag_id, parameter_name,
-                                        algorithm_configuration_id, cross_section_id, tag_id))
-            await db.commit()
+        belonging to the given parameter. A cross section parameter is added if it is
+        missing, as the foreign key of the tag only holds for existing parameters."""
+        statements = _ensure_parameter_cross_section(cross_section_id)
+        if cross_section_id is not None:
+            statements.append(("""INSERT OR IGNORE INTO parameter (algorithm_configuration_id,
+            name, cross_section_id) VALUES (?, ?, ?)""",
+                               (algorithm_configuration_id, parameter_name, cross_section_id)))
+        await self._writes.write(*statements, ("""INSERT INTO parameter_tag (id, parameter_name,
+        algorithm_configuration_id, cross_section_id, tag_id)
+        VALUES (?, ?, ?, ?, ?)""", (parameter_tag_id, parameter_name,
+                                    algorithm_configuration_id, cross_section_id, tag_id)))
 
     async def remove_parameter_tag(self, parameter_tag_id: str) -> None:
         """Remove a parameter tag entry."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
-            await db.execute("""DELETE FROM parameter_tag WHERE id = ?""",
-                             [parameter_tag_id])
-            await db.commit()
+        await self._writes.write(("""DELETE FROM parameter_tag WHERE id = ?""",
+                                  [parameter_tag_id]))
 
     async def get_all_tags(self) -> list[tuple[str, str]]:
         """Return the id and name for all tags in this project."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             async with db.execute("""
             SELECT * FROM tag""") as cursor:
                 res = await cursor.fetchall()
@@ -484,7 +485,7 @@ class ProjectSQLite(ProjectDatabase):
                                             parameter_name: str,
                                             cross_section_id: str | None) -> list[str]:
         """Return all tag ids belonging to the given parameter."""
-        async with aiosqlite.connect(str(self._file.get_path())) as db:
+        async with self._pool.reader() as db:
             if cross_section_id is None:
                 async with db.execute("""SELECT tag_id FROM parameter_tag
                     WHERE parameter_name = ? AND algorithm_configuration_id = ?
@@ -0,0 +1,149 @@
+"""This module contains the WriteQueue class."""
+import asyncio
+import time
+from collections import deque
+from typing import Any, NamedTuple, Sequence
+
+from sbaid.model.database.connection_pool import ConnectionPool
+
+Statement = tuple[str, Sequence[Any]]
+"""An SQL statement together with its parameters."""
+
+
+class WriteQueueStatistics(NamedTuple):
+    """A snapshot of how a WriteQueue has been used so far. Latencies are in seconds,
+    measured from queuing a write until its transaction is committed."""
+    queue_depth: int
+    writes: int
+    transactions: int
+    failed: int
+    average_latency: float
+    max_latency: float
+
+
+class _Write:  # pylint: disable=too-few-public-methods
+    """A queued write with the future its caller waits for."""
+
+    def __init__(self, statements: tuple[Statement, ...],
+                 future: asyncio.Future[int]) -> None:
+        self.statements = statements
+        self.future = future
+        self.queued_at = time.monotonic()
+
+
+class WriteQueue:  # pylint: disable=too-many-instance-attributes
+    """This class funnels the small writes to a database through the single writer
+    connection of its ConnectionPool. Writes are executed strictly in the order they
+    were queued, so writes to the same row never overtake each other.
+
+    Queued writes are collected for batch_interval seconds and then committed together
+    in one transaction of at most max_batch writes. Every write runs in its own
+    savepoint, so a failing write only fails its own caller."""
+
+    __pool: ConnectionPool
+    __batch_interval: float
+    __max_batch: int
+    __pending: deque[_Write]
+    __task: asyncio.Task[None] | None
+    __flushing: asyncio.Event
+    __closed: bool
+    __writes: int
+    __transactions: int
+    __failed: int
+    __total_latency: float
+    __max_latency: float
+
+    def __init__(self, pool: ConnectionPool, batch_interval: float = 0.005,
+                 max_batch: int = 256) -> None:
+        self.__pool = pool
+        self.__batch_interval = batch_interval
+        self.__max_batch = max_batch
+        self.__pending = deque()
+        self.__task = None
+        self.__flushing = asyncio.Event()
+        self.__closed = False
+        self.__writes = 0
+        self.__transactions = 0
+        self.__failed = 0
+        self.__total_latency = 0.0
+        self.__max_latency = 0.0
+
+    @property
+    def statistics(self) -> WriteQueueStatistics:
+        """Return the current queue depth and the counters and latencies so far."""
+        done = self.__writes + self.__failed
+        return WriteQueueStatistics(len(self.__pending), self.__writes, self.__transactions,
+                                    self.__failed,
+                                    self.__total_latency / done if done else 0.0,
+                                    self.__max_latency)
+
+    def write(self, *statements: Statement) -> asyncio.Future[int]:
+        """Queue the given statements to be executed together and return a future that
+        resolves to the number of changed rows once they are committed, or raises the
+        error of the failing statement. Must be called from within a running event loop."""
+        if self.__closed:
+            raise RuntimeError("Writes cannot be queued after close.")
+        future = asyncio.get_running_loop().create_future()
+        self.__pending.append(_Write(statements, future))
+        if self.__task is None or self.__task.done():
+            # a new event, as the queue may be used from another event loop than before
+            self.__flushing = asyncio.Event()
+            self.__task = asyncio.create_task(self.__run())
+        return future
+
+    async def flush(self) -> None:
+        """Commit all queued writes right away and wait until they are committed."""
+        while self.__task is not None and not self.__task.done():
+            self.__flushing.set()
+            await asyncio.shield(self.__task)
+
+    async def close(self) -> None:
+        """Commit all queued writes and stop accepting new ones."""
+        self.__closed = True
+        await self.flush()
+
+    async def __run(self) -> None:
+        while self.__pending:
+            try:
+                await asyncio.wait_for(self.__flushing.wait(), self.__batch_interval)
+            except asyncio.TimeoutError:
+                pass
+            batch = [self.__pending.popleft()
+                     for _ in range(min(self.__max_batch, len(self.__pending)))]
+            try:
+                results = await self.__execute(batch)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                results = [e] * len(batch)
+            self.__transactions += 1
+            now = time.monotonic()
+            for write, result in zip(batch, results):
+                latency = now - write.queued_at
+                self.__total_latency += latency
+                self.__max_latency = max(self.__max_latency, latency)
+                if isinstance(result, Exception):
+                    self.__failed += 1
+                    if not write.future.done():
+                        write.future.set_exception(result)
+                else:
+                    self.__writes += 1
+                    if not write.future.done():
+                        write.future.set_result(result)
+
+    async def __execute(self, batch: list[_Write]) -> list[int | Exception]:
+        results: list[int | Exception] = []
+        async with self.__pool.writer() as db:
+            if not db.in_transaction:
+                await db.execute("BEGIN")
+            for write in batch:
+                await db.execute("SAVEPOINT queued_write")
+                try:
+                    changes = 0
+                    for sql, parameters in write.statements:
+                        async with db.execute(sql, parameters) as cursor:
+                            changes += max(cursor.rowcount, 0)
+                    results.append(changes)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    await db.execute("ROLLBACK TO queued_write")
+                    results.append(e)
+                await db.execute("RELEASE queued_write")
+        return results
@@ -1,11 +1,12 @@
 """This module contains the cross section class."""
+import functools
 
 from gi.repository import GObject
 
-import sbaid.common
 from sbaid.model.simulator.simulator_cross_section import SimulatorCrossSection
 from sbaid.common.location import Location
 from sbaid.common.cross_section_type import CrossSectionType
+from sbaid.common.write_behind import write_behind
 from sbaid.model.database.project_database import ProjectDatabase
 
 
@@ -43,7 +44,9 @@ class CrossSection(GObject.GObject):
     @name.setter  # type: ignore
     def name(self, value: str) -> None:  # pylint: disable=function-redefined
         self.__name = value
-        sbaid.common.run_coro_in_background(self.__update_cross_section_name(value))
+        write_behind.schedule((self.__project_db, "cross_section", self.id, "name"),
+                              functools.partial(self.__project_db.set_cross_section_name,
+                                                self.id, value))
 
     location: Location = GObject.Property(type=Location)  # type: ignore
 
@@ -81,7 +84,10 @@ class CrossSection(GObject.GObject):
     def b_display_active(self, value: bool) -> None:  # pylint: disable=function-redefined
         """Sets the simulator cross section's b display status."""
         self.__b_display_active = value
-        sbaid.common.run_coro_in_background(self.__update_b_display_active(value))
+        write_behind.schedule((self.__project_db, "cross_section", self.id, "b_display_active"),
+                              functools.partial(
+                                  self.__project_db.set_cross_section_b_display_active,
+                                  self.id, value))
 
     hard_shoulder_available: bool = GObject.Property(type=bool, default=False)  # type: ignore
 
@@ -106,7 +112,10 @@ class CrossSection(GObject.GObject):
         if not self.hard_shoulder_available:
             raise FunctionalityNotAvailableException("Hard shoulder is not available.")
         self.__hard_shoulder_active = value
-        sbaid.common.run_coro_in_background(self.__update_hard_shoulder_active(value))
+        write_behind.schedule(
+            (self.__project_db, "cross_section", self.id, "hard_shoulder_active"),
+            functools.partial(self.__project_db.set_cross_section_hard_shoulder_active,
+                              self.id, value))
 
     def __init__(self, simulator_cross_section: SimulatorCrossSection,
                  project_db: ProjectDatabase) -> None:
@@ -122,26 +131,21 @@ class CrossSection(GObject.GObject):
 
     async def load_from_db(self) -> None:
         """Loads cross section details from the database."""
-        db_name = await self.__project_db.get_cross_section_name(self.id)
-        if db_name is not None:
-            self.__name = db_name
+        self.set_loaded_data(
+            await self.__project_db.get_cross_section_name(self.id),
+            await self.__project_db.get_cross_section_hard_shoulder_active(self.id),
+            await self.__project_db.get_cross_section_b_display_active(self.id))
+
+    def set_loaded_data(self, name: str | None, hard_shoulder_active: bool | None,
+                        b_display_active: bool | None) -> None:
+        """Sets the cross section details loaded from the db, without writing them back.
+        Details that are None were not stored and keep their current value."""
+        if name is not None:
+            self.__name = name
             self.notify("name")
-        db_hard_shoulder_active = await (self.__project_db.
-                                         get_cross_section_hard_shoulder_active(self.id))
-        if db_hard_shoulder_active is not None:
-            self.__hard_shoulder_active = db_hard_shoulder_active
+        if hard_shoulder_active is not None:
+            self.__hard_shoulder_active = hard_shoulder_active
             self.notify("hard-shoulder-active")
-        db_b_display_active = await (self.__project_db.
-                                     get_cross_section_b_display_active(self.id))
-        if db_b_display_active is not None:
+        if b_display_active is not None:
+            self.__b_display_active = b_display_active
             self.notify("b-display-active")
-            self.__b_display_active = db_b_display_active
-
-    async def __update_b_display_active(self, value: bool) -> None:
-        await self.__project_db.set_cross_section_b_display_active(self.id, value)
-
-    async def __update_hard_shoulder_active(self, value: bool) -> None:
-        await self.__project_db.set_cross_section_hard_shoulder_active(self.id, value)
-
-    async def __update_cross_section_name(self, name: str) -> None:
-        await self.__project_db.set_cross_section_name(self.id, name)
@@ -41,18 +41,30 @@ class Network(GObject.Object):
                                     GObject.ParamFlags.CONSTRUCT_ONLY)
 
     __cross_sections: Gtk.MapListModel
+    __loaded_cross_sections: dict[str, tuple[str | None, bool | None, bool | None] | None]
 
     def __init__(self, simulator: Simulator, project_db: ProjectDatabase) -> None:
         """Constructs a Network."""
         self.__simulator = simulator
         self.__project_db = project_db
         self.__cross_sections = Gtk.MapListModel.new(None, self.__map_func)
+        self.__loaded_cross_sections = {}
         super().__init__(route=Route(simulator.route_points))
 
     async def load(self) -> None:
-        """Sets the model for this network's MapListModel of simulator and model cross sections,
-         triggering the loading of cross section metadata from the database in the __map_func."""
-        if self.__cross_sections.get_model() is None:
+        """Loads the metadata of all cross sections from the database in one query and sets
+        the model for this network's MapListModel of simulator and model cross sections,
+        which fills the model cross sections with it in the __map_func."""
+        if self.__cross_sections.get_model() is not None:
+            return
+        rows = {cross_section_id: (name, hard_shoulder_active, b_display_active)
+                for cross_section_id, name, hard_shoulder_active, b_display_active
+                in await self.__project_db.get_all_cross_sections()}
+        # cross sections without a row have nothing stored, so they need no query either
+        self.__loaded_cross_sections = {
+            sim_cross_section.id: rows.get(sim_cross_section.id)
+            for sim_cross_section in list_model_iterator(self.__simulator.cross_sections)}
+        if self.__cross_sections.get_model() is None:  # unless loaded meanwhile
             self.__cross_sections.set_model(self.__simulator.cross_sections)
 
     async def import_from_file(self, file: Gio.File) -> tuple[int, int]:
@@ -139,9 +151,15 @@ class Network(GObject.Object):
     def __map_func(self, sim_cross_section: SimulatorCrossSection) -> CrossSection:
         """Creates a new network cross section from the given simulator cross section,
         to be mapped to the given simulator cross section in the MapListModel.
-        Starts the loading of cross section metadata form the database."""
+        Fills it with the metadata prefetched in load, or starts the loading of its
+        metadata from the database for cross sections created later."""
         model_cross_section = CrossSection(sim_cross_section, self.__project_db)
-        sbaid.common.run_coro_in_background(model_cross_section.load_from_db())
+        if sim_cross_section.id in self.__loaded_cross_sections:
+            row = self.__loaded_cross_sections.pop(sim_cross_section.id)
+            if row is not None:
+                model_cross_section.set_loaded_data(*row)
+        else:
+            sbaid.common.run_coro_in_background(model_cross_section.load_from_db())
         return model_cross_section
 
 
@@ -0,0 +1,333 @@
+"""This module defines the ParameterSweep class"""
+import asyncio
+import hashlib
+import itertools
+import json
+import math
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, NamedTuple
+
+import aiofiles
+import pandas as pd
+from gi.repository import GObject, GLib
+
+from sbaid import common
+from sbaid.common.i18n import i18n
+from sbaid.model.algorithm_configuration.algorithm_configuration import AlgorithmConfiguration
+from sbaid.model.batch_observer import BatchObserver
+from sbaid.model.batch_runner import BatchRun, BatchRunner, DEFAULT_ALGORITHM_TIMEOUT
+from sbaid.model.network.network import Network
+from sbaid.model.results.result import Result
+from sbaid.model.results.result_manager import ResultManager
+from sbaid.model.simulation_manager import ParameterValues
+from sbaid.model.simulator.simulator import Simulator
+
+
+class SweepException(Exception):
+    """Raised when a parameter of a sweep does not exist, has no values
+    or values of the wrong type."""
+
+
+class SweepParameter(NamedTuple):
+    """A parameter of a sweep and the values it takes. The cross section id is None
+    for a global parameter."""
+    name: str
+    cross_section_id: str | None
+    values: Sequence[GLib.Variant]
+
+
+def value_range(start: float, stop: float, step: float,
+                value_type: str = "d") -> list[GLib.Variant]:
+    """Return the values from start to stop, inclusive, in steps of step as variants
+    of the given type string, e.g. "d" or "i"."""
+    if step <= 0:
+        raise ValueError("The step of a value range must be positive.")
+    count = math.floor((stop - start) / step + 1e-9) + 1
+    values = (start + i * step for i in range(max(count, 0)))
+    if value_type == "d":
+        return [GLib.Variant(value_type, float(value)) for value in values]
+    return [GLib.Variant(value_type, round(value)) for value in values]
+
+
+async def _digest_file(path: str) -> str | None:
+    """Return the sha256 digest of the contents of the file, or None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        async with aiofiles.open(path, "rb") as file:
+            while chunk := await file.read(1024 * 1024):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class _SweepObserver(BatchObserver):
+    """Forwards the events of the batch of a sweep, except the end of the batch,
+    and reports the outcome of every run to the sweep."""
+
+    def __init__(self, observer: BatchObserver,
+                 on_finished: Callable[[str, str], None],
+                 on_failed: Callable[[str, GLib.Error], None]) -> None:
+        super().__init__()
+        self.__observer = observer
+        self.__on_finished = on_finished
+        self.__on_failed = on_failed
+
+    def update_progress(self, percentage: float) -> None:
+        self.__observer.update_progress(percentage)
+
+    def run_finished(self, run_id: str, result_id: str) -> None:
+        self.__on_finished(run_id, result_id)
+        self.__observer.run_finished(run_id, result_id)
+
+    def run_failed(self, run_id: str, error: GLib.Error) -> None:
+        self.__on_failed(run_id, error)
+        self.__observer.run_failed(run_id, error)
+
+    def finished(self) -> None:
+        """The sweep notifies its observer once the results are tagged."""
+
+
+class ParameterSweep(GObject.GObject):  # pylint: disable=too-many-instance-attributes
+    """
+    This class simulates an algorithm configuration once for every combination of the
+    values of the swept parameters, as a batch. The result of each combination is tagged
+    with the id of the algorithm configuration and the parameter set, which is also the
+    run id of the combination.
+
+    Every result is stored with a digest of all inputs of its simulation, i.e. the values
+    of all parameters, the script path and contents and the intervals of the algorithm
+    configuration, the cross sections of the network, the simulation input and the
+    contents of the input files. A combination is skipped if a complete result with the
+    same digest exists.
+    """
+
+    __project_name: str
+    __algorithm_configuration: AlgorithmConfiguration
+    __parameters: list[SweepParameter]
+    __combinations: list[tuple[str, ParameterValues]]
+    __network: Network
+    __create_simulator: Callable[[], Awaitable[Simulator]]
+    __simulation_input: str
+    __input_files: list[str]
+    __result_manager: ResultManager
+    __observer: BatchObserver
+    __algorithm_timeout: float | None
+    __max_parallel_runs: int | None
+
+    __cache_keys: dict[str, str]
+    __result_ids: dict[str, str]
+    __cached: set[str]
+    __errors: dict[str, GLib.Error]
+    __tagging: list[asyncio.Future[None]]
+    __runner: BatchRunner | None
+    __cancelled: bool
+    __sweep_task: asyncio.Task[None] | None
+
+    def __init__(self, project_name: str, algorithm_configuration: AlgorithmConfiguration,
+                 parameters: list[SweepParameter], network: Network,
+                 create_simulator: Callable[[], Awaitable[Simulator]],
+                 simulation_input: str, input_files: Sequence[str],
+                 result_manager: ResultManager, observer: BatchObserver,
+                 algorithm_timeout: float | None = DEFAULT_ALGORITHM_TIMEOUT,
+                 max_parallel_runs: int | None = None) -> None:
+        """Initialize the sweep. The simulation input identifies the simulation the
+        simulators of create_simulator are loaded with, e.g. the simulator type and
+        simulation file, and the input files are the files it is loaded from. Raises a
+        SweepException if a swept parameter does not exist in the parameter configuration,
+        has no values or values of the wrong type.
+        See BatchRunner for the other arguments."""
+        super().__init__()
+        self.__project_name = project_name
+        self.__algorithm_configuration = algorithm_configuration
+        self.__parameters = parameters
+        self.__network = network
+        self.__create_simulator = create_simulator
+        self.__simulation_input = simulation_input
+        self.__input_files = list(input_files)
+        self.__result_manager = result_manager
+        self.__observer = observer
+        self.__algorithm_timeout = algorithm_timeout
+        self.__max_parallel_runs = max_parallel_runs
+
+        self.__check_parameters()
+        self.__combinations = []
+        for values in itertools.product(*(parameter.values for parameter in parameters)):
+            label = ", ".join(f"{_parameter_label(parameter)}={value.print_(False)}"
+                              for parameter, value in zip(parameters, values))
+            self.__combinations.append((
+                f"{algorithm_configuration.id}: {label}",
+                {(parameter.name, parameter.cross_section_id): value
+                 for parameter, value in zip(parameters, values)}))
+
+        self.__cache_keys = {}
+        self.__result_ids = {}
+        self.__cached = set()
+        self.__errors = {}
+        self.__tagging = []
+        self.__runner = None
+        self.__cancelled = False
+        self.__sweep_task = None
+
+    @property
+    def run_ids(self) -> list[str]:
+        """Return the run ids of the combinations, which are the names of their tags."""
+        return [run_id for run_id, _ in self.__combinations]
+
+    def start(self) -> None:
+        """Start the simulations of the combinations that are not cached"""
+        self.__sweep_task = asyncio.create_task(self.__run())
+
+    async def wait(self) -> None:
+        """Wait until every combination has finished or failed and the results are tagged.
+        Returns right away if the sweep was not started."""
+        if self.__sweep_task is not None:
+            await asyncio.wait((self.__sweep_task,))
+
+    async def cancel(self) -> None:
+        """Cancel the running simulations and skip the ones that did not start yet."""
+        self.__cancelled = True
+        if self.__runner is not None:
+            await self.__runner.cancel()
+
+    def summary(self) -> pd.DataFrame:
+        """Return a table with a row for every combination, in order. It has a column with
+        the value of every swept parameter, the status of the run, which is one of
+        "cached", "finished", "failed" and "pending", the result id, the mean, minimum and
+        maximum average speed of the cross sections, the summed traffic volume, and the
+        duration and algorithm CPU time of the run in seconds. The metrics are read from
+        the database, which blocks."""
+        results = {result.id: result
+                   for result in common.list_model_iterator(self.__result_manager.results)}
+        run_statistics = self.__runner.run_statistics if self.__runner is not None else {}
+
+        rows = []
+        for run_id, values in self.__combinations:
+            row: dict[str, Any] = {_parameter_label(parameter): values[
+                (parameter.name, parameter.cross_section_id)].unpack()
+                for parameter in self.__parameters}
+            result_id = self.__result_ids.get(run_id)
+            if run_id in self.__cached:
+                row["status"] = "cached"
+            elif result_id is not None:
+                row["status"] = "finished"
+            elif run_id in self.__errors:
+                row["status"] = "failed"
+            else:
+                row["status"] = "pending"
+            row["result_id"] = result_id
+            row.update(_result_metrics(results.get(result_id) if result_id else None))
+            statistics = run_statistics.get(run_id)
+            row["duration"] = statistics.total if statistics else math.nan
+            row["algorithm_cpu"] = statistics.algorithm_cpu if statistics else math.nan
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    async def __run(self) -> None:
+        # the files are read once, so they must not change while the sweep runs
+        file_digests = [await _digest_file(path) for path in
+                        [self.__algorithm_configuration.script_path, *self.__input_files]]
+        runs = []
+        for run_id, values in self.__combinations:
+            cache_key = self.__get_cache_key(values, file_digests)
+            self.__cache_keys[run_id] = cache_key
+            cached = await self.__result_manager.find_cached_result(cache_key)
+            if cached is not None:
+                self.__cached.add(run_id)
+                self.__result_ids[run_id] = cached.id
+                self.__observer.run_finished(run_id, cached.id)
+            else:
+                runs.append(BatchRun(run_id, self.__algorithm_configuration, values))
+
+        if self.__cancelled:
+            for run in runs:
+                self.__on_run_failed(run.id, GLib.Error(i18n._("Simulation was cancelled.")))
+                self.__observer.run_failed(run.id, self.__errors[run.id])
+        elif runs:
+            observer = _SweepObserver(self.__observer, self.__on_run_finished,
+                                      self.__on_run_failed)
+            self.__runner = BatchRunner(self.__project_name, runs, self.__network,
+                                        self.__create_simulator, self.__result_manager,
+                                        observer, self.__algorithm_timeout,
+                                        self.__max_parallel_runs)
+            self.__runner.start()
+            await self.__runner.wait()
+            await asyncio.gather(*self.__tagging)
+
+        self.__observer.finished()
+
+    def __on_run_finished(self, run_id: str, result_id: str) -> None:
+        self.__result_ids[run_id] = result_id
+        self.__tagging.append(asyncio.ensure_future(self.__store_result(result_id, run_id)))
+
+    def __on_run_failed(self, run_id: str, error: GLib.Error) -> None:
+        self.__errors[run_id] = error
+
+    async def __store_result(self, result_id: str, run_id: str) -> None:
+        try:
+            await self.__result_manager.set_result_cache_key(result_id,
+                                                             self.__cache_keys[run_id])
+            await self.__result_manager.add_tag_to_result(result_id, run_id)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            print(i18n._("Failed to tag the result: "), e)
+
+    def __get_cache_key(self, values: ParameterValues, file_digests: list[str | None]) -> str:
+        configuration = self.__algorithm_configuration
+        parameters = []
+        for parameter in common.list_model_iterator(
+                configuration.parameter_configuration.parameters):
+            cross_section_id = parameter.cross_section.id if parameter.cross_section else None
+            value = values.get((parameter.name, cross_section_id), parameter.value)
+            parameters.append([parameter.name, cross_section_id,
+                               value.print_(True) if value is not None else None])
+        cross_sections = [[cross_section.id, int(cross_section.type), cross_section.lanes,
+                           cross_section.b_display_active, cross_section.hard_shoulder_active]
+                          for cross_section in common.list_model_iterator(
+                              self.__network.cross_sections)]
+        inputs = [self.__simulation_input, configuration.script_path,
+                  configuration.evaluation_interval, configuration.display_interval,
+                  sorted(parameters, key=str), cross_sections, self.__input_files, file_digests]
+        return hashlib.sha256(json.dumps(inputs).encode()).hexdigest()
+
+    def __check_parameters(self) -> None:
+        value_types = {}
+        for parameter in common.list_model_iterator(
+                self.__algorithm_configuration.parameter_configuration.parameters):
+            cross_section_id = parameter.cross_section.id if parameter.cross_section else None
+            value_types[(parameter.name, cross_section_id)] = parameter.value_type
+
+        swept = set()
+        for parameter in self.__parameters:
+            key = (parameter.name, parameter.cross_section_id)
+            label = _parameter_label(parameter)
+            if key not in value_types:
+                raise SweepException(i18n._("The parameter {} does not exist.").format(label))
+            if key in swept:
+                raise SweepException(i18n._("The parameter {} is swept twice.").format(label))
+            if not parameter.values:
+                raise SweepException(i18n._("The parameter {} has no values.").format(label))
+            for value in parameter.values:
+                if not value.is_of_type(value_types[key]):
+                    raise SweepException(i18n._("The value {} does not fit the parameter {}.")
+                                         .format(value.print_(True), label))
+            swept.add(key)
+
+
+def _parameter_label(parameter: SweepParameter) -> str:
+    if parameter.cross_section_id is None:
+        return parameter.name
+    return f"{parameter.name}@{parameter.cross_section_id}"
+
+
+def _result_metrics(result: Result | None) -> dict[str, float]:
+    if result is None:
+        return dict.fromkeys(("mean_speed", "min_speed", "max_speed", "traffic_volume"),
+                             math.nan)
+    data = result.query(None, ["average_speed", "traffic_volume"])
+    if data.empty:
+        return {"mean_speed": math.nan, "min_speed": math.nan, "max_speed": math.nan,
+                "traffic_volume": 0.0}
+    return {"mean_speed": float(data["average_speed"].mean()),
+            "min_speed": float(data["average_speed"].min()),
+            "max_speed": float(data["average_speed"].max()),
+            "traffic_volume": float(data["traffic_volume"].sum())}
@@ -1,11 +1,14 @@
 # pylint: disable=too-many-instance-attributes
 """This module defines the Project class."""
+import asyncio
+import functools
 
 from gi.repository import GObject, GLib, Gio
 
 
 from sbaid import common
 from sbaid.common.i18n import i18n
+from sbaid.common.write_behind import write_behind
 from sbaid.model.simulator.simulator_factory import SimulatorFactory
 from sbaid.model.database.project_database import ProjectDatabase
 from sbaid.model.database.project_sqlite import ProjectSQLite
@@ -13,6 +16,9 @@ from sbaid.common.simulator_type import SimulatorType
 from sbaid.model.results.result_manager import ResultManager
 from sbaid.model.simulation_observer import SimulationObserver
 from sbaid.model.simulation_manager import SimulationManager
+from sbaid.model.batch_observer import BatchObserver
+from sbaid.model.batch_runner import BatchRun, BatchRunner, DEFAULT_ALGORITHM_TIMEOUT
+from sbaid.model.parameter_sweep import ParameterSweep, SweepParameter
 from sbaid.model.algorithm_configuration.algorithm_configuration_manager import (
     AlgorithmConfigurationManager)
 from sbaid.model.simulator.simulator import Simulator
@@ -30,6 +36,7 @@ class Project(GObject.GObject):
 
     __loaded: bool = False
     __project_db: ProjectDatabase
+    __db_opened: asyncio.Future[None] | None = None
     __simulator: Simulator
     __name: str
 
@@ -51,7 +58,8 @@ class Project(GObject.GObject):
     def name(self, new_name: str) -> None:
         """Sets the name of the project"""
         self.__name = new_name
-        common.run_coro_in_background(self.__project_db.set_project_name(new_name))
+        write_behind.schedule((self.__project_db, "meta_information", None, "name"),
+                              functools.partial(self.__set_project_name, new_name))
 
     simulator_type: SimulatorType = GObject.Property(type=SimulatorType,  # type: ignore
                                                      flags=GObject.ParamFlags.READABLE |
@@ -120,6 +128,8 @@ class Project(GObject.GObject):
     async def load(self) -> None:
         """Loads the project, i.e. the algorithm configurations and the network."""
 
+        await self.__open_db()
+
         new_last_opened = GLib.DateTime.new_now_local()
 
         if new_last_opened:
@@ -141,10 +151,13 @@ class Project(GObject.GObject):
             self.__loaded = False  # If loading fails make sure we can try again
             raise e
 
-    async def start_simulation(self, observer: SimulationObserver) -> SimulationManager:
+    async def start_simulation(self, observer: SimulationObserver,
+                               algorithm_timeout: float | None = None) -> SimulationManager:
         """Starts a simulation with the currently selected algorithm configuration.
         The transferred observer is regularly informed about the progress of the simulation.
-        The returned SimulationManager manages the simulation and can be used to control it."""
+        The returned SimulationManager manages the simulation and can be used to control it.
+        If algorithm_timeout is given, the algorithm runs in a separate process and may take
+        that many seconds for each step."""
         selected_id = self.algorithm_configuration_manager.selected_algorithm_configuration_id
 
         algo_config = None
@@ -159,14 +172,92 @@ class Project(GObject.GObject):
                 "No selected algorithm configuration found!"))
 
         manager = SimulationManager(self.name, algo_config, self.network, self.__simulator,
-                                    self.result_manager, observer)
+                                    self.result_manager, observer,
+                                    algorithm_timeout=algorithm_timeout)
         manager.start()
         return manager
 
+    async def start_batch(self, algorithm_configuration_ids: list[str], observer: BatchObserver,
+                          algorithm_timeout: float | None = DEFAULT_ALGORITHM_TIMEOUT,
+                          max_parallel_runs: int | None = None) -> BatchRunner:
+        """Starts a simulation for each of the given algorithm configurations, each with its
+        own simulator and concurrently unless algorithm_timeout is None, see BatchRunner.
+        The transferred observer is informed about the progress of the whole batch and
+        about every simulation that ends, whose run id is the id of its algorithm
+        configuration.
+        The returned BatchRunner can be used to cancel the simulations."""
+        configurations = {config.id: config for config in common.list_model_iterator(
+            self.algorithm_configuration_manager.algorithm_configurations)}
+
+        missing = [config_id for config_id in algorithm_configuration_ids
+                   if config_id not in configurations]
+        if missing:
+            raise AlgorithmConfigurationException(
+                i18n._("Algorithm configurations not found: ") + ", ".join(missing))
+
+        runner = BatchRunner(self.name, [BatchRun(config_id, configurations[config_id])
+                                         for config_id in dict.fromkeys(
+                                             algorithm_configuration_ids)],
+                             self.network, self.__create_simulator, self.result_manager,
+                             observer, algorithm_timeout, max_parallel_runs)
+        runner.start()
+        return runner
+
+    async def start_parameter_sweep(self, algorithm_configuration_id: str,
+                                    parameters: list[SweepParameter], observer: BatchObserver,
+                                    algorithm_timeout: float | None = DEFAULT_ALGORITHM_TIMEOUT,
+                                    max_parallel_runs: int | None = None) -> ParameterSweep:
+        """Starts a simulation of the given algorithm configuration for every combination
+        of the values of the given parameters that has no result yet, see ParameterSweep.
+        The returned ParameterSweep can be used to cancel the simulations and to get
+        a summary of the results."""
+        for config in common.list_model_iterator(
+                self.algorithm_configuration_manager.algorithm_configurations):
+            if config.id == algorithm_configuration_id:
+                break
+        else:
+            raise AlgorithmConfigurationException(i18n._(
+                "Algorithm configurations not found: ") + algorithm_configuration_id)
+
+        sweep = ParameterSweep(self.name, config, parameters, self.network,
+                               self.__create_simulator,
+                               f"{self.simulator_type.id}:{self.simulation_file_path}",
+                               [self.simulation_file_path], self.result_manager, observer,
+                               algorithm_timeout, max_parallel_runs)
+        sweep.start()
+        return sweep
+
+    async def __create_simulator(self) -> Simulator:
+        simulator = SimulatorFactory().get_simulator(self.simulator_type)
+        await simulator.load_file(Gio.File.new_for_path(self.simulation_file_path))
+        return simulator
+
+    async def __open_db(self) -> None:
+        if self.__db_opened is None:
+            self.__db_opened = asyncio.ensure_future(self.__project_db.open())
+        try:
+            await asyncio.shield(self.__db_opened)
+        except Exception:
+            self.__db_opened = None  # If opening fails make sure we can try again
+            raise
+
+    async def __set_project_name(self, name: str) -> None:
+        await self.__open_db()
+        await self.__project_db.set_project_name(name)
+
+    def load_from_metadata(self, name: str, created_at: GLib.DateTime,
+                           last_opened: GLib.DateTime) -> None:
+        """Sets the attributes of the project from metadata cached elsewhere, so the
+        project database is only opened once the project is loaded."""
+        self.__name = name
+        self.notify("name")
+        self.created_at = created_at
+        self.last_opened = last_opened
+
     async def load_from_db(self) -> None:
         """Loads the attributes of the project, such as name and last modification date,
         from the database."""
-        await self.__project_db.open()
+        await self.__open_db()
         name = await self.__project_db.get_project_name()
         if name is not None:
             self.__name = name
@@ -177,8 +268,20 @@ class Project(GObject.GObject):
         if last_opened is not None:
             self.last_opened = last_opened
 
+    async def save(self) -> None:
+        """Writes all pending property edits to the databases right away."""
+        await write_behind.flush()
+
+    async def close(self) -> None:
+        """Saves pending edits and closes the connections to the project database."""
+        try:
+            await self.save()
+        finally:
+            await self.__project_db.close()
+
     async def delete(self) -> None:
         """Deletes the project database file."""
+        await self.__project_db.close()
         # TODO: Delete whole folder
         file = Gio.File.new_for_path(self.project_file_path).get_child("db")
         await file.delete_async(0, None)  # type: ignore
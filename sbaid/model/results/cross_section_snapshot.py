@@ -1,16 +1,15 @@
 """This module defines the CrossSectionSnapshot class."""
 from gi.repository import Gio, GObject
 from sbaid.common.b_display import BDisplay
-from sbaid.model.database.global_database import GlobalDatabase
 from sbaid.model.results.lane_snapshot import LaneSnapshot
 
 
 class CrossSectionSnapshot(GObject.GObject):
     """This class defines the cross section snapshot class.
     Attributes:
-        snapshot_id (str): The unique identifier of the snapshot this
+        snapshot_id (int): The unique identifier of the snapshot this
             cross section snapshot belongs to.
-        cs_snapshot_id (str): The unique identifier of the
+        cs_snapshot_id (int): The unique identifier of the
             cross section the snapshot represents.
         cross_section_name (str): The name of the cross section the snapshot represents.
         b_display (BDisplay): The B display of the cross section this snapshot represents.
@@ -19,13 +18,13 @@ class CrossSectionSnapshot(GObject.GObject):
     """
 
     # GObject Property definitions
-    snapshot_id: str = GObject.Property(  # type: ignore
-        type=str,
+    snapshot_id: int = GObject.Property(  # type: ignore
+        type=GObject.TYPE_INT64,
         flags=GObject.ParamFlags.READABLE |
         GObject.ParamFlags.WRITABLE |
         GObject.ParamFlags.CONSTRUCT_ONLY)
-    cs_snapshot_id: str = GObject.Property(  # type: ignore
-        type=str,
+    cs_snapshot_id: int = GObject.Property(  # type: ignore
+        type=GObject.TYPE_INT64,
         flags=GObject.ParamFlags.READABLE |
         GObject.ParamFlags.WRITABLE |
         GObject.ParamFlags.CONSTRUCT_ONLY)
@@ -54,32 +53,17 @@ class CrossSectionSnapshot(GObject.GObject):
         return self.__lane_snapshots
 
     __lane_snapshots: Gio.ListStore
-    __global_db: GlobalDatabase
 
-    def __init__(self, snapshot_id: str, cross_section_snapshot_id: str, cross_section_name: str,
-                 cross_section_id: str, b_display: BDisplay, global_db: GlobalDatabase) -> None:
+    def __init__(self, snapshot_id: int, cross_section_snapshot_id: int, cross_section_name: str,
+                 cross_section_id: str, b_display: BDisplay) -> None:
         """Initialize the cross-section snapshot class."""
         self.__lane_snapshots = Gio.ListStore.new(LaneSnapshot)
-        self.__global_db = global_db
         super().__init__(snapshot_id=snapshot_id,
                          cs_snapshot_id=cross_section_snapshot_id,
                          cross_section_name=cross_section_name,
                          cross_section_id=cross_section_id,
                          b_display=b_display)
 
-    async def load_from_db(self) -> None:
-        """Loads Lane Snapshots from the database and adds them to this class"""
-        lane_snapshot_data = await self.__global_db.get_all_lane_snapshots(
-            self.cs_snapshot_id)
-        for lane_snapshot in lane_snapshot_data:
-            new_lane_snapshot = LaneSnapshot(self.cs_snapshot_id,
-                                             lane_snapshot[0], lane_snapshot[1],
-                                             lane_snapshot[2], lane_snapshot[3],
-                                             lane_snapshot[4], self.__global_db)
-
-            await new_lane_snapshot.load_from_db()
-            self.__lane_snapshots.append(new_lane_snapshot)
-
     def add_lane_snapshot(self, snapshot: LaneSnapshot) -> None:
         """Add a LaneSnapshot to this CrossSectionSnapshot."""
         self.__lane_snapshots.append(snapshot)
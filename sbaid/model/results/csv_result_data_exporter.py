@@ -0,0 +1,37 @@
+"""This module contains an exporter class that allows exporting the data of a result
+to a csv file."""
+import csv
+import io
+from typing import Any, AsyncIterator, Sequence
+
+import aiofiles
+import numpy.typing as npt
+from gi.repository import Gio
+
+from sbaid.model.results.result_data_exporter import ResultDataExporter
+from sbaid.model.results.result_export_format import ResultExportFormat
+
+
+class CSVResultDataExporter(ResultDataExporter):
+    """This class exports the data of a result to a csv file with a header row."""
+
+    def get_export_format(self) -> ResultExportFormat:
+        return ResultExportFormat("csv", "CSV")
+
+    async def export_columns(self, file: Gio.File, fields: Sequence[str],
+                             chunks: AsyncIterator[dict[str, npt.NDArray[Any]]]) -> int:
+        path = file.get_path()
+        assert isinstance(path, str)
+        rows = 0
+        async with aiofiles.open(path, "w", newline="") as csvfile:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(fields)
+            async for columns in chunks:
+                writer.writerows(zip(*(columns[field].tolist() for field in fields)))
+                rows += len(columns[fields[0]]) if fields else 0
+                await csvfile.write(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+            await csvfile.write(buffer.getvalue())
+        return rows
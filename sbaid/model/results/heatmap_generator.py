@@ -2,6 +2,7 @@
 from io import BytesIO
 import matplotlib.pyplot as plt
 import numpy as np
+import numpy.typing as npt
 import seaborn as sns
 from matplotlib.colors import LinearSegmentedColormap
 from matplotlib.figure import Figure
@@ -14,7 +15,6 @@ from sbaid.common.image import Image
 from sbaid.model.results.result import Result
 from sbaid.common.diagram_type import DiagramType
 from sbaid.model.results.seaborn_image import SeabornImage
-from sbaid.common import list_model_iterator
 
 
 class HeatmapGenerator(GlobalDiagramGenerator):
@@ -37,31 +37,30 @@ class HeatmapGenerator(GlobalDiagramGenerator):
         return DiagramType("heatmap_diagram", i18n._("Heatmap-Diagram"))
 
     def __filter_result_data(self, result: Result, cross_section_ids: list[str])\
-            -> tuple[list[float], list[str], list[str]]:
-        diagram_data = []
+            -> tuple[npt.NDArray[np.float64], list[str], list[str]]:
+        data = result.query(cross_section_ids, ["cross_section_id", "cross_section_name",
+                                                "date", "average_speed"])
+        # every snapshot has a row for each of the cross sections, in the same order
+        cross_section_count = data["cross_section_id"].nunique()
+        if cross_section_count == 0:
+            return np.empty((0, 0)), [], []
+        cross_section_names = data["cross_section_name"][:cross_section_count].tolist()
         timestamps = []
-        cross_section_names = []
-        for snapshot in list_model_iterator(result.snapshots):
-            timestamp = snapshot.capture_timestamp
+        for date in data["date"][::cross_section_count]:
+            timestamp = GLib.DateTime.new_from_iso8601(date)  # pylint: disable=no-member
             if timestamp.get_minute() == 0 and timestamp.get_second() == 0:
                 timestamps.append(timestamp.format("%R"))
             else:
                 timestamps.append("")
-            average_speeds = []
-            for cs_snapshot in snapshot.cross_section_snapshots:
-                if cs_snapshot.cross_section_id in cross_section_ids:
-                    average_speeds.append(cs_snapshot.calculate_cs_average_speed())
-                    if cs_snapshot.cross_section_name not in cross_section_names:
-                        cross_section_names.append(cs_snapshot.cross_section_name)
-            diagram_data.append(average_speeds)
+        diagram_data = data["average_speed"].to_numpy().reshape(-1, cross_section_count)
         return diagram_data, cross_section_names, timestamps
 
     def __generate_diagram(self, result_name: str, project_name: str,
-                           data: tuple[list[float], list[str], list[str]],
+                           data: tuple[npt.NDArray[np.float64], list[str], list[str]],
                            datetime: GLib.DateTime) -> Figure:
         colorscheme = (LinearSegmentedColormap.from_list
                        ('rg', ["#910000", "#c10000", "r", "#ffa500", "y", "g"], N=256))
-        diagram_data = np.array(data[0])
+        diagram_data = data[0]
         cross_sections = data[1]
         timestamps = data[2]
         formatted_date = datetime.format("%F")
@@ -1,35 +1,37 @@
 """This module defines the lane snapshot class."""
 from gi.repository import Gio, GObject
 from sbaid.common.a_display import ADisplay
-from sbaid.model.database.global_database import GlobalDatabase
+from sbaid.common.vehicle_type import VehicleType
 from sbaid.model.results.vehicle_snapshot import VehicleSnapshot
+from sbaid.model.results.vehicle_snapshot_list import VehicleSnapshotList
 
 
 class LaneSnapshot(GObject.GObject):
     """ This class represents a lane snapshot, which contains data collected from a specific
      traffic lane at a specific time in the simulation.
      Attributes:
-         cross_section_snapshot_id (str): The unique identifier of the cross section snapshot
+         cross_section_snapshot_id (int): The unique identifier of the cross section snapshot
          this lane snapshot belongs to.
-         id (str): The unique identifier of this lane snapshot.
+         id (int): The unique identifier of this lane snapshot.
          lane (int): The lane this snapshot represents.
          average_speed (float): The average speed of the vehicles in the lane snapshot.
          traffic_volume (int): The amount of vehicles that pass through the lane per hour.
          a_display (ADisplay): The display the snapshot's lane is showing
             at the time of the snapshot.
          vehicle_snapshots (ListModel<VehicleSnapshots>): A ListModel of the
-            lane's vehicle snapshots.
+            lane's vehicle snapshots. It is a VehicleSnapshotList, which also gives access
+            to the vehicle types and speeds as arrays.
     """
 
     # GObject.Property definitions
 
-    cross_section_snapshot_id: str = GObject.Property(  # type: ignore
-        type=str,
+    cross_section_snapshot_id: int = GObject.Property(  # type: ignore
+        type=GObject.TYPE_INT64,
         flags=GObject.ParamFlags.READABLE |
         GObject.ParamFlags.WRITABLE |
         GObject.ParamFlags.CONSTRUCT_ONLY)
-    id: str = GObject.Property(  # type: ignore
-        type=str,
+    id: int = GObject.Property(  # type: ignore
+        type=GObject.TYPE_INT64,
         flags=GObject.ParamFlags.READABLE |
         GObject.ParamFlags.WRITABLE |
         GObject.ParamFlags.CONSTRUCT_ONLY)
@@ -63,12 +65,10 @@ class LaneSnapshot(GObject.GObject):
         """Getter for the vehicle snapshots"""
         return self.__vehicle_snapshots
 
-    __global_db: GlobalDatabase
-    __vehicle_snapshots: Gio.ListStore
+    __vehicle_snapshots: VehicleSnapshotList
 
-    def __init__(self, cross_section_snapshot_id: str, lane_snapshot_id: str, lane: int,
-                 average_speed: float, traffic_volume: int, a_display: ADisplay,
-                 global_db: GlobalDatabase) -> None:
+    def __init__(self, cross_section_snapshot_id: int, lane_snapshot_id: int, lane: int,
+                 average_speed: float, traffic_volume: int, a_display: ADisplay) -> None:
         """ Initialize the lane snapshot object."""
         super().__init__(cross_section_snapshot_id=cross_section_snapshot_id,
                          id=lane_snapshot_id,
@@ -76,16 +76,21 @@ class LaneSnapshot(GObject.GObject):
                          average_speed=average_speed,
                          traffic_volume=traffic_volume,
                          a_display=a_display)
-        self.__vehicle_snapshots = Gio.ListStore.new(VehicleSnapshot)
-        self.__global_db = global_db
-
-    async def load_from_db(self) -> None:
-        """Loads the vehicle snapshot information from the database."""
-        vehicle_snapshot_info = await self.__global_db.get_all_vehicle_snapshots(self.id)
-        for vehicle_snapshot in vehicle_snapshot_info:
-            self.__vehicle_snapshots.append(
-                VehicleSnapshot(self.id, vehicle_snapshot[0], vehicle_snapshot[1]))
+        self.__vehicle_snapshots = VehicleSnapshotList(lane_snapshot_id)
 
     def add_vehicle_snapshot(self, snapshot: VehicleSnapshot) -> None:
         """Adds a vehicle snapshot to the list in this lane snapshot."""
-        self.__vehicle_snapshots.append(snapshot)
+        self.add_vehicle(snapshot.vehicle_type, snapshot.speed)
+
+    def add_vehicle(self, vehicle_type: VehicleType, speed: float) -> None:
+        """Adds a vehicle to this lane snapshot without creating a vehicle snapshot."""
+        self.__vehicle_snapshots.append(vehicle_type, speed)
+
+    def set_vehicle_columns(self, types: bytes, speeds: bytes) -> None:
+        """Replaces the vehicles of this lane snapshot with the ones in the given columns,
+        in the format of the global database."""
+        self.__vehicle_snapshots.set_columns(types, speeds)
+
+    def get_vehicle_columns(self) -> tuple[bytes, bytes]:
+        """Returns the vehicles of this lane snapshot in the format of the global database."""
+        return self.__vehicle_snapshots.get_columns()
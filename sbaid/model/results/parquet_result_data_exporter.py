@@ -0,0 +1,46 @@
+"""This module contains an exporter class that allows exporting the data of a result
+to a parquet file. It needs pyarrow, which is optional."""
+import asyncio
+from typing import Any, AsyncIterator, Sequence
+
+import numpy.typing as npt
+from gi.repository import Gio
+
+from sbaid.model.results.result_data_exporter import ResultDataExporter
+from sbaid.model.results.result_export_format import ResultExportFormat
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+class ParquetResultDataExporter(ResultDataExporter):
+    """This class exports the data of a result to a parquet file, one row group per chunk.
+    It may only be used if PYARROW_AVAILABLE is True."""
+
+    def get_export_format(self) -> ResultExportFormat:
+        return ResultExportFormat("parquet", "Parquet")
+
+    async def export_columns(self, file: Gio.File, fields: Sequence[str],
+                             chunks: AsyncIterator[dict[str, npt.NDArray[Any]]]) -> int:
+        path = file.get_path()
+        assert isinstance(path, str)
+        rows = 0
+        writer = None
+        try:
+            async for columns in chunks:
+                table = pa.table({field: columns[field] for field in fields})
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                # writing compresses the chunk, which would block the event loop
+                await asyncio.to_thread(writer.write_table, table)
+                rows += table.num_rows
+            if writer is None:
+                pq.write_table(pa.table({field: [] for field in fields}), path)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
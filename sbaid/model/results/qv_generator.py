@@ -2,7 +2,6 @@
 from io import BytesIO
 import seaborn as sns
 import matplotlib.pyplot as plt
-import pandas as pd
 from matplotlib.colors import LinearSegmentedColormap
 from matplotlib.figure import Figure
 from pandas import DataFrame
@@ -11,11 +10,8 @@ from sbaid.common.i18n import i18n
 from sbaid.common.image import Image
 from sbaid.common.image_format import ImageFormat
 from sbaid.model.results.cross_section_diagram_generator import CrossSectionDiagramGenerator
-from sbaid.model.results.cross_section_snapshot import CrossSectionSnapshot
-from sbaid.model.results.lane_snapshot import LaneSnapshot
 from sbaid.model.results.result import Result
 from sbaid.model.results.seaborn_image import SeabornImage
-from sbaid.model.results.snapshot import Snapshot
 
 
 class QVGenerator(CrossSectionDiagramGenerator):
@@ -42,36 +38,14 @@ class QVGenerator(CrossSectionDiagramGenerator):
         return SeabornImage(buffer.getvalue(), export_format)
 
     def __extract_data(self, result: Result, cross_section_id: str) -> DataFrame:
-        """Extracts the needed information from the Result class and puts
-        together a DataFrame with appropriate headers. """
-
-        average_speed = []
-        traffic_volume = []
-        a_displays = []
-
-        cross_section_name: str | None = None
-
-        for snapshot in result.snapshots:
-            assert isinstance(snapshot, Snapshot)
-            for cs_snapshot in snapshot.cross_section_snapshots:
-                assert isinstance(cs_snapshot, CrossSectionSnapshot)
-                if cs_snapshot.cross_section_id == cross_section_id:
-                    if cross_section_name is None:
-                        cross_section_name = cs_snapshot.cross_section_name
-                    for lane_snapshot in cs_snapshot.lane_snapshots:
-                        assert isinstance(lane_snapshot, LaneSnapshot)
-                        if lane_snapshot.traffic_volume != 0:
-                            average_speed.append(lane_snapshot.average_speed)
-                            traffic_volume.append(lane_snapshot.traffic_volume)
-                            a_displays.append(lane_snapshot.a_display)
-
-        data = {
-            "speed": average_speed,
-            "volume": traffic_volume,
-            "display": a_displays
-        }
-
-        return pd.DataFrame(data)
+        """Queries the lanes of the cross section from the result and keeps those
+        with traffic, with appropriate headers. """
+
+        data = result.query([cross_section_id],
+                            ["lane_average_speed", "lane_traffic_volume", "a_display"])
+        data = data[data["lane_traffic_volume"] != 0]
+        return data.rename(columns={"lane_average_speed": "speed",
+                                    "lane_traffic_volume": "volume", "a_display": "display"})
 
     def __generate_diagram(self, data: DataFrame) -> Figure:
         """Maps the desired diagram with Matplotlib and Seaborn."""
@@ -1,11 +1,19 @@
 """ This module represents the Result class."""
+import functools
+from typing import Sequence
 
+import pandas as pd
 from gi.repository import Gio, GLib, GObject
 
 from sbaid import common
 from sbaid.common.tag import Tag
-from sbaid.model.results.snapshot import Snapshot
-from sbaid.model.database.global_database import GlobalDatabase
+from sbaid.common.write_behind import write_behind
+from sbaid.model.results.snapshot import Snapshot, snapshot_to_data
+from sbaid.model.results.snapshot_list import SnapshotList
+from sbaid.model.results.result_exporter import ResultExporter
+from sbaid.model.database.global_database import (GlobalDatabase, build_query_columns,
+                                                  get_query_level, get_query_rows,
+                                                  in_time_window)
 
 
 class Result(GObject.GObject):
@@ -16,6 +24,8 @@ class Result(GObject.GObject):
         project_name (str): The name of the project the result belongs to.
             Is created automatically from the result metadata.
         creation_date_time (DateTime): Date and time the result was created.
+        complete (bool): Whether all snapshots of the result have been stored. A result is
+            incomplete if its simulation ended before the result was finished.
         selected_tags (ListModel<Tag>): Available tags for a result. Tags that have been
          added to the result are selected.
     """
@@ -39,7 +49,9 @@ class Result(GObject.GObject):
         """Sets the name of this result"""
         self.__name = new_name
 
-        common.run_coro_in_background(self.__global_db.set_result_name(self.id, new_name))
+        write_behind.schedule((self.__global_db, "result", self.id, "name"),
+                              functools.partial(self.__global_db.set_result_name, self.id,
+                                                new_name))
 
     project_name: str = GObject.Property(   # type: ignore
         type=str,
@@ -52,6 +64,12 @@ class Result(GObject.GObject):
         GObject.ParamFlags.WRITABLE |
         GObject.ParamFlags.CONSTRUCT_ONLY)
 
+    complete: bool = GObject.Property(   # type: ignore
+        type=bool, default=True,
+        flags=GObject.ParamFlags.READABLE |
+        GObject.ParamFlags.WRITABLE |
+        GObject.ParamFlags.CONSTRUCT_ONLY)
+
     selected_tags: Gio.ListModel = GObject.Property(type=Gio.ListModel)  # type: ignore[assignment]
 
     @selected_tags.getter  # type: ignore
@@ -64,36 +82,52 @@ class Result(GObject.GObject):
     @snapshots.getter  # type: ignore
     def snapshots(self) -> Gio.ListModel:
         """Getter for the snapshots."""
+        if self.__stored_snapshots is not None:
+            return self.__stored_snapshots
         return self.__snapshots
 
     __name: str
     __snapshots: Gio.ListStore
+    __stored_snapshots: SnapshotList | None
     __selected_tags: Gio.ListStore
     __global_db: GlobalDatabase
 
     def __init__(self, result_id: str, project_name: str,
-                 creation_date_time: GLib.DateTime, global_db: GlobalDatabase) -> None:
-        """Initializes the Result class."""
+                 creation_date_time: GLib.DateTime, global_db: GlobalDatabase,
+                 complete: bool = True, name: str | None = None) -> None:
+        """Initializes the Result class. Without a name, the name is created from the
+        project name and creation date."""
         super().__init__(id=result_id,
                          project_name=project_name,
-                         creation_date_time=creation_date_time)
+                         creation_date_time=creation_date_time,
+                         complete=complete)
 
-        self.__name = project_name + "_" + str(creation_date_time.format("%F"))
+        if name is None:
+            name = project_name + "_" + str(creation_date_time.format("%F"))
+        self.__name = name
         self.__snapshots = Gio.ListStore.new(Snapshot)
+        self.__stored_snapshots = None
         self.__selected_tags = Gio.ListStore.new(Tag)
         self.__global_db = global_db
 
     async def load(self) -> None:
-        """Handles the logic for loading snapshots."""
-        if self.__snapshots.get_n_items():  # We are already loaded
-            return
-
-        db_snapshots = await self.__global_db.get_all_snapshots(self.id)
-
-        for snapshot in db_snapshots:
-            new_snapshot = Snapshot(snapshot[0], snapshot[1], self.__global_db)
-            await new_snapshot.load_from_db()
-            self.add_snapshot(new_snapshot)
+        """Handles the logic for loading snapshots. The snapshots of a stored result
+        are read from the database page by page when they are accessed."""
+        if self.__snapshots.get_n_items() or self.__stored_snapshots is not None:
+            return  # We are already loaded
+
+        self.__stored_snapshots = SnapshotList(self.id, self.__global_db)
+        self.notify("snapshots")
+
+    def reload_snapshots(self) -> None:
+        """Reads the snapshots from the database again after they were changed there.
+        Snapshots held in memory are replaced by the stored ones."""
+        if self.__stored_snapshots is not None:
+            self.__stored_snapshots.reload()
+        elif self.__snapshots.get_n_items():
+            self.__snapshots.remove_all()
+            self.__stored_snapshots = SnapshotList(self.id, self.__global_db)
+            self.notify("snapshots")
 
     def add_tag(self, tag: Tag) -> None:
         """Adds tag to the selected_tags list"""
@@ -105,19 +139,30 @@ class Result(GObject.GObject):
         if exists:
             self.__selected_tags.remove(position)
 
-    async def load_from_db(self) -> None:
-        """Loads metainformation about the result name and tags, and saves them in the class."""
-        name_from_db = await self.__global_db.get_result_name(self.id)
-        if name_from_db is not None:
-            self.__name = name_from_db
-            self.notify("result-name")
-
-        tag_ids = await self.__global_db.get_result_tag_ids(self.id)
-
-        for tag_id in tag_ids:
-            tag_name = await self.__global_db.get_tag_name(tag_id)
-            if tag_name is not None:
-                self.add_tag(Tag(tag_id, tag_name))
+    def query(self, cross_section_ids: Sequence[str] | None, fields: Sequence[str],
+              start: GLib.DateTime | None = None,
+              end: GLib.DateTime | None = None) -> pd.DataFrame:
+        """Returns a DataFrame with the given fields as columns, see
+        GlobalDatabase.query_result. The values are read from the database without
+        creating snapshot objects, which blocks, unless the snapshots are held in memory."""
+        if self.__stored_snapshots is None and self.__snapshots.get_n_items() > 0:
+            snapshots = [snapshot_to_data(snapshot, self.id)
+                         for snapshot in common.list_model_iterator(self.__snapshots)
+                         if in_time_window(snapshot.capture_timestamp, start, end)]
+            rows = get_query_rows(snapshots, cross_section_ids, get_query_level(fields))
+            return pd.DataFrame(build_query_columns(rows, fields))
+        return pd.DataFrame(self.__global_db.query_result(self.id, cross_section_ids, fields,
+                                                          start, end))
+
+    async def export_data(self, exporter: ResultExporter, directory: Gio.File,
+                          format_id: str | None = None,
+                          cross_section_ids: Sequence[str] | None = None,
+                          start: GLib.DateTime | None = None,
+                          end: GLib.DateTime | None = None) -> list[Gio.File]:
+        """Exports the lane and vehicle data of the stored snapshots into the given
+        directory with the given exporter, see ResultExporter.export."""
+        return await exporter.export(self.__global_db, self.id, directory, format_id,
+                                     cross_section_ids, start, end)
 
     def add_snapshot(self, snapshot: Snapshot) -> None:
         """Adds a snapshot toe the list of snapshots"""
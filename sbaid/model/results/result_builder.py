@@ -1,18 +1,26 @@
 """This module defines the ResultBuilder class and its helper classes"""
+import itertools
 import uuid
+from collections.abc import Iterator, Sequence
 from typing import Self
+
+import numpy as np
 from gi.repository import GLib, GObject
 from sbaid.common.a_display import ADisplay
 from sbaid.common.i18n import i18n
 from sbaid.common.vehicle_type import VehicleType
-from sbaid.model.database.global_database import GlobalDatabase
+from sbaid.model.database.global_database import (GlobalDatabase, SnapshotData,
+                                                  CrossSectionSnapshotData, LaneSnapshotData,
+                                                  VEHICLE_TYPE_DTYPE, VEHICLE_SPEED_DTYPE)
 from sbaid.model.results.cross_section_snapshot import CrossSectionSnapshot
 from sbaid.model.results.lane_snapshot import LaneSnapshot
 from sbaid.model.results.result_manager import ResultManager
 from sbaid.common.b_display import BDisplay
 from sbaid.model.results.result import Result
-from sbaid.model.results.snapshot import Snapshot
-from sbaid.model.results.vehicle_snapshot import VehicleSnapshot
+from sbaid.model.results.result_writer import ResultWriter
+from sbaid.model.results.snapshot import Snapshot, build_snapshot, snapshot_to_data
+from sbaid.model.simulation.display import Display
+from sbaid.model.simulation.input import Input
 
 
 class _CrossSectionBuilder:
@@ -20,18 +28,18 @@ class _CrossSectionBuilder:
     # required for construction
     __cross_section_name: str
     __cross_section_id: str
-    __snapshot_id: str
-    __global_db: GlobalDatabase
+    __snapshot_id: int
+    __cs_snapshot_id: int
 
     # added later
     __cross_section_b_display: BDisplay
 
-    def __init__(self, cs_name: str, snapshot_id: str, cross_section_id: str,
-                 global_db: GlobalDatabase) -> None:
+    def __init__(self, cs_name: str, snapshot_id: int, cs_snapshot_id: int,
+                 cross_section_id: str) -> None:
         self.__cross_section_name = cs_name
         self.__snapshot_id = snapshot_id
+        self.__cs_snapshot_id = cs_snapshot_id
         self.__cross_section_id = cross_section_id
-        self.__global_db = global_db
         self.__cross_section_b_display = BDisplay.NOT_AVAILABLE
 
     def set_b_display(self, b_display: BDisplay) -> Self:
@@ -42,28 +50,27 @@ class _CrossSectionBuilder:
     def try_build(self) -> CrossSectionSnapshot | None:
         """Builds and returns cross-section snapshot if attributes complete, None otherwise"""
 
-        return CrossSectionSnapshot(self.__snapshot_id, str(uuid.uuid4()),
+        return CrossSectionSnapshot(self.__snapshot_id, self.__cs_snapshot_id,
                                     self.__cross_section_name,
                                     self.__cross_section_id,
-                                    self.__cross_section_b_display,
-                                    self.__global_db)
+                                    self.__cross_section_b_display)
 
 
 class _LaneBuilder:
     """This auxiliary class contains the lane snapshot builder methods"""
     # required for construction
     __lane_number: int
-    __cross_section_id: str
-    __global_db: GlobalDatabase
+    __cs_snapshot_id: int
+    __lane_snapshot_id: int
     # added later
     __average_speed: float | None
     __traffic_volume: int | None
     __a_display: ADisplay
 
-    def __init__(self, lane_number: int, cross_section_id: str, global_db: GlobalDatabase) -> None:
+    def __init__(self, lane_number: int, cs_snapshot_id: int, lane_snapshot_id: int) -> None:
         self.__lane_number = lane_number
-        self.__cross_section_id = cross_section_id
-        self.__global_db = global_db
+        self.__cs_snapshot_id = cs_snapshot_id
+        self.__lane_snapshot_id = lane_snapshot_id
         self.__average_speed = None
         self.__traffic_volume = None
         self.__a_display = ADisplay.NOT_AVAILABLE
@@ -87,26 +94,23 @@ class _LaneBuilder:
         """Builds and returns lane snapshot if attributes complete, None otherwise"""
         if (self.__average_speed is not None) and (self.__average_speed is not None) and (
                 self.__traffic_volume is not None):
-            return LaneSnapshot(self.__cross_section_id,
-                                str(uuid.uuid4()),
+            return LaneSnapshot(self.__cs_snapshot_id,
+                                self.__lane_snapshot_id,
                                 self.__lane_number,
                                 self.__average_speed,
                                 self.__traffic_volume,
-                                self.__a_display,
-                                self.__global_db)
+                                self.__a_display)
         return None
 
 
 class _VehicleBuilder:
-    """This auxiliary class contains the vehicle snapshot builder methods"""
-    # required for construction
-    __lane_id: str
+    """This auxiliary class contains the vehicle snapshot builder methods.
+    Vehicles are stored in columns of their lane snapshot, so no VehicleSnapshot is built."""
     # added later
     __vehicle_type: VehicleType | None
     __vehicle_speed: float | None
 
-    def __init__(self, lane_id: str) -> None:
-        self.__lane_id = lane_id
+    def __init__(self) -> None:
         self.__vehicle_type = None
         self.__vehicle_speed = None
 
@@ -120,17 +124,44 @@ class _VehicleBuilder:
         self.__vehicle_speed = vehicle_speed
         return self
 
-    def try_build(self) -> VehicleSnapshot | None:
-        """Builds and returns vehicle snapshot if attributes complete, None otherwise"""
+    def try_build(self) -> tuple[VehicleType, float] | None:
+        """Returns vehicle type and speed if attributes complete, None otherwise"""
         if self.__vehicle_type is not None and self.__vehicle_speed is not None:
-            return VehicleSnapshot(self.__lane_id, self.__vehicle_type, self.__vehicle_speed)
+            return self.__vehicle_type, self.__vehicle_speed
         return None
 
 
+def _lane_snapshot_data(lane_snapshot_id: int, cs_snapshot_id: int, cross_section_id: str,
+                        lane: int, measurement: Input, display: Display | None) \
+        -> LaneSnapshotData:
+    """Returns the row of a lane snapshot, with the vehicles of the lane as columns."""
+    a_display = ADisplay.NOT_AVAILABLE if display is None \
+        else display.get_a_display(cross_section_id, lane)
+    vehicle_infos = measurement.get_all_vehicle_infos(cross_section_id, lane)
+    types = np.fromiter((info.vehicle_type for info in vehicle_infos),
+                        VEHICLE_TYPE_DTYPE, len(vehicle_infos))
+    speeds = np.fromiter((info.speed for info in vehicle_infos),
+                         VEHICLE_SPEED_DTYPE, len(vehicle_infos))
+    return (lane_snapshot_id, cs_snapshot_id, lane,
+            measurement.get_average_speed(cross_section_id, lane),
+            measurement.get_traffic_volume(cross_section_id, lane),
+            a_display.value, types.tobytes(), speeds.tobytes())
+
+
 class ResultBuilder(GObject.GObject):  # pylint:disable=too-many-instance-attributes
-    """Contains methods to build the results."""
+    """Contains methods to build the results.
+    Every result gets a random uuid, while the snapshot, cross section snapshot and lane
+    snapshot ids are counted up from 1 within each result, as the global database
+    assigns its own keys when storing them.
+    In streaming mode every finished snapshot is handed to a ResultWriter that appends it
+    to the database in the background, instead of keeping the whole result in memory."""
     __result_manager: ResultManager
     __global_db: GlobalDatabase
+    __max_in_flight: int | None
+    __writer: ResultWriter | None = None
+    __snapshot_ids: Iterator[int]
+    __cs_snapshot_ids: Iterator[int]
+    __lane_snapshot_ids: Iterator[int]
 
     # the following optionals are also used for controlling the logic
     # that regulates the correct building order.
@@ -144,13 +175,16 @@ class ResultBuilder(GObject.GObject):  # pylint:disable=too-many-instance-attrib
     __current_lane: LaneSnapshot | None = None
     __current_lane_builder: _LaneBuilder | None = None
 
-    __current_vehicle: VehicleSnapshot | None = None
+    __current_vehicle: tuple[VehicleType, float] | None = None
     __current_vehicle_builder: _VehicleBuilder | None = None
 
-    def __init__(self, result_manager: ResultManager) -> None:
-        """Initializes the ResultBuilder class."""
+    def __init__(self, result_manager: ResultManager,
+                 max_in_flight: int | None = None) -> None:
+        """Initializes the ResultBuilder class. If max_in_flight is given, results are
+        streamed to the database with at most that many snapshots waiting to be written."""
         super().__init__()
         self.__result_manager = result_manager
+        self.__max_in_flight = max_in_flight
 
         # getter in this circumstance, because result-builder
         # is tightly coupled with the manager, which already has the database
@@ -164,26 +198,37 @@ class ResultBuilder(GObject.GObject):  # pylint:disable=too-many-instance-attrib
         if now is None:
             raise GLibErrorException(i18n._("Could not get current time from local system"))
 
-        self.__current_result = Result(str(uuid.uuid4()),
-                                       project_name, now, self.__global_db)
+        self.__current_result = Result(str(uuid.uuid4()), project_name, now, self.__global_db)
+        self.__snapshot_ids = itertools.count(1)
+        self.__cs_snapshot_ids = itertools.count(1)
+        self.__lane_snapshot_ids = itertools.count(1)
+
+        if self.__max_in_flight is not None:
+            self.__writer = ResultWriter(self.__global_db, self.__current_result,
+                                         self.__max_in_flight)
+
+    async def wait_for_writer(self) -> None:
+        """In streaming mode, waits until another snapshot may be built without exceeding
+        the maximum number of snapshots in flight. Returns immediately otherwise."""
+        if self.__writer is not None:
+            await self.__writer.wait_for_capacity()
 
     def begin_snapshot(self, simulation_timestamp: GLib.DateTime) -> None:
         """Sets current_snapshot to a new snapshot with the given timestamp."""
         if self.__current_result is None:
             raise WrongOrderException(i18n._("Result has not been set"))
 
-        self.__current_snapshot = Snapshot(str(uuid.uuid4()),
-                                           simulation_timestamp, self.__global_db)
+        self.__current_snapshot = Snapshot(next(self.__snapshot_ids),
+                                           simulation_timestamp)
 
     def begin_cross_section(self, cross_section_id: str, cross_section_name: str) -> None:
         """Sets the current cs builder to a new instance, constructed with
         the given cross-section name and current snapshot id."""
         if self.__current_snapshot is None:
             raise WrongOrderException(i18n._("Current snapshot has not been set"))
-        self.__current_cs_builder = _CrossSectionBuilder(cross_section_name,
-                                                         self.__current_snapshot.id,
-                                                         cross_section_id,
-                                                         self.__global_db)
+        self.__current_cs_builder = _CrossSectionBuilder(
+            cross_section_name, self.__current_snapshot.id,
+            next(self.__cs_snapshot_ids), cross_section_id)
 
         self.__current_cross_section = self.__current_cs_builder.try_build()
 
@@ -205,7 +250,7 @@ class ResultBuilder(GObject.GObject):  # pylint:disable=too-many-instance-attrib
             raise WrongOrderException("Current cross section snapshot has not been set")
         self.__current_lane_builder = _LaneBuilder(lane_number,
                                                    self.__current_cross_section.cs_snapshot_id,
-                                                   self.__global_db)
+                                                   next(self.__lane_snapshot_ids))
 
     def add_average_speed(self, speed: float) -> None:
         """Sets average speed in the current lane builder to given value."""
@@ -229,7 +274,7 @@ class ResultBuilder(GObject.GObject):  # pylint:disable=too-many-instance-attrib
         """Sets the current vehicle builder to a new instance."""
         if self.__current_lane is None:
             raise WrongOrderException(i18n._("Current lane snapshot has not been set"))
-        self.__current_vehicle_builder = _VehicleBuilder(self.__current_lane.id)
+        self.__current_vehicle_builder = _VehicleBuilder()
 
     def add_vehicle_type(self, vehicle_type: VehicleType) -> None:
         """Sets the vehicle type in the current vehicle builder to given value."""
@@ -252,7 +297,7 @@ class ResultBuilder(GObject.GObject):  # pylint:disable=too-many-instance-attrib
         if self.__current_vehicle is None or self.__current_lane is None:
             raise WrongOrderException(i18n._("Vehicle snapshot has not been created"))
 
-        self.__current_lane.add_vehicle_snapshot(self.__current_vehicle)
+        self.__current_lane.add_vehicle(*self.__current_vehicle)
         self.__current_vehicle_builder = None
         self.__current_vehicle = None
 
@@ -287,7 +332,8 @@ class ResultBuilder(GObject.GObject):  # pylint:disable=too-many-instance-attrib
         self.__current_cross_section = None
 
     def end_snapshot(self) -> None:
-        """Adds the current snapshot to current result. Resets current snapshot to None.
+        """Adds the current snapshot to current result, or submits it to the writer in
+        streaming mode. Resets current snapshot to None.
         Raises WrongOrderException if snapshot has not been created
          or a cross-section snapshot is in the process of being created ."""
 
@@ -295,22 +341,83 @@ class ResultBuilder(GObject.GObject):  # pylint:disable=too-many-instance-attrib
                 or self.__current_result is None):
             raise WrongOrderException(i18n._("Snapshot creation cannot successfully finish"))
 
-        self.__current_result.add_snapshot(self.__current_snapshot)
+        if self.__writer is not None:
+            self.__writer.submit(snapshot_to_data(self.__current_snapshot,
+                                                  self.__current_result.id))
+        else:
+            self.__current_result.add_snapshot(self.__current_snapshot)
         self.__current_snapshot = None
 
+    def add_snapshot_from_input(self, timestamp: GLib.DateTime, measurement: Input,
+                                display: Display | None,
+                                cross_sections: Sequence[tuple[str, str, int]]) -> None:
+        """Records a whole snapshot with the given timestamp from the measurement and display
+        of a simulation step, like the calls from begin_snapshot to end_snapshot would.
+        The cross sections are given as precomputed (id, name, number of lanes) tuples in
+        the order they are recorded in. The snapshot is assembled as database rows, so no
+        builder or vehicle objects are created."""
+        if self.__current_result is None:
+            raise WrongOrderException(i18n._("Result has not been set"))
+        if self.__current_snapshot is not None:
+            raise WrongOrderException(i18n._("Another snapshot is being built"))
+
+        snapshot_id = next(self.__snapshot_ids)
+        cs_sn_data: list[CrossSectionSnapshotData] = []
+        for cross_section_id, cross_section_name, lanes in cross_sections:
+            cs_snapshot_id = next(self.__cs_snapshot_ids)
+            b_display = BDisplay.NOT_AVAILABLE if display is None \
+                else display.get_b_display(cross_section_id)
+            lane_sn_data = [_lane_snapshot_data(next(self.__lane_snapshot_ids), cs_snapshot_id,
+                                                cross_section_id, lane, measurement, display)
+                            for lane in range(lanes)]
+            cs_sn_data.append((cs_snapshot_id, snapshot_id, cross_section_id,
+                               cross_section_name, b_display.value, lane_sn_data))
+        data: SnapshotData = (snapshot_id, self.__current_result.id,
+                              str(timestamp.format_iso8601()), cs_sn_data)
+
+        if self.__writer is not None:
+            self.__writer.submit(data)
+        else:
+            self.__current_result.add_snapshot(build_snapshot(data))
+
     async def end_result(self) -> Result:
-        """Returns current result and resets to None.
+        """Returns current result and resets to None. In streaming mode the remaining
+        snapshots are written and the result is marked complete.
          Raises WrongOrderException if result has not been
          created or a snapshot is in the process of being created"""
         if self.__current_result is None or self.__current_snapshot is not None:
             raise WrongOrderException(i18n._("Result cannot be created"))
 
         result = self.__current_result
+        writer = self.__writer
+        self.__current_result = None
+        self.__writer = None
 
-        await self.__result_manager.register_result(result)
+        if writer is not None:
+            await writer.finish()
+            self.__result_manager.add_stored_result(result)
+        else:
+            await self.__result_manager.register_result(result)
 
         return result
 
+    async def abort_result(self) -> None:
+        """Discards the current result. In streaming mode the snapshots submitted so far
+        are still written and the result stays incomplete in the database."""
+        writer = self.__writer
+        self.__current_result = None
+        self.__current_snapshot = None
+        self.__current_cs_builder = None
+        self.__current_cross_section = None
+        self.__current_lane_builder = None
+        self.__current_lane = None
+        self.__current_vehicle_builder = None
+        self.__current_vehicle = None
+        self.__writer = None
+
+        if writer is not None:
+            await writer.finish(complete=False)
+
 
 class WrongOrderException(Exception):
     """Raised when the result builder methods are called in the wrong order"""
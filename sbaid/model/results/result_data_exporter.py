@@ -0,0 +1,22 @@
+"""This module contains the ResultDataExporter interface."""
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Sequence
+
+import numpy.typing as npt
+from gi.repository import Gio
+
+from sbaid.model.results.result_export_format import ResultExportFormat
+
+
+class ResultDataExporter(ABC):
+    """This interface defines the functions a result data exporter is capable of."""
+
+    @abstractmethod
+    def get_export_format(self) -> ResultExportFormat:
+        """Returns the export format."""
+
+    @abstractmethod
+    async def export_columns(self, file: Gio.File, fields: Sequence[str],
+                             chunks: AsyncIterator[dict[str, npt.NDArray[Any]]]) -> int:
+        """Writes the chunks of columns with the given fields as a table into the given
+        file, one chunk at a time. Returns the number of rows written."""
@@ -0,0 +1,99 @@
+"""This module defines the ResultDeleter class."""
+import asyncio
+from collections import deque
+from typing import Callable
+
+from sbaid.model.database.global_database import GlobalDatabase
+
+
+class ResultDeleter:  # pylint: disable=too-many-instance-attributes
+    """This class deletes results from the global database in the background. Every
+    result is deleted chunk by chunk in short transactions, so other reads and writes
+    are never blocked for long. Afterward the freed space is returned to the file system
+    in steps as well.
+
+    The results have to be marked as deleted before they are handed to delete, results
+    left marked by an interrupted deletion can simply be handed over again."""
+
+    __global_db: GlobalDatabase
+    __on_progress: Callable[[float], None]
+    __chunk_size: int
+    __vacuum_pages: int
+    __pending: deque[str]
+    __total: int
+    __deleted: int
+    __closed: bool
+    __error: Exception | None
+    __task: asyncio.Task[None] | None
+
+    def __init__(self, global_db: GlobalDatabase, on_progress: Callable[[float], None],
+                 chunk_size: int = 100, vacuum_pages: int = 1000) -> None:
+        """Initialize the deleter. on_progress is called with the fraction of the
+        snapshots of all pending results deleted so far, and with 1.0 once done."""
+        self.__global_db = global_db
+        self.__on_progress = on_progress
+        self.__chunk_size = chunk_size
+        self.__vacuum_pages = vacuum_pages
+        self.__pending = deque()
+        self.__total = 0
+        self.__deleted = 0
+        self.__closed = False
+        self.__error = None
+        self.__task = None
+
+    @property
+    def busy(self) -> bool:
+        """Whether results are being deleted or space is being reclaimed."""
+        return self.__task is not None and not self.__task.done()
+
+    def delete(self, result_id: str, snapshot_count: int) -> None:
+        """Queue a result that is marked as deleted and has the given number of snapshots
+        left for deletion. Must be called from within a running event loop."""
+        if self.__closed:
+            raise RuntimeError("Results cannot be deleted after close.")
+        self.__pending.append(result_id)
+        self.__total += snapshot_count
+        if not self.busy:
+            self.__task = asyncio.create_task(self.__run())
+
+    async def wait(self) -> None:
+        """Wait until all queued results are deleted and the space is reclaimed.
+        Raise the error that stopped the deletion, if any."""
+        if self.__task is not None:
+            await asyncio.shield(self.__task)
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise error
+
+    async def close(self) -> None:
+        """Stop after the current chunk. Results that are not deleted completely stay
+        marked as deleted."""
+        self.__closed = True
+        if self.__task is not None:
+            await asyncio.shield(self.__task)
+
+    async def __run(self) -> None:
+        try:
+            # results queued while the space is reclaimed are picked up afterward
+            while self.__pending and not self.__closed:
+                await self.__delete_pending()
+                while not self.__closed and await self.__global_db.reclaim_space(
+                        self.__vacuum_pages):
+                    pass
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.__error = e
+            self.__pending.clear()
+        finally:
+            self.__total = 0
+            self.__deleted = 0
+            self.__on_progress(1.0)
+
+    async def __delete_pending(self) -> None:
+        while self.__pending and not self.__closed:
+            deleted = await self.__global_db.delete_result_chunk(self.__pending[0],
+                                                                 self.__chunk_size)
+            if deleted == 0:
+                self.__pending.popleft()
+                continue
+            self.__deleted += deleted
+            self.__on_progress(min(self.__deleted / self.__total, 1.0) if self.__total else 0.0)
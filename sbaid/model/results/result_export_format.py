@@ -0,0 +1,20 @@
+"""This module defines the ResultExportFormat class."""
+from gi.repository import GObject
+
+
+class ResultExportFormat(GObject.GObject):
+    """This class represents a file format the data of results can be exported to."""
+    format_id = GObject.Property(
+        type=str,
+        flags=GObject.ParamFlags.READABLE |
+        GObject.ParamFlags.WRITABLE |
+        GObject.ParamFlags.CONSTRUCT_ONLY)
+    name = GObject.Property(
+        type=str,
+        flags=GObject.ParamFlags.READABLE |
+        GObject.ParamFlags.WRITABLE |
+        GObject.ParamFlags.CONSTRUCT)
+
+    def __init__(self, format_id: str, name: str) -> None:
+        """Constructs the result export format. The format id is the file extension."""
+        super().__init__(format_id=format_id, name=name)
@@ -0,0 +1,88 @@
+"""This module defines the ResultExporter class."""
+from typing import Sequence
+
+from gi.repository import Gio, GLib, GObject
+
+from sbaid.common import list_model_iterator
+from sbaid.model.database.global_database import GlobalDatabase
+from sbaid.model.results.csv_result_data_exporter import CSVResultDataExporter
+from sbaid.model.results.parquet_result_data_exporter import (ParquetResultDataExporter,
+                                                              PYARROW_AVAILABLE)
+from sbaid.model.results.result_data_exporter import ResultDataExporter
+from sbaid.model.results.result_export_format import ResultExportFormat
+
+LANE_FIELDS = ["snapshot_id", "date", "cross_section_id", "cross_section_name", "b_display",
+               "lane_number", "lane_average_speed", "lane_traffic_volume", "a_display"]
+"""The columns of the lane layer of an export, one row per lane snapshot."""
+VEHICLE_FIELDS = ["snapshot_id", "date", "cross_section_id", "lane_number", "vehicle_type",
+                  "vehicle_speed"]
+"""The columns of the vehicle layer of an export, one row per vehicle."""
+LAYERS = {"lanes": LANE_FIELDS, "vehicles": VEHICLE_FIELDS}
+"""The layers of an export by name."""
+
+
+class ResultExporter(GObject.GObject):
+    """Handles the export of the data of stored results to files. The data is streamed
+    from the global database in chunks, so the memory used does not grow with the size
+    of the result. Parquet is offered if pyarrow is available, csv always."""
+
+    __exporters: list[ResultDataExporter]
+    __formats: Gio.ListStore
+    __chunk_size: int
+
+    # GObject.Property definitions
+    available_formats: Gio.ListModel = (
+        GObject.Property(type=Gio.ListModel))  # type: ignore[assignment]
+
+    @available_formats.getter  # type: ignore
+    def available_formats(self) -> Gio.ListModel:
+        """Returns ListModel of the available ResultExportFormats, the preferred first."""
+        return self.__formats
+
+    def __init__(self, chunk_size: int = 10000) -> None:
+        """Initialize the result exporter. chunk_size is the number of lane snapshots
+        read from the database at once."""
+        super().__init__()
+        self.__exporters = []
+        if PYARROW_AVAILABLE:
+            self.__exporters.append(ParquetResultDataExporter())
+        self.__exporters.append(CSVResultDataExporter())
+        self.__chunk_size = chunk_size
+
+        self.__formats = Gio.ListStore.new(ResultExportFormat)
+        for exporter in self.__exporters:
+            self.__formats.append(exporter.get_export_format())
+
+    def get_exporter(self, format_id: str) -> ResultDataExporter | None:
+        """Looks for the exporter of the given format in the available exporters."""
+        for exporter in self.__exporters:
+            if exporter.get_export_format().format_id == format_id:
+                return exporter
+        return None
+
+    async def export(self, global_db: GlobalDatabase, result_id: str, directory: Gio.File,
+                     format_id: str | None = None,
+                     cross_section_ids: Sequence[str] | None = None,
+                     start: GLib.DateTime | None = None, end: GLib.DateTime | None = None,
+                     layers: Sequence[str] = tuple(LAYERS)) -> list[Gio.File]:
+        """Exports the given layers of a stored result into one file each in the given
+        directory, named after the result id and the layer. Only the given cross sections
+        and the snapshots captured between start and end are exported, None exports all.
+        Without a format the preferred available format is used.
+        Returns the written files."""
+        if format_id is None:
+            format_id = next(list_model_iterator(self.__formats)).format_id
+        exporter = self.get_exporter(format_id)
+        if exporter is None:
+            raise ValueError(f"Unsupported result export format: {format_id}")
+
+        files = []
+        for layer in layers:
+            if layer not in LAYERS:
+                raise ValueError(f"Unknown result export layer: {layer}")
+            file = directory.get_child(f"{result_id}_{layer}.{format_id}")
+            chunks = global_db.stream_query_result(result_id, cross_section_ids, LAYERS[layer],
+                                                   start, end, self.__chunk_size)
+            await exporter.export_columns(file, LAYERS[layer], chunks)
+            files.append(file)
+        return files
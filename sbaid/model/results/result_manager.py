@@ -4,12 +4,10 @@ from typing import cast
 
 from gi.repository import Gio, GObject
 
-from sbaid.model.results.cross_section_snapshot import CrossSectionSnapshot
-from sbaid.model.results.lane_snapshot import LaneSnapshot
-from sbaid.model.results.snapshot import Snapshot
-from sbaid.model.results.vehicle_snapshot import VehicleSnapshot
+from sbaid.model.results.snapshot import Snapshot, snapshot_to_data
 from sbaid.model.database.global_database import GlobalDatabase
 from sbaid.model.results.result import Result
+from sbaid.model.results.result_deleter import ResultDeleter
 from sbaid.common.tag import Tag
 from sbaid.common import list_model_iterator
 
@@ -32,9 +30,19 @@ class ResultManager(GObject.GObject):
         """Getter for the available tags."""
         return self.__available_tags
 
+    deletion_progress: float = GObject.Property(type=float)  # type: ignore[assignment]
+
+    @deletion_progress.getter  # type: ignore
+    def deletion_progress(self) -> float:
+        """Getter for the fraction of the deleted results that is already removed from
+        the database. It is 1.0 while no results are being deleted."""
+        return self.__deletion_progress
+
     __available_tags: Gio.ListStore
     __results: Gio.ListStore
     __global_db: GlobalDatabase
+    __deleter: ResultDeleter
+    __deletion_progress: float
 
     def global_db(self) -> GlobalDatabase:
         """Getter for the global database."""
@@ -46,21 +54,33 @@ class ResultManager(GObject.GObject):
         self.__available_tags = Gio.ListStore.new(Tag)
         self.__results = Gio.ListStore.new(Result)
         self.__global_db = global_db
+        self.__deleter = ResultDeleter(global_db, self.__set_deletion_progress)
+        self.__deletion_progress = 1.0
 
     async def load_from_db(self) -> None:
-        """Loads metainformation about the results and tags from the global database"""
-        result_information = await self.__global_db.get_all_results()
-        for results in result_information:
-            result = Result(results[0], results[2], results[3], self.__global_db)
-            await result.load_from_db()
-
-            self.__results.append(result)
-
-        tag_information = await self.__global_db.get_all_tags()
-
-        for tag in tag_information:
-            new_tag = Tag(tag[0], tag[1])
-            self.__available_tags.append(new_tag)
+        """Loads metainformation about the results and tags from the global database.
+        The results and the ids of their tags are read with a single query, the tags
+        are resolved from the available tags."""
+        tags: dict[str, Tag] = {}
+        for tag_id, tag_name in await self.__global_db.get_all_tags():
+            tags[tag_id] = Tag(tag_id, tag_name)
+        self.__available_tags.splice(self.__available_tags.get_n_items(), 0,
+                                     list(tags.values()))
+
+        results = []
+        for (result_id, name, project_name, creation_date_time, complete,
+             tag_ids) in await self.__global_db.get_all_results_with_tag_ids():
+            result = Result(result_id, project_name, creation_date_time, self.__global_db,
+                            complete=complete, name=name)
+            for tag_id in tag_ids:
+                if tag_id in tags:
+                    result.add_tag(tags[tag_id])
+            results.append(result)
+        self.__results.splice(self.__results.get_n_items(), 0, results)
+
+        # continue deletions that were interrupted when the application was closed
+        for result_id in await self.__global_db.get_deleted_result_ids():
+            self.__deleter.delete(result_id, await self.__global_db.mark_result_deleted(result_id))
 
     async def create_tag(self, name: str) -> int:
         """Creates a new tag with the given name and adds it to the list of available tags."""
@@ -70,6 +90,40 @@ class ResultManager(GObject.GObject):
         self.__available_tags.append(new_tag)
         return len(self.__available_tags) - 1
 
+    async def add_tag_to_result(self, result_id: str, tag_name: str) -> None:
+        """Adds the tag with the given name to the result with the given id and stores
+        that in the global database, unless the result already has the tag.
+        The tag is created if no available tag has the name."""
+        for tag in list_model_iterator(self.__available_tags):
+            if tag.name == tag_name:
+                break
+        else:
+            tag = self.__available_tags.get_item(await self.create_tag(tag_name))
+        assert isinstance(tag, Tag)
+
+        for result in list_model_iterator(self.__results):
+            if result.id == result_id:
+                if result.selected_tags.find(tag)[0]:
+                    return
+                result.add_tag(tag)
+                break
+        await self.__global_db.add_result_tag(str(uuid.uuid4()), result_id, tag.tag_id)
+
+    async def set_result_cache_key(self, result_id: str, cache_key: str) -> None:
+        """Stores the key of the inputs the result with the given id was simulated with,
+        see find_cached_result."""
+        await self.__global_db.set_result_cache_key(result_id, cache_key)
+
+    async def find_cached_result(self, cache_key: str) -> Result | None:
+        """Returns a complete result that was simulated with the inputs of the given key,
+        or None if there is none."""
+        result_ids = await self.__global_db.get_result_ids_with_cache_key(cache_key)
+        for result in list_model_iterator(self.__results):
+            assert isinstance(result, Result)
+            if result.complete and result.id in result_ids:
+                return result
+        return None
+
     async def delete_tag(self, tags_id: str) -> None:
         """Removes a tag with the given id from the list of available tags,
          and removes all its uses in results"""
@@ -86,47 +140,39 @@ class ResultManager(GObject.GObject):
             await self.__global_db.remove_tag(tags_id)
 
     async def delete_result(self, result_id: str) -> None:
-        """Removes a result with the given id from the list of available tags."""
+        """Removes a result with the given id from the list of results. Its snapshots
+        are deleted from the database in the background, see deletion_progress."""
         for i, result in enumerate(list_model_iterator(self.__results)):
             assert isinstance(result, Result)
             if result.id == result_id:
                 self.__results.remove(i)
-                await self.__global_db.delete_result(result_id)
+                snapshot_count = await self.__global_db.mark_result_deleted(result_id)
+                self.__deleter.delete(result_id, snapshot_count)
                 break
 
+    async def wait_for_deletions(self) -> None:
+        """Waits until all deleted results are removed from the database."""
+        await self.__deleter.wait()
+
+    async def close(self) -> None:
+        """Stops deleting results after the current chunk. The deletion continues the
+        next time the results are loaded."""
+        await self.__deleter.close()
+
+    def __set_deletion_progress(self, progress: float) -> None:
+        self.__deletion_progress = progress
+        self.notify("deletion-progress")
+
+    def add_stored_result(self, result: Result) -> None:
+        """Appends a result whose snapshots are already stored in the database,
+        e.g. by a ResultWriter, to the list of results."""
+        self.__results.append(result)
+
     async def register_result(self, result: Result) -> None:
         """Appends a result to the existing list of results in the result manager.
         Also registers result and all snapshots to the database"""
         self.__results.append(result)
-        snapshot_data: list[tuple[str, str, str,
-                                  list[tuple[str, str, str, str, int,
-                                             list[tuple[str, str, int, float, int, int,
-                                                        list[tuple[str, int, float]]]]]]]] = []
-        for snapshot in result.snapshots:
-            snapshot = cast(Snapshot, snapshot)
-            cs_sn_data: list[tuple[str, str, str, str, int,
-                                   list[tuple[str, str, int, float, int, int,
-                                              list[tuple[str, int, float]]]]]] = []
-            for cs_sn in snapshot.cross_section_snapshots:
-                cs_sn = cast(CrossSectionSnapshot, cs_sn)
-                lane_sn_data: list[tuple[str, str, int, float, int, int,
-                                         list[tuple[str, int, float]]]] = []
-                for lane_sn in cs_sn.lane_snapshots:
-                    lane_sn = cast(LaneSnapshot, lane_sn)
-                    veh_sn_data: list[tuple[str, int, float]] = []
-                    for veh_sn in lane_sn.vehicle_snapshots:
-                        veh_sn = cast(VehicleSnapshot, veh_sn)
-                        veh_sn_data.append((veh_sn.lane_snapshot_id,
-                                            veh_sn.vehicle_type.value, veh_sn.speed))
-                    lane_sn_data.append((lane_sn.id, lane_sn.cross_section_snapshot_id,
-                                         lane_sn.lane, lane_sn.average_speed,
-                                         lane_sn.traffic_volume, lane_sn.a_display.value,
-                                         veh_sn_data))
-                cs_sn_data.append((cs_sn.cs_snapshot_id, cs_sn.snapshot_id, cs_sn.cross_section_id,
-                                   cs_sn.cross_section_name,
-                                   cs_sn.b_display.value, lane_sn_data))
-            snapshot_data.append((str(snapshot.id), result.id,
-                                  str(snapshot.capture_timestamp.format_iso8601()),
-                                  cs_sn_data))
+        snapshot_data = [snapshot_to_data(cast(Snapshot, snapshot), result.id)
+                         for snapshot in result.snapshots]
         await self.__global_db.add_entire_result(result.id, result.result_name, result.project_name,
                                                  result.creation_date_time, snapshot_data)
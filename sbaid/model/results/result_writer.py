@@ -0,0 +1,102 @@
+"""This module defines the ResultWriter class."""
+import asyncio
+from collections import deque
+
+from sbaid.model.database.global_database import GlobalDatabase, SnapshotData
+from sbaid.model.results.result import Result
+
+
+class ResultWriter:  # pylint: disable=too-many-instance-attributes
+    """This class appends the snapshots of a result to the global database while the result
+    is still being built. Snapshots are handed over with submit and written by a background
+    task, which stores everything submitted since its last write in one transaction.
+    The result is added as incomplete right away and only marked complete by finish, so the
+    snapshots written so far are kept if the simulation ends early.
+
+    At most max_in_flight snapshots are held in memory as long as the single producer
+    awaits wait_for_capacity before building the next snapshot."""
+
+    __global_db: GlobalDatabase
+    __result: Result
+    __max_in_flight: int
+    __pending: deque[SnapshotData]
+    __writing: int
+    __closed: bool
+    __error: Exception | None
+    __has_work: asyncio.Event
+    __progress: asyncio.Event
+    __task: asyncio.Task[None]
+
+    def __init__(self, global_db: GlobalDatabase, result: Result,
+                 max_in_flight: int = 16) -> None:
+        """Initialize the writer and start writing the result in the background.
+        Must be called from within a running event loop."""
+        if max_in_flight < 1:
+            raise ValueError("At least one snapshot must be allowed in flight.")
+        self.__global_db = global_db
+        self.__result = result
+        self.__max_in_flight = max_in_flight
+        self.__pending = deque()
+        self.__writing = 0
+        self.__closed = False
+        self.__error = None
+        self.__has_work = asyncio.Event()
+        self.__progress = asyncio.Event()
+        self.__task = asyncio.create_task(self.__run())
+
+    @property
+    def in_flight(self) -> int:
+        """The number of submitted snapshots that have not been written yet."""
+        return len(self.__pending) + self.__writing
+
+    def submit(self, snapshot_data: SnapshotData) -> None:
+        """Queue a snapshot for writing. Raise the error of a failed earlier write."""
+        if self.__error is not None:
+            raise self.__error
+        if self.__closed:
+            raise RuntimeError("Snapshots cannot be submitted after finish.")
+        self.__pending.append(snapshot_data)
+        self.__has_work.set()
+
+    async def wait_for_capacity(self) -> None:
+        """Wait until fewer than max_in_flight snapshots are waiting to be written.
+        Raise the error of a failed earlier write."""
+        while self.__error is None and self.in_flight >= self.__max_in_flight:
+            self.__progress.clear()
+            await self.__progress.wait()
+        if self.__error is not None:
+            raise self.__error
+
+    async def finish(self, complete: bool = True) -> None:
+        """Write all submitted snapshots and stop the background task. The result is
+        marked complete if complete is True, otherwise it stays incomplete."""
+        self.__closed = True
+        self.__has_work.set()
+        await asyncio.shield(self.__task)
+        if self.__error is not None:
+            raise self.__error
+        if complete:
+            await self.__global_db.complete_result(self.__result.id)
+
+    async def __run(self) -> None:
+        try:
+            await self.__global_db.begin_result(self.__result.id, self.__result.result_name,
+                                                self.__result.project_name,
+                                                self.__result.creation_date_time)
+            while True:
+                if not self.__pending:
+                    if self.__closed:
+                        return
+                    self.__has_work.clear()
+                    await self.__has_work.wait()
+                    continue
+                batch = list(self.__pending)
+                self.__pending.clear()
+                self.__writing = len(batch)
+                await self.__global_db.add_snapshots(batch)
+                self.__writing = 0
+                self.__progress.set()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.__error = e
+        finally:
+            self.__progress.set()
@@ -0,0 +1,224 @@
+"""This module defines the RetentionPolicy and the RetentionScheduler that applies it."""
+import asyncio
+from typing import NamedTuple
+
+from gi.repository import GLib
+
+from sbaid.common import list_model_iterator
+from sbaid.common.i18n import i18n
+from sbaid.model.results.result import Result
+from sbaid.model.results.result_manager import ResultManager
+
+
+class RetentionPolicy(NamedTuple):
+    """The rules for which results are kept and how older results are down-sampled.
+    A rule that is None is not applied. Results with one of the keep_tag_ids are neither
+    deleted nor down-sampled, and do not count towards max_results."""
+
+    keep_tag_ids: frozenset[str] = frozenset()
+    max_age_days: float | None = None
+    """Results older than this are deleted."""
+    max_results: int | None = None
+    """Only this many of the newest results are kept."""
+    drop_vehicles_after_days: float | None = None
+    """Results older than this lose their vehicle data, the lane values are kept."""
+    thin_after_days: float | None = None
+    """Results older than this keep one snapshot per snapshot_interval_seconds."""
+    snapshot_interval_seconds: float = 300.0
+
+
+class RetentionReport(NamedTuple):
+    """What a run of the RetentionScheduler did."""
+
+    deleted_results: int
+    downsampled_results: int
+    bytes_reclaimed: int
+
+
+def _date_key(date: GLib.DateTime) -> tuple[int, int]:
+    return date.to_unix(), date.get_microsecond()
+
+
+def get_thinned_out_snapshot_ids(snapshots: list[tuple[int, GLib.DateTime]],
+                                 interval_seconds: float) -> list[int]:
+    """Return the ids of the snapshots to delete so that, starting with the first one,
+    only snapshots at least interval_seconds after the previously kept one are left."""
+    interval = interval_seconds * GLib.TIME_SPAN_SECOND
+    thinned_out = []
+    last_kept: GLib.DateTime | None = None
+    for snapshot_id, date in sorted(snapshots, key=lambda snapshot: _date_key(snapshot[1])):
+        if last_kept is None or date.difference(last_kept) >= interval:
+            last_kept = date
+        else:
+            thinned_out.append(snapshot_id)
+    return thinned_out
+
+
+async def _wait_for_idle() -> None:
+    """Wait until the main loop has nothing more important to do."""
+    idle = asyncio.get_running_loop().create_future()
+
+    def on_idle() -> bool:
+        if not idle.done():
+            idle.set_result(None)
+        return GLib.SOURCE_REMOVE
+
+    GLib.idle_add(on_idle)
+    await idle
+
+
+class RetentionScheduler:  # pylint: disable=too-many-instance-attributes
+    """This class applies a RetentionPolicy to the results of a ResultManager in the
+    background. Once started, it runs every interval_seconds. Every step of a run waits
+    for the main loop to become idle first, so it only runs while the application is idle.
+
+    Results that are not complete are left alone. Results are deleted through the
+    ResultManager, the data of older results is down-sampled in short transactions of
+    chunk_size rows and their snapshots are reloaded. Afterward the freed space is returned to the
+    file system and the reclaimed bytes are recorded.
+
+    Nothing starts a scheduler yet, since the policy cannot be configured anywhere."""
+
+    __result_manager: ResultManager
+    __policy: RetentionPolicy
+    __interval_seconds: int
+    __chunk_size: int
+    __vacuum_pages: int
+    __bytes_reclaimed: int
+    __last_report: RetentionReport | None
+    __source_id: int | None
+    __task: asyncio.Task[None] | None
+    __closed: bool
+
+    def __init__(self, result_manager: ResultManager,
+                 policy: RetentionPolicy = RetentionPolicy(), interval_seconds: int = 3600,
+                 chunk_size: int = 100, vacuum_pages: int = 1000) -> None:
+        """Initialize the scheduler. The default policy keeps everything."""
+        self.__result_manager = result_manager
+        self.__policy = policy
+        self.__interval_seconds = interval_seconds
+        self.__chunk_size = chunk_size
+        self.__vacuum_pages = vacuum_pages
+        self.__bytes_reclaimed = 0
+        self.__last_report = None
+        self.__source_id = None
+        self.__task = None
+        self.__closed = False
+
+    @property
+    def policy(self) -> RetentionPolicy:
+        """The policy applied by the next run."""
+        return self.__policy
+
+    @policy.setter
+    def policy(self, policy: RetentionPolicy) -> None:
+        self.__policy = policy
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        """The number of bytes the database shrank by in all runs so far."""
+        return self.__bytes_reclaimed
+
+    @property
+    def last_report(self) -> RetentionReport | None:
+        """The report of the last run, or None if there was none yet."""
+        return self.__last_report
+
+    def start(self) -> None:
+        """Start running the policy periodically. Must be called from within a running
+        event loop."""
+        if self.__source_id is None and not self.__closed:
+            self.__source_id = GLib.timeout_add_seconds(self.__interval_seconds,
+                                                        self.__on_timeout)
+
+    async def close(self) -> None:
+        """Stop running the policy. A running run stops after the current chunk."""
+        self.__closed = True
+        if self.__source_id is not None:
+            GLib.source_remove(self.__source_id)
+            self.__source_id = None
+        if self.__task is not None:
+            await asyncio.shield(self.__task)
+
+    def __on_timeout(self) -> bool:
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.create_task(self.__run_in_background())
+        return GLib.SOURCE_CONTINUE
+
+    async def __run_in_background(self) -> None:
+        try:
+            await self.run()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            print(i18n._("Failed to apply the result retention policy: "), e)
+
+    async def run(self) -> RetentionReport:
+        """Apply the policy once and return what was done. Must be called from within a
+        running GLib event loop."""
+        global_db = self.__result_manager.global_db()
+        policy = self.__policy
+        size_before = await global_db.get_database_size()
+        now = GLib.DateTime.new_now_utc()
+
+        results: list[Result] = [
+            result for result in list_model_iterator(self.__result_manager.results)
+            if result.complete and not self.__is_kept(result, policy)]
+        results.sort(key=lambda result: _date_key(result.creation_date_time), reverse=True)
+
+        deleted = []
+        remaining = []
+        for index, result in enumerate(results):
+            age = now.difference(result.creation_date_time) / GLib.TIME_SPAN_DAY
+            if ((policy.max_results is not None and index >= policy.max_results)
+                    or (policy.max_age_days is not None and age > policy.max_age_days)):
+                deleted.append(result)
+            else:
+                remaining.append((result, age))
+
+        for result in deleted:
+            await _wait_for_idle()
+            await self.__result_manager.delete_result(result.id)
+
+        downsampled = 0
+        for result, age in remaining:
+            if self.__closed:
+                break
+            if await self.__downsample(result.id, age, policy):
+                result.reload_snapshots()
+                downsampled += 1
+
+        if deleted:
+            await self.__result_manager.wait_for_deletions()
+        while not self.__closed:
+            await _wait_for_idle()
+            if not await global_db.reclaim_space(self.__vacuum_pages):
+                break
+
+        bytes_reclaimed = max(size_before - await global_db.get_database_size(), 0)
+        self.__bytes_reclaimed += bytes_reclaimed
+        self.__last_report = RetentionReport(len(deleted), downsampled, bytes_reclaimed)
+        return self.__last_report
+
+    @staticmethod
+    def __is_kept(result: Result, policy: RetentionPolicy) -> bool:
+        return any(tag.tag_id in policy.keep_tag_ids
+                   for tag in list_model_iterator(result.selected_tags))
+
+    async def __downsample(self, result_id: str, age: float, policy: RetentionPolicy) -> bool:
+        global_db = self.__result_manager.global_db()
+        changed = False
+        if policy.drop_vehicles_after_days is not None and age > policy.drop_vehicles_after_days:
+            while not self.__closed:
+                await _wait_for_idle()
+                if not await global_db.drop_vehicle_data(result_id, self.__chunk_size):
+                    break
+                changed = True
+        if policy.thin_after_days is not None and age > policy.thin_after_days:
+            snapshot_ids = get_thinned_out_snapshot_ids(
+                await global_db.get_all_snapshots(result_id), policy.snapshot_interval_seconds)
+            for i in range(0, len(snapshot_ids), self.__chunk_size):
+                if self.__closed:
+                    break
+                await _wait_for_idle()
+                await global_db.delete_snapshots(result_id, snapshot_ids[i:i + self.__chunk_size])
+                changed = True
+        return changed
@@ -1,15 +1,20 @@
 """ This module represents the Snapshot class."""
+from typing import cast
 
 from gi.repository import Gio, GLib, GObject
-from sbaid.model.database.global_database import GlobalDatabase
+from sbaid.common.a_display import ADisplay
+from sbaid.common.b_display import BDisplay
+from sbaid.model.database.global_database import (SnapshotData, CrossSectionSnapshotData,
+                                                  LaneSnapshotData)
 from sbaid.model.results.cross_section_snapshot import CrossSectionSnapshot
+from sbaid.model.results.lane_snapshot import LaneSnapshot
 
 
 class Snapshot(GObject.GObject):
     """ This class represents a snapshot, containing cross section snapshots
             with the same timestamp.
     Attributes:
-        id (str): The unique identifier of the snapshot.
+        id (int): The unique identifier of the snapshot.
         capture_timestamp (DateTime): The timestamp of the snapshot capture.
         cross_section_snapshots (ListModel<CrossSectionSnapshot>): The list of cross section
          snapshots the snapshot consists of.
@@ -17,7 +22,7 @@ class Snapshot(GObject.GObject):
 
     # GObject.Property definitions
     id = GObject.Property(
-        type=str,
+        type=GObject.TYPE_INT64,
         flags=GObject.ParamFlags.READABLE |
         GObject.ParamFlags.WRITABLE |
         GObject.ParamFlags.CONSTRUCT_ONLY)
@@ -36,28 +41,51 @@ class Snapshot(GObject.GObject):
         """Getter for the cross section snapshots."""
         return self.__cross_section_snapshots
 
-    __global_database: GlobalDatabase
     __cross_section_snapshots: Gio.ListStore
 
-    def __init__(self, snapshot_id: str, capture_timestamp: GLib.DateTime,
-                 global_db: GlobalDatabase) -> None:
+    def __init__(self, snapshot_id: int, capture_timestamp: GLib.DateTime) -> None:
         """Initialize the Snapshot class."""
         super().__init__(id=snapshot_id,
                          capture_timestamp=capture_timestamp)
 
         self.__cross_section_snapshots = Gio.ListStore.new(CrossSectionSnapshot)
-        self.__global_database = global_db
-
-    async def load_from_db(self) -> None:
-        """Loads the snapshot with the cross-section snapshots."""
-        cross_section_ids = await self.__global_database.get_all_cross_section_snapshots(self.id)
-        for cross_section in cross_section_ids:
-            cross_section_snapshot = (CrossSectionSnapshot
-                                      (cross_section[1], cross_section[0], cross_section[2],
-                                       cross_section[3], cross_section[4], self.__global_database))
-            await cross_section_snapshot.load_from_db()
-            self.add_cross_section_snapshot(cross_section_snapshot)
 
     def add_cross_section_snapshot(self, snapshot: CrossSectionSnapshot) -> None:
         """This method adds a cross-section snapshot to the existing list."""
         self.__cross_section_snapshots.append(snapshot)
+
+
+def build_snapshot(data: SnapshotData) -> Snapshot:
+    """Create a snapshot with all its cross section, lane and vehicle snapshots from
+    the data returned by GlobalDatabase.get_snapshot_range, without any further queries."""
+    timestamp = GLib.DateTime.new_from_iso8601(data[2])  # pylint: disable=no-member
+    snapshot = Snapshot(data[0], timestamp)
+    for cs_data in data[3]:
+        cs_snapshot = CrossSectionSnapshot(data[0], cs_data[0], cs_data[3], cs_data[2],
+                                           BDisplay(cs_data[4]))
+        for lane_data in cs_data[5]:
+            lane_snapshot = LaneSnapshot(cs_data[0], lane_data[0], lane_data[2], lane_data[3],
+                                         lane_data[4], ADisplay(lane_data[5]))
+            lane_snapshot.set_vehicle_columns(lane_data[6], lane_data[7])
+            cs_snapshot.add_lane_snapshot(lane_snapshot)
+        snapshot.add_cross_section_snapshot(cs_snapshot)
+    return snapshot
+
+
+def snapshot_to_data(snapshot: Snapshot, result_id: str) -> SnapshotData:
+    """Flatten a snapshot of the given result with all its sub-snapshots into the format
+    GlobalDatabase.add_entire_result takes. This is the inverse of build_snapshot."""
+    cs_sn_data: list[CrossSectionSnapshotData] = []
+    for cs_sn in snapshot.cross_section_snapshots:
+        cs_sn = cast(CrossSectionSnapshot, cs_sn)
+        lane_sn_data: list[LaneSnapshotData] = []
+        for lane_sn in cs_sn.lane_snapshots:
+            lane_sn = cast(LaneSnapshot, lane_sn)
+            lane_sn_data.append((lane_sn.id, lane_sn.cross_section_snapshot_id,
+                                 lane_sn.lane, lane_sn.average_speed,
+                                 lane_sn.traffic_volume, lane_sn.a_display.value,
+                                 *lane_sn.get_vehicle_columns()))
+        cs_sn_data.append((cs_sn.cs_snapshot_id, cs_sn.snapshot_id, cs_sn.cross_section_id,
+                           cs_sn.cross_section_name, cs_sn.b_display.value, lane_sn_data))
+    return (snapshot.id, result_id, str(snapshot.capture_timestamp.format_iso8601()),
+            cs_sn_data)
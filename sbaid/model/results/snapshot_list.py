@@ -0,0 +1,75 @@
+"""This module defines the SnapshotList class."""
+from collections import OrderedDict
+
+from gi.repository import Gio, GObject
+
+from sbaid.model.database.global_database import GlobalDatabase
+from sbaid.model.results.snapshot import Snapshot, build_snapshot
+
+
+class SnapshotList(GObject.GObject, Gio.ListModel):  # type: ignore[misc]
+    """This class is a list model of the snapshots of a stored result that only keeps
+    some of them in memory. Snapshots are read from the database in pages of page_size
+    when they are accessed, and at most max_pages pages are kept, dropping the least
+    recently used one first. Call reload when the snapshots of the result change in the
+    database."""
+
+    __result_id: str
+    __global_db: GlobalDatabase
+    __page_size: int
+    __max_pages: int
+    __n_items: int | None
+    __pages: OrderedDict[int, list[Snapshot]]
+
+    def __init__(self, result_id: str, global_db: GlobalDatabase,
+                 page_size: int = 64, max_pages: int = 8) -> None:
+        """Initialize the snapshot list."""
+        super().__init__()
+        self.__result_id = result_id
+        self.__global_db = global_db
+        self.__page_size = page_size
+        self.__max_pages = max_pages
+        self.__n_items = None
+        self.__pages = OrderedDict()
+
+    def do_get_item_type(self) -> GObject.GType:
+        """Return the type of the items in this list."""
+        return Snapshot.__gtype__  # type: ignore[no-any-return]
+
+    def do_get_n_items(self) -> int:
+        """Return the number of snapshots of the result. The count is queried once
+        until the list is reloaded."""
+        if self.__n_items is None:
+            self.__n_items = self.__global_db.get_snapshot_count(self.__result_id)
+        return self.__n_items
+
+    def do_get_item(self, position: int) -> Snapshot | None:
+        """Return the snapshot at the given position, reading its page if necessary."""
+        if position >= self.do_get_n_items():
+            return None
+        page_number, index = divmod(position, self.__page_size)
+        page = self.__pages.get(page_number)
+        if page is None:
+            page = self.__load_page(page_number)
+        else:
+            self.__pages.move_to_end(page_number)
+        return page[index] if index < len(page) else None
+
+    def reload(self) -> None:
+        """Drop the cached count and pages, so that the snapshots are read from the
+        database again, and notify that all items changed."""
+        old_n_items = self.__n_items
+        self.__n_items = None
+        self.__pages.clear()
+        if old_n_items is not None:
+            self.items_changed(0, old_n_items, self.do_get_n_items())
+
+    def __load_page(self, page_number: int) -> list[Snapshot]:
+        data = self.__global_db.get_snapshot_range(self.__result_id,
+                                                   page_number * self.__page_size,
+                                                   self.__page_size)
+        page = [build_snapshot(snapshot_data) for snapshot_data in data]
+        self.__pages[page_number] = page
+        while len(self.__pages) > self.__max_pages:
+            self.__pages.popitem(last=False)
+        return page
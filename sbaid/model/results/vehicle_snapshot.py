@@ -9,7 +9,7 @@ class VehicleSnapshot(GObject.GObject):
     Attributes:
         vehicle_type (VehicleType): The type of the vehicle the snapshot represents.
         speed (float): Speed of the vehicle.
-        lane_snapshot_id (str): The unique identifier of the lane the vehicle snapshot belongs to.
+        lane_snapshot_id (int): The unique identifier of the lane the vehicle snapshot belongs to.
     """
 
     # GObject.Property definitions
@@ -25,12 +25,12 @@ class VehicleSnapshot(GObject.GObject):
         GObject.ParamFlags.WRITABLE |
         GObject.ParamFlags.CONSTRUCT_ONLY)
     lane_snapshot_id = GObject.Property(
-        type=str,
+        type=GObject.TYPE_INT64,
         flags=GObject.ParamFlags.READABLE |
         GObject.ParamFlags.WRITABLE |
         GObject.ParamFlags.CONSTRUCT_ONLY)
 
-    def __init__(self, lane_snapshot_id: str, vehicle_type: VehicleType, speed: float) -> None:
+    def __init__(self, lane_snapshot_id: int, vehicle_type: VehicleType, speed: float) -> None:
         """Initialize the vehicle snapshot class."""
         super().__init__(vehicle_type=vehicle_type,
                          speed=speed,
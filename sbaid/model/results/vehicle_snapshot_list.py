@@ -0,0 +1,80 @@
+"""This module defines the VehicleSnapshotList class."""
+import numpy as np
+import numpy.typing as npt
+from gi.repository import Gio, GObject
+
+from sbaid.common.vehicle_type import VehicleType
+from sbaid.model.database.global_database import VEHICLE_TYPE_DTYPE, VEHICLE_SPEED_DTYPE
+from sbaid.model.results.vehicle_snapshot import VehicleSnapshot
+
+
+class VehicleSnapshotList(GObject.GObject, Gio.ListModel):  # type: ignore[misc]
+    """This class is a list model of the vehicle snapshots of a lane snapshot. The vehicles
+    are stored column by column in a vehicle type and a speed array, VehicleSnapshot objects
+    are only created when an item is requested."""
+
+    __lane_snapshot_id: int
+    __types: npt.NDArray[np.uint8]
+    __speeds: npt.NDArray[np.float32]
+    __n_items: int
+
+    def __init__(self, lane_snapshot_id: int) -> None:
+        """Initialize an empty vehicle snapshot list."""
+        super().__init__()
+        self.__lane_snapshot_id = lane_snapshot_id
+        self.__types = np.empty(0, dtype=VEHICLE_TYPE_DTYPE)
+        self.__speeds = np.empty(0, dtype=VEHICLE_SPEED_DTYPE)
+        self.__n_items = 0
+
+    @property
+    def types(self) -> npt.NDArray[np.uint8]:
+        """The VehicleType values of all vehicles, in order."""
+        return self.__types[:self.__n_items]
+
+    @property
+    def speeds(self) -> npt.NDArray[np.float32]:
+        """The speeds of all vehicles, in order."""
+        return self.__speeds[:self.__n_items]
+
+    def do_get_item_type(self) -> GObject.GType:
+        """Return the type of the items in this list."""
+        return VehicleSnapshot.__gtype__  # type: ignore[no-any-return]
+
+    def do_get_n_items(self) -> int:
+        """Return the number of vehicles."""
+        return self.__n_items
+
+    def do_get_item(self, position: int) -> VehicleSnapshot | None:
+        """Return a new vehicle snapshot for the vehicle at the given position."""
+        if position >= self.__n_items:
+            return None
+        return VehicleSnapshot(self.__lane_snapshot_id, VehicleType(int(self.__types[position])),
+                               float(self.__speeds[position]))
+
+    def append(self, vehicle_type: VehicleType, speed: float) -> None:
+        """Append a vehicle. The arrays grow geometrically, so appending is amortized O(1)."""
+        if self.__n_items == len(self.__types):
+            capacity = max(8, 2 * self.__n_items)
+            self.__types = np.resize(self.__types, capacity)
+            self.__speeds = np.resize(self.__speeds, capacity)
+        self.__types[self.__n_items] = int(vehicle_type)
+        self.__speeds[self.__n_items] = speed
+        self.__n_items += 1
+        self.items_changed(self.__n_items - 1, 0, 1)
+
+    def set_columns(self, types: bytes, speeds: bytes) -> None:
+        """Replace all vehicles with the ones in the given columns, as stored by the
+        global database. The arrays share the memory of the given bytes."""
+        type_array = np.frombuffer(types, dtype=VEHICLE_TYPE_DTYPE)
+        speed_array = np.frombuffer(speeds, dtype=VEHICLE_SPEED_DTYPE)
+        if len(type_array) != len(speed_array):
+            raise ValueError("The vehicle type and speed columns differ in length.")
+        removed = self.__n_items
+        self.__types = type_array
+        self.__speeds = speed_array
+        self.__n_items = len(type_array)
+        self.items_changed(0, removed, self.__n_items)
+
+    def get_columns(self) -> tuple[bytes, bytes]:
+        """Return the vehicle type and speed columns in the format of the global database."""
+        return self.types.tobytes(), self.speeds.tobytes()
@@ -5,17 +5,14 @@ import matplotlib.pyplot as plt
 import pandas as pd
 from pandas import DataFrame
 from matplotlib.figure import Figure
+from gi.repository import GLib
 from sbaid.common.diagram_type import DiagramType
 from sbaid.common.i18n import i18n
 from sbaid.common.image import Image
 from sbaid.common.image_format import ImageFormat
 from sbaid.model.results.cross_section_diagram_generator import CrossSectionDiagramGenerator
-from sbaid.model.results.cross_section_snapshot import CrossSectionSnapshot
-from sbaid.model.results.lane_snapshot import LaneSnapshot
 from sbaid.model.results.result import Result
 from sbaid.model.results.seaborn_image import SeabornImage
-from sbaid.model.results.snapshot import Snapshot
-from sbaid.model.results.vehicle_snapshot import VehicleSnapshot
 
 
 class VelocityGenerator(CrossSectionDiagramGenerator):
@@ -44,37 +41,19 @@ class VelocityGenerator(CrossSectionDiagramGenerator):
 
     @staticmethod
     def __extract_data(result: Result, cross_section_id: str) -> DataFrame:
-        """Extracts the needed information from the Result class and puts
+        """Queries the vehicles of the cross section from the result and puts
         together a DataFrame with appropriate headers. """
 
-        vehicle_speeds = []
-        capture_timestamps = []
-        vehicle_type = []
-        cross_section_name: str | None = None
-
-        for snapshot in result.snapshots:
-            assert isinstance(snapshot, Snapshot)
-            for cs_snapshot in snapshot.cross_section_snapshots:
-                assert isinstance(cs_snapshot, CrossSectionSnapshot)
-                if cs_snapshot.cross_section_id == cross_section_id:
-                    if cross_section_name is None:
-                        cross_section_name = cs_snapshot.cross_section_name
-                    for lane_snapshot in cs_snapshot.lane_snapshots:
-                        assert isinstance(lane_snapshot, LaneSnapshot)
-                        for vehicle_snapshot in lane_snapshot.vehicle_snapshots:
-                            assert isinstance(vehicle_snapshot, VehicleSnapshot)
-                            vehicle_speeds.append(vehicle_snapshot.speed)
-                            vehicle_type.append(vehicle_snapshot.vehicle_type)
-                            formatted_time = snapshot.capture_timestamp.format("%y:%m:%d:%H:%M:%S")
-                            capture_timestamps.append(formatted_time)
-
-        data = {
-            "vehicle speeds": vehicle_speeds,
-            "types": vehicle_type,
-            "timestamps": capture_timestamps,
-        }
-
-        return pd.DataFrame(data)
+        data = result.query([cross_section_id], ["vehicle_speed", "vehicle_type", "date"])
+        # the dates are formatted once per snapshot instead of once per vehicle
+        formatted_times = {date: GLib.DateTime.new_from_iso8601(  # pylint: disable=no-member
+            date).format("%y:%m:%d:%H:%M:%S") for date in data["date"].unique()}
+
+        return pd.DataFrame({
+            "vehicle speeds": data["vehicle_speed"],
+            "types": data["vehicle_type"],
+            "timestamps": data["date"].map(formatted_times),
+        })
 
     @staticmethod
     def __generate_diagram(data: DataFrame) -> Figure:
@@ -4,6 +4,10 @@ from gi.repository import GObject
 from sbaid.common.a_display import ADisplay
 from sbaid.common.b_display import BDisplay
 
+DisplayData = tuple[dict[str, dict[int, int]], dict[str, int]]
+"""The values of the a displays per cross section id and lane number, followed by the
+values of the b displays per cross section id."""
+
 
 class Display(GObject.GObject):
     """This class provides record-like funcionality of a display that contains a displays
@@ -44,3 +48,24 @@ class Display(GObject.GObject):
         if cross_section_id not in self._a_display:
             self._b_display[cross_section_id] = display
         self._b_display[cross_section_id] = display
+
+    def to_data(self) -> DisplayData:
+        """Return the content of this display as plain data, e.g. to send it to another
+        process. This is the inverse of from_data."""
+        return ({cross_section_id: {lane_number: int(a_display)
+                                    for lane_number, a_display in lanes.items()}
+                 for cross_section_id, lanes in self._a_display.items()},
+                {cross_section_id: int(b_display)
+                 for cross_section_id, b_display in self._b_display.items()})
+
+    @classmethod
+    def from_data(cls, data: DisplayData) -> 'Display':
+        """Construct a new Display with the content returned by to_data."""
+        display = cls()
+        a_displays, b_displays = data
+        for cross_section_id, lanes in a_displays.items():
+            for lane_number, a_display in lanes.items():
+                display.set_a_display(cross_section_id, lane_number, ADisplay(a_display))
+        for cross_section_id, b_display in b_displays.items():
+            display.set_b_display(cross_section_id, BDisplay(b_display))
+        return display
@@ -1,8 +1,15 @@
 """This module contains the Input class."""
+import numpy as np
 from gi.repository import GObject
 from sbaid.model.simulation.vehicle_info import VehicleInfo
 from sbaid.common.vehicle_type import VehicleType
 
+InputData = tuple[dict[str, dict[int, tuple[bytes, bytes]]],
+                  dict[str, dict[int, float]], dict[str, dict[int, int]]]
+"""The vehicles of an Input as vehicle type and speed columns of uint8 and float64 values
+per cross section id and lane number, followed by the average speeds and traffic volumes
+per cross section id and lane number."""
+
 
 class Input(GObject.GObject):
     """This class stores information about the state of the traffic within the simulation.
@@ -71,3 +78,35 @@ class Input(GObject.GObject):
 
         self._average_speeds[cross_section_id][lane_number] = avg_speed
         self._traffic_volumes[cross_section_id][lane_number] = volume
+
+    def to_data(self) -> InputData:
+        """Return the content of this input as plain data, e.g. to send it to another
+        process. This is the inverse of from_data, the speeds are kept exactly."""
+        vehicles: dict[str, dict[int, tuple[bytes, bytes]]] = {}
+        for cross_section_id, lanes in self._all_vehicle_infos.items():
+            vehicles[cross_section_id] = {}
+            for lane_number, vehicle_infos in lanes.items():
+                types = np.fromiter((info.vehicle_type for info in vehicle_infos),
+                                    np.uint8, len(vehicle_infos))
+                speeds = np.fromiter((info.speed for info in vehicle_infos),
+                                     np.float64, len(vehicle_infos))
+                vehicles[cross_section_id][lane_number] = (types.tobytes(), speeds.tobytes())
+        return vehicles, self._average_speeds, self._traffic_volumes
+
+    @classmethod
+    def from_data(cls, data: InputData) -> 'Input':
+        """Construct a new Input with the content returned by to_data."""
+        algorithm_input = cls()
+        vehicles, average_speeds, traffic_volumes = data
+        for cross_section_id, lanes in vehicles.items():
+            for lane_number, (types, speeds) in lanes.items():
+                for vehicle_type, speed in zip(np.frombuffer(types, np.uint8),
+                                               np.frombuffer(speeds, np.float64)):
+                    algorithm_input.add_vehicle_info(cross_section_id, lane_number,
+                                                     VehicleType(int(vehicle_type)),
+                                                     float(speed))
+        for cross_section_id, lane_speeds in average_speeds.items():
+            for lane_number, average_speed in lane_speeds.items():
+                algorithm_input.add_lane_info(cross_section_id, lane_number, average_speed,
+                                              traffic_volumes[cross_section_id][lane_number])
+        return algorithm_input
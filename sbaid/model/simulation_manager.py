@@ -1,5 +1,8 @@
 """This module defines the SimulationManager class"""
 import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import NamedTuple
 
 from gi.repository import GObject, GLib
 
@@ -14,17 +17,58 @@ from sbaid.model.simulation.network_state import NetworkState
 from sbaid.model.simulation.parameter_configuration_state import ParameterConfigurationState
 from sbaid.model.simulation_observer import SimulationObserver
 from sbaid.model.network.network import Network
+from sbaid.model.algorithm.algorithm_worker import (AlgorithmWorker, AlgorithmTimeoutException,
+                                                    AlgorithmCrashedException)
 from sbaid.model.algorithm_configuration.algorithm_configuration import AlgorithmConfiguration
 from sbaid.model.simulator.simulator import Simulator
 from sbaid.model.results.result_manager import ResultManager
 
 
-class SimulationManager(GObject.GObject):
+ParameterValues = dict[tuple[str, str | None], GLib.Variant]
+"""Parameter values by parameter name and cross section id, None for global parameters."""
+
+
+class SimulationStatistics(NamedTuple):
+    """The time in seconds a simulation spent in each stage of its steps. In pipelined mode
+    the recording overlaps the simulation, so the stages add up to more than the total."""
+    steps: int
+    simulating: float
+    """Advancing the simulator and measuring."""
+    calculating: float
+    """Calculating the display with the algorithm and setting it in the simulator."""
+    recording: float
+    """Adding the measurements to the result and updating the progress."""
+    stalled: float
+    """Waiting for the recording to catch up, because the pipeline was full."""
+    total: float
+    algorithm_cpu: float
+    """The CPU time the algorithm used, in its worker process if there is one."""
+
+
+class _Step(NamedTuple):
+    """A simulated step that is waiting to be recorded."""
+    measurement: Input
+    display: Display | None
+    elapsed_time: int
+
+
+class SimulationManager(GObject.GObject):  # pylint: disable=too-many-instance-attributes
     """
     This class defines the SimulationManager class, that manages a running simulation.
+    In pipelined mode a step is recorded in a separate task while the simulator
+    already advances to the next step.
     """
 
     __result_builder: ResultBuilder
+    __algorithm_timeout: float | None
+    __algorithm_worker: AlgorithmWorker | None
+    __parameter_values: ParameterValues
+    __pipeline_depth: int
+    __steps: int
+    __stage_times: dict[str, float]
+    __algorithm_cpu_time: float
+    __started_at: float
+    __finished_at: float | None
 
     __project_name: str
     __algorithm_configuration: AlgorithmConfiguration
@@ -36,15 +80,47 @@ class SimulationManager(GObject.GObject):
 
     def __init__(self, project_name: str, algorithm_configuration: AlgorithmConfiguration,
                  network: Network, simulator: Simulator, result_manager: ResultManager,
-                 observer: SimulationObserver) -> None:
+                 observer: SimulationObserver, max_in_flight_snapshots: int = 16,
+                 pipeline_depth: int = 4, algorithm_timeout: float | None = None,
+                 parameter_values: ParameterValues | None = None) -> None:
+        """Initialize the simulation manager. The result is streamed to the database while
+        the simulation runs, with at most max_in_flight_snapshots snapshots in memory.
+        At most pipeline_depth simulated steps wait to be recorded, a depth of 0 records
+        every step before the simulator advances. If algorithm_timeout is given, the
+        algorithm runs in a separate process with that many seconds for each step.
+        The given parameter_values are used instead of the values of the parameter
+        configuration, without changing it."""
         super().__init__()
-        self.__result_builder = ResultBuilder(result_manager)
+        self.__parameter_values = parameter_values or {}
+        self.__algorithm_timeout = algorithm_timeout
+        self.__algorithm_worker = None
+        self.__result_builder = ResultBuilder(result_manager, max_in_flight_snapshots)
+        self.__pipeline_depth = pipeline_depth
+        self.__steps = 0
+        self.__stage_times = dict.fromkeys(("simulating", "calculating", "recording",
+                                            "stalled"), 0.0)
+        self.__algorithm_cpu_time = 0.0
+        self.__started_at = time.perf_counter()
+        self.__finished_at = None
         self.__project_name = project_name
         self.__algorithm_configuration = algorithm_configuration
         self.__network = network
         self.__simulator = simulator
         self.__observer = observer
 
+    @property
+    def statistics(self) -> SimulationStatistics:
+        """Return the number of recorded steps and the time spent in each stage so far."""
+        end = self.__finished_at if self.__finished_at is not None else time.perf_counter()
+        algorithm_cpu = self.__algorithm_cpu_time
+        if self.__algorithm_worker is not None:
+            algorithm_cpu = self.__algorithm_worker.cpu_time
+        return SimulationStatistics(self.__steps, self.__stage_times["simulating"],
+                                    self.__stage_times["calculating"],
+                                    self.__stage_times["recording"],
+                                    self.__stage_times["stalled"], end - self.__started_at,
+                                    algorithm_cpu)
+
     async def cancel(self) -> None:
         """Cancel the running simulation"""
         self.__simulation_task.cancel()
@@ -59,9 +135,14 @@ class SimulationManager(GObject.GObject):
 
     def start(self) -> None:
         """Start the simulation"""
-
+        self.__started_at = time.perf_counter()
         self.__simulation_task = asyncio.create_task(self.__try_run_simulation())
 
+    async def wait(self) -> None:
+        """Wait until the simulation has finished, failed or was cancelled
+        and the simulator was stopped."""
+        await asyncio.wait((self.__simulation_task,))
+
     async def __try_run_simulation(self) -> None:
         try:
             await self.__run_simulation()
@@ -69,6 +150,12 @@ class SimulationManager(GObject.GObject):
             msg = i18n._("Failed to simulate: ")
             print(msg, e)
             self.__observer.failed(GLib.Error(i18n._("Failed to simulate: ") + str(e)))
+            await self.__abort_result()
+        except asyncio.CancelledError:
+            await self.__abort_result()
+            raise
+        finally:
+            self.__finished_at = time.perf_counter()
 
         try:
             await self.__simulator.stop_simulation()
@@ -82,45 +169,152 @@ class SimulationManager(GObject.GObject):
         simulation_start_time, simulation_duration = \
             await self.__simulator.init_simulation(eval_interval)
 
-        algorithm = self.__algorithm_configuration.algorithm
         display_interval = self.__algorithm_configuration.display_interval
 
         param_config_state = self.__build_parameter_configuration_state()
         network_state = self.__build_network_state()
-        algorithm.init(param_config_state, network_state)
+        calculate = await self.__init_algorithm(param_config_state, network_state)
 
         self.__result_builder.begin_result(self.__project_name)
 
-        elapsed_time = 0
-        while elapsed_time < simulation_duration:
-            await self.__simulator.continue_simulation(eval_interval)
+        cross_sections = self.__build_cross_section_index(network_state)
 
-            measurement = await self.__simulator.measure()
+        async def record(step: _Step) -> None:
+            await self.__record_step(step, cross_sections, simulation_start_time,
+                                     simulation_duration)
 
-            display = None
+        queue: asyncio.Queue[_Step | None] = asyncio.Queue(self.__pipeline_depth)
+        recorder = None
+        if self.__pipeline_depth > 0:
+            recorder = asyncio.create_task(self.__record_steps(queue, record))
 
-            if elapsed_time % display_interval == 0:
-                display = algorithm.calculate_display(measurement)
-                await self.__simulator.set_display(display)
-
-            self.__add_to_results(measurement, display, network_state,
-                                  simulation_start_time, elapsed_time)
-
-            self.__observer.update_progress(elapsed_time / simulation_duration)
-
-            elapsed_time += eval_interval
+        try:
+            elapsed_time = 0
+            while elapsed_time < simulation_duration:
+                step = await self.__simulate_step(calculate, eval_interval,
+                                                  elapsed_time % display_interval == 0,
+                                                  elapsed_time)
+                if recorder is None:
+                    await record(step)
+                else:
+                    await self.__enqueue(queue, recorder, step)
+
+                elapsed_time += eval_interval
+
+            if recorder is not None:
+                await self.__enqueue(queue, recorder, None)
+                await recorder
+        finally:
+            if recorder is not None and not recorder.done():
+                recorder.cancel()
+                # the result must not be aborted while a step is still being recorded
+                await asyncio.gather(recorder, return_exceptions=True)
+            if self.__algorithm_worker is not None:
+                await self.__algorithm_worker.stop()
 
         result = await self.__result_builder.end_result()
 
         self.__observer.finished(result.id)
 
+    async def __init_algorithm(self, param_config_state: ParameterConfigurationState,
+                               network_state: NetworkState) \
+            -> Callable[[Input], Awaitable[Display | None]]:
+        """Initializes the algorithm, in a worker process if there is an algorithm timeout,
+        and returns the function that calculates a display with it."""
+        if self.__algorithm_timeout is None:
+            algorithm = self.__algorithm_configuration.algorithm
+            algorithm.init(param_config_state, network_state)
+
+            async def calculate_in_process(measurement: Input) -> Display | None:
+                start = time.process_time()
+                display = algorithm.calculate_display(measurement)
+                self.__algorithm_cpu_time += time.process_time() - start
+                return display
+            return calculate_in_process
+
+        worker = AlgorithmWorker(self.__algorithm_configuration.script_path,
+                                 self.__algorithm_timeout)
+        await worker.start(param_config_state, network_state)
+        self.__algorithm_worker = worker
+
+        async def calculate_in_worker(measurement: Input) -> Display | None:
+            try:
+                return await worker.calculate_display(measurement)
+            except (AlgorithmTimeoutException, AlgorithmCrashedException) as e:
+                print(i18n._("Skipped the display of a step: "), e)
+                return None
+        return calculate_in_worker
+
+    async def __simulate_step(self, calculate: Callable[[Input], Awaitable[Display | None]],
+                              eval_interval: int, calculate_display: bool,
+                              elapsed_time: int) -> _Step:
+        start = time.perf_counter()
+        await self.__simulator.continue_simulation(eval_interval)
+        measurement = await self.__simulator.measure()
+        calculated = time.perf_counter()
+        self.__stage_times["simulating"] += calculated - start
+
+        display = None
+        if calculate_display:
+            display = await calculate(measurement)
+            if display is not None:
+                await self.__simulator.set_display(display)
+        self.__stage_times["calculating"] += time.perf_counter() - calculated
+        return _Step(measurement, display, elapsed_time)
+
+    async def __enqueue(self, queue: asyncio.Queue[_Step | None],
+                        recorder: asyncio.Task[None], step: _Step | None) -> None:
+        """Queue the step for the recorder, raising the error of the recorder if it failed
+        instead of waiting for it forever. If there is room, the simulator continues right
+        away and the step is recorded while the simulator is busy."""
+        if not queue.full() and not recorder.done():
+            queue.put_nowait(step)
+            return
+        start = time.perf_counter()
+        put = asyncio.ensure_future(queue.put(step))
+        try:
+            await asyncio.wait((put, recorder), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            put.cancel()
+        self.__stage_times["stalled"] += time.perf_counter() - start
+        if recorder.done():
+            # the recorder only finishes on its own after the last step if it fails
+            recorder.result()
+
+    @staticmethod
+    async def __record_steps(queue: asyncio.Queue[_Step | None],
+                             record: Callable[[_Step], Awaitable[None]]) -> None:
+        while (step := await queue.get()) is not None:
+            await record(step)
+
+    async def __record_step(self, step: _Step, cross_sections: list[tuple[str, str, int]],
+                            start_time: GLib.DateTime, simulation_duration: int) -> None:
+        await self.__result_builder.wait_for_writer()
+
+        start = time.perf_counter()
+        timestamp = start_time.add_seconds(step.elapsed_time)
+        assert timestamp
+        self.__result_builder.add_snapshot_from_input(timestamp, step.measurement, step.display,
+                                                      cross_sections)
+        self.__observer.update_progress(step.elapsed_time / simulation_duration)
+        self.__steps += 1
+        self.__stage_times["recording"] += time.perf_counter() - start
+
+    async def __abort_result(self) -> None:
+        try:
+            await self.__result_builder.abort_result()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            print(i18n._("Failed to store the partial result: "), e)
+
     def __build_parameter_configuration_state(self) -> ParameterConfigurationState:
         config = self.__algorithm_configuration.parameter_configuration
 
         parameter_states = []
         for parameter in common.list_model_iterator(config.parameters):
-            parameter_states.append(ParameterState(parameter.name, parameter.value,
-                                                   parameter.cross_section))
+            cross_section_id = parameter.cross_section.id if parameter.cross_section else None
+            value = self.__parameter_values.get((parameter.name, cross_section_id),
+                                                parameter.value)
+            parameter_states.append(ParameterState(parameter.name, value, cross_section_id))
 
         return ParameterConfigurationState(parameter_states)
 
@@ -132,47 +326,11 @@ class SimulationManager(GObject.GObject):
                                                cs.b_display_active, cs.hard_shoulder_active))
         return NetworkState(locations, cs_states)
 
-    def __add_to_results(self, measurement: Input,
-                         display: Display | None, network_state: NetworkState,
-                         start_time: GLib.DateTime, elapsed_time: int) -> None:
-        new_time = start_time.add_seconds(elapsed_time)
-        assert new_time
-
-        self.__result_builder.begin_snapshot(new_time)
-
-        for cs_state in network_state.cross_section_states:
-            cs_name = i18n._("Unknown cross section")
-
-            for cs in common.list_model_iterator(self.__network.cross_sections):
-                if cs.id == cs_state.id:
-                    cs_name = cs.name
-                    break
-
-            self.__result_builder.begin_cross_section(cs_state.id, cs_name)
-
-            if display:
-                self.__result_builder.add_b_display(display.get_b_display(cs_state.id))
-
-            for lane in range(cs_state.lanes):
-                self.__result_builder.begin_lane(lane)
-
-                avg_speed = measurement.get_average_speed(cs_state.id, lane)
-                self.__result_builder.add_average_speed(avg_speed)
-
-                volume = measurement.get_traffic_volume(cs_state.id, lane)
-                self.__result_builder.add_traffic_volume(volume)
-
-                if display:
-                    self.__result_builder.add_a_display(display.get_a_display(cs_state.id, lane))
-
-                for vehicle_info in measurement.get_all_vehicle_infos(cs_state.id, lane):
-                    self.__result_builder.begin_vehicle()
-                    self.__result_builder.add_vehicle_type(vehicle_info.vehicle_type)
-                    self.__result_builder.add_vehicle_speed(vehicle_info.speed)
-                    self.__result_builder.end_vehicle()
-
-                self.__result_builder.end_lane()
-
-            self.__result_builder.end_cross_section()
-
-        self.__result_builder.end_snapshot()
+    def __build_cross_section_index(self, network_state: NetworkState) \
+            -> list[tuple[str, str, int]]:
+        """Returns the id, name and number of lanes of every cross section, in the order
+        of the network state."""
+        names = {cs.id: cs.name for cs in common.list_model_iterator(self.__network.cross_sections)}
+        unknown_name = i18n._("Unknown cross section")
+        return [(cs_state.id, names.get(cs_state.id, unknown_name), cs_state.lanes)
+                for cs_state in network_state.cross_section_states]
@@ -9,6 +9,7 @@ import gi
 
 from sbaid.common.diagram_type import DiagramType
 from sbaid.common.image import Image
+from sbaid.model.results.result_export_format import ResultExportFormat
 from sbaid.view import utils
 from sbaid.view.results.cross_section_row import CrossSectionRow
 from sbaid.view_model.results.result import Result, CrossSectionSnapshotWrapper
@@ -97,17 +98,38 @@ class ExportResultsDialog(Adw.Window):
         export_button.set_margin_start(6)
         export_button.connect("clicked", self.__on_exported)
 
+        data_format_name_expression = Gtk.PropertyExpression.new(ResultExportFormat, None,
+                                                                 "name")
+
+        data_format_drop_down = Gtk.DropDown.new(result.data_formats,
+                                                 data_format_name_expression)
+        data_format_drop_down.bind_property("selected", result.data_formats, "selected")
+
+        export_data_button = Gtk.Button.new_with_label(i18n._("Export Data"))
+        export_data_button.set_tooltip_text(i18n._("Export the lane and vehicle data of the "
+                                                   "selected cross sections"))
+        export_data_button.set_margin_bottom(6)
+        export_data_button.set_margin_top(6)
+        export_data_button.set_margin_start(6)
+        export_data_button.connect("clicked", self.__on_data_exported)
+
+        bottom_box = Gtk.Box.new(Gtk.Orientation.HORIZONTAL, 0)
+        bottom_box.set_halign(Gtk.Align.END)
+        bottom_box.append(export_data_button)
+        bottom_box.append(export_button)
+
         grid = Gtk.Grid(margin_end=12, margin_top=12, margin_bottom=12, margin_start=12,
                         column_spacing=12, row_spacing=12, column_homogeneous=True)
         grid.attach(diagram_type_drop_down, 0, 0, 2, 1)
         grid.attach(cross_sections_frame, 0, 1, 1, 1)
         grid.attach(preview_frame, 1, 1, 1, 1)
         grid.attach(image_format_drop_down, 0, 2, 2, 1)
+        grid.attach(data_format_drop_down, 0, 3, 2, 1)
 
         toolbar_view = Adw.ToolbarView()
         toolbar_view.add_top_bar(header_bar)
         toolbar_view.set_content(grid)
-        toolbar_view.add_bottom_bar(export_button)
+        toolbar_view.add_bottom_bar(bottom_box)
 
         self.set_content(toolbar_view)
         self.set_title("Export " + result.name)
@@ -162,3 +184,21 @@ class ExportResultsDialog(Adw.Window):
             return
 
         self.__result.save_diagrams(file.get_path())
+
+    def __on_data_exported(self, button: Gtk.Button) -> None:
+        utils.run_coro_with_error_reporting(self.__export_data())
+
+    async def __export_data(self) -> None:
+        dialog = Gtk.FileDialog()
+
+        try:
+            file = await dialog.select_folder(self)  # type: ignore
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            msg = i18n._("Failed to allow the user to choose a file: ")
+            print(msg, e)
+            return
+
+        if file is None:
+            return
+
+        await self.__result.export_data(file)
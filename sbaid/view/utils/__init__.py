@@ -18,6 +18,15 @@ def register_error_reporter(error_reporter: Callable[[Exception], None]) -> None
     error_reporters.append(error_reporter)
 
 
+def report_error(exception: Exception) -> None:
+    """
+    Calls every registered error_reporter with the given exception.
+    :param exception: the exception to report
+    """
+    for error_reporter in error_reporters:
+        error_reporter(exception)
+
+
 def run_coro_with_error_reporting(coro: Coroutine[Any, Any, None]) -> None:
     """
     Runs the given coro in the background. If an exception occurs, calls every
@@ -31,5 +40,4 @@ async def __coro_runner(coro: Coroutine[Any, Any, None]) -> None:
     try:
         await coro
     except Exception as e:  # pylint: disable=broad-exception-caught
-        for error_reporter in error_reporters:
-            error_reporter(e)
+        report_error(e)
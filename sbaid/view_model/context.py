@@ -64,6 +64,13 @@ class Context(GObject.Object):
 
         await self.__context.load()
 
+    async def close(self) -> None:
+        """
+        Closes this context, i.e. all its database connections.
+        """
+
+        await self.__context.close()
+
     async def create_project(
         self, name: str, sim_type: SimulatorType,
         simulation_file_path: str, project_file_path: str
@@ -12,6 +12,8 @@ from sbaid.common.image_format import ImageFormat
 from sbaid.model.results.cross_section_snapshot import CrossSectionSnapshot
 from sbaid.model.results.diagram_exporter import DiagramExporter
 from sbaid.model.results.result import Result as ModelResult
+from sbaid.model.results.result_export_format import ResultExportFormat
+from sbaid.model.results.result_exporter import ResultExporter
 from sbaid.model.results.snapshot import Snapshot
 
 try:
@@ -97,7 +99,13 @@ class Result(GObject.GObject):
         flags=GObject.ParamFlags.READABLE | GObject.ParamFlags.WRITABLE |
         GObject.ParamFlags.CONSTRUCT)
 
+    data_formats: Gtk.SingleSelection = GObject.Property(  # type: ignore
+        type=Gtk.SingleSelection,
+        flags=GObject.ParamFlags.READABLE | GObject.ParamFlags.WRITABLE |
+        GObject.ParamFlags.CONSTRUCT)
+
     __diagram_exporter: DiagramExporter
+    __result_exporter: ResultExporter
     __available_diagram_types: Gio.ListModel
     __result: ModelResult
     __previews: Gio.ListStore
@@ -105,13 +113,16 @@ class Result(GObject.GObject):
     def __init__(self, result: ModelResult, available_tags: Gio.ListModel):
         self.__result = result
         self.__diagram_exporter = DiagramExporter()
+        self.__result_exporter = ResultExporter()
         self.__available_diagram_types = self.__diagram_exporter.available_diagram_types
         self.__previews = Gio.ListStore.new(Image)
 
         super().__init__(selected_tags=Gtk.MultiSelection.new(available_tags),
                          diagram_types=Gtk.SingleSelection.new(self.__available_diagram_types),
                          cross_section=Gtk.MultiSelection(),
-                         formats=Gtk.SingleSelection.new(Adw.EnumListModel.new(ImageFormat)))
+                         formats=Gtk.SingleSelection.new(Adw.EnumListModel.new(ImageFormat)),
+                         data_formats=Gtk.SingleSelection.new(
+                             self.__result_exporter.available_formats))
 
         self.formats.connect("selection-changed", self._on_selection_changed)
         self.diagram_types.connect("selection-changed", self._on_selection_changed)
@@ -140,6 +151,15 @@ class Result(GObject.GObject):
             full_path = os.path.join(path, filename)
             image.save_to_file(full_path)
 
+    async def export_data(self, directory: Gio.File) -> None:
+        """Exports the lane and vehicle data of the selected cross sections, or of all
+        if none are selected, to files in the selected data format in the directory."""
+        export_format = self.data_formats.get_selected_item()
+        assert isinstance(export_format, ResultExportFormat)
+        id_list = self.__get_selected_diagram_information()[0]
+        await self.__result.export_data(self.__result_exporter, directory,
+                                        export_format.format_id, id_list or None)
+
     def __get_selected_diagram_information(self) -> tuple[list[str], ImageFormat, DiagramType]:
         image_format = ImageFormat(self.formats.get_selected())
         diagram_type = self.__available_diagram_types.get_item(self.diagram_types.get_selected())
@@ -0,0 +1,19 @@
+"""Helpers shared by the benchmarks. Benchmarks are skipped unless the SBAID_BENCHMARK
+environment variable is set, since they take far longer than the regular tests."""
+import os
+import unittest
+
+ENABLED = bool(os.environ.get("SBAID_BENCHMARK"))
+
+benchmark = unittest.skipUnless(ENABLED, "set SBAID_BENCHMARK=1 to run benchmarks")
+
+
+def report(name: str, seconds: float, amount: int | None = None, unit: str = "rows") -> None:
+    """Print a single benchmark line, optionally with a throughput."""
+    if amount is None:
+        print(f"\n[benchmark] {name}: {seconds:.3f} s")
+    else:
+        rate = amount / seconds if seconds > 0 else float("inf")
+        print(f"\n[benchmark] {name}: {amount} {unit} in {seconds:.3f} s "
+              f"({rate:,.0f} {unit}/s)")
+
@@ -0,0 +1,74 @@
+"""Benchmarks for the GlobalSQLite result write path."""
+import asyncio
+import os
+import random
+import tempfile
+import time
+import unittest
+
+import numpy as np
+from gi.repository import Gio, GLib
+
+from sbaid.model.database.global_sqlite import GlobalSQLite
+from tests.benchmarks.benchmark_utils import benchmark, report
+
+HOURS = 24
+SNAPSHOT_INTERVAL_SECONDS = 60
+CROSS_SECTIONS = 50
+LANES = 3
+VEHICLES_PER_LANE = 5
+
+
+def generate_snapshot_data(result_id: str, hours: int = HOURS) -> tuple[list, int]:
+    """Return synthetic snapshot data in the add_entire_result format for a result with
+    50 cross sections, 24 hours long by default, and the number of rows it contains."""
+    rows = 0
+    start = GLib.DateTime.new_utc(2025, 7, 1, 0, 0, 0)
+    snapshot_data = []
+    cs_snapshot_id = 0
+    lane_snapshot_id = 0
+    for i in range(hours * 3600 // SNAPSHOT_INTERVAL_SECONDS):
+        snapshot_id = i + 1
+        date = start.add_seconds(i * SNAPSHOT_INTERVAL_SECONDS).format_iso8601()
+        cs_data = []
+        for cs in range(CROSS_SECTIONS):
+            cs_snapshot_id += 1
+            lane_data = []
+            for lane in range(LANES):
+                lane_snapshot_id += 1
+                types = np.random.randint(0, 2, VEHICLES_PER_LANE, dtype="u1")
+                speeds = np.random.uniform(60, 140, VEHICLES_PER_LANE).astype("<f4")
+                lane_data.append((lane_snapshot_id, cs_snapshot_id, lane,
+                                  random.uniform(60, 140), VEHICLES_PER_LANE, 0,
+                                  types.tobytes(), speeds.tobytes()))
+                rows += 1
+            cs_data.append((cs_snapshot_id, snapshot_id, f"cs-{cs}", f"Cross section {cs}", 0,
+                            lane_data))
+            rows += 1
+        snapshot_data.append((snapshot_id, result_id, date, cs_data))
+        rows += 1
+    return snapshot_data, rows
+
+
+@benchmark
+class GlobalSQLiteBenchmark(unittest.TestCase):
+    """Measures how many rows per second add_entire_result persists."""
+
+    def test_add_entire_result(self) -> None:
+        asyncio.run(self.__test_add_entire_result())
+
+    async def __test_add_entire_result(self) -> None:
+        snapshot_data, rows = generate_snapshot_data("benchmark_result")
+        with tempfile.TemporaryDirectory() as directory:
+            db = GlobalSQLite(Gio.File.new_for_path(os.path.join(directory, "global_db")))
+            await db.open()
+
+            start = time.perf_counter()
+            await db.add_entire_result("benchmark_result", "benchmark", "project",
+                                       GLib.DateTime.new_now_local(), snapshot_data)
+            elapsed = time.perf_counter() - start
+
+            report("add_entire_result (24h, 50 cross sections)", elapsed, rows)
+            self.assertEqual(len(await db.get_all_snapshots("benchmark_result")),
+                             HOURS * 3600 // SNAPSHOT_INTERVAL_SECONDS)
+            await db.close()
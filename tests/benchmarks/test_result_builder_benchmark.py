@@ -0,0 +1,52 @@
+"""Measures the throughput of the ResultBuilder."""
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from gi.repository import GLib
+
+from sbaid.common.a_display import ADisplay
+from sbaid.common.b_display import BDisplay
+from sbaid.model.results.result_builder import ResultBuilder
+from sbaid.model.results.result_manager import ResultManager
+from tests.benchmarks.benchmark_utils import benchmark, report
+
+SNAPSHOTS = 500
+CROSS_SECTIONS = 50
+LANES = 3
+
+
+@benchmark
+class ResultBuilderBenchmark(unittest.TestCase):
+    """Times building a result of 500 snapshots of 50 cross sections with 3 lanes each."""
+
+    def test_build(self) -> None:
+        asyncio.run(self.__test_build())
+
+    async def __test_build(self) -> None:
+        rows = SNAPSHOTS * CROSS_SECTIONS * (LANES + 1)
+        builder = ResultBuilder(ResultManager(mock.AsyncMock()))
+        start = time.perf_counter()
+        result = await self.__build(builder)
+        report("ResultBuilder", time.perf_counter() - start, rows)
+        self.assertEqual(SNAPSHOTS, len(result.snapshots))
+
+    @staticmethod
+    async def __build(builder: ResultBuilder):
+        builder.begin_result("benchmark")
+        date = GLib.DateTime.new_now_local()
+        for _ in range(SNAPSHOTS):
+            builder.begin_snapshot(date)
+            for cross_section in range(CROSS_SECTIONS):
+                builder.begin_cross_section(f"cs_{cross_section}", f"cross section {cross_section}")
+                builder.add_b_display(BDisplay.OFF)
+                for lane in range(LANES):
+                    builder.begin_lane(lane)
+                    builder.add_a_display(ADisplay.OFF)
+                    builder.add_traffic_volume(10)
+                    builder.add_average_speed(100.0)
+                    builder.end_lane()
+                builder.end_cross_section()
+            builder.end_snapshot()
+        return await builder.end_result()
@@ -0,0 +1,60 @@
+"""Compares loading a stored result snapshot by snapshot with the paged bulk loader."""
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from gi.repository import Gio, GLib
+
+from sbaid.model.database.global_sqlite import GlobalSQLite
+from sbaid.model.results.cross_section_snapshot import CrossSectionSnapshot
+from sbaid.model.results.lane_snapshot import LaneSnapshot
+from sbaid.model.results.result import Result
+from sbaid.model.results.snapshot import Snapshot
+from tests.benchmarks.benchmark_utils import benchmark, report
+from tests.benchmarks.test_global_sqlite_benchmark import generate_snapshot_data
+
+
+@benchmark
+class ResultLoadingBenchmark(unittest.TestCase):
+    """Times Result.load against the previous per-row loading of the snapshot tree."""
+
+    def test_load(self) -> None:
+        asyncio.run(self.__test_load())
+
+    async def __test_load(self) -> None:
+        snapshot_data, rows = generate_snapshot_data("benchmark_result", hours=2)
+        with tempfile.TemporaryDirectory() as directory:
+            db = GlobalSQLite(Gio.File.new_for_path(os.path.join(directory, "global_db")))
+            await db.open()
+            await db.add_entire_result("benchmark_result", "benchmark", "project",
+                                       GLib.DateTime.new_now_local(), snapshot_data)
+
+            start = time.perf_counter()
+            snapshots = []
+            for snapshot_id, date in await db.get_all_snapshots("benchmark_result"):
+                snapshot = Snapshot(snapshot_id, date)
+                for cs_row in await db.get_all_cross_section_snapshots(snapshot_id):
+                    cs_snapshot = CrossSectionSnapshot(cs_row[1], cs_row[0], cs_row[3],
+                                                       cs_row[2], cs_row[4])
+                    for lane_row in await db.get_all_lane_snapshots(cs_row[0]):
+                        lane_snapshot = LaneSnapshot(cs_row[0], *lane_row)
+                        lane_snapshot.set_vehicle_columns(
+                            *await db.get_vehicle_snapshot_columns(lane_row[0]))
+                        cs_snapshot.add_lane_snapshot(lane_snapshot)
+                    snapshot.add_cross_section_snapshot(cs_snapshot)
+                snapshots.append(snapshot)
+            per_row = time.perf_counter() - start
+            report("Loading snapshot by snapshot (2h, 50 cross sections)", per_row, rows)
+
+            result = Result("benchmark_result", "project", GLib.DateTime.new_now_local(), db)
+            start = time.perf_counter()
+            await result.load()
+            loaded = list(result.snapshots)
+            bulk = time.perf_counter() - start
+            report("Result.load and reading every snapshot (2h, 50 cross sections)", bulk, rows)
+
+            self.assertEqual(len(snapshots), len(loaded))
+            self.assertLess(bulk, per_row)
+            await db.close()
@@ -0,0 +1,61 @@
+"""Compares loading the result list at startup result by result with the bulk loader."""
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+import uuid
+
+from gi.repository import Gio, GLib
+
+from sbaid.model.database.global_sqlite import GlobalSQLite
+from sbaid.model.results.result_manager import ResultManager
+from tests.benchmarks.benchmark_utils import benchmark, report
+
+RESULTS = 3000
+TAGS = 20
+TAGS_PER_RESULT = 3
+
+
+@benchmark
+class ResultManagerBenchmark(unittest.TestCase):
+    """Times ResultManager.load_from_db against loading every result on its own."""
+
+    def test_load_from_db(self) -> None:
+        asyncio.run(self.__test_load_from_db())
+
+    async def __test_load_from_db(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            db = GlobalSQLite(Gio.File.new_for_path(os.path.join(directory, "global_db")))
+            await db.open()
+            tag_ids = [str(uuid.uuid4()) for _ in range(TAGS)]
+            for i, tag_id in enumerate(tag_ids):
+                await db.add_tag(tag_id, f"tag {i}")
+            for i in range(RESULTS):
+                result_id = str(uuid.uuid4())
+                await db.add_entire_result(result_id, f"result {i}", "project",
+                                           GLib.DateTime.new_now_local(), [])
+                for j in range(TAGS_PER_RESULT):
+                    await db.add_result_tag(str(uuid.uuid4()), result_id,
+                                            tag_ids[(i + j) % TAGS])
+
+            # the name and every tag of a result used to be queried on their own
+            start = time.perf_counter()
+            for result_id, _, _, _, _ in await db.get_all_results():
+                await db.get_result_name(result_id)
+                for tag_id in await db.get_result_tag_ids(result_id):
+                    await db.get_tag_name(tag_id)
+            per_result = time.perf_counter() - start
+            report(f"Loading result by result ({RESULTS} results)", per_result,
+                   RESULTS, "results")
+
+            result_manager = ResultManager(db)
+            start = time.perf_counter()
+            await result_manager.load_from_db()
+            bulk = time.perf_counter() - start
+            report(f"ResultManager.load_from_db ({RESULTS} results)", bulk, RESULTS, "results")
+
+            self.assertEqual(RESULTS, len(result_manager.results))
+            self.assertEqual(TAGS_PER_RESULT, len(result_manager.results[0].selected_tags))
+            self.assertLess(bulk, per_result)
+            await db.close()
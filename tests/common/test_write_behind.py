@@ -0,0 +1,65 @@
+import asyncio
+import functools
+import unittest
+
+from sbaid.common.write_behind import WriteBehind, WriteBehindStatistics
+
+
+class WriteBehindTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__written = []
+
+    async def write(self, key, value):
+        self.__written.append((key, value))
+
+    async def failing_write(self):
+        raise ValueError()
+
+    def test_coalesce(self):
+        asyncio.run(self.__test_coalesce())
+
+    async def __test_coalesce(self):
+        write_behind = WriteBehind(delay=0.05)
+        for i in range(5):
+            write_behind.schedule("a", functools.partial(self.write, "a", i))
+            write_behind.schedule("b", functools.partial(self.write, "b", i))
+        self.assertEqual(WriteBehindStatistics(2, 10, 8, 0, 0), write_behind.statistics)
+        self.assertEqual([], self.__written)
+
+        await asyncio.sleep(0.2)
+        self.assertEqual([("a", 4), ("b", 4)], self.__written)
+        self.assertEqual(WriteBehindStatistics(0, 10, 8, 2, 0), write_behind.statistics)
+
+    def test_max_delay(self):
+        asyncio.run(self.__test_max_delay())
+
+    async def __test_max_delay(self):
+        write_behind = WriteBehind(delay=0.05, max_delay=0.1)
+        for i in range(10):
+            write_behind.schedule("a", functools.partial(self.write, "a", i))
+            await asyncio.sleep(0.03)
+        # the writes were flushed although the delay never passed without a new write
+        self.assertNotEqual([], self.__written)
+        await write_behind.flush()
+        self.assertEqual(("a", 9), self.__written[-1])
+
+    def test_flush(self):
+        asyncio.run(self.__test_flush())
+
+    async def __test_flush(self):
+        write_behind = WriteBehind(delay=60)
+        errors = []
+        write_behind.register_error_reporter(errors.append)
+        write_behind.schedule("a", functools.partial(self.write, "a", 1))
+        write_behind.schedule("fail", self.failing_write)
+        write_behind.schedule("b", functools.partial(self.write, "b", 1))
+        await asyncio.wait_for(write_behind.flush(), 5)
+
+        self.assertEqual([("a", 1), ("b", 1)], self.__written)
+        self.assertEqual(WriteBehindStatistics(0, 3, 0, 2, 1), write_behind.statistics)
+        self.assertEqual([ValueError], [type(error) for error in errors])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -62,6 +62,8 @@ class ContextProjectsTestCase(unittest.TestCase):
         self.assertEqual(1, context_2.projects.get_n_items())
 
         # tear down
+        await vm_context.close()
+        await context_2.close()
         global_file = Gio.File.new_build_filenamev([GLib.get_user_data_dir(), "sbaid", "global_db"])
         project_file = Gio.File.new_for_path("project_file_path")
         await global_file.delete_async(0)
@@ -99,6 +101,7 @@ class ContextProjectsTestCase(unittest.TestCase):
         await context.result_manager.delete_result(context.result_manager.results[0].id)
 
         # cleanup:
+        await context.close()
         global_file = Gio.File.new_build_filenamev([GLib.get_user_data_dir(), "sbaid", "global_db"])
         project_file = Gio.File.new_for_path("project_file/db")
         project_directory = Gio.File.new_for_path("project_file")
@@ -43,32 +43,28 @@ class ProjectDatabaseTestCase(unittest.TestCase):
                                    GLib.DateTime.new_now_local(),
                                    global_db)
 
-        vehicle_snapshot = VehicleSnapshot("lane_snapshot_id",
+        vehicle_snapshot = VehicleSnapshot(1,
                                            VehicleType.CAR,
                                            0.0)
 
-        lane_snapshot = LaneSnapshot("cross_section_snapshot_id",
-                                     "lane_snapshot_id",
+        lane_snapshot = LaneSnapshot(1,
+                                     1,
                                      0,
                                      0.0,
                                      1,
-                                     ADisplay.OFF,
-                                     global_db)
+                                     ADisplay.OFF)
 
         lane_snapshot.add_vehicle_snapshot(vehicle_snapshot)
 
-        cs_snapshot = CrossSectionSnapshot("snapshot_id",
-                                           "cross_section_snapshot_id",
+        cs_snapshot = CrossSectionSnapshot(1,
+                                           1,
                                            "cross_section_name",
                                            "cross_section_id",
-                                           BDisplay.OFF,
-                                           global_db)
+                                           BDisplay.OFF)
 
         cs_snapshot.add_lane_snapshot(lane_snapshot)
 
-        snapshot = Snapshot("snapshot_id",
-                            GLib.DateTime.new_now_local(),
-                            global_db)
+        snapshot = Snapshot(1, GLib.DateTime.new_now_local())
         snapshot.add_cross_section_snapshot(cs_snapshot)
 
         model_result.add_snapshot(snapshot)
@@ -89,9 +85,8 @@ class ProjectDatabaseTestCase(unittest.TestCase):
                                        global_db)
 
         await same_model_result.load()
-        await same_model_result.load_from_db()
 
-        self.assertEqual(result.name, same_model_result.result_name)
+        self.assertEqual(result.name, await global_db.get_result_name("my_result_id"))
 
         same_snapshot = cast(Snapshot, same_model_result.snapshots[0])
         self.assertEqual(snapshot.id, same_snapshot.id)
@@ -105,4 +100,5 @@ class ProjectDatabaseTestCase(unittest.TestCase):
         same_vehicle_snapshot = cast(VehicleSnapshot, same_lane_snapshot.vehicle_snapshots[0])
         self.assertEqual(vehicle_snapshot.speed, same_vehicle_snapshot.speed)
 
+        await global_db.close()
         await global_db_file.delete_async(0, None)
@@ -91,6 +91,8 @@ class ProjectDatabaseTestCase(unittest.TestCase):
         self.assertEqual(context2.projects.get_item(0).id, proj_id)
         self.assertEqual(context2.projects.get_n_items(), 1)
 
+        await context1.close()
+        await context2.close()
         await global_file.delete_async(0, None)
         project_file = Gio.File.new_for_path("test_project/db")
         project_dir = Gio.File.new_for_path("test_project")
@@ -118,6 +120,7 @@ class ProjectDatabaseTestCase(unittest.TestCase):
         await same_algo_config_manager.load()
         self.assertEqual(1, len(same_algo_config_manager.algorithm_configurations))
 
+        await project_db.close()
         await project_db_file.delete_async(0, None)
 
     async def algo_config_properties(self) -> None:
@@ -142,6 +145,7 @@ class ProjectDatabaseTestCase(unittest.TestCase):
         self.assertEqual(algo_config_manager.algorithm_configurations[0].id,
                          same_algo_config_manager.selected_algorithm_configuration_id)
 
+        await project_db.close()
         await project_db_file.delete_async(0, None)
 
     async def algo_config_tag(self) -> None:
@@ -171,6 +175,7 @@ class ProjectDatabaseTestCase(unittest.TestCase):
 
         self.assertEqual(0, len(other_same_algo_config_manager.available_tags))
 
+        await project_db.close()
         await project_db_file.delete_async(0, None)
 
 
@@ -223,4 +228,6 @@ class ProjectDatabaseTestCase(unittest.TestCase):
         # 6 = 2 (global params) + 2 (cross sections) * 2 (cross sections params)
         self.assertEqual(6, config_2.parameter_configuration.parameters.get_n_items())
 
+        await project_db.close()
+        await project_db_2.close()
         await project_db_file.delete_async(0, None)
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from sbaid.common.a_display import ADisplay
+from sbaid.common.cross_section_type import CrossSectionType
+from sbaid.common.location import Location
+from sbaid.common.vehicle_type import VehicleType
+from sbaid.model.algorithm.algorithm_worker import (AlgorithmWorker, AlgorithmWorkerException,
+                                                    AlgorithmTimeoutException,
+                                                    AlgorithmCrashedException)
+from sbaid.model.simulation.cross_section_state import CrossSectionState
+from sbaid.model.simulation.input import Input
+from sbaid.model.simulation.network_state import NetworkState
+from sbaid.model.simulation.parameter_configuration_state import ParameterConfigurationState
+
+ALGORITHM = """
+import os
+import sys
+import time
+
+from sbaid.common.a_display import ADisplay
+from sbaid.model.algorithm.algorithm import Algorithm
+from sbaid.model.simulation.display import Display
+
+
+class AlgorithmImpl(Algorithm):
+    def init(self, parameter_configuration_state, network_state):
+        # the worker process does not load the user interface
+        if "sbaid.application" in sys.modules or "gi.repository.Gtk" in sys.modules:
+            raise ImportError("the user interface was imported")
+        self.cross_sections = [(state.id, state.lanes)
+                               for state in network_state.cross_section_states]
+
+    def calculate_display(self, algorithm_input):
+        display = Display()
+        for cross_section_id, lanes in self.cross_sections:
+            speed = algorithm_input.get_average_speed(cross_section_id, 0)
+            if speed > 200:
+                time.sleep(60)
+            if speed < 0:
+                os._exit(1)
+            if speed == 0:
+                raise ValueError("no vehicles")
+            for lane in range(lanes):
+                display.set_a_display(cross_section_id, lane, ADisplay.SPEED_LIMIT_80
+                                      if speed < 100 else ADisplay.SPEED_LIMIT_130)
+        return display
+"""
+
+
+class AlgorithmWorkerTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.__script_path = os.path.join(directory.name, "worker_algorithm.py")
+        with open(self.__script_path, "w", encoding="utf-8") as script:
+            script.write(ALGORITHM)
+        self.__network_state = NetworkState(
+            [Location(0, 0)], [CrossSectionState("cs", CrossSectionType.COMBINED, 2, True, False)])
+
+    @staticmethod
+    def __input(speed):
+        algorithm_input = Input()
+        algorithm_input.add_vehicle_info("cs", 0, VehicleType.CAR, speed)
+        return algorithm_input
+
+    def test_calculate_display(self):
+        asyncio.run(self.__test_calculate_display())
+
+    async def __test_calculate_display(self):
+        worker = AlgorithmWorker(self.__script_path)
+        await worker.start(ParameterConfigurationState([]), self.__network_state)
+        try:
+            # the same process is used for every step
+            display = await worker.calculate_display(self.__input(80))
+            self.assertEqual(ADisplay.SPEED_LIMIT_80, display.get_a_display("cs", 1))
+            display = await worker.calculate_display(self.__input(120))
+            self.assertEqual(ADisplay.SPEED_LIMIT_130, display.get_a_display("cs", 0))
+
+            # an error of the algorithm does not end the process
+            with self.assertRaises(AlgorithmWorkerException):
+                await worker.calculate_display(Input())
+            await worker.calculate_display(self.__input(80))
+            self.assertEqual(0, worker.restarts)
+            self.assertGreater(worker.cpu_time, 0)
+        finally:
+            await worker.stop()
+
+    def test_timeout_and_crash(self):
+        asyncio.run(self.__test_timeout_and_crash())
+
+    async def __test_timeout_and_crash(self):
+        worker = AlgorithmWorker(self.__script_path, timeout=1, max_restarts=2)
+        await worker.start(ParameterConfigurationState([]), self.__network_state)
+        try:
+            with self.assertRaises(AlgorithmTimeoutException):
+                await worker.calculate_display(self.__input(250))
+            # the process is restarted for the next step
+            display = await worker.calculate_display(self.__input(80))
+            self.assertEqual(ADisplay.SPEED_LIMIT_80, display.get_a_display("cs", 0))
+
+            with self.assertRaises(AlgorithmCrashedException):
+                await worker.calculate_display(self.__input(-1))
+            await worker.calculate_display(self.__input(80))
+            self.assertEqual(2, worker.restarts)
+
+            # the worker gives up after max_restarts restarts
+            with self.assertRaises(AlgorithmCrashedException):
+                await worker.calculate_display(self.__input(-1))
+            with self.assertRaises(AlgorithmWorkerException):
+                await worker.calculate_display(self.__input(80))
+        finally:
+            await worker.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
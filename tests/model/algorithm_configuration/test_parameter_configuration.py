@@ -15,6 +15,9 @@ class MyTestCase(unittest.IsolatedAsyncioTestCase):
         self.__db_mock = Mock()
         self.__db_mock.get_parameter_value = AsyncMock()
         self.__db_mock.get_all_tag_ids_for_parameter = AsyncMock()
+        self.__db_mock.get_all_parameter_values_and_tags = AsyncMock(return_value=[
+            ("my global param", None, GLib.Variant.new_string("stored"), [("tag_id", "tag")]),
+            ("my global param", "unknown_cs_id", GLib.Variant.new_string("other"), [])])
         self.__ac_id = "acid"
         self.__algo_mock = Mock()
 
@@ -36,6 +39,11 @@ class MyTestCase(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(parameter_config.parameters.get_n_items (),
                          1 + network.cross_sections.get_n_items())
+        global_param = parameter_config.parameters.get_item(0)
+        self.assertEqual("stored", global_param.value.get_string())
+        self.assertEqual(["tag_id"], [tag.tag_id for tag in global_param.selected_tags])
+        self.__db_mock.get_all_parameter_values_and_tags.assert_awaited_once_with(self.__ac_id)
+        self.__db_mock.get_parameter_value.assert_not_awaited()
 
 
 if __name__ == '__main__':
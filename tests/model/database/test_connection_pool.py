@@ -0,0 +1,82 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from sbaid.model.database.connection_pool import ConnectionPool
+
+
+class ConnectionPoolTest(unittest.TestCase):
+
+    def test_reuse(self):
+        asyncio.run(self.__test_reuse())
+
+    async def __test_reuse(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pool = ConnectionPool(os.path.join(directory, "test.db"))
+
+            async with pool.writer() as db:
+                await db.execute("CREATE TABLE test (value INTEGER)")
+            for i in range(10):
+                async with pool.writer() as db:
+                    await db.execute("INSERT INTO test VALUES (?)", (i,))
+            for _ in range(10):
+                async with pool.reader() as db:
+                    async with db.execute("SELECT COUNT(*) FROM test") as cursor:
+                        self.assertEqual((10,), await cursor.fetchone())
+
+            statistics = pool.statistics
+            self.assertEqual(2, statistics.created)
+            self.assertEqual(19, statistics.reused)
+            self.assertEqual(1, statistics.open_readers)
+            self.assertTrue(statistics.writer_open)
+
+            async with pool.reader() as db:
+                async with db.execute("PRAGMA journal_mode") as cursor:
+                    self.assertEqual(("wal",), await cursor.fetchone())
+                async with db.execute("PRAGMA foreign_keys") as cursor:
+                    self.assertEqual((1,), await cursor.fetchone())
+
+            await pool.close()
+            self.assertFalse(pool.statistics.writer_open)
+
+    def test_rollback(self):
+        asyncio.run(self.__test_rollback())
+
+    async def __test_rollback(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pool = ConnectionPool(os.path.join(directory, "test.db"))
+            async with pool.writer() as db:
+                await db.execute("CREATE TABLE test (value INTEGER)")
+
+            with self.assertRaises(KeyError):
+                async with pool.writer() as db:
+                    await db.execute("INSERT INTO test VALUES (1)")
+                    raise KeyError()
+
+            async with pool.reader() as db:
+                async with db.execute("SELECT COUNT(*) FROM test") as cursor:
+                    self.assertEqual((0,), await cursor.fetchone())
+
+            await pool.close()
+
+    def test_concurrent_readers(self):
+        asyncio.run(self.__test_concurrent_readers())
+
+    async def __test_concurrent_readers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pool = ConnectionPool(os.path.join(directory, "test.db"), max_readers=2)
+
+            async def read() -> None:
+                async with pool.reader() as db:
+                    await db.execute("SELECT 1")
+                    await asyncio.sleep(0.01)
+
+            await asyncio.gather(*(read() for _ in range(8)))
+            self.assertEqual(2, pool.statistics.created)
+            self.assertEqual(6, pool.statistics.reused)
+
+            await pool.close()
+            await read()
+            self.assertEqual(3, pool.statistics.created)
+            await pool.close()
@@ -1,11 +1,16 @@
 import asyncio
 import unittest
 
+import numpy as np
+
 from gi.repository import Gio, GLib
 from gi.repository.GLib import DateTime, TimeZone
 from gi.events import GLibEventLoopPolicy
 
 from sbaid.common.simulator_type import SimulatorType
+from sbaid.model.database.global_database import (VEHICLE_SPEED_DTYPE, RESULT_QUERY_FIELDS,
+                                                  build_query_columns, get_query_level,
+                                                  get_query_rows)
 from sbaid.model.database.global_sqlite import GlobalSQLite
 
 class GlobalSQLiteTest(unittest.TestCase):
@@ -21,6 +26,10 @@ class GlobalSQLiteTest(unittest.TestCase):
         await self.path()
         await self.remove()
         await self.add_entire_result()
+        await self.stream_result()
+        await self.delete_result_in_chunks()
+        await self.downsample_result()
+        await self.query_result()
         await self.multiple_dbs()
         await self.tags()
 
@@ -30,6 +39,7 @@ class GlobalSQLiteTest(unittest.TestCase):
         db = GlobalSQLite(file)
         await db.open()
         self.assertTrue(file.query_exists())
+        await db.close()
         await file.delete_async(0, None)
 
     async def remove(self) -> None:
@@ -49,6 +59,19 @@ class GlobalSQLiteTest(unittest.TestCase):
         all_projects = await db.get_all_projects()
         self.assertEqual(len(all_projects), 1)
 
+        project = (await db.get_all_projects_with_metadata())[0]
+        self.assertEqual(("my_project_id", "my_simulator_file_path", "my_project_file_path",
+                          None, None, None), project[:1] + project[2:])
+        created_at = GLib.DateTime.new_from_iso8601("2025-07-24T15:30:00+02")
+        last_opened = GLib.DateTime.new_from_iso8601("2025-07-25T15:30:00+02")
+        await db.set_project_metadata("my_project_id", "my_name", created_at, last_opened)
+        project = (await db.get_all_projects_with_metadata())[0]
+        self.assertEqual("my_name", project[4])
+        self.assertTrue(created_at.equal(project[5]))
+        self.assertTrue(last_opened.equal(project[6]))
+
+        await db.close()
+
         await file.delete_async(0, None)
 
     async def times(self):
@@ -60,10 +83,10 @@ class GlobalSQLiteTest(unittest.TestCase):
         await db.add_project("my_project_id", SimulatorType("0", "Vissim"),
                              "my_simulator_file_path",
                              "my_project_file_path")
-        veh_sn = [("lane_sn_id", 0, 120.0)]
-        lane_sn = [("lane_sn_id", "cs_sn_id", 0, 120.0, 5, 0, veh_sn)]
-        cs_sn = [("cs_sn_id", "sn_id", "cs_id", "cs_name", 0, lane_sn)]
-        snapshot_data = [("sn_id", "my_res_id", GLib.DateTime.new_now_local().format_iso8601(), cs_sn)]
+        speeds = np.array([120.0], dtype=VEHICLE_SPEED_DTYPE).tobytes()
+        lane_sn = [(1, 1, 0, 120.0, 5, 0, bytes([0]), speeds)]
+        cs_sn = [(1, 1, "cs_id", "cs_name", 0, lane_sn)]
+        snapshot_data = [(1, "my_res_id", GLib.DateTime.new_now_local().format_iso8601(), cs_sn)]
         await db.add_entire_result("my_res_id", "my_res_name", "my_project_name",
                                    GLib.DateTime.new_now_local(), snapshot_data)
         all_results = await db.get_all_results()
@@ -72,6 +95,8 @@ class GlobalSQLiteTest(unittest.TestCase):
         self.assertEqual(all_results[0][2], "my_project_name")
         self.assertEqual(all_results[0][3].format_iso8601(), revo_date.format_iso8601())
 
+        await db.close()
+
         await file.delete_async(0, None)
 
     async def tags(self):
@@ -94,6 +119,8 @@ class GlobalSQLiteTest(unittest.TestCase):
         all_tags = await db.get_all_tags()
         self.assertEqual(0, len(all_tags))
 
+        await db.close()
+
         await file.delete_async(0, None)
 
     async def foreign_key_error(self):
@@ -106,20 +133,23 @@ class GlobalSQLiteTest(unittest.TestCase):
         no_snapshots = await db.get_all_snapshots("doesn't exist")
         self.assertEqual(0, len(no_snapshots))
 
-        veh_sn = [("lane_sn_id", 0, 120.0)]
-        lane_sn = [("lane_sn_id", "cs_sn_id", 0, 120.0, 5, 0, veh_sn)]
-        cs_sn = [("cs_sn_id", "sn_id", "cs_id", "cs_name", 0, lane_sn)]
-        snapshot_data = [("sn_id", "my_res_id", GLib.DateTime.new_now_local().format_iso8601(), cs_sn)]
+        speeds = np.array([120.0], dtype=VEHICLE_SPEED_DTYPE).tobytes()
+        lane_sn = [(1, 1, 0, 120.0, 5, 0, bytes([0]), speeds)]
+        cs_sn = [(1, 1, "cs_id", "cs_name", 0, lane_sn)]
+        snapshot_data = [(1, "my_res_id", GLib.DateTime.new_now_local().format_iso8601(), cs_sn)]
         await db.add_entire_result("my_res_id", "my_res_name", "my_project_name",
                                    GLib.DateTime.new_now_local(), snapshot_data)
 
         self.assertEqual(1, len(await db.get_all_results()))
+        self.assertTrue((await db.get_all_results())[0][4])
         self.assertEqual(1, len(await db.get_all_snapshots("my_res_id")))
-        self.assertEqual(1, len(await db.get_all_lane_snapshots("cs_sn_id")))
-        self.assertEqual(1, len(await db.get_all_vehicle_snapshots("lane_sn_id")))
+        self.assertEqual(1, len(await db.get_all_lane_snapshots(1)))
+
+        types, speeds = await db.get_vehicle_snapshot_columns(1)
+        self.assertEqual(bytes([0]), types)
+        self.assertEqual([120.0], np.frombuffer(speeds, dtype=VEHICLE_SPEED_DTYPE).tolist())
 
-        vehs = await db.get_all_vehicle_snapshots("lane_sn_id")
-        self.assertEqual(120.0, vehs[0][1])
+        await db.close()
 
         await file.delete_async(0, None)
 
@@ -139,6 +169,200 @@ class GlobalSQLiteTest(unittest.TestCase):
         await db3.open()
         self.assertEqual(len(await db3.get_all_projects()), 2)
 
+        await db.close()
+        await db2.close()
+        await db3.close()
+
+        await file.delete_async(0, None)
+
+    async def stream_result(self):
+        file = Gio.File.new_for_path("test.db")
+        db = GlobalSQLite(file)
+        await db.open()
+
+        await db.begin_result("my_res_id", "my_res_name", "my_project_name",
+                              GLib.DateTime.new_now_local())
+        self.assertFalse((await db.get_all_results())[0][4])
+        await db.set_result_cache_key("my_res_id", "my_cache_key")
+        # only complete results are found by their cache key
+        self.assertEqual([], await db.get_result_ids_with_cache_key("my_cache_key"))
+
+        snapshot_data = []
+        for i in range(1, 4):
+            lane_sn = [(i, i, 0, 120.0, 1, 0, bytes([i % 2]),
+                        np.array([100.0 + i], dtype=VEHICLE_SPEED_DTYPE).tobytes())]
+            cs_sn = [(i, i, "cs_id", "cs_name", 0, lane_sn)]
+            snapshot_data.append((i, "my_res_id",
+                                  f"2025-07-24T15:3{i}:00+02", cs_sn))
+        await db.add_snapshots(snapshot_data[:2])
+        await db.add_snapshots(snapshot_data[2:])
+        self.assertEqual(snapshot_data, db.get_snapshot_range("my_res_id", 0, 10))
+
+        await db.complete_result("my_res_id")
+        self.assertTrue((await db.get_all_results())[0][4])
+        self.assertEqual(["my_res_id"], await db.get_result_ids_with_cache_key("my_cache_key"))
+        self.assertEqual([], await db.get_result_ids_with_cache_key("other_cache_key"))
+
+        await db.close()
+
+        await file.delete_async(0, None)
+
+    async def delete_result_in_chunks(self):
+        file = Gio.File.new_for_path("test.db")
+        db = GlobalSQLite(file)
+        await db.open()
+
+        snapshot_data = []
+        for i in range(1, 6):
+            lane_sn = [(i, i, 0, 120.0, 1, 0, bytes([0]) * 1000,
+                        np.zeros(1000, dtype=VEHICLE_SPEED_DTYPE).tobytes())]
+            snapshot_data.append((i, "my_res_id", f"2025-07-24T15:3{i}:00+02",
+                                  [(i, i, "cs_id", "cs_name", 0, lane_sn)]))
+        await db.add_entire_result("my_res_id", "my_res_name", "my_project_name",
+                                   GLib.DateTime.new_now_local(), snapshot_data)
+        await db.add_tag("tag_id", "tag_name")
+        await db.add_result_tag("result_tag_id", "my_res_id", "tag_id")
+        await db.set_result_cache_key("my_res_id", "my_cache_key")
+
+        self.assertEqual(5, await db.mark_result_deleted("my_res_id"))
+        self.assertEqual([], await db.get_result_ids_with_cache_key("my_cache_key"))
+        self.assertEqual([], await db.get_all_results())
+        self.assertEqual([], await db.get_all_results_with_tag_ids())
+        self.assertEqual(["my_res_id"], await db.get_deleted_result_ids())
+
+        self.assertEqual([2, 2, 1, 0], [await db.delete_result_chunk("my_res_id", 2)
+                                        for _ in range(4)])
+        self.assertEqual([], await db.get_deleted_result_ids())
+        self.assertEqual([], db.get_snapshot_range("my_res_id", 0, 10))
+        self.assertEqual(0, len(db.query_result("my_res_id", None, ["snapshot_id"])["snapshot_id"]))
+        self.assertEqual([], await db.get_result_tag_ids("my_res_id"))
+
+        self.assertGreater(await db.reclaim_space(1000), 0)
+        while await db.reclaim_space(1000):
+            pass
+
+        await db.close()
+
+        await file.delete_async(0, None)
+
+    async def downsample_result(self):
+        file = Gio.File.new_for_path("test.db")
+        db = GlobalSQLite(file)
+        await db.open()
+
+        snapshot_data = []
+        for i in range(1, 6):
+            lane_sn = [(i, i, 0, 120.0, 1, 0, bytes([0]) * 1000,
+                        np.zeros(1000, dtype=VEHICLE_SPEED_DTYPE).tobytes())]
+            snapshot_data.append((i, "my_res_id", f"2025-07-24T15:3{i}:00+02",
+                                  [(i, i, "cs_id", "cs_name", 0, lane_sn)]))
+        await db.add_entire_result("my_res_id", "my_res_name", "my_project_name",
+                                   GLib.DateTime.new_now_local(), snapshot_data)
+
+        self.assertEqual([2, 2, 1, 0], [await db.drop_vehicle_data("my_res_id", 2)
+                                        for _ in range(4)])
+        lanes = [snapshot[3][0][5][0] for snapshot in db.get_snapshot_range("my_res_id", 0, 10)]
+        self.assertEqual([(120.0, 1, b"", b"")] * 5,
+                         [(lane[3], lane[4], lane[6], lane[7]) for lane in lanes])
+        self.assertEqual(5, len(db.query_result("my_res_id", None, ["snapshot_id"])["snapshot_id"]))
+
+        self.assertEqual(0, await db.delete_snapshots("other_res_id", [1]))
+        self.assertEqual(2, await db.delete_snapshots("my_res_id", [2, 4]))
+        self.assertEqual([1, 3, 5], [snapshot[0] for snapshot in
+                                     await db.get_all_snapshots("my_res_id")])
+        self.assertEqual([1, 3, 5],
+                         db.query_result("my_res_id", None, ["snapshot_id"])["snapshot_id"].tolist())
+
+        size = await db.get_database_size()
+        while await db.reclaim_space(1000):
+            pass
+        self.assertLess(await db.get_database_size(), size)
+
+        await db.delete_result("my_res_id")
+        await db.close()
+
+        await file.delete_async(0, None)
+
+    async def query_result(self):
+        file = Gio.File.new_for_path("test.db")
+        db = GlobalSQLite(file)
+        await db.open()
+
+        snapshot_data = []
+        for i in range(1, 3):
+            cs_sn = []
+            for j, cs_id in enumerate(["cs_b", "cs_a"]):
+                cs_snapshot_id = 2 * i + j
+                lane_sn = [(2 * cs_snapshot_id + lane, cs_snapshot_id, lane, 100.0 + lane, i,
+                            lane, bytes([lane]) * i,
+                            np.full(i, 10.0 * i + lane, dtype=VEHICLE_SPEED_DTYPE).tobytes())
+                           for lane in (1, 0)]
+                cs_sn.append((cs_snapshot_id, i, cs_id, cs_id + "_name", j, lane_sn))
+            snapshot_data.append((i, "my_res_id", f"2025-07-24T15:3{i}:00+02", cs_sn))
+        await db.add_entire_result("my_res_id", "my_res_name", "my_project_name",
+                                   GLib.DateTime.new_now_local(), snapshot_data)
+
+        columns = db.query_result("my_res_id", ["cs_a"], ["snapshot_id", "date",
+                                                          "average_speed", "traffic_volume"])
+        self.assertEqual([1, 2], columns["snapshot_id"].tolist())
+        self.assertEqual(["2025-07-24T15:31:00+02", "2025-07-24T15:32:00+02"],
+                         columns["date"].tolist())
+        self.assertEqual([100.5, 100.5], columns["average_speed"].tolist())
+        self.assertEqual([2, 4], columns["traffic_volume"].tolist())
+
+        columns = db.query_result("my_res_id", None, ["cross_section_id", "lane_number"])
+        self.assertEqual(["cs_b", "cs_b", "cs_a", "cs_a"] * 2,
+                         columns["cross_section_id"].tolist())
+        self.assertEqual([0, 1] * 4, columns["lane_number"].tolist())
+
+        second = GLib.DateTime.new_from_iso8601("2025-07-24T13:32:00Z")
+        columns = db.query_result("my_res_id", ["cs_a"], ["snapshot_id", "vehicle_speed"],
+                                  start=second)
+        self.assertEqual([2, 2, 2, 2], columns["snapshot_id"].tolist())
+        self.assertEqual([20.0, 20.0, 21.0, 21.0], columns["vehicle_speed"].tolist())
+        columns = db.query_result("my_res_id", None, ["vehicle_type"],
+                                  end=second.add_seconds(-1))
+        self.assertEqual([0, 1, 0, 1], columns["vehicle_type"].tolist())
+        columns = db.query_result("my_res_id", ["cs_b"], ["snapshot_id"],
+                                  start=second, end=second)
+        self.assertEqual([2], columns["snapshot_id"].tolist())
+
+        # the window and the order follow the time, not the text of the dates
+        dates = ["2025-10-26T02:59:59.5+02", "2025-10-26T02:00:00+01", "2025-10-26T02:00:00.25+01"]
+        await db.add_entire_result("dst_res_id", "dst_res_name", "my_project_name",
+                                   GLib.DateTime.new_now_local(),
+                                   [(i, "dst_res_id", date, [(i, i, "cs_a", "cs_a_name", 0, [])])
+                                    for i, date in enumerate(dates)])
+        columns = db.query_result("dst_res_id", None, ["date"])
+        self.assertEqual(dates, columns["date"].tolist())
+        columns = db.query_result("dst_res_id", None, ["date"],
+                                  start=GLib.DateTime.new_from_iso8601("2025-10-26T01:00:00Z"))
+        self.assertEqual(dates[1:], columns["date"].tolist())
+
+        # the database and the rows built from snapshot data agree
+        for fields in (["average_speed"], ["lane_average_speed"], list(RESULT_QUERY_FIELDS)):
+            expected = build_query_columns(
+                get_query_rows(snapshot_data, ["cs_a"], get_query_level(fields)), fields)
+            columns = db.query_result("my_res_id", ["cs_a"], fields)
+            self.assertEqual({field: values.tolist() for field, values in expected.items()},
+                             {field: values.tolist() for field, values in columns.items()})
+
+        # streaming returns the same columns in chunks of rows
+        chunks = [chunk async for chunk in db.stream_query_result(
+            "my_res_id", None, ["lane_number", "vehicle_speed"], chunk_size=3)]
+        self.assertEqual(3, len(chunks))  # 8 lanes
+        columns = db.query_result("my_res_id", None, ["lane_number", "vehicle_speed"])
+        self.assertEqual(columns["vehicle_speed"].tolist(),
+                         np.concatenate([chunk["vehicle_speed"] for chunk in chunks]).tolist())
+        chunks = [chunk async for chunk in db.stream_query_result(
+            "my_res_id", ["cs_a"], ["date"], start=second)]
+        self.assertEqual([["2025-07-24T15:32:00+02"]], [chunk["date"].tolist() for chunk in chunks])
+
+        with self.assertRaises(ValueError):
+            db.query_result("my_res_id", None, ["speed"])
+
+        await db.close()
+
         await file.delete_async(0, None)
 
     async def add_entire_result(self):
@@ -148,31 +372,62 @@ class GlobalSQLiteTest(unittest.TestCase):
         await db.add_project("my_project_id", SimulatorType("0", "Vissim"),
                              "my_simulator_file_path", "my_project_file_path")
 
-        veh_sn = [("lane_sn_id", 0, 120.0)]
-        lane_sn = [("lane_sn_id", "cs_sn_id", 0, 120.0, 5, 0, veh_sn)]
-        cs_sn = [("cs_sn_id", "sn_id", "cs_id", "cs_name", 0, lane_sn)]
-        snapshot_data = [("sn_id", "my_res_id", GLib.DateTime.new_now_local().format_iso8601(), cs_sn)]
+        speeds = np.array([120.0], dtype=VEHICLE_SPEED_DTYPE).tobytes()
+        lane_sn = [(1, 1, 0, 120.0, 5, 0, bytes([0]), speeds)]
+        cs_sn = [(1, 1, "cs_id", "cs_name", 0, lane_sn)]
+        snapshot_data = [(1, "my_res_id", GLib.DateTime.new_now_local().format_iso8601(), cs_sn)]
         await db.add_entire_result("my_res_id", "my_res_name", "my_project_name",
                                    GLib.DateTime.new_now_local(), snapshot_data)
 
         self.assertEqual(1, len(await db.get_all_results()))
         self.assertEqual(1, len(await db.get_all_snapshots("my_res_id")))
-        self.assertEqual(1, len(await db.get_all_lane_snapshots("cs_sn_id")))
-        self.assertEqual(1, len(await db.get_all_vehicle_snapshots("lane_sn_id")))
+        self.assertEqual(1, len(await db.get_all_lane_snapshots(1)))
 
-        vehs = await db.get_all_vehicle_snapshots("lane_sn_id")
-        self.assertEqual(120.0, vehs[0][1])
+        types, speeds = await db.get_vehicle_snapshot_columns(1)
+        self.assertEqual(bytes([0]), types)
+        self.assertEqual([120.0], np.frombuffer(speeds, dtype=VEHICLE_SPEED_DTYPE).tolist())
 
-        all_cs_sn = await db.get_all_cross_section_snapshots("sn_id")
+        all_cs_sn = await db.get_all_cross_section_snapshots(1)
         self.assertEqual(1, len(all_cs_sn))
 
+        self.assertEqual([], db.get_snapshot_range("doesn't exist", 0, 10))
+        self.assertEqual(1, db.get_snapshot_count("my_res_id"))
+        self.assertEqual(snapshot_data, db.get_snapshot_range("my_res_id", 0, 10))
+        self.assertEqual([], db.get_snapshot_range("my_res_id", 1, 10))
+
+        fields = ["snapshot_id", "date", "cross_section_id", "cross_section_name", "b_display",
+                  "average_speed", "traffic_volume", "lane_average_speed",
+                  "lane_traffic_volume", "a_display"]
+        columns = db.query_result("my_res_id", ["cs_id"], fields)
+        self.assertEqual([[1], [snapshot_data[0][2]], ["cs_id"], ["cs_name"], [0], [120.0], [5],
+                          [120.0], [5], [0]],
+                         [values.tolist() for values in columns.values()])
+        self.assertEqual(0, len(db.query_result("my_res_id", ["other_cs_id"],
+                                                ["snapshot_id"])["snapshot_id"]))
+
+        # snapshot ids only need to be unique within a result, the database assigns new ones
+        await db.add_entire_result("other_res_id", "other_res_name", "my_project_name",
+                                   GLib.DateTime.new_now_local(),
+                                   [(1, "other_res_id", snapshot_data[0][2], cs_sn)])
+        other = db.get_snapshot_range("other_res_id", 0, 10)[0]
+        self.assertEqual((2, "other_res_id"), other[:2])
+        self.assertEqual((2, 2), other[3][0][:2])
+        self.assertEqual((2, 2), other[3][0][5][0][:2])
+        await db.delete_result("other_res_id")
 
 
         # test result tag
         await db.add_tag("tag_id", "tag_name")
         await db.add_result_tag("new_result_tag_id", "my_res_id", "tag_id")
         all_res_tag_ids_for_res = await db.get_result_tag_ids("my_res_id")
-        self.assertEqual(1, len(all_res_tag_ids_for_res))
+        self.assertEqual(["tag_id"], all_res_tag_ids_for_res)
+        await db.add_entire_result("untagged_res_id", "untagged_res_name", "my_project_name",
+                                   GLib.DateTime.new_now_local(), [])
+        results = await db.get_all_results_with_tag_ids()
+        self.assertEqual([("my_res_id", "my_res_name", ["tag_id"]),
+                          ("untagged_res_id", "untagged_res_name", [])],
+                         [(result[0], result[1], result[5]) for result in results])
+        await db.delete_result("untagged_res_id")
 
         # test result name
         await db.set_result_name("my_res_id", "new_result_name")
@@ -182,5 +437,8 @@ class GlobalSQLiteTest(unittest.TestCase):
         await db.delete_result("my_res_id")
         all_results = await db.get_all_results()
         self.assertEqual(0, len(all_results))
+        self.assertEqual(0, len(db.query_result("my_res_id", None, ["snapshot_id"])["snapshot_id"]))
+
+        await db.close()
 
         await file.delete_async(0, None)
@@ -0,0 +1,160 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import aiosqlite
+import numpy as np
+from gi.repository import Gio
+
+from sbaid.model.database.global_database import VEHICLE_SPEED_DTYPE
+from sbaid.model.database.global_migrations import MIGRATIONS
+from sbaid.model.database.global_sqlite import GlobalSQLite
+from sbaid.model.database.migrations import (migrate, get_schema_version,
+                                              SchemaVersionError)
+from sbaid.model.database.project_migrations import MIGRATIONS as PROJECT_MIGRATIONS
+from sbaid.model.database.project_sqlite import ProjectSQLite
+
+
+class MigrationsTest(unittest.TestCase):
+
+    def test_migrate(self):
+        asyncio.run(self.__test_migrate())
+
+    async def __test_migrate(self):
+        applied = []
+
+        async def first(db):
+            applied.append(1)
+            await db.execute("CREATE TABLE first (value INTEGER)")
+
+        async def second(db):
+            applied.append(2)
+            await db.execute("CREATE TABLE second (value INTEGER)")
+
+        async def failing(db):
+            await db.execute("CREATE TABLE third (value INTEGER)")
+            raise RuntimeError()
+
+        with tempfile.TemporaryDirectory() as directory:
+            async with aiosqlite.connect(os.path.join(directory, "test.db")) as db:
+                self.assertEqual(1, await migrate(db, [first]))
+                self.assertEqual(2, await migrate(db, [first, second]))
+                self.assertEqual(2, await migrate(db, [first, second]))
+                self.assertEqual([1, 2], applied)
+
+                with self.assertRaises(RuntimeError):
+                    await migrate(db, [first, second, failing])
+                self.assertEqual(2, await get_schema_version(db))
+                async with db.execute("SELECT name FROM sqlite_master WHERE name = 'third'") \
+                        as cursor:
+                    self.assertIsNone(await cursor.fetchone())
+
+                with self.assertRaises(SchemaVersionError):
+                    await migrate(db, [first])
+
+    def test_upgrade_existing_global_database(self):
+        asyncio.run(self.__test_upgrade_existing_global_database())
+
+    async def __test_upgrade_existing_global_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "global_db")
+
+            # Create a database with the schema from before the migrations existed.
+            with mock.patch("sbaid.model.database.global_sqlite.MIGRATIONS", []):
+                db = GlobalSQLite(Gio.File.new_for_path(path))
+                await db.open()
+                await db.close()
+            with sqlite3.connect(path) as connection:
+                connection.executescript("""
+                PRAGMA auto_vacuum = NONE;
+                VACUUM;
+                INSERT INTO result VALUES ('result', 'name', 'project', '2025-07-24T15:30:00+02');
+                INSERT INTO snapshot VALUES ('snapshot', 'result', '2025-07-24T15:30:00+02');
+                INSERT INTO cross_section_snapshot VALUES ('cs', 'snapshot', 'cs_id', 'name', 0);
+                INSERT INTO lane_snapshot VALUES ('lane', 'cs', 0, 80.0, 3, 0);
+                INSERT INTO lane_snapshot VALUES ('empty_lane', 'cs', 1, 0.0, 0, 0);
+                INSERT INTO vehicle_snapshot VALUES ('lane', 1, 70.5);
+                INSERT INTO vehicle_snapshot VALUES ('lane', 0, 90.25);
+                INSERT INTO vehicle_snapshot VALUES ('lane', 0, 80.0);
+                INSERT INTO snapshot VALUES ('orphan', 'deleted', '2025-07-24T15:30:00+02');""")
+            connection.close()
+
+            db = GlobalSQLite(Gio.File.new_for_path(path))
+            await db.open()
+            snapshot = db.get_snapshot_range("result", 0, 10)[0]
+            lanes = snapshot[3][0][5]
+            self.assertEqual((1, "result"), snapshot[:2])
+            self.assertEqual((1, 1), snapshot[3][0][:2])
+            self.assertEqual([(1, 1), (2, 1)], [lane[:2] for lane in lanes])
+            self.assertEqual([bytes([1, 0, 0]), b""], [lane[6] for lane in lanes])
+            self.assertEqual([70.5, 90.25, 80.0],
+                             np.frombuffer(lanes[0][7], dtype=VEHICLE_SPEED_DTYPE).tolist())
+            self.assertTrue((await db.get_all_results())[0][4])
+            columns = db.query_result("result", ["cs_id"], ["snapshot_id", "date",
+                                                            "cross_section_id",
+                                                            "cross_section_name", "b_display",
+                                                            "average_speed", "traffic_volume"])
+            self.assertEqual([1, "2025-07-24T15:30:00+02", "cs_id", "name", 0, 40.0, 3],
+                             [values[0] for values in columns.values()])
+            columns = db.query_result("result", ["cs_id"], ["lane_traffic_volume"])
+            self.assertEqual([3, 0], columns["lane_traffic_volume"].tolist())
+            self.assertEqual(0, db.get_snapshot_count("deleted"))
+            with sqlite3.connect(path) as connection:
+                self.assertEqual(0, connection.execute("PRAGMA auto_vacuum").fetchone()[0])
+            connection.close()
+            await db.reclaim_space(1000)
+            await db.close()
+
+            with sqlite3.connect(path) as connection:
+                version = connection.execute("PRAGMA user_version").fetchone()[0]
+                self.assertEqual(len(MIGRATIONS), version)
+                auto_vacuum = connection.execute("PRAGMA auto_vacuum").fetchone()[0]
+                self.assertEqual(2, auto_vacuum)  # INCREMENTAL
+                self.assertEqual((1753363800000000,), connection.execute(
+                    "SELECT timestamp FROM cross_section_aggregate").fetchone())
+                plan = connection.execute("EXPLAIN QUERY PLAN SELECT id, date FROM snapshot "
+                                          "WHERE result_id = ?", ("id",)).fetchall()
+                self.assertIn("snapshot_result_id_date", str(plan))
+                self.assertIsNone(connection.execute(
+                    "SELECT name FROM sqlite_master WHERE name = 'vehicle_snapshot'").fetchone())
+                for table in ("snapshot", "cross_section_snapshot", "lane_snapshot"):
+                    columns = connection.execute(f"PRAGMA table_info({table})").fetchall()
+                    self.assertEqual(("id", "INTEGER", 1),
+                                     (columns[0][1], columns[0][2], columns[0][5]))
+            connection.close()
+
+    def test_upgrade_existing_project_database(self):
+        asyncio.run(self.__test_upgrade_existing_project_database())
+
+    async def __test_upgrade_existing_project_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "db")
+
+            with mock.patch("sbaid.model.database.project_sqlite.MIGRATIONS", []):
+                db = ProjectSQLite(Gio.File.new_for_path(path))
+                await db.open()
+                await db.close()
+            with sqlite3.connect(path) as connection:
+                connection.executescript("""
+                INSERT INTO parameter VALUES ('config', 'global', NULL, '''old''');
+                INSERT INTO parameter VALUES ('config', 'global', NULL, '''new''');
+                INSERT INTO parameter VALUES ('config', 'cs', 'cs_id', '''value''');""")
+            connection.close()
+
+            db = ProjectSQLite(Gio.File.new_for_path(path))
+            await db.open()
+            self.assertCountEqual([("global", None, "new"), ("cs", "cs_id", "value")],
+                                  [(name, cs_id, value.get_string()) for name, cs_id, value, _
+                                   in await db.get_all_parameter_values_and_tags("config")])
+            await db.close()
+
+            with sqlite3.connect(path) as connection:
+                version = connection.execute("PRAGMA user_version").fetchone()[0]
+                self.assertEqual(len(PROJECT_MIGRATIONS), version)
+                with self.assertRaises(sqlite3.IntegrityError):
+                    connection.execute(
+                        "INSERT INTO parameter VALUES ('config', 'global', NULL, 'duplicate')")
+            connection.close()
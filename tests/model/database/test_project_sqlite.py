@@ -52,6 +52,8 @@ class ProjectSQLiteTest(unittest.TestCase):
         new_last_opened = await db.get_last_opened()
         self.assertTrue(GLib.DateTime.compare(new_last_opened, created_at) == 1)
 
+        await db.close()
+
         file.delete_async(0, None)
 
     async def algorithm_configuration(self):
@@ -98,6 +100,8 @@ class ProjectSQLiteTest(unittest.TestCase):
         algo_config = await db.get_algorithm_configuration("my_algorithm_configuration_id")
         self.assertIsNotNone(algo_config)
 
+        await db.close()
+
         file.delete_async(0, None)
 
     async def parameters(self):
@@ -127,6 +131,37 @@ class ProjectSQLiteTest(unittest.TestCase):
 
         self.assertEqual(new_value, await db.get_parameter_value("my_algorithm_configuration_id", "my_parameter_name", None))
 
+        # values are upserted, also for parameters that were never added
+        await db.set_parameter_value("my_algorithm_configuration_id", "my_cs_parameter_name",
+                                     "my_cs_id", new_value)
+        await db.set_parameter_value("my_algorithm_configuration_id", "my_cs_parameter_name",
+                                     "my_cs_id", value_to_be_inserted)
+        await db.add_tag("my_tag_id", "my_tag_name")
+        await db.add_parameter_tag("my_parameter_tag_id", "my_cs_parameter_name",
+                                   "my_algorithm_configuration_id", "my_cs_id", "my_tag_id")
+        await db.add_parameter_tag("my_other_parameter_tag_id", "my_tagged_parameter_name",
+                                   "my_algorithm_configuration_id", None, "my_tag_id")
+        self.assertCountEqual([("my_parameter_name", None), ("my_cs_parameter_name", "my_cs_id")],
+                              await db.get_all_parameters("my_algorithm_configuration_id"))
+        self.assertCountEqual([
+            ("my_parameter_name", None, new_value, []),
+            ("my_cs_parameter_name", "my_cs_id", value_to_be_inserted,
+             [("my_tag_id", "my_tag_name")]),
+            ("my_tagged_parameter_name", None, None, [("my_tag_id", "my_tag_name")]),
+        ], await db.get_all_parameter_values_and_tags("my_algorithm_configuration_id"))
+
+        # the parameters of a cross section and their tags are deleted with it
+        await db.add_parameter_tag("my_cs_parameter_tag_id", "my_untouched_parameter_name",
+                                   "my_algorithm_configuration_id", "my_other_cs_id", "my_tag_id")
+        await db.remove_cross_section("my_cs_id")
+        await db.remove_cross_section("my_other_cs_id")
+        self.assertEqual([("my_parameter_name", None)],
+                         await db.get_all_parameters("my_algorithm_configuration_id"))
+        self.assertEqual([], await db.get_all_tag_ids_for_parameter(
+            "my_algorithm_configuration_id", "my_cs_parameter_name", "my_cs_id"))
+
+        await db.close()
+
         file.delete_async(0, None)
 
 
@@ -158,10 +193,18 @@ class ProjectSQLiteTest(unittest.TestCase):
 
         self.assertEqual(await db.get_cross_section_name("my_cross_section_id_2"), "my_cross_section_name_2")
 
+        await db.add_cross_section("my_cross_section_id_3")
+        self.assertCountEqual(await db.get_all_cross_sections(), [
+            ("my_cross_section_id", "my_cross_section_name", False, True),
+            ("my_cross_section_id_2", "my_cross_section_name_2", True, False),
+            ("my_cross_section_id_3", None, None, None)])
+
         await db.remove_cross_section("my_cross_section_id_2")
 
         self.assertEqual(await db.get_cross_section_name("my_cross_section_id_2"), None)
 
+        await db.close()
+
         file.delete_async(0, None)
 
 
@@ -203,6 +246,8 @@ class ProjectSQLiteTest(unittest.TestCase):
         all_parameter_tag_ids = await db.get_all_tag_ids_for_parameter("my_algorithm_configuration_id", "my_parameter_name", None)
         self.assertEqual(len(all_parameter_tag_ids), 0)
 
+        await db.close()
+
         file.delete_async(0, None)
 
     async def foreign_key_error(self):
@@ -225,10 +270,13 @@ class ProjectSQLiteTest(unittest.TestCase):
             except ForeignKeyError:
                 self.assertTrue(True)
 
+                await db.close()
+
                 file.delete_async(0, None)
                 return
 
             self.assertTrue(False)
+        await db.close()
         file.delete_async(0, None)
 
     async def already_existed(self) -> None:
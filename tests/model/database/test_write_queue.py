@@ -0,0 +1,88 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from sbaid.model.database.connection_pool import ConnectionPool
+from sbaid.model.database.write_queue import WriteQueue
+
+
+class WriteQueueTest(unittest.TestCase):
+
+    def test_batching_and_order(self):
+        asyncio.run(self.__test_batching_and_order())
+
+    async def __test_batching_and_order(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pool = ConnectionPool(os.path.join(directory, "test.db"))
+            async with pool.writer() as db:
+                await db.execute("CREATE TABLE test (key TEXT PRIMARY KEY, value INTEGER)")
+            queue = WriteQueue(pool, max_batch=4)
+
+            futures = [queue.write(("INSERT OR REPLACE INTO test VALUES ('key', ?)", (i,)))
+                       for i in range(10)]
+            self.assertEqual(10, queue.statistics.queue_depth)
+            self.assertEqual([1] * 10, await asyncio.gather(*futures))
+
+            async with pool.reader() as db:
+                async with db.execute("SELECT value FROM test WHERE key = 'key'") as cursor:
+                    self.assertEqual((9,), await cursor.fetchone())
+
+            statistics = queue.statistics
+            self.assertEqual(0, statistics.queue_depth)
+            self.assertEqual(10, statistics.writes)
+            self.assertEqual(3, statistics.transactions)
+            self.assertEqual(0, statistics.failed)
+            self.assertGreater(statistics.max_latency, 0)
+            self.assertLessEqual(statistics.average_latency, statistics.max_latency)
+            await queue.close()
+            await pool.close()
+
+    def test_failing_write(self):
+        asyncio.run(self.__test_failing_write())
+
+    async def __test_failing_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pool = ConnectionPool(os.path.join(directory, "test.db"))
+            async with pool.writer() as db:
+                await db.execute("CREATE TABLE test (value INTEGER UNIQUE)")
+            queue = WriteQueue(pool)
+
+            first = queue.write(("INSERT INTO test VALUES (1)", ()))
+            failing = queue.write(("INSERT INTO test VALUES (2)", ()),
+                                  ("INSERT INTO test VALUES (1)", ()))
+            last = queue.write(("INSERT INTO test VALUES (3)", ()))
+            self.assertEqual(1, await first)
+            with self.assertRaises(sqlite3.IntegrityError):
+                await failing
+            self.assertEqual(1, await last)
+
+            # the failing write is rolled back as a whole, the others are committed
+            async with pool.reader() as db:
+                async with db.execute("SELECT value FROM test ORDER BY value") as cursor:
+                    self.assertEqual([(1,), (3,)], list(await cursor.fetchall()))
+            self.assertEqual(1, queue.statistics.failed)
+            self.assertEqual(1, queue.statistics.transactions)
+            await pool.close()
+
+    def test_close(self):
+        asyncio.run(self.__test_close())
+
+    async def __test_close(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pool = ConnectionPool(os.path.join(directory, "test.db"))
+            async with pool.writer() as db:
+                await db.execute("CREATE TABLE test (value INTEGER)")
+            queue = WriteQueue(pool, batch_interval=60)
+
+            for i in range(3):
+                queue.write(("INSERT INTO test VALUES (?)", (i,)))
+            await asyncio.wait_for(queue.close(), 5)
+            with self.assertRaises(RuntimeError):
+                queue.write(("INSERT INTO test VALUES (3)", ()))
+
+            async with pool.reader() as db:
+                async with db.execute("SELECT COUNT(*) FROM test") as cursor:
+                    self.assertEqual((3,), await cursor.fetchone())
+            await pool.close()
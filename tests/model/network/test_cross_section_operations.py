@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import AsyncMock
 from unittest import mock
 import asyncio
 from typing import cast
@@ -14,7 +15,8 @@ from sbaid.common.cross_section_type import CrossSectionType
 
 class CrossSectionOperationsTest(unittest.TestCase):
     __mock_simulator = MockSimulator()
-    __network = Network(__mock_simulator, unittest.mock.Mock())
+    __network = Network(__mock_simulator,
+                        unittest.mock.Mock(get_all_cross_sections=AsyncMock(return_value=[])))
     __sim_cross_section = SimulatorCrossSection()
     __mock_cross_section = MockCrossSection("test_id",
                                             "start_name",
@@ -15,7 +15,8 @@ from tests.mock_simulator import MockSimulator
 
 class NetworkTest(unittest.TestCase):
     __mock_simulator = MockSimulator()
-    __network = Network(__mock_simulator, unittest.mock.Mock())
+    __network = Network(__mock_simulator,
+                        unittest.mock.Mock(get_all_cross_sections=AsyncMock(return_value=[])))
 
     def test_factory_singleton(self):
         first_instance = ParserFactory()
@@ -35,6 +36,28 @@ class NetworkTest(unittest.TestCase):
                          self.__network.cross_sections.get_n_items())
         self.assertEqual(self.__network.cross_sections.get_item(1).name, "cross_section_1")
 
+    def test_load_prefetched(self):
+        asyncio.run(self._test_load_prefetched())
+
+    async def _test_load_prefetched(self):
+        """Expected behavior: the metadata of all cross sections is loaded in one query
+        and no single-row queries are made for the cross sections existing on load."""
+        project_db = unittest.mock.Mock()
+        project_db.get_all_cross_sections = AsyncMock(return_value=[
+            ("cs_1_id", "database_name", None, True), ("removed_id", "removed_name", None, None)])
+        project_db.get_cross_section_name = AsyncMock()
+        network = Network(MockSimulator(), project_db)
+        await network.load()
+        first, second = network.cross_sections.get_item(0), network.cross_sections.get_item(1)
+        await asyncio.sleep(0)
+
+        self.assertEqual(first.name, "cross_section_0")
+        self.assertEqual(second.name, "database_name")
+        self.assertFalse(second.hard_shoulder_active)
+        self.assertTrue(second.b_display_active)
+        project_db.get_all_cross_sections.assert_awaited_once()
+        project_db.get_cross_section_name.assert_not_awaited()
+
     @unittest.skipUnless(sys.platform.startswith("win"), "Requires Windows")
     def test_import_from_file(self):
         asyncio.run(self._test_import_from_file())
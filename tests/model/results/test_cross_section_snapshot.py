@@ -2,8 +2,6 @@
 import unittest
 import uuid
 
-from gi.repository import GLib, Gio
-from sbaid.model.database.global_sqlite import GlobalSQLite
 from sbaid.model.results.cross_section_snapshot import CrossSectionSnapshot
 from sbaid.model.results.lane_snapshot import LaneSnapshot
 from sbaid.common.b_display import BDisplay
@@ -12,21 +10,15 @@ from sbaid.common.a_display import ADisplay
 class CrossSectionSnapshotTest(unittest.TestCase):
     """This class tests the CrossSectionSnapshot class."""
 
-    __gio_file = Gio.File.new_for_path("placeholder_path.db")
-    __global_db = GlobalSQLite(__gio_file)
-
-    cross_section_snapshot = CrossSectionSnapshot(GLib.uuid_string_random(),
-                                                  GLib.uuid_string_random(),
+    cross_section_snapshot = CrossSectionSnapshot(1, 1,
                                                   "Julia",
                                                   str(uuid.uuid4()),
-                                                  BDisplay.SNOW, __global_db)
-
-    lane_snapshot_1 = LaneSnapshot(GLib.uuid_string_random(),
-                                   GLib.uuid_string_random(), 0,
-                                   70.6, 9, ADisplay.SPEED_LIMIT_100, GlobalSQLite(__gio_file))
-    lane_snapshot_2 = LaneSnapshot(GLib.uuid_string_random(),
-                                   GLib.uuid_string_random(), 1,
-                                   99.3, 5, ADisplay.SPEED_LIMIT_100, GlobalSQLite(__gio_file))
+                                                  BDisplay.SNOW)
+
+    lane_snapshot_1 = LaneSnapshot(1, 1, 0,
+                                   70.6, 9, ADisplay.SPEED_LIMIT_100)
+    lane_snapshot_2 = LaneSnapshot(1, 2, 1,
+                                   99.3, 5, ADisplay.SPEED_LIMIT_100)
 
     def test_add_lane_snapshot(self):
         """Tests adding lane snapshots."""
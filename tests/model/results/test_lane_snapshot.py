@@ -1,7 +1,5 @@
 """This module contains unittests for the LaneSnapshot class."""
 import unittest
-from gi.repository import GLib, Gio
-from sbaid.model.database.global_sqlite import GlobalSQLite
 from sbaid.model.results.lane_snapshot import LaneSnapshot
 from sbaid.model.results.vehicle_snapshot import VehicleSnapshot
 from sbaid.common.a_display import ADisplay
@@ -10,23 +8,22 @@ from sbaid.common.vehicle_type import VehicleType
 
 class LaneSnapshotTest(unittest.TestCase):
     """This class tests the LaneSnapshot class."""
-    __gio_file = Gio.File.new_for_path("placeholder_path.db")
-    __global_placeholder_db = GlobalSQLite(__gio_file)
 
     def test_add_vehicle_snapshot(self):
         """Test adding a vehicle snapshot."""
 
         # Initialize valid instance of LaneSnapshot and VehicleSnapshot
-        lane_snapshot = LaneSnapshot(GLib.uuid_string_random(),
-                                     GLib.uuid_string_random(), 4,
-                                       70.6, 9, ADisplay.SPEED_LIMIT_100,
-                                     self.__global_placeholder_db)
+        lane_snapshot = LaneSnapshot(1, 1, 4,
+                                       70.6, 9, ADisplay.SPEED_LIMIT_100)
 
-        vehicle_snapshot_1 = VehicleSnapshot(GLib.uuid_string_random(), VehicleType.CAR, 80.324)
+        vehicle_snapshot_1 = VehicleSnapshot(1, VehicleType.CAR, 80.324)
 
         # Add vehicle_snapshot to list in lane_snapshot
         lane_snapshot.add_vehicle_snapshot(vehicle_snapshot_1)
 
-        # Assertions
-        self.assertIn(vehicle_snapshot_1, lane_snapshot.vehicle_snapshots)
+        # Assertions, the list creates a new vehicle snapshot with the same values
         self.assertEqual(len(lane_snapshot.vehicle_snapshots), 1)
+        vehicle_snapshot_2 = lane_snapshot.vehicle_snapshots[0]
+        self.assertEqual(vehicle_snapshot_1.vehicle_type, vehicle_snapshot_2.vehicle_type)
+        self.assertAlmostEqual(vehicle_snapshot_1.speed, vehicle_snapshot_2.speed, places=4)
+        self.assertEqual(lane_snapshot.id, vehicle_snapshot_2.lane_snapshot_id)
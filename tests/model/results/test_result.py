@@ -1,5 +1,9 @@
 """This module contains unittests for the Result class."""
+import asyncio
 import unittest
+from unittest import mock
+
+import numpy as np
 from gi.repository import GLib, Gio
 from sbaid.model.database.global_sqlite import GlobalSQLite
 from sbaid.model.results.result import Result
@@ -43,8 +47,8 @@ class ResultClassTestCase(unittest.TestCase):
         now = GLib.DateTime.new_now_local()
         result = Result(GLib.uuid_string_random(), "my_project", now, self.__global_db)
 
-        my_snapshot = Snapshot(GLib.uuid_string_random(), now, self.__global_db)
-        my_snapshot2 = Snapshot(GLib.uuid_string_random(), now, self.__global_db)
+        my_snapshot = Snapshot(1, now)
+        my_snapshot2 = Snapshot(2, now)
 
         result.add_snapshot(my_snapshot)
         result.add_snapshot(my_snapshot2)
@@ -53,7 +57,38 @@ class ResultClassTestCase(unittest.TestCase):
         self.assertIn(my_snapshot, result.snapshots)
         self.assertIn(my_snapshot2, result.snapshots)
 
+    def test_reload_snapshots(self):
+        """Test that snapshots held in memory are replaced by the stored ones."""
+        now = GLib.DateTime.new_now_local()
+        global_db = mock.Mock()
+        global_db.get_snapshot_count.return_value = 0
+        result = Result(GLib.uuid_string_random(), "my_project", now, global_db)
+        result.add_snapshot(Snapshot(1, now))
+        result.add_snapshot(Snapshot(2, now))
+
+        result.reload_snapshots()
+
+        self.assertEqual(0, len(result.snapshots))
+        global_db.get_snapshot_count.assert_called_once_with(result.id)
+
     def test_name_setting(self):
         datetime = GLib.DateTime.new_now_local()
         result = Result(GLib.uuid_string_random(), "project_name", datetime, self.__global_db)
         self.assertEqual(result.result_name, "project_name_" + datetime.format("%F"))
+
+    def test_query(self):
+        asyncio.run(self.__test_query())
+
+    async def __test_query(self):
+        """Test that a stored result is queried in the database and returns a DataFrame."""
+        global_db = mock.Mock()
+        global_db.query_result.return_value = {"snapshot_id": np.array([1, 2]),
+                                               "average_speed": np.array([80.0, 90.0])}
+        result = Result("result_id", "project_name", GLib.DateTime.new_now_local(), global_db)
+        await result.load()
+
+        data = result.query(["cs_id"], ["snapshot_id", "average_speed"])
+        self.assertEqual(["snapshot_id", "average_speed"], list(data.columns))
+        self.assertEqual([80.0, 90.0], data["average_speed"].tolist())
+        global_db.query_result.assert_called_once_with(
+            "result_id", ["cs_id"], ["snapshot_id", "average_speed"], None, None)
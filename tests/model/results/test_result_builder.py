@@ -11,7 +11,9 @@ from sbaid.model.results.cross_section_snapshot import CrossSectionSnapshot
 from sbaid.model.results.result import Result
 from sbaid.model.results.result_builder import ResultBuilder, WrongOrderException
 from sbaid.model.results.result_manager import ResultManager
-from sbaid.model.results.snapshot import Snapshot
+from sbaid.model.results.snapshot import Snapshot, snapshot_to_data
+from sbaid.model.simulation.display import Display
+from sbaid.model.simulation.input import Input
 from tests import result_testing_utils
 
 
@@ -42,6 +44,61 @@ class ResultBuilderTest(unittest.TestCase):
         self.assertIsInstance(random_cs_snapshot, CrossSectionSnapshot)
         self.assertEqual(len(random_cs_snapshot.lane_snapshots), lane_amount)
 
+        self.assertEqual(list(range(1, snapshot_amount + 1)),
+                         [snapshot.id for snapshot in result.snapshots])
+        cs_snapshot_ids = [cs_snapshot.cs_snapshot_id for snapshot in result.snapshots
+                           for cs_snapshot in snapshot.cross_section_snapshots]
+        self.assertEqual(list(range(1, snapshot_amount * cs_amount + 1)), cs_snapshot_ids)
+
+    def test_add_snapshot_from_input(self):
+        asyncio.run(self.__test_add_snapshot_from_input())
+
+    async def __test_add_snapshot_from_input(self):
+        """Tests that recording a whole input gives the same snapshots as the fine-grained
+        builder methods."""
+        measurement = Input()
+        measurement.add_vehicle_info("cs_1", 0, VehicleType.CAR, 120.0)
+        measurement.add_vehicle_info("cs_1", 0, VehicleType.LORRY, 80.0)
+        measurement.add_vehicle_info("cs_1", 1, VehicleType.CAR, 130.0)
+        display = Display()
+        display.set_b_display("cs_1", BDisplay.TRAFFIC_JAM)
+        display.set_a_display("cs_1", 1, ADisplay.SPEED_LIMIT_100)
+        cross_sections = [("cs_1", "first", 2), ("cs_2", "second", 1)]
+        time = GLib.DateTime.new_now_local()
+
+        bulk_builder = ResultBuilder(ResultManager(self.__global_mock_db))
+        bulk_builder.begin_result("bulk")
+        bulk_builder.add_snapshot_from_input(time, measurement, display, cross_sections)
+        bulk_builder.add_snapshot_from_input(time, measurement, None, cross_sections)
+        bulk_result = await bulk_builder.end_result()
+
+        builder = ResultBuilder(ResultManager(self.__global_mock_db))
+        builder.begin_result("fine-grained")
+        for step_display in (display, None):
+            builder.begin_snapshot(time)
+            for cs_id, cs_name, lanes in cross_sections:
+                builder.begin_cross_section(cs_id, cs_name)
+                if step_display:
+                    builder.add_b_display(step_display.get_b_display(cs_id))
+                for lane in range(lanes):
+                    builder.begin_lane(lane)
+                    builder.add_average_speed(measurement.get_average_speed(cs_id, lane))
+                    builder.add_traffic_volume(measurement.get_traffic_volume(cs_id, lane))
+                    if step_display:
+                        builder.add_a_display(step_display.get_a_display(cs_id, lane))
+                    for vehicle_info in measurement.get_all_vehicle_infos(cs_id, lane):
+                        builder.begin_vehicle()
+                        builder.add_vehicle_type(vehicle_info.vehicle_type)
+                        builder.add_vehicle_speed(vehicle_info.speed)
+                        builder.end_vehicle()
+                    builder.end_lane()
+                builder.end_cross_section()
+            builder.end_snapshot()
+        result = await builder.end_result()
+
+        self.assertEqual([snapshot_to_data(snapshot, "result") for snapshot in result.snapshots],
+                         [snapshot_to_data(snapshot, "result")
+                          for snapshot in bulk_result.snapshots])
 
     def test_build_in_wrong_order(self):
         """Tests if the internal logic is robust enough to catch errors in the false building order."""
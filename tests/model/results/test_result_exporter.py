@@ -0,0 +1,65 @@
+"""This module contains unittests for the ResultExporter class."""
+import asyncio
+import csv
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from gi.repository import Gio, GLib
+
+from sbaid.model.database.global_database import VEHICLE_SPEED_DTYPE
+from sbaid.model.database.global_sqlite import GlobalSQLite
+from sbaid.model.results.result_exporter import ResultExporter, LANE_FIELDS, VEHICLE_FIELDS
+
+
+class ResultExporterTest(unittest.TestCase):
+    """This class tests the ResultExporter class."""
+
+    def test_export_csv(self):
+        asyncio.run(self.__test_export_csv())
+
+    async def __test_export_csv(self):
+        """Test exporting the lane and vehicle layers of a result in small chunks."""
+        with tempfile.TemporaryDirectory() as directory:
+            db = GlobalSQLite(Gio.File.new_for_path(os.path.join(directory, "global_db")))
+            await db.open()
+            snapshot_data = []
+            for i in range(1, 4):
+                lanes = [(2 * i + lane, i, lane, 80.0 + lane, 2, 0, bytes([0, 1]),
+                          np.array([70.0 + i, 90.0], dtype=VEHICLE_SPEED_DTYPE).tobytes())
+                         for lane in range(2)]
+                snapshot_data.append((i, "result", f"2025-07-24T15:3{i}:00+02",
+                                      [(i, i, "cs_id", "cs_name", 1, lanes)]))
+            await db.add_entire_result("result", "name", "project",
+                                       GLib.DateTime.new_now_local(), snapshot_data)
+
+            exporter = ResultExporter(chunk_size=2)
+            self.assertIn("csv", [export_format.format_id
+                                  for export_format in exporter.available_formats])
+            files = await exporter.export(db, "result", Gio.File.new_for_path(directory), "csv",
+                                          ["cs_id"],
+                                          start=GLib.DateTime.new_from_iso8601(
+                                              "2025-07-24T15:32:00+02"))
+            await db.close()
+
+            self.assertEqual([os.path.join(directory, "result_lanes.csv"),
+                              os.path.join(directory, "result_vehicles.csv")],
+                             [file.get_path() for file in files])
+            with open(files[0].get_path(), newline="") as csvfile:
+                lanes = list(csv.reader(csvfile))
+            self.assertEqual(LANE_FIELDS, lanes[0])
+            self.assertEqual(["2", "2025-07-24T15:32:00+02", "cs_id", "cs_name", "1", "0",
+                              "80.0", "2", "0"], lanes[1])
+            self.assertEqual(5, len(lanes))
+            with open(files[1].get_path(), newline="") as csvfile:
+                vehicles = list(csv.reader(csvfile))
+            self.assertEqual(VEHICLE_FIELDS, vehicles[0])
+            self.assertEqual([["0", "72.0"], ["1", "90.0"]] * 2 + [["0", "73.0"], ["1", "90.0"]] * 2,
+                             [vehicle[4:] for vehicle in vehicles[1:]])
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(ResultExporter().export(mock.Mock(), "result",
+                                                Gio.File.new_for_path("."), "xlsx"))
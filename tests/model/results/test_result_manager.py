@@ -9,6 +9,9 @@ from sbaid.model.results.result import Result
 class ResultManagerTest(unittest.TestCase):
     """This class tests the ResultManager class. """
     __global_db = unittest.mock.AsyncMock()
+    __global_db.mark_result_deleted.return_value = 0
+    __global_db.delete_result_chunk.return_value = 0
+    __global_db.reclaim_space.return_value = 0
     result_manager = ResultManager(__global_db)
 
     def test_add_and_remove_tag(self):
@@ -72,3 +75,87 @@ class ResultManagerTest(unittest.TestCase):
         # assert state of results list
         self.assertEqual(len(self.result_manager.results), 2)
         self.assertNotIn(result, self.result_manager.results)
+
+    def test_load_from_db(self):
+        asyncio.run(self.__test_load_from_db())
+
+    async def __test_load_from_db(self):
+        """Test loading the results and tags with their bulk queries."""
+        global_db = unittest.mock.AsyncMock()
+        now = GLib.DateTime.new_now_local()
+        global_db.get_all_tags.return_value = [("tag_1", "first"), ("tag_2", "second")]
+        global_db.get_all_results_with_tag_ids.return_value = [
+            ("result_1", "name_1", "project", now, True, ["tag_2", "tag_1"]),
+            ("result_2", "name_2", "project", now, False, []),
+        ]
+        result_manager = ResultManager(global_db)
+
+        await result_manager.load_from_db()
+
+        self.assertEqual(["tag_1", "tag_2"],
+                         [tag.tag_id for tag in result_manager.available_tags])
+        first, second = list(result_manager.results)
+        self.assertEqual("name_1", first.result_name)
+        self.assertTrue(first.complete)
+        self.assertFalse(second.complete)
+        # the tags of the results are the available tags themselves
+        self.assertEqual([result_manager.available_tags[1], result_manager.available_tags[0]],
+                         list(first.selected_tags))
+        self.assertEqual(0, len(second.selected_tags))
+        global_db.get_result_name.assert_not_awaited()
+        global_db.get_tag_name.assert_not_awaited()
+
+    def test_add_tag_to_result(self):
+        asyncio.run(self.__test_add_tag_to_result())
+
+    async def __test_add_tag_to_result(self):
+        """Test tagging a result by the name of a tag."""
+        global_db = unittest.mock.AsyncMock()
+        result_manager = ResultManager(global_db)
+        result = Result("result", "project", GLib.DateTime.new_now_local(), global_db)
+        result_manager.add_stored_result(result)
+
+        await result_manager.add_tag_to_result("result", "sweep")
+        await result_manager.add_tag_to_result("result", "sweep")
+
+        # the tag is only created and added once
+        self.assertEqual(1, len(result_manager.available_tags))
+        tag = result_manager.available_tags[0]
+        self.assertEqual("sweep", tag.name)
+        global_db.add_tag.assert_awaited_once_with(tag.tag_id, "sweep")
+        self.assertEqual([tag], list(result.selected_tags))
+        global_db.add_result_tag.assert_awaited_once()
+        self.assertEqual(("result", tag.tag_id),
+                         global_db.add_result_tag.await_args.args[1:])
+
+    def test_delete_result_in_background(self):
+        asyncio.run(self.__test_delete_result_in_background())
+
+    async def __test_delete_result_in_background(self):
+        """Test that results are deleted chunk by chunk with progress reports."""
+        global_db = unittest.mock.AsyncMock()
+        global_db.get_all_tags.return_value = []
+        global_db.get_all_results_with_tag_ids.return_value = [
+            ("result_1", "name", "project", GLib.DateTime.new_now_local(), True, [])]
+        global_db.get_deleted_result_ids.return_value = ["interrupted"]
+        global_db.mark_result_deleted.side_effect = [1, 4]
+        chunks = {"interrupted": [1, 0], "result_1": [2, 2, 0]}
+
+        async def delete_result_chunk(result_id, max_snapshots):
+            return chunks[result_id].pop(0)
+
+        global_db.delete_result_chunk.side_effect = delete_result_chunk
+        global_db.reclaim_space.side_effect = [10, 0]
+        result_manager = ResultManager(global_db)
+        progress = []
+        result_manager.connect("notify::deletion-progress",
+                               lambda manager, _: progress.append(manager.deletion_progress))
+
+        await result_manager.load_from_db()
+        await result_manager.delete_result("result_1")
+        self.assertEqual(0, len(result_manager.results))
+        await result_manager.wait_for_deletions()
+
+        self.assertEqual([0.2, 0.6, 1.0, 1.0], progress)
+        self.assertEqual({"interrupted": [], "result_1": []}, chunks)
+        self.assertEqual(2, global_db.reclaim_space.await_count)
@@ -0,0 +1,80 @@
+"""This module contains unittests for the ResultWriter class."""
+import asyncio
+import unittest
+from unittest import mock
+
+from gi.repository import GLib
+
+from sbaid.model.results.result import Result
+from sbaid.model.results.result_writer import ResultWriter
+
+
+def _snapshot_data(i):
+    return (i, "result_id", "2025-07-24T15:30:00+02", [])
+
+
+class ResultWriterTest(unittest.TestCase):
+    """This class tests the ResultWriter class."""
+
+    def setUp(self):
+        self.global_db = mock.AsyncMock()
+        self.result = Result("result_id", "project", GLib.DateTime.new_now_local(),
+                             self.global_db)
+
+    def test_write(self):
+        asyncio.run(self.__test_write())
+
+    async def __test_write(self):
+        writer = ResultWriter(self.global_db, self.result, max_in_flight=4)
+        for i in range(10):
+            await writer.wait_for_capacity()
+            writer.submit(_snapshot_data(i))
+        await writer.finish()
+
+        self.global_db.begin_result.assert_awaited_once()
+        written = [data for call in self.global_db.add_snapshots.await_args_list
+                   for data in call.args[0]]
+        self.assertEqual([_snapshot_data(i) for i in range(10)], written)
+        self.global_db.complete_result.assert_awaited_once_with("result_id")
+
+        with self.assertRaises(RuntimeError):
+            writer.submit(_snapshot_data(10))
+
+    def test_bounded_in_flight(self):
+        asyncio.run(self.__test_bounded_in_flight())
+
+    async def __test_bounded_in_flight(self):
+        release = asyncio.Event()
+
+        async def add_snapshots(_):
+            await release.wait()
+
+        self.global_db.add_snapshots.side_effect = add_snapshots
+        writer = ResultWriter(self.global_db, self.result, max_in_flight=2)
+        writer.submit(_snapshot_data(0))
+        writer.submit(_snapshot_data(1))
+
+        waiter = asyncio.create_task(writer.wait_for_capacity())
+        await asyncio.sleep(0.01)
+        self.assertEqual(2, writer.in_flight)
+        self.assertFalse(waiter.done())
+
+        release.set()
+        await waiter
+        self.assertEqual(0, writer.in_flight)
+        await writer.finish(complete=False)
+        self.global_db.complete_result.assert_not_awaited()
+
+    def test_failed_write(self):
+        asyncio.run(self.__test_failed_write())
+
+    async def __test_failed_write(self):
+        self.global_db.add_snapshots.side_effect = OSError("disk full")
+        writer = ResultWriter(self.global_db, self.result)
+        writer.submit(_snapshot_data(0))
+
+        with self.assertRaises(OSError):
+            await writer.finish()
+        with self.assertRaises(OSError):
+            writer.submit(_snapshot_data(1))
+        self.global_db.complete_result.assert_not_awaited()
@@ -0,0 +1,76 @@
+"""This module contains unittests for the RetentionScheduler class."""
+import asyncio
+import unittest
+from unittest import mock
+
+from gi.events import GLibEventLoopPolicy
+from gi.repository import GLib
+
+from sbaid.model.results.result_manager import ResultManager
+from sbaid.model.results.retention_policy import (RetentionPolicy, RetentionReport,
+                                                  RetentionScheduler,
+                                                  get_thinned_out_snapshot_ids)
+
+
+class RetentionSchedulerTest(unittest.TestCase):
+    """This class tests the RetentionScheduler class."""
+
+    def test_thinned_out_snapshot_ids(self):
+        start = GLib.DateTime.new_now_utc()
+        snapshots = [(i, start.add_seconds(seconds))
+                     for i, seconds in enumerate([0, 330, 60, 300, 120, 600])]
+        self.assertEqual([2, 4, 1], get_thinned_out_snapshot_ids(snapshots, 300))
+        self.assertEqual([], get_thinned_out_snapshot_ids(snapshots, 30))
+
+    def test_run(self):
+        asyncio.set_event_loop_policy(GLibEventLoopPolicy())
+        loop = asyncio.get_event_loop()
+        try:
+            loop.run_until_complete(self.__test_run())
+        finally:
+            loop.close()
+            asyncio.set_event_loop_policy(None)
+
+    async def __test_run(self):
+        """Test that the policy deletes and down-samples the right results, every step
+        once the main loop is idle."""
+        now = GLib.DateTime.new_now_local()
+        global_db = mock.AsyncMock()
+        global_db.get_all_tags.return_value = [("keep", "keep")]
+        global_db.get_all_results_with_tag_ids.return_value = [
+            ("kept", "kept", "project", now.add_days(-40), True, ["keep"]),
+            ("old", "old", "project", now.add_days(-40), True, []),
+            ("incomplete", "incomplete", "project", now.add_days(-40), False, []),
+            ("new_3", "new_3", "project", now.add_days(-3), True, []),
+            ("new_1", "new_1", "project", now.add_hours(-1), True, []),
+            ("new_2", "new_2", "project", now.add_days(-2), True, []),
+        ]
+        global_db.get_deleted_result_ids.return_value = []
+        global_db.mark_result_deleted.return_value = 0
+        global_db.delete_result_chunk.return_value = 0
+        global_db.reclaim_space.return_value = 0
+        global_db.get_database_size.side_effect = [5000, 1000]
+        global_db.drop_vehicle_data.side_effect = [100, 20, 0]
+        global_db.get_all_snapshots.return_value = [(1, now), (2, now.add_seconds(10)),
+                                                    (3, now.add_seconds(60))]
+        global_db.delete_snapshots.return_value = 1
+        result_manager = ResultManager(global_db)
+        await result_manager.load_from_db()
+
+        scheduler = RetentionScheduler(result_manager, RetentionPolicy(
+            keep_tag_ids=frozenset(["keep"]), max_age_days=30, max_results=2,
+            drop_vehicles_after_days=1, thin_after_days=1, snapshot_interval_seconds=30))
+        with mock.patch.object(GLib, "idle_add", wraps=GLib.idle_add) as idle_add:
+            report = await scheduler.run()
+
+        self.assertEqual(RetentionReport(2, 1, 4000), report)
+        self.assertEqual(report, scheduler.last_report)
+        self.assertEqual(4000, scheduler.bytes_reclaimed)
+        self.assertEqual(["kept", "incomplete", "new_1", "new_2"],
+                         [result.id for result in result_manager.results])
+        global_db.drop_vehicle_data.assert_has_awaits([mock.call("new_2", 100)] * 3)
+        global_db.get_all_snapshots.assert_awaited_once_with("new_2")
+        global_db.delete_snapshots.assert_awaited_once_with("new_2", [2])
+        # two deletions, three vehicle data chunks, one thinning chunk and one vacuum step
+        self.assertEqual(7, idle_add.call_count)
+        await scheduler.close()
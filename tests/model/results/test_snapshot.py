@@ -2,27 +2,24 @@
 import unittest
 import uuid
 
-from gi.repository import GLib, Gio
+from gi.repository import GLib
 from sbaid.common.b_display import BDisplay
-from sbaid.model.database.global_sqlite import GlobalSQLite
 from sbaid.model.results.snapshot import Snapshot
 from sbaid.model.results.cross_section_snapshot import CrossSectionSnapshot
 
 
 class SnapshotTestCase(unittest.TestCase):
     """Test class for the Snapshot class"""
-    __gio_file = Gio.File.new_for_path("placeholder_path.db")
-    __global_db = GlobalSQLite(__gio_file)
 
     def test_add_cross_section(self):
         """Test adding a cross-section snapshot."""
         now = GLib.DateTime.new_now_local()
-        snapshot = Snapshot(GLib.uuid_string_random(), now, self.__global_db)
+        snapshot = Snapshot(1, now)
 
         # initialize and add cross-section snapshot
-        cs_snapshot_1 = CrossSectionSnapshot(GLib.uuid_string_random(), GLib.uuid_string_random(),
+        cs_snapshot_1 = CrossSectionSnapshot(1, 1,
                                              "Jake", str(uuid.uuid4()),
-                                             BDisplay.SNOW, self.__global_db)
+                                             BDisplay.SNOW)
 
         snapshot.add_cross_section_snapshot(cs_snapshot_1)
 
@@ -31,9 +28,9 @@ class SnapshotTestCase(unittest.TestCase):
         self.assertEqual(len(snapshot.cross_section_snapshots), 1)
 
         # initialize and add cross-section snapshot
-        cs_snapshot_2 = CrossSectionSnapshot(GLib.uuid_string_random(), GLib.uuid_string_random(),
+        cs_snapshot_2 = CrossSectionSnapshot(1, 2,
                                              "Eduardo", str(uuid.uuid4()),
-                                             BDisplay.TRAFFIC_JAM, self.__global_db)
+                                             BDisplay.TRAFFIC_JAM)
 
         snapshot.add_cross_section_snapshot(cs_snapshot_2)
 
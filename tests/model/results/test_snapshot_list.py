@@ -0,0 +1,85 @@
+"""This module contains unittests for the SnapshotList class."""
+import unittest
+from unittest import mock
+
+import numpy as np
+from gi.repository import GLib
+
+from sbaid.model.database.global_database import VEHICLE_SPEED_DTYPE
+from sbaid.model.results.snapshot import Snapshot
+from sbaid.model.results.snapshot_list import SnapshotList
+
+
+def _snapshot_range(result_id, offset, limit, ids=range(10)):
+    date = GLib.DateTime.new_now_local().format_iso8601()
+    return [(i, result_id, date,
+             [(i, i, "cs_id", "cs_name", 0,
+               [(i, i, 0, 80.0, 3, 0,
+                 bytes([0]), np.array([80.0], dtype=VEHICLE_SPEED_DTYPE).tobytes())])])
+            for i in ids[offset:offset + limit]]
+
+
+class SnapshotListTest(unittest.TestCase):
+    """This class tests the SnapshotList class."""
+
+    def setUp(self):
+        self.global_db = mock.MagicMock()
+        self.global_db.get_snapshot_count.return_value = 10
+        self.global_db.get_snapshot_range.side_effect = _snapshot_range
+
+    def test_items(self):
+        snapshots = SnapshotList("result_id", self.global_db, page_size=4, max_pages=2)
+
+        self.assertEqual(Snapshot.__gtype__, snapshots.get_item_type())
+        self.assertEqual(10, snapshots.get_n_items())
+        self.assertEqual(10, snapshots.get_n_items())
+        self.global_db.get_snapshot_count.assert_called_once_with("result_id")
+
+        snapshot = snapshots.get_item(5)
+        self.assertEqual(5, snapshot.id)
+        cs_snapshot = snapshot.cross_section_snapshots.get_item(0)
+        self.assertEqual("cs_id", cs_snapshot.cross_section_id)
+        self.assertEqual("cs_name", cs_snapshot.cross_section_name)
+        lane_snapshot = cs_snapshot.lane_snapshots.get_item(0)
+        self.assertEqual(1, lane_snapshot.vehicle_snapshots.get_n_items())
+
+        self.assertIsNone(snapshots.get_item(10))
+        self.assertEqual(list(range(10)),
+                         [snapshot.id for snapshot in snapshots])
+
+    def test_page_cache(self):
+        snapshots = SnapshotList("result_id", self.global_db, page_size=4, max_pages=2)
+
+        first = snapshots.get_item(0)
+        self.assertIs(first, snapshots.get_item(0))
+        snapshots.get_item(3)
+        self.global_db.get_snapshot_range.assert_called_once_with("result_id", 0, 4)
+
+        snapshots.get_item(4)
+        snapshots.get_item(0)  # page 0 is now the most recently used one
+        snapshots.get_item(8)  # evicts page 1
+        self.assertEqual(3, self.global_db.get_snapshot_range.call_count)
+
+        self.assertIs(first, snapshots.get_item(0))
+        self.assertEqual(3, self.global_db.get_snapshot_range.call_count)
+        snapshots.get_item(4)
+        self.assertEqual(4, self.global_db.get_snapshot_range.call_count)
+
+    def test_reload(self):
+        snapshots = SnapshotList("result_id", self.global_db, page_size=4, max_pages=2)
+        changes = []
+        snapshots.connect("items-changed", lambda _, *args: changes.append(args))
+        self.assertEqual(9, snapshots.get_item(9).id)
+
+        # every other snapshot is deleted from the database
+        remaining = list(range(0, 10, 2))
+        self.global_db.get_snapshot_count.return_value = len(remaining)
+        self.global_db.get_snapshot_range.side_effect = (
+            lambda result_id, offset, limit: _snapshot_range(result_id, offset, limit,
+                                                             remaining))
+        snapshots.reload()
+
+        self.assertEqual([(0, 10, 5)], changes)
+        self.assertEqual(5, snapshots.get_n_items())
+        self.assertEqual(remaining, [snapshot.id for snapshot in snapshots])
+        self.assertIsNone(snapshots.get_item(5))
@@ -0,0 +1,58 @@
+"""This module contains unittests for the VehicleSnapshotList class."""
+import unittest
+
+import numpy as np
+
+from sbaid.common.vehicle_type import VehicleType
+from sbaid.model.results.vehicle_snapshot import VehicleSnapshot
+from sbaid.model.results.vehicle_snapshot_list import VehicleSnapshotList
+
+
+class VehicleSnapshotListTest(unittest.TestCase):
+    """This class tests the VehicleSnapshotList class."""
+
+    def test_append(self):
+        vehicles = VehicleSnapshotList(1)
+        changes = []
+        vehicles.connect("items-changed", lambda _, *args: changes.append(args))
+
+        for i in range(20):
+            vehicles.append(VehicleType(i % 2), 60.0 + i)
+
+        self.assertEqual(VehicleSnapshot.__gtype__, vehicles.get_item_type())
+        self.assertEqual(20, vehicles.get_n_items())
+        self.assertEqual([(i, 0, 1) for i in range(20)], changes)
+        self.assertEqual([i % 2 for i in range(20)], vehicles.types.tolist())
+        self.assertEqual([60.0 + i for i in range(20)], vehicles.speeds.tolist())
+
+        vehicle = vehicles.get_item(3)
+        self.assertEqual(1, vehicle.lane_snapshot_id)
+        self.assertEqual(VehicleType.LORRY, vehicle.vehicle_type)
+        self.assertEqual(63.0, vehicle.speed)
+        self.assertIsNone(vehicles.get_item(20))
+
+    def test_columns(self):
+        vehicles = VehicleSnapshotList(1)
+        vehicles.append(VehicleType.CAR, 80.5)
+        vehicles.append(VehicleType.LORRY, 70.25)
+        types, speeds = vehicles.get_columns()
+        self.assertEqual(bytes([0, 1]), types)
+        self.assertEqual(8, len(speeds))
+
+        copy = VehicleSnapshotList(1)
+        copy.set_columns(types, speeds)
+        self.assertEqual([0, 1], copy.types.tolist())
+        self.assertEqual([80.5, 70.25], copy.speeds.tolist())
+
+        copy.append(VehicleType.CAR, 90.0)
+        self.assertEqual(3, copy.get_n_items())
+        self.assertEqual((types, speeds), vehicles.get_columns())
+
+        with self.assertRaises(ValueError):
+            copy.set_columns(bytes([0]), speeds)
+
+    def test_empty(self):
+        vehicles = VehicleSnapshotList(1)
+        self.assertEqual(0, vehicles.get_n_items())
+        self.assertEqual((b"", b""), vehicles.get_columns())
+        self.assertIsInstance(vehicles.speeds, np.ndarray)
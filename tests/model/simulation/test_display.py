@@ -51,3 +51,14 @@ class DisplayTestCase(unittest.TestCase):
         self.assertEqual(display.get_a_display("my_cross_section", 0), ADisplay.SPEED_LIMIT_110)
         self.assertEqual(display.get_a_display("my_cross_section", 1), ADisplay.SPEED_LIMIT_130)
         self.assertEqual(display.get_b_display("my_cross_section"), BDisplay.OFF)
+
+    def test_data(self):
+        """Test that a display is the same after converting it to data and back."""
+        display = Display()
+        display.set_a_display("my_cross_section", 1, ADisplay.SPEED_LIMIT_80)
+        display.set_b_display("my_cross_section", BDisplay.CAUTION_FOG)
+        restored = Display.from_data(display.to_data())
+
+        self.assertEqual(restored.get_a_display("my_cross_section", 1), ADisplay.SPEED_LIMIT_80)
+        self.assertEqual(restored.get_a_display("my_cross_section", 0), ADisplay.OFF)
+        self.assertEqual(restored.get_b_display("my_cross_section"), BDisplay.CAUTION_FOG)
@@ -75,3 +75,29 @@ class InputTestCase(unittest.TestCase):
         self.assertEqual(test_input.get_average_speed("my_cross_section_id", 0), 100)
         self.assertEqual(test_input.get_average_speed("my_other_cross_section_id", 0), 130)
         self.assertEqual(test_input.get_average_speed("my_nonexistent_cross_section_id", 0), 0)
+
+    def test_data(self):
+        """Test that an input is the same after converting it to data and back."""
+        test_input = Input()
+        test_input.add_vehicle_info("my_cross_section_id", 0, VehicleType.CAR, 100)
+        test_input.add_vehicle_info("my_cross_section_id", 0, VehicleType.LORRY, 80.5)
+        test_input.add_vehicle_info("my_cross_section_id", 1, VehicleType.CAR, 120)
+        restored = Input.from_data(test_input.to_data())
+
+        self.assertEqual(restored.get_all_vehicle_infos("my_cross_section_id", 0),
+                         test_input.get_all_vehicle_infos("my_cross_section_id", 0))
+        self.assertEqual(restored.get_traffic_volume("my_cross_section_id", 1), 1)
+        self.assertEqual(restored.get_average_speed("my_cross_section_id", 1), 120)
+
+        lane_input = Input()
+        lane_input.add_lane_info("my_cross_section_id", 0, 95.5, 12)
+        restored = Input.from_data(lane_input.to_data())
+        self.assertEqual(restored.get_average_speed("my_cross_section_id", 0), 95.5)
+        self.assertEqual(restored.get_traffic_volume("my_cross_section_id", 0), 12)
+
+        # the speeds are not rounded on the way
+        precise_input = Input()
+        precise_input.add_vehicle_info("my_cross_section_id", 0, VehicleType.CAR, 100.1)
+        restored = Input.from_data(precise_input.to_data())
+        self.assertEqual(restored.get_all_vehicle_infos("my_cross_section_id", 0)[0].speed,
+                         100.1)
@@ -0,0 +1,168 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from gi.repository import Gio, GLib
+
+from sbaid.model import simulation_manager
+from sbaid.model.batch_runner import BatchRun, BatchRunner
+
+
+class BatchRunnerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__log = []
+        self.__failing = set()
+
+        self.__network = mock.Mock()
+        self.__network.route.points = Gio.ListStore()
+        self.__network.cross_sections = Gio.ListStore()
+
+        self.__observer = mock.Mock()
+
+        result_ids = iter(f"result_{i}" for i in range(10))
+
+        def create_builder(result_manager, max_in_flight):
+            builder = mock.Mock()
+            builder.wait_for_writer = mock.AsyncMock()
+            builder.end_result = mock.AsyncMock(
+                side_effect=lambda: mock.Mock(id=next(result_ids)))
+            builder.abort_result = mock.AsyncMock()
+            return builder
+
+        patcher = mock.patch.object(simulation_manager, "ResultBuilder",
+                                    side_effect=create_builder)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        def create_worker(script_path, timeout):
+            worker = mock.AsyncMock(cpu_time=0.0)
+            worker.calculate_display.return_value = None
+            return worker
+
+        patcher = mock.patch.object(simulation_manager, "AlgorithmWorker",
+                                    side_effect=create_worker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def __configuration(config_id):
+        config = mock.Mock(id=config_id, evaluation_interval=1, display_interval=1)
+        config.parameter_configuration.parameters = Gio.ListStore()
+        return config
+
+    async def __create_simulator(self):
+        name = f"sim{len([e for e in self.__log if e[0] == 'created'])}"
+        self.__log.append(("created", name))
+        simulator = mock.AsyncMock()
+        if name in self.__failing:
+            simulator.init_simulation.side_effect = ValueError("broken simulation file")
+        else:
+            simulator.init_simulation.return_value = (GLib.DateTime.new_from_unix_utc(0), 3)
+
+        async def continue_simulation(span):
+            self.__log.append(("continue", name))
+            await asyncio.sleep(0.01)
+        simulator.continue_simulation.side_effect = continue_simulation
+        simulator.measure.side_effect = lambda: mock.Mock()
+        simulator.set_display.side_effect = (
+            lambda display: self.__log.append(("display", name, display)))
+        return simulator
+
+    def __runner(self, config_ids, max_parallel_runs=None):
+        return BatchRunner("project", [BatchRun(config_id, self.__configuration(config_id))
+                                       for config_id in config_ids],
+                           self.__network, self.__create_simulator, mock.Mock(),
+                           self.__observer, algorithm_timeout=1.0,
+                           max_parallel_runs=max_parallel_runs)
+
+    def test_run(self):
+        asyncio.run(self.__test_run())
+
+    async def __test_run(self):
+        self.__failing.add("sim1")
+        runner = self.__runner(["a", "b", "c"], max_parallel_runs=3)
+        runner.start()
+        await asyncio.wait_for(runner.wait(), 5)
+
+        # the simulations run concurrently, each with its own simulator
+        continued = [entry[1] for entry in self.__log if entry[0] == "continue"]
+        self.assertEqual(["sim0", "sim2"], sorted(set(continued)))
+        self.assertNotEqual(sorted(continued), continued)
+
+        finished = {call.args[0]: call.args[1]
+                    for call in self.__observer.run_finished.call_args_list}
+        self.assertCountEqual(["a", "c"], finished.keys())
+        self.assertEqual(2, len(set(finished.values())))
+        self.__observer.run_failed.assert_called_once()
+        self.assertEqual("b", self.__observer.run_failed.call_args.args[0])
+        self.__observer.finished.assert_called_once_with()
+        self.assertEqual(1.0, self.__observer.update_progress.call_args.args[0])
+
+        statistics = runner.statistics
+        self.assertEqual((3, 2, 1), statistics[:3])
+        self.assertGreater(statistics.total, 0.0)
+        self.assertEqual(3, runner.run_statistics["a"].steps)
+
+    def test_max_parallel_runs(self):
+        asyncio.run(self.__test_max_parallel_runs())
+
+    async def __test_max_parallel_runs(self):
+        runner = self.__runner(["a", "b"], max_parallel_runs=1)
+        runner.start()
+        await asyncio.wait_for(runner.wait(), 5)
+
+        continued = [entry[1] for entry in self.__log if entry[0] == "continue"]
+        self.assertEqual(["sim0"] * 3 + ["sim1"] * 3, continued)
+        self.assertEqual(2, self.__observer.run_finished.call_count)
+
+    def test_in_process_algorithm(self):
+        asyncio.run(self.__test_in_process_algorithm())
+
+    async def __test_in_process_algorithm(self):
+        class Algorithm:
+            value = None
+
+            def init(self, parameter_configuration_state, network_state):
+                self.value = parameter_configuration_state.parameter_states[0].value.unpack()
+
+            def calculate_display(self, measurement):
+                return self.value
+
+        limit = mock.Mock(cross_section=None, value=GLib.Variant("i", 0))
+        limit.name = "limit"
+        config = self.__configuration("config")
+        config.parameter_configuration.parameters = mock.Mock(
+            get_n_items=lambda: 1, get_item=[limit].__getitem__)
+        config.algorithm = Algorithm()
+        runner = BatchRunner("project", [
+            BatchRun(f"run_{value}", config, {("limit", None): GLib.Variant("i", value)})
+            for value in (80, 120)], self.__network, self.__create_simulator, mock.Mock(),
+            self.__observer, algorithm_timeout=None, max_parallel_runs=2)
+        runner.start()
+        await asyncio.wait_for(runner.wait(), 5)
+
+        # the runs share the algorithm, so they must not run at the same time
+        displays = [entry[1:] for entry in self.__log if entry[0] == "display"]
+        self.assertEqual([("sim0", 80)] * 3 + [("sim1", 120)] * 3, displays)
+        self.assertEqual(2, self.__observer.run_finished.call_count)
+
+    def test_cancel(self):
+        asyncio.run(self.__test_cancel())
+
+    async def __test_cancel(self):
+        runner = self.__runner(["a", "b", "c"], max_parallel_runs=2)
+        runner.start()
+        await asyncio.sleep(0.015)
+        await runner.cancel()
+        await asyncio.wait_for(runner.wait(), 5)
+
+        # the third simulation never gets a simulator
+        self.assertEqual(2, len([entry for entry in self.__log if entry[0] == "created"]))
+        self.__observer.run_finished.assert_not_called()
+        self.assertEqual(3, runner.statistics.failed)
+        self.__observer.finished.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -42,6 +42,14 @@ class ContextTestCase(unittest.TestCase):
         self.assertEqual(context2.projects.get_item(0).id, proj_id)
         self.assertEqual(context2.projects.get_n_items(), 1)
 
+        await context1.close()
+        await context2.close()
+
+        # the metadata was cached in the global database when the contexts were closed
+        context3 = Context()
+        await context3.load()
+        self.assertEqual(context3.projects.get_item(0).name, "project name")
+        await context3.close()
         await global_file.delete_async(0, None)
 
     async def projects(self):
@@ -65,4 +73,5 @@ class ContextTestCase(unittest.TestCase):
         self.assertEqual(context.projects.get_item(0).id, proj_id_2)
         self.assertEqual(context.projects.get_n_items(), 1)
 
+        await context.close()
         await global_file.delete_async(0, None)
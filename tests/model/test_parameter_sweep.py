@@ -0,0 +1,198 @@
+import asyncio
+import itertools
+import math
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from gi.repository import Gio, GLib
+
+from sbaid.model import parameter_sweep
+from sbaid.model.parameter_sweep import (ParameterSweep, SweepException, SweepParameter,
+                                         value_range)
+from sbaid.model.results.result import Result
+from sbaid.model.results.result_manager import ResultManager
+
+
+class ParameterSweepTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__global_db = mock.AsyncMock()
+        self.__global_db.query_result = mock.Mock(return_value={
+            "average_speed": np.array([80.0, 100.0], dtype="<f4"),
+            "traffic_volume": np.array([3, 5])})
+        cache_keys = {}
+        self.__global_db.set_result_cache_key.side_effect = (
+            lambda result_id, cache_key: cache_keys.setdefault(cache_key, []).append(result_id))
+        self.__global_db.get_result_ids_with_cache_key.side_effect = (
+            lambda cache_key: cache_keys.get(cache_key, []))
+        self.__result_manager = ResultManager(self.__global_db)
+
+        threshold = mock.Mock(value_type=GLib.VariantType("d"), cross_section=None,
+                              value=GLib.Variant("d", 0.1))
+        threshold.name = "threshold"
+        self.__limit = mock.Mock(value_type=GLib.VariantType("i"),
+                                 cross_section=mock.Mock(id="cs1"), value=GLib.Variant("i", 1))
+        self.__limit.name = "limit"
+        parameters = [threshold, self.__limit]
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.__script_path = os.path.join(directory.name, "algorithm.py")
+        self.__simulation_path = os.path.join(directory.name, "simulation.json")
+        for path in (self.__script_path, self.__simulation_path):
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("original")
+        self.__configuration = mock.Mock(id="config", script_path=self.__script_path,
+                                         evaluation_interval=1, display_interval=1)
+        self.__configuration.parameter_configuration.parameters = mock.Mock(
+            get_n_items=lambda: len(parameters), get_item=parameters.__getitem__)
+
+        self.__network = mock.Mock(cross_sections=Gio.ListStore())
+        self.__observer = mock.Mock()
+        self.__runs = []
+        self.__failing = set()
+        result_ids = (f"new_{i}" for i in itertools.count())
+
+        def create_runner(project_name, runs, network, create_simulator, result_manager,
+                          observer, algorithm_timeout, max_parallel_runs):
+            self.__runs.extend(runs)
+
+            async def wait():
+                for run in runs:
+                    if run.id in self.__failing:
+                        observer.run_failed(run.id, GLib.Error("failed"))
+                        continue
+                    result_id = next(result_ids)
+                    result_manager.add_stored_result(Result(
+                        result_id, project_name, GLib.DateTime.new_now_local(),
+                        self.__global_db))
+                    observer.run_finished(run.id, result_id)
+                observer.finished()
+
+            runner = mock.Mock(run_statistics={run.id: mock.Mock(total=2.0, algorithm_cpu=1.0)
+                                               for run in runs})
+            runner.wait.side_effect = wait
+            return runner
+
+        patcher = mock.patch.object(parameter_sweep, "BatchRunner", side_effect=create_runner)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def __sweep(self, parameters, simulation_input="simulation"):
+        return ParameterSweep("project", self.__configuration, parameters, self.__network,
+                              mock.AsyncMock(), simulation_input, [self.__simulation_path],
+                              self.__result_manager, self.__observer)
+
+    async def __run_sweep(self, parameters, simulation_input="simulation"):
+        sweep = self.__sweep(parameters, simulation_input)
+        sweep.start()
+        await asyncio.wait_for(sweep.wait(), 5)
+        return sweep
+
+    def test_value_range(self):
+        self.assertEqual([0.5, 0.75, 1.0],
+                         [value.unpack() for value in value_range(0.5, 1.0, 0.25)])
+        self.assertEqual([80, 100, 120],
+                         [value.unpack() for value in value_range(80, 125, 20, "i")])
+        self.assertTrue(value_range(1, 2, 1, "i")[0].is_of_type(GLib.VariantType("i")))
+        with self.assertRaises(ValueError):
+            value_range(0, 1, 0)
+
+    def test_sweep(self):
+        asyncio.run(self.__test_sweep())
+
+    async def __test_sweep(self):
+        # the result of the second combination exists already
+        await self.__run_sweep([SweepParameter("threshold", None, [GLib.Variant("d", 0.5)]),
+                                SweepParameter("limit", "cs1", [GLib.Variant("i", 100)])])
+        self.__runs.clear()
+        self.__observer.reset_mock()
+
+        sweep = self.__sweep([SweepParameter("threshold", None, value_range(0.5, 1.0, 0.5)),
+                              SweepParameter("limit", "cs1", value_range(80, 100, 20, "i"))])
+        self.assertEqual(["config: threshold=0.5, limit@cs1=80",
+                          "config: threshold=0.5, limit@cs1=100",
+                          "config: threshold=1.0, limit@cs1=80",
+                          "config: threshold=1.0, limit@cs1=100"], sweep.run_ids)
+
+        # a tag with the name of a combination does not make a result reusable
+        self.__result_manager.add_stored_result(Result(
+            "tagged", "project", GLib.DateTime.new_now_local(), self.__global_db))
+        await self.__result_manager.add_tag_to_result("tagged", sweep.run_ids[2])
+        self.__failing.add(sweep.run_ids[2])
+
+        await asyncio.wait_for(sweep.wait(), 5)  # not started yet
+        sweep.start()
+        await asyncio.wait_for(sweep.wait(), 5)
+
+        self.assertEqual([sweep.run_ids[0], sweep.run_ids[2], sweep.run_ids[3]],
+                         [run.id for run in self.__runs])
+        self.assertEqual({("threshold", None): 1.0, ("limit", "cs1"): 100},
+                         {key: value.unpack()
+                          for key, value in self.__runs[2].parameter_values.items()})
+        self.__observer.run_finished.assert_any_call(sweep.run_ids[1], "new_0")
+        self.assertEqual(3, self.__observer.run_finished.call_count)
+        self.__observer.run_failed.assert_called_once()
+        self.__observer.finished.assert_called_once_with()
+
+        # the new results are tagged with their parameter set
+        results = {result.id: result for result in self.__result_manager.results}
+        self.assertEqual([sweep.run_ids[3]],
+                         [tag.name for tag in results["new_2"].selected_tags])
+
+        summary = sweep.summary()
+        self.assertEqual(["finished", "cached", "failed", "finished"],
+                         list(summary["status"]))
+        self.assertEqual([0.5, 0.5, 1.0, 1.0], list(summary["threshold"]))
+        self.assertEqual([80, 100, 80, 100], list(summary["limit@cs1"]))
+        self.assertEqual(["new_1", "new_0", "new_2"], list(summary["result_id"].dropna()))
+        self.assertTrue(summary["result_id"].isna()[2])
+        self.assertEqual(90.0, summary["mean_speed"][0])
+        self.assertEqual(8.0, summary["traffic_volume"][3])
+        self.assertTrue(math.isnan(summary["mean_speed"][2]))
+        self.assertTrue(math.isnan(summary["duration"][1]))
+        self.assertEqual(2.0, summary["duration"][0])
+
+    def test_cache_key(self):
+        asyncio.run(self.__test_cache_key())
+
+    async def __test_cache_key(self):
+        parameters = [SweepParameter("threshold", None, [GLib.Variant("d", 0.5)])]
+        await self.__run_sweep(parameters)
+        await self.__run_sweep(parameters)
+        self.assertEqual(1, len(self.__runs))
+
+        # every input of the simulation is part of the key
+        self.__limit.value = GLib.Variant("i", 2)
+        await self.__run_sweep(parameters)
+        self.__configuration.script_path = self.__simulation_path
+        await self.__run_sweep(parameters)
+        self.__configuration.script_path = self.__script_path
+        await self.__run_sweep(parameters, "other simulation")
+        self.assertEqual(4, len(self.__runs))
+        await self.__run_sweep(parameters, "other simulation")
+        self.assertEqual(4, len(self.__runs))
+
+        # so are the contents of the algorithm script and the simulation file
+        for path in (self.__script_path, self.__simulation_path):
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("edited")
+            await self.__run_sweep(parameters, "other simulation")
+        self.assertEqual(6, len(self.__runs))
+        await self.__run_sweep(parameters, "other simulation")
+        self.assertEqual(6, len(self.__runs))
+
+    def test_invalid_parameters(self):
+        for parameters in ([SweepParameter("unknown", None, [GLib.Variant("d", 1.0)])],
+                           [SweepParameter("threshold", "cs1", [GLib.Variant("d", 1.0)])],
+                           [SweepParameter("threshold", None, [GLib.Variant("i", 1)])],
+                           [SweepParameter("limit", "cs1", [])],
+                           [SweepParameter("limit", "cs1", [GLib.Variant("i", 1)])] * 2):
+            with self.assertRaises(SweepException):
+                self.__sweep(parameters)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -58,6 +58,8 @@ class ProjectTestCase(unittest.TestCase):
         self.assertIsNotNone(other_project.algorithm_configuration_manager)
         self.assertIsNotNone(other_project.simulator)
 
+        await other_project.close()
+        await context.close()
         await Gio.File.new_for_path("global_db").delete_async(0)
 
     async def start_simulation(self):
@@ -0,0 +1,132 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from gi.repository import Gio, GLib
+
+from sbaid.model import simulation_manager
+from sbaid.model.simulation_manager import SimulationManager
+
+
+class SimulationManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__log = []
+        self.__start = GLib.DateTime.new_from_unix_utc(0)
+
+        self.__simulator = mock.AsyncMock()
+        self.__simulator.init_simulation.return_value = (self.__start, 5)
+        self.__simulator.continue_simulation.side_effect = self.__continue_simulation
+        self.__simulator.measure.side_effect = lambda: mock.Mock()
+
+        self.__algorithm_configuration = mock.Mock()
+        self.__algorithm_configuration.evaluation_interval = 1
+        self.__algorithm_configuration.display_interval = 2
+        self.__algorithm_configuration.parameter_configuration.parameters = Gio.ListStore()
+
+        self.__network = mock.Mock()
+        self.__network.route.points = Gio.ListStore()
+        self.__network.cross_sections = Gio.ListStore()
+
+        self.__observer = mock.Mock()
+        self.__observer.update_progress.side_effect = lambda progress: self.__log.append(
+            ("progress", progress))
+
+        self.__builder = mock.Mock()
+        self.__builder.wait_for_writer = mock.AsyncMock()
+        self.__builder.end_result = mock.AsyncMock(return_value=mock.Mock(id="result_id"))
+        self.__builder.abort_result = mock.AsyncMock()
+        self.__builder.add_snapshot_from_input.side_effect = \
+            lambda date, measurement, display, cross_sections: self.__log.append(
+                ("record", date.difference(self.__start) // GLib.TIME_SPAN_SECOND))
+
+        patcher = mock.patch.object(simulation_manager, "ResultBuilder",
+                                    return_value=self.__builder)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def __continue_simulation(self, span):
+        self.__log.append(("continue", len([e for e in self.__log if e[0] == "continue"])))
+        await asyncio.sleep(0.01)
+
+    def __manager(self, pipeline_depth):
+        return SimulationManager("project", self.__algorithm_configuration, self.__network,
+                                 self.__simulator, mock.Mock(), self.__observer,
+                                 pipeline_depth=pipeline_depth)
+
+    def test_pipelined(self):
+        asyncio.run(self.__test_pipelined())
+
+    async def __test_pipelined(self):
+        manager = self.__manager(2)
+        manager.start()
+        await asyncio.wait_for(self.__finished(), 5)
+
+        # every step is recorded in order while the simulator already runs the next step
+        records = [entry for entry in self.__log if entry[0] == "record"]
+        self.assertEqual([("record", i) for i in range(5)], records)
+        progress = [entry[1] for entry in self.__log if entry[0] == "progress"]
+        self.assertEqual([0.0, 0.2, 0.4, 0.6, 0.8], progress)
+        for i in range(4):
+            self.assertLess(self.__log.index(("continue", i + 1)),
+                            self.__log.index(("record", i)))
+        self.assertEqual(3, self.__algorithm_configuration.algorithm.calculate_display
+                         .call_count)
+        self.__observer.finished.assert_called_once_with("result_id")
+
+        statistics = manager.statistics
+        self.assertEqual(5, statistics.steps)
+        self.assertGreater(statistics.simulating, 0.04)
+        self.assertLessEqual(statistics.simulating, statistics.total)
+
+    def test_sequential(self):
+        asyncio.run(self.__test_sequential())
+
+    async def __test_sequential(self):
+        self.__manager(0).start()
+        await asyncio.wait_for(self.__finished(), 5)
+
+        steps = [entry for entry in self.__log if entry[0] != "progress"]
+        self.assertEqual([(stage, i) for i in range(5) for stage in ("continue", "record")],
+                         steps)
+        self.__observer.finished.assert_called_once_with("result_id")
+
+    def test_failed_recording(self):
+        asyncio.run(self.__test_failed_recording())
+
+    async def __test_failed_recording(self):
+        self.__builder.add_snapshot_from_input.side_effect = [None,
+                                                              ValueError("recording failed")]
+        self.__manager(1).start()
+        await asyncio.wait_for(self.__failed(), 5)
+
+        self.assertLess(self.__simulator.continue_simulation.await_count, 5)
+        self.__builder.abort_result.assert_awaited_once()
+        self.__observer.finished.assert_not_called()
+
+    def test_cancel(self):
+        asyncio.run(self.__test_cancel())
+
+    async def __test_cancel(self):
+        manager = self.__manager(2)
+        manager.start()
+        await asyncio.sleep(0.025)
+        await manager.cancel()
+        await asyncio.wait_for(self.__failed(), 5)
+        await asyncio.sleep(0.05)
+
+        self.__builder.abort_result.assert_awaited_once()
+        self.__observer.finished.assert_not_called()
+        self.assertLess(self.__simulator.continue_simulation.await_count, 5)
+
+    async def __finished(self):
+        while not self.__observer.finished.called:
+            await asyncio.sleep(0.01)
+
+    async def __failed(self):
+        while not self.__observer.failed.called or not self.__builder.abort_result.await_count:
+            await asyncio.sleep(0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+"""This module contains unittests for the headless result export."""
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from gi.repository import Gio, GLib
+
+from sbaid.export_results import main
+from sbaid.model.database.global_sqlite import GlobalSQLite
+
+
+class ExportResultsTest(unittest.TestCase):
+    """This class tests exporting results from the command line."""
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, "global_db")
+            asyncio.run(self.__create_database(database))
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                self.assertEqual(0, main(["result", directory, "--format", "csv",
+                                          "--layer", "lanes", "--database", database]))
+            self.assertEqual(os.path.join(directory, "result_lanes.csv"),
+                             output.getvalue().strip())
+            self.assertTrue(os.path.exists(os.path.join(directory, "result_lanes.csv")))
+            self.assertFalse(os.path.exists(os.path.join(directory, "result_vehicles.csv")))
+
+            with contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(1, main(["unknown", directory, "--database", database]))
+                self.assertEqual(1, main(["result", directory, "--database",
+                                          os.path.join(directory, "missing")]))
+
+    @staticmethod
+    async def __create_database(path: str) -> None:
+        db = GlobalSQLite(Gio.File.new_for_path(path))
+        await db.open()
+        await db.add_entire_result("result", "name", "project", GLib.DateTime.new_now_local(),
+                                   [(1, "result", "2025-07-24T15:30:00+02", [])])
+        await db.close()
@@ -8,6 +8,9 @@ from tests import result_testing_utils
 
 class ViewModelResultManagerTest(unittest.TestCase):
     __global_db = unittest.mock.AsyncMock()
+    __global_db.mark_result_deleted.return_value = 0
+    __global_db.delete_result_chunk.return_value = 0
+    __global_db.reclaim_space.return_value = 0
     __model_result_manager = ModelResultManager(__global_db)
 
     def test_delete_result(self):